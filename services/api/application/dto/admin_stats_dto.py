@@ -0,0 +1,19 @@
+from decimal import Decimal
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class SymbolHoldingStatsDTO(BaseModel):
+    ticker_symbol: str
+    holders: int
+    total_quantity: int
+    cost_basis: Decimal
+
+
+class AssetsUnderManagementDTO(BaseModel):
+    # 取引通貨ごとの評価額（キャッシュ済みの株価で評価、換算はしない）
+    market_value: Dict[str, Decimal]
+    cost_basis: Dict[str, Decimal]
+    # 株価がキャッシュになく、評価額に含めなかった銘柄
+    unpriced_symbols: List[str]
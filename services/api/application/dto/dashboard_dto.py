@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from application.dto.exchange_rate_dto import ExchangeRateDTO
+from application.dto.stock_dto import StockPriceResponse
+
+
+class DashboardUserDTO(BaseModel):
+    id: int
+    user_id: int
+    username: str
+    email: str
+    full_name: Optional[str] = None
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class DashboardHoldingDTO(BaseModel):
+    id: int
+    user_stock_id: int
+    user_id: int
+    ticker_symbol: str
+    quantity: int
+    acquisition_price: float
+    created_at: datetime
+    updated_at: datetime
+
+
+class DashboardDTO(BaseModel):
+    user: DashboardUserDTO
+    holdings: List[DashboardHoldingDTO]
+    # 保有銘柄ごとの株価（取得できなかった銘柄は含まない）
+    quotes: List[StockPriceResponse]
+    usd_jpy: Optional[ExchangeRateDTO] = None
@@ -1,5 +1,7 @@
+from datetime import date
+from typing import List, Optional
+
 from pydantic import BaseModel
-from typing import Optional
 
 class ExchangeRateDTO(BaseModel):
     symbol: str
@@ -8,3 +10,13 @@ class ExchangeRateDTO(BaseModel):
     high: Optional[str] = None
     low: Optional[str] = None
     last: Optional[str] = None
+
+
+class FxRatePointDTO(BaseModel):
+    date: date
+    rate: float
+
+
+class FxHistoryDTO(BaseModel):
+    pair: str
+    rates: List[FxRatePointDTO]
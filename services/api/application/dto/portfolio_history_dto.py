@@ -0,0 +1,19 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class PortfolioHistoryPointDTO(BaseModel):
+    date: date
+    total_value: Decimal
+    cost_basis: Decimal
+    exposures: Dict[str, Decimal]
+    # 株価または為替レートがなく評価額に含めなかった保有株の件数
+    excluded_holdings: int
+
+
+class PortfolioHistoryDTO(BaseModel):
+    currency: str
+    points: List[PortfolioHistoryPointDTO]
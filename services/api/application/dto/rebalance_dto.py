@@ -0,0 +1,38 @@
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+
+class RebalanceTradeDTO(BaseModel):
+    symbol: str
+    action: Literal["BUY", "SELL"]
+    # 売買株数と単元数（quantity = lots × board_lot）
+    quantity: int
+    lots: int
+    board_lot: int
+    price: float
+    currency: str
+    # 円換算の売買代金
+    amount: float
+
+
+class RebalancePositionDTO(BaseModel):
+    symbol: str
+    quantity_before: int
+    quantity_after: int
+    weight_before: float
+    weight_after: float
+    target_weight: float
+
+
+class RebalanceDTO(BaseModel):
+    # 現金を含む円換算の総資産
+    total_value: float
+    cash_before: float
+    cash_after: float
+    transaction_cost: float
+    # 目標構成比からの乖離（現金を含む構成比の差の二乗和の平方根）
+    tracking_error_before: float
+    tracking_error_after: float
+    trades: List[RebalanceTradeDTO]
+    positions: List[RebalancePositionDTO]
@@ -0,0 +1,27 @@
+from datetime import date
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class PortfolioRiskDTO(BaseModel):
+    symbols: List[str]
+    benchmark: str
+    start_date: date
+    end_date: date
+    # リターンの観測日数
+    observations: int
+    # 期間最終日の終値で評価した円換算の評価額
+    portfolio_value: float
+    weights: Dict[str, float]
+    annualized_volatility: float
+    symbol_volatilities: Dict[str, float]
+    beta: float
+    # symbolsの順に並んだ相関行列
+    correlation: List[List[float]]
+    confidence: float
+    # 1日VaR（評価額に対する損失率）と円換算の損失額
+    historical_var: float
+    parametric_var: float
+    historical_var_amount: float
+    parametric_var_amount: float
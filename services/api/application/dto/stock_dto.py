@@ -7,4 +7,13 @@ class StockPriceResponse(BaseModel):
     price: float
     currency: str
     timestamp: datetime
-    message: str
\ No newline at end of file
+    # live: 立会中の価格, close: 立会時間外に取得した終値
+    price_type: str
+    message: str
+
+class SymbolSearchResult(BaseModel):
+    symbol: str
+    exchange: str
+    name: str
+    name_en: str
+    name_kana: str
@@ -0,0 +1,116 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from domain.repositories.price_history_repository import PriceHistoryRepository
+from domain.repositories.user_stock_repository import UserStockRepository
+from domain.services.market_calendar import TSE, MarketCalendar
+from domain.services.risk_analytics import ReturnMatrix, build_return_matrix
+from infrastructure.cache.return_matrix_cache import ReturnMatrixCache
+
+
+@dataclass(frozen=True)
+class HoldingsReturns:
+    """保有株の日次リターンと、期間最終日の終値で評価した円換算の評価額"""
+
+    symbols: List[str]
+    quantities: Dict[str, int]
+    matrix: ReturnMatrix
+    # symbolsの順に並んだリターン行列と評価額
+    returns: np.ndarray
+    values: np.ndarray
+
+    @property
+    def portfolio_value(self) -> float:
+        return float(self.values.sum())
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self.values / self.values.sum()
+
+
+class PortfolioReturnsLoader:
+    """ユーザーの保有株と株価履歴からリターン行列を組み立てる
+
+    リターン行列は銘柄の組み合わせ・期間ごとにキャッシュする。
+    """
+
+    def __init__(
+        self,
+        user_stock_repository: UserStockRepository,
+        price_history_repository: PriceHistoryRepository,
+        exchange_rate_repository: ExchangeRateRepository,
+        return_matrix_cache: ReturnMatrixCache,
+        calendar: MarketCalendar,
+    ):
+        self.user_stock_repository = user_stock_repository
+        self.price_history_repository = price_history_repository
+        self.exchange_rate_repository = exchange_rate_repository
+        self.return_matrix_cache = return_matrix_cache
+        self.calendar = calendar
+
+    async def load(
+        self, user_id: int, start: date, end: date, extra_symbols: Sequence[str] = ()
+    ) -> Optional[HoldingsReturns]:
+        """
+        保有株のリターンを取得する
+
+        Args:
+            extra_symbols: 保有株と同じ日付に揃えて取得する銘柄（ベンチマークなど）
+
+        Returns:
+            保有株がなければNone
+
+        Raises:
+            ValueError: 株価履歴や為替レートが不足している場合
+        """
+        holdings = await self.user_stock_repository.get_by_user_id(user_id)
+        if not holdings:
+            return None
+
+        quantities: Dict[str, int] = defaultdict(int)
+        for holding in holdings:
+            quantities[holding.ticker_symbol] += holding.quantity
+        symbols = sorted(quantities)
+
+        matrix = await self._return_matrix(symbols + list(extra_symbols), start, end)
+        closes = matrix.last_closes[[matrix.symbols.index(symbol) for symbol in symbols]]
+        values = closes * np.array([quantities[s] for s in symbols]) * self._jpy_rates(symbols)
+        return HoldingsReturns(
+            symbols=symbols,
+            quantities=dict(quantities),
+            matrix=matrix,
+            returns=matrix.columns(symbols),
+            values=values,
+        )
+
+    async def _return_matrix(self, symbols: List[str], start: date, end: date) -> ReturnMatrix:
+        """リターン行列を取得（同じ銘柄の組み合わせ・期間ならキャッシュを使う）"""
+        key = self.return_matrix_cache.key(symbols, start, end)
+        matrix = self.return_matrix_cache.get(key)
+        if matrix is None:
+            ordered = key[0]
+            histories = await asyncio.gather(
+                *(
+                    self.price_history_repository.get_daily_closes(symbol, start, end)
+                    for symbol in ordered
+                )
+            )
+            matrix = build_return_matrix(dict(zip(ordered, histories)), ordered)
+            self.return_matrix_cache.put(key, matrix)
+        return matrix
+
+    def _jpy_rates(self, symbols: List[str]) -> np.ndarray:
+        """銘柄ごとの円換算レート（東証銘柄は1、それ以外はUSD/JPY）"""
+        is_tse = np.array([self.calendar.market_for_symbol(s) == TSE for s in symbols])
+        if is_tse.all():
+            return np.ones(len(symbols))
+        rate = self.exchange_rate_repository.get_usd_jpy_rate()
+        if not rate or not rate.get("last"):
+            raise ValueError("USD/JPY rate is not available")
+        return np.where(is_tse, 1.0, float(rate["last"]))
@@ -0,0 +1,67 @@
+"""株式分割を読み取り時に反映するリポジトリ
+
+保存済みの保有株・株価履歴はそのままにして、取得した結果にだけ分割の倍率を掛ける。
+"""
+
+from datetime import date
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from domain.entities.user_stock import UserStock
+from domain.repositories.price_history_repository import PriceHistoryRepository
+from domain.repositories.user_stock_repository import UserStockRepository
+from domain.services.split_adjustment import SplitAdjustments
+
+
+class SplitAdjustedUserStockRepository(UserStockRepository):
+    """取得日より後の分割を反映した株数・取得単価の保有株を返すリポジトリ"""
+
+    def __init__(self, repository: UserStockRepository, adjustments: SplitAdjustments):
+        self.repository = repository
+        self.adjustments = adjustments
+
+    async def create(self, user_stock: UserStock) -> UserStock:
+        return await self.repository.create(user_stock)
+
+    async def get_version(self, user_id: int) -> Optional[int]:
+        return await self.repository.get_version(user_id)
+
+    async def get_by_user_id(self, user_id: int) -> List[UserStock]:
+        return self.adjustments.adjust_holdings(await self.repository.get_by_user_id(user_id))
+
+    async def list_holder_ids(self, after_user_id: int, limit: int) -> List[int]:
+        return await self.repository.list_holder_ids(after_user_id, limit)
+
+    async def get_by_user_ids(self, user_ids: Sequence[int]) -> List[UserStock]:
+        return self.adjustments.adjust_holdings(await self.repository.get_by_user_ids(user_ids))
+
+    def stream_by_user_id(self, user_id: int, batch_size: int) -> Iterator[List[UserStock]]:
+        for batch in self.repository.stream_by_user_id(user_id, batch_size):
+            yield self.adjustments.adjust_holdings(batch)
+
+    def stream_ticker_symbols(self, batch_size: int) -> Iterator[List[str]]:
+        return self.repository.stream_ticker_symbols(batch_size)
+
+
+class SplitAdjustedPriceHistoryRepository(PriceHistoryRepository):
+    """権利落ち日より前の終値を分割後の水準に揃えて返すリポジトリ"""
+
+    split_adjusted = True
+
+    def __init__(self, repository: PriceHistoryRepository, adjustments: SplitAdjustments):
+        self.repository = repository
+        self.adjustments = adjustments
+
+    async def get_daily_closes(
+        self, symbol: str, start: date, end: date
+    ) -> List[Tuple[date, float]]:
+        closes = await self.repository.get_daily_closes(symbol, start, end)
+        return self.adjustments.adjust_closes(symbol, closes)
+
+
+def split_adjusted_price_history(
+    repository: PriceHistoryRepository, adjustments: SplitAdjustments
+) -> PriceHistoryRepository:
+    """取得元が調整済みでなければ分割を反映するリポジトリで包む"""
+    if repository.split_adjusted or not adjustments:
+        return repository
+    return SplitAdjustedPriceHistoryRepository(repository, adjustments)
@@ -0,0 +1,55 @@
+from decimal import Decimal
+from typing import Optional
+
+from domain.entities.portfolio import Portfolio, PortfolioItem
+from domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from domain.repositories.portfolio_repository import PortfolioRepository
+from domain.repositories.stock_repository import StockRepository
+from presentation.schemas.portfolio import PortfolioItemCreateRequest
+
+
+class AddPortfolioItemUseCase:
+    """ポートフォリオに明細を追加するユースケース"""
+
+    def __init__(
+        self,
+        portfolio_repository: PortfolioRepository,
+        stock_repository: StockRepository,
+        exchange_rate_repository: ExchangeRateRepository,
+    ):
+        self.portfolio_repository = portfolio_repository
+        self.stock_repository = stock_repository
+        self.exchange_rate_repository = exchange_rate_repository
+
+    async def execute(
+        self, portfolio: Portfolio, request: PortfolioItemCreateRequest
+    ) -> PortfolioItem:
+        """ユースケースの実行（現在値が取得できれば評価額も計算して登録する）"""
+
+        stock = await self.stock_repository.get_stock_price(request.symbol)
+        currency = stock.currency if stock else request.currency
+        fx_rate = self._fx_rate(currency, portfolio.currency)
+
+        item = PortfolioItem(
+            portfolio_id=portfolio.id,
+            symbol=request.symbol,
+            name=request.name or (stock.name if stock else request.symbol),
+            quantity=request.quantity,
+            average_price=request.average_price,
+            currency=currency,
+            current_price=Decimal(str(stock.price)) if stock else None,
+            fx_rate=fx_rate,
+            asset_type=request.asset_type,
+        )
+        return await self.portfolio_repository.add_item(item)
+
+    def _fx_rate(self, currency: str, portfolio_currency: str) -> Decimal:
+        if currency == portfolio_currency:
+            return Decimal("1")
+        if (currency, portfolio_currency) != ("USD", "JPY"):
+            raise ValueError(f"Unsupported currency pair: {currency}/{portfolio_currency}")
+
+        rate: Optional[dict] = self.exchange_rate_repository.get_usd_jpy_rate()
+        if not rate or not rate.get("last"):
+            raise ValueError("USD/JPY rate is not available")
+        return Decimal(rate["last"])
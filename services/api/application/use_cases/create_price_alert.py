@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from domain.entities.price_alert import AlertCondition, PriceAlert
+from domain.repositories.price_alert_repository import PriceAlertRepository
+from domain.repositories.stock_repository import StockRepository
+from presentation.schemas.price_alert import PriceAlertCreateRequest
+
+
+class CreatePriceAlertUseCase:
+    """株価アラートを登録するユースケース"""
+
+    def __init__(
+        self, price_alert_repository: PriceAlertRepository, stock_repository: StockRepository
+    ):
+        self.price_alert_repository = price_alert_repository
+        self.stock_repository = stock_repository
+
+    async def execute(self, user_id: int, request: PriceAlertCreateRequest) -> PriceAlert:
+        """
+        ユースケースの実行（変動率のアラートで基準の株価がなければ現在値を使う）
+
+        Raises:
+            ValueError: 変動率のアラートの基準の株価が決まらない場合
+        """
+        reference_price = request.reference_price
+        if request.condition == AlertCondition.PERCENT_MOVE:
+            if reference_price is None:
+                stock = await self.stock_repository.get_stock_price(request.symbol)
+                if stock is None:
+                    raise ValueError(f"Current price of {request.symbol} is not available")
+                reference_price = Decimal(str(stock.price))
+        else:
+            reference_price = None
+
+        return await self.price_alert_repository.create(
+            PriceAlert(
+                user_id=user_id,
+                symbol=request.symbol,
+                condition=request.condition,
+                threshold=request.threshold,
+                reference_price=reference_price,
+            )
+        )
@@ -0,0 +1,52 @@
+import logging
+from typing import List
+
+from domain.entities.price_alert import AlertTrigger
+from domain.repositories.price_alert_repository import PriceAlertRepository
+from infrastructure.cache.price_alert_engine import AlertDeliveryQueue
+
+logger = logging.getLogger(__name__)
+
+
+class DeliverPriceAlertsUseCase:
+    """配信キューの発火したアラートを発火済みとして記録し、ユーザーに通知するユースケース"""
+
+    def __init__(
+        self,
+        price_alert_repository: PriceAlertRepository,
+        queue: AlertDeliveryQueue,
+        batch_size: int = 500,
+    ):
+        self.price_alert_repository = price_alert_repository
+        self.queue = queue
+        self.batch_size = batch_size
+
+    async def execute(self) -> List[AlertTrigger]:
+        """
+        キューが空になるまで配信する
+
+        Returns:
+            通知したアラート（削除済み・発火済みのものは除く）
+        """
+        delivered: List[AlertTrigger] = []
+        while True:
+            batch = self.queue.drain(self.batch_size)
+            if not batch:
+                return delivered
+            try:
+                marked = await self.price_alert_repository.mark_triggered(batch)
+            except Exception:
+                # 次回のジョブで配信し直す
+                self.queue.requeue(batch)
+                raise
+            for trigger in marked:
+                logger.info(
+                    "Price alert triggered",
+                    extra={
+                        "alert_id": trigger.alert_id,
+                        "user_id": trigger.user_id,
+                        "symbol": trigger.symbol,
+                        "price": trigger.price,
+                    },
+                )
+            delivered.extend(marked)
@@ -0,0 +1,78 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+from application.dto.dashboard_dto import DashboardDTO, DashboardHoldingDTO, DashboardUserDTO
+from application.dto.stock_dto import StockPriceResponse
+from application.use_cases.get_stock_price import GetStockPriceUseCase
+from application.use_cases.get_usd_jpy_rate import GetUsdJpyRateUseCase
+from domain.entities.user_stock import UserStock
+from domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from domain.repositories.stock_repository import StockRepository
+from domain.repositories.user_repository import UserRepository
+from domain.repositories.user_stock_repository import UserStockRepository
+from domain.services.market_calendar import QuoteFreshnessPolicy
+
+
+class GetDashboardUseCase:
+    """ダッシュボードの表示に必要なユーザー・保有株・株価・為替レートをまとめて取得するユースケース
+
+    ユーザー、保有株とその株価、為替レートは互いに依存しないためasyncio.gatherで並行して取得する。
+    株価は保有株の取得後に銘柄ごとに並行して取得する。
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        user_stock_repository: UserStockRepository,
+        stock_repository: StockRepository,
+        exchange_rate_repository: ExchangeRateRepository,
+        freshness_policy: Optional[QuoteFreshnessPolicy] = None,
+    ):
+        self.user_repository = user_repository
+        self.user_stock_repository = user_stock_repository
+        self.stock_repository = stock_repository
+        self.exchange_rate_repository = exchange_rate_repository
+        self.freshness_policy = freshness_policy
+
+    async def execute(self, user_id: int) -> Optional[DashboardDTO]:
+        """
+        ユースケースの実行
+
+        Args:
+            user_id: トークンのsub（usersテーブルのid。登録時にuser_idと同じ値になる）
+
+        Returns:
+            ユーザーが存在しないか無効な場合はNone
+        """
+        user, (holdings, quotes), usd_jpy = await asyncio.gather(
+            self.user_repository.get_by_id(user_id),
+            self._holdings_with_quotes(user_id),
+            # 為替レートの取得は同期のHTTP呼び出しになり得るためスレッドで待つ
+            asyncio.to_thread(GetUsdJpyRateUseCase(self.exchange_rate_repository).execute),
+        )
+        if user is None or not user.is_active:
+            return None
+        return DashboardDTO(
+            user=DashboardUserDTO.model_validate(user, from_attributes=True),
+            holdings=[
+                DashboardHoldingDTO.model_validate(holding, from_attributes=True)
+                for holding in holdings
+            ],
+            quotes=quotes,
+            usd_jpy=usd_jpy,
+        )
+
+    async def _holdings_with_quotes(
+        self, user_id: int
+    ) -> Tuple[List[UserStock], List[StockPriceResponse]]:
+        """保有株を取得し、保有銘柄の株価を並行して取得する"""
+        holdings = await self.user_stock_repository.get_by_user_id(user_id)
+        symbols = sorted({holding.ticker_symbol for holding in holdings})
+        stock_price = GetStockPriceUseCase(self.stock_repository, self.freshness_policy)
+        quotes = await asyncio.gather(
+            *(stock_price.execute(symbol) for symbol in symbols), return_exceptions=True
+        )
+        return holdings, [
+            quote for quote in quotes
+            if quote is not None and not isinstance(quote, BaseException)
+        ]
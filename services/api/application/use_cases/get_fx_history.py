@@ -0,0 +1,21 @@
+from datetime import date
+from typing import Optional
+
+from application.dto.exchange_rate_dto import FxHistoryDTO, FxRatePointDTO
+from domain.services.fx_history import FxHistory
+
+
+class GetFxHistoryUseCase:
+    """期間内の日次為替レートを取得するユースケース"""
+
+    def __init__(self, fx_history: FxHistory):
+        self.fx_history = fx_history
+
+    def execute(self, pair: str, start: date, end: date) -> Optional[FxHistoryDTO]:
+        series = self.fx_history.series(pair)
+        if series is None:
+            return None
+        return FxHistoryDTO(
+            pair=pair,
+            rates=[FxRatePointDTO(date=day, rate=rate) for day, rate in series.between(start, end)],
+        )
@@ -0,0 +1,44 @@
+from typing import List, Optional
+
+from application.dto.admin_stats_dto import AssetsUnderManagementDTO, SymbolHoldingStatsDTO
+from domain.entities.holding_rollup import SymbolHoldingRollup
+from domain.repositories.holding_rollup_repository import HoldingRollupRepository
+from domain.services.holding_rollup import assets_by_currency
+from domain.services.portfolio_valuation import to_price
+from infrastructure.cache.quote_cache import QuoteCache
+
+
+class GetHoldingStatsUseCase:
+    """銘柄ごとの保有株の集計から運用向けの統計を返すユースケース（保有株のテーブルは読まない）"""
+
+    def __init__(self, rollup_repository: HoldingRollupRepository, quote_cache: QuoteCache):
+        self.rollup_repository = rollup_repository
+        self.quote_cache = quote_cache
+
+    async def most_held(self, limit: int) -> List[SymbolHoldingStatsDTO]:
+        return [_to_dto(rollup) for rollup in await self.rollup_repository.most_held(limit)]
+
+    async def symbol(self, ticker_symbol: str) -> Optional[SymbolHoldingStatsDTO]:
+        rollup = await self.rollup_repository.get(ticker_symbol)
+        return _to_dto(rollup) if rollup else None
+
+    async def assets_under_management(self) -> AssetsUnderManagementDTO:
+        rollups = [rollup for rollup in await self.rollup_repository.list_all() if rollup.holders]
+        quotes = {}
+        for rollup in rollups:
+            stock = self.quote_cache.get_quote(rollup.ticker_symbol)
+            if stock is not None:
+                quotes[rollup.ticker_symbol] = (to_price(stock.price), stock.currency)
+        market_value, cost_basis, unpriced = assets_by_currency(rollups, quotes)
+        return AssetsUnderManagementDTO(
+            market_value=market_value, cost_basis=cost_basis, unpriced_symbols=unpriced
+        )
+
+
+def _to_dto(rollup: SymbolHoldingRollup) -> SymbolHoldingStatsDTO:
+    return SymbolHoldingStatsDTO(
+        ticker_symbol=rollup.ticker_symbol,
+        holders=rollup.holders,
+        total_quantity=rollup.total_quantity,
+        cost_basis=rollup.cost_basis,
+    )
@@ -0,0 +1,30 @@
+from datetime import date
+
+from application.dto.portfolio_history_dto import PortfolioHistoryDTO, PortfolioHistoryPointDTO
+from domain.repositories.portfolio_snapshot_repository import PortfolioSnapshotRepository
+from domain.services.portfolio_snapshot import BASE_CURRENCY, downsample
+
+
+class GetPortfolioHistoryUseCase:
+    """期間内の日次のポートフォリオ評価を間引いて取得するユースケース"""
+
+    def __init__(self, snapshot_repository: PortfolioSnapshotRepository):
+        self.snapshot_repository = snapshot_repository
+
+    async def execute(
+        self, user_id: int, start: date, end: date, max_points: int
+    ) -> PortfolioHistoryDTO:
+        snapshots = await self.snapshot_repository.list_range(user_id, start, end)
+        return PortfolioHistoryDTO(
+            currency=BASE_CURRENCY,
+            points=[
+                PortfolioHistoryPointDTO(
+                    date=snapshot.snapshot_date,
+                    total_value=snapshot.total_value,
+                    cost_basis=snapshot.cost_basis,
+                    exposures=snapshot.exposures,
+                    excluded_holdings=snapshot.excluded_holdings,
+                )
+                for snapshot in downsample(snapshots, max_points)
+            ],
+        )
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from application.dto.risk_dto import PortfolioRiskDTO
+from application.services.portfolio_returns import PortfolioReturnsLoader
+from domain.services.risk_analytics import (
+    annualized_volatility,
+    beta,
+    correlation_matrix,
+    covariance_matrix,
+    historical_var,
+    parametric_var,
+)
+
+# ベンチマークの銘柄コード（TOPIXは連動ETFの終値で代用する）
+BENCHMARKS = {"TOPIX": "1306", "SP500": "^GSPC"}
+
+
+class GetPortfolioRiskUseCase:
+    """ユーザーの保有株のリスク指標を計算するユースケース"""
+
+    def __init__(self, returns_loader: PortfolioReturnsLoader):
+        self.returns_loader = returns_loader
+
+    async def execute(
+        self,
+        user_id: int,
+        benchmark: str = "TOPIX",
+        lookback_days: int = 365,
+        confidence: float = 0.95,
+        as_of: Optional[date] = None,
+    ) -> Optional[PortfolioRiskDTO]:
+        """
+        ユースケースの実行
+
+        Returns:
+            リスク指標（保有株がなければNone）
+
+        Raises:
+            ValueError: 株価履歴や為替レートが不足している場合
+        """
+        end = as_of or date.today()
+        start = end - timedelta(days=lookback_days)
+        benchmark_symbol = BENCHMARKS[benchmark]
+        holdings = await self.returns_loader.load(user_id, start, end, [benchmark_symbol])
+        if holdings is None:
+            return None
+
+        returns = holdings.returns
+        weights = holdings.weights
+        portfolio_value = holdings.portfolio_value
+        portfolio_returns = returns @ weights
+
+        historical = historical_var(portfolio_returns, confidence)
+        parametric = parametric_var(weights, covariance_matrix(returns), confidence)
+        return PortfolioRiskDTO(
+            symbols=holdings.symbols,
+            benchmark=benchmark,
+            start_date=holdings.matrix.dates[0].item(),
+            end_date=holdings.matrix.dates[-1].item(),
+            observations=len(holdings.matrix.dates),
+            portfolio_value=portfolio_value,
+            weights=dict(zip(holdings.symbols, weights.tolist())),
+            annualized_volatility=annualized_volatility(portfolio_returns),
+            symbol_volatilities={
+                symbol: annualized_volatility(returns[:, j])
+                for j, symbol in enumerate(holdings.symbols)
+            },
+            beta=beta(portfolio_returns, holdings.matrix.column(benchmark_symbol)),
+            correlation=correlation_matrix(returns).tolist(),
+            confidence=confidence,
+            historical_var=historical,
+            parametric_var=parametric,
+            historical_var_amount=historical * portfolio_value,
+            parametric_var_amount=parametric * portfolio_value,
+        )
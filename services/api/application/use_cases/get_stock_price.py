@@ -1,23 +1,35 @@
 from typing import Optional
 
 from domain.repositories.stock_repository import StockRepository
+from domain.services.market_calendar import PRICE_TYPE_LIVE, QuoteFreshnessPolicy
 
 from application.dto.stock_dto import StockPriceResponse
 
 
 class GetStockPriceUseCase:
-    def __init__(self, stock_repository: StockRepository):
+    def __init__(
+        self,
+        stock_repository: StockRepository,
+        freshness_policy: Optional[QuoteFreshnessPolicy] = None,
+    ):
         self.stock_repository = stock_repository
+        self.freshness_policy = freshness_policy
 
     async def execute(self, symbol: str) -> Optional[StockPriceResponse]:
         stock = await self.stock_repository.get_stock_price(symbol)
         if stock:
+            price_type = (
+                self.freshness_policy.price_type(stock.symbol, stock.timestamp)
+                if self.freshness_policy
+                else PRICE_TYPE_LIVE
+            )
             return StockPriceResponse(
                 symbol=stock.symbol,
                 name=stock.name,
                 price=stock.price,
                 currency=stock.currency,
                 timestamp=stock.timestamp,
+                price_type=price_type,
                 message=f"{stock.name}の株価は{stock.price:,.0f}円です",
             )
         return None
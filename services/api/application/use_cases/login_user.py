@@ -4,14 +4,20 @@ from typing import Optional
 
 from domain.entities.auth import User
 from domain.repositories.user_repository import UserRepository
-from infrastructure.security import verify_password
+from infrastructure.security import PasswordVerifier, verify_password
 
 
 class LoginUserUseCase:
     """ユーザーログインのユースケース"""
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_verifier: Optional[PasswordVerifier] = None,
+    ):
         self.user_repository = user_repository
+        # 指定されていれば同時実行数を制限してスレッドで検証する
+        self.password_verifier = password_verifier
 
     async def execute(self, email: str, password: str) -> Optional[User]:
         """
@@ -23,6 +29,9 @@ class LoginUserUseCase:
 
         Returns:
             認証成功時はUserオブジェクト、失敗時はNone
+
+        Raises:
+            PasswordVerificationBusy: パスワードの検証が混み合っている場合
         """
         # メールアドレスからユーザーを取得
         user = await self.user_repository.get_by_email(email)
@@ -32,7 +41,11 @@ class LoginUserUseCase:
             return None
 
         # パスワードの検証
-        if not verify_password(password, user.password_hash):
+        if self.password_verifier is not None:
+            verified = await self.password_verifier.verify(password, user.password_hash)
+        else:
+            verified = verify_password(password, user.password_hash)
+        if not verified:
             # パスワードが一致しない
             return None
 
@@ -41,4 +54,4 @@ class LoginUserUseCase:
             # アカウントが無効化されている
             return None
 
-        return user
\ No newline at end of file
+        return user
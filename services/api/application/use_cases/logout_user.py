@@ -0,0 +1,45 @@
+"""ログアウト（トークンの失効）のユースケース"""
+
+from datetime import datetime
+from typing import Optional
+
+from domain.repositories.token_repository import RefreshTokenRepository, RevokedTokenRepository
+from infrastructure.jwt_utils import hash_refresh_token
+
+
+class LogoutUserUseCase:
+    """アクセストークンとリフレッシュトークンを失効させる"""
+
+    def __init__(
+        self,
+        refresh_token_repository: RefreshTokenRepository,
+        revoked_token_repository: RevokedTokenRepository,
+    ):
+        self.refresh_token_repository = refresh_token_repository
+        self.revoked_token_repository = revoked_token_repository
+
+    async def execute(
+        self,
+        user_id: int,
+        jti: Optional[str],
+        expires_at: datetime,
+        refresh_token: Optional[str] = None,
+    ) -> None:
+        """
+        ログアウトする
+
+        Args:
+            user_id: ログアウトするユーザーのID
+            jti: 使用中のアクセストークンのjti（旧形式のトークンではNone）
+            expires_at: アクセストークンの有効期限（失効リストはこれ以降読み込まれない）
+            refresh_token: あわせて失効させるリフレッシュトークン
+        """
+        if jti:
+            await self.revoked_token_repository.add(jti, user_id, expires_at)
+        if refresh_token:
+            record = await self.refresh_token_repository.get_by_token_hash(
+                hash_refresh_token(refresh_token)
+            )
+            # 他人のリフレッシュトークンは失効させない
+            if record is not None and record.user_id == user_id:
+                await self.refresh_token_repository.revoke(record.id)
@@ -0,0 +1,146 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from application.dto.rebalance_dto import RebalanceDTO, RebalancePositionDTO, RebalanceTradeDTO
+from domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from domain.repositories.price_history_repository import PriceHistoryRepository
+from domain.repositories.stock_repository import StockRepository
+from domain.repositories.user_stock_repository import UserStockRepository
+from domain.services.market_calendar import TSE, MarketCalendar
+from domain.services.rebalancing import solve_rebalance, tracking_error
+from presentation.schemas.rebalance import RebalanceRequest
+
+# 株価が取得できない銘柄は、この日数以内の終値で代用する
+CLOSE_LOOKBACK_DAYS = 14
+
+
+class RebalancePortfolioUseCase:
+    """保有株を目標配分に近づける売買を求めるユースケース"""
+
+    def __init__(
+        self,
+        user_stock_repository: UserStockRepository,
+        stock_repository: StockRepository,
+        price_history_repository: PriceHistoryRepository,
+        exchange_rate_repository: ExchangeRateRepository,
+        calendar: MarketCalendar,
+    ):
+        self.user_stock_repository = user_stock_repository
+        self.stock_repository = stock_repository
+        self.price_history_repository = price_history_repository
+        self.exchange_rate_repository = exchange_rate_repository
+        self.calendar = calendar
+
+    async def execute(
+        self, user_id: int, request: RebalanceRequest, as_of: Optional[date] = None
+    ) -> RebalanceDTO:
+        """
+        ユースケースの実行
+
+        保有していない目標銘柄は新規に買い、目標にない保有銘柄は売却の対象になる。
+
+        Raises:
+            ValueError: 株価や為替レートが取得できない場合、総資産が0の場合
+        """
+        quantities: Dict[str, int] = defaultdict(int)
+        for holding in await self.user_stock_repository.get_by_user_id(user_id):
+            quantities[holding.ticker_symbol] += holding.quantity
+        symbols = sorted(set(quantities) | set(request.target_weights))
+        if not symbols:
+            raise ValueError("No holdings or target weights")
+
+        end = as_of or date.today()
+        quotes = await asyncio.gather(*(self._price(symbol, end) for symbol in symbols))
+        prices = np.array([price for price, _ in quotes])
+        currencies = [currency for _, currency in quotes]
+        jpy_prices = prices * self._jpy_rates(currencies)
+
+        held = np.array([quantities.get(symbol, 0) for symbol in symbols])
+        board_lots = np.array([self.calendar.board_lot(symbol) for symbol in symbols])
+        targets = np.array([request.target_weights.get(symbol, 0.0) for symbol in symbols])
+        current_values = held * jpy_prices
+
+        plan = solve_rebalance(
+            current_values,
+            board_lots * jpy_prices,
+            targets,
+            request.cash,
+            request.cost_rate,
+            min_lots=-(held // board_lots),
+        )
+
+        after = held + plan.lots * board_lots
+        values_after = after * jpy_prices
+        total_before = float(current_values.sum()) + request.cash
+        total_after = float(values_after.sum()) + plan.cash_after
+
+        trades: List[RebalanceTradeDTO] = [
+            RebalanceTradeDTO(
+                symbol=symbol,
+                action="BUY" if lots > 0 else "SELL",
+                quantity=abs(int(lots * lot)),
+                lots=abs(int(lots)),
+                board_lot=int(lot),
+                price=float(price),
+                currency=currency,
+                amount=abs(float(amount)),
+            )
+            for symbol, lots, lot, price, currency, amount in zip(
+                symbols, plan.lots, board_lots, prices, currencies, plan.trade_values
+            )
+            if lots != 0
+        ]
+        positions = [
+            RebalancePositionDTO(
+                symbol=symbol,
+                quantity_before=int(before),
+                quantity_after=int(quantity),
+                weight_before=float(value_before / total_before),
+                weight_after=float(value_after / total_after),
+                target_weight=float(target),
+            )
+            for symbol, before, quantity, value_before, value_after, target in zip(
+                symbols, held, after, current_values, values_after, targets
+            )
+        ]
+        return RebalanceDTO(
+            total_value=total_before,
+            cash_before=request.cash,
+            cash_after=plan.cash_after,
+            transaction_cost=plan.transaction_cost,
+            tracking_error_before=tracking_error(current_values, request.cash, targets),
+            tracking_error_after=tracking_error(values_after, plan.cash_after, targets),
+            trades=trades,
+            positions=positions,
+        )
+
+    async def _price(self, symbol: str, end: date) -> Tuple[float, str]:
+        """現在値と取引通貨（現在値がなければ直近の終値で代用する）"""
+        stock = await self.stock_repository.get_stock_price(symbol)
+        if stock is not None and stock.price > 0:
+            return float(stock.price), stock.currency
+
+        closes = await self.price_history_repository.get_daily_closes(
+            symbol, end - timedelta(days=CLOSE_LOOKBACK_DAYS), end
+        )
+        if not closes or closes[-1][1] <= 0:
+            raise ValueError(f"Price is not available: {symbol}")
+        currency = "JPY" if self.calendar.market_for_symbol(symbol) == TSE else "USD"
+        return float(closes[-1][1]), currency
+
+    def _jpy_rates(self, currencies: List[str]) -> np.ndarray:
+        """取引通貨ごとの円換算レート"""
+        unsupported = set(currencies) - {"JPY", "USD"}
+        if unsupported:
+            raise ValueError(f"Unsupported currency: {', '.join(sorted(unsupported))}")
+        is_jpy = np.array([currency == "JPY" for currency in currencies])
+        if is_jpy.all():
+            return np.ones(len(currencies))
+        rate = self.exchange_rate_repository.get_usd_jpy_rate()
+        if not rate or not rate.get("last"):
+            raise ValueError("USD/JPY rate is not available")
+        return np.where(is_jpy, 1.0, float(rate["last"]))
@@ -0,0 +1,38 @@
+import logging
+from typing import Dict
+
+from domain.entities.holding_rollup import SymbolHoldingRollup
+from domain.repositories.holding_rollup_repository import HoldingRollupRepository
+from domain.services.holding_rollup import build_rollups
+from domain.services.split_adjustment import SplitAdjustments
+
+logger = logging.getLogger(__name__)
+
+
+class ReconcileHoldingRollupsUseCase:
+    """保有株のテーブルから銘柄ごとの集計を作り直し、差分で保持していた値と置き換えるユースケース
+
+    登録時の差分では反映されない株式分割もここで反映する。
+    """
+
+    def __init__(self, rollup_repository: HoldingRollupRepository, adjustments: SplitAdjustments):
+        self.rollup_repository = rollup_repository
+        self.adjustments = adjustments
+
+    async def execute(self) -> int:
+        """
+        集計を作り直す
+
+        Returns:
+            差分で保持していた値と食い違っていた銘柄の数
+        """
+        rebuilt = build_rollups(self.rollup_repository.summarize_lots(), self.adjustments)
+        current: Dict[str, SymbolHoldingRollup] = {
+            rollup.ticker_symbol: rollup for rollup in await self.rollup_repository.list_all()
+        }
+        drifted = sum(1 for rollup in rebuilt if current.pop(rollup.ticker_symbol, None) != rollup)
+        drifted += sum(1 for rollup in current.values() if rollup.holders)
+        await self.rollup_repository.replace_all(rebuilt)
+        if drifted:
+            logger.info("Holding rollups corrected", extra={"symbols": drifted})
+        return drifted
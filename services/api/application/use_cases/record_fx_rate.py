@@ -0,0 +1,27 @@
+from datetime import date
+from typing import Optional
+
+from infrastructure.external.exchange_rate_client import ExchangeRateClient
+from infrastructure.repositories.exchange_rate_repository_impl import USD_JPY
+from infrastructure.repositories.fx_history_store import FxHistoryStore
+
+
+class RecordFxRateUseCase:
+    """当日のUSD/JPYを取得し、日次為替レートの履歴に追記するユースケース"""
+
+    def __init__(self, exchange_rate_client: ExchangeRateClient, fx_history_store: FxHistoryStore):
+        self.exchange_rate_client = exchange_rate_client
+        self.fx_history_store = fx_history_store
+
+    def execute(self, day: date) -> Optional[float]:
+        """
+        dayのレートとして記録する（同じ日に再実行した場合は後のレートで置き換わる）
+
+        Returns:
+            記録したレート。取得できなければNone
+        """
+        rate = self.exchange_rate_client.get_usd_jpy_rate()
+        if rate is None:
+            return None
+        self.fx_history_store.append(USD_JPY, day, float(rate))
+        return float(rate)
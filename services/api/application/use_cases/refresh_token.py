@@ -0,0 +1,56 @@
+"""リフレッシュトークンの発行とローテーションのユースケース"""
+
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from domain.entities.auth import RefreshToken
+from domain.repositories.token_repository import RefreshTokenRepository
+from infrastructure.jwt_utils import (
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    create_refresh_token,
+    hash_refresh_token,
+)
+
+
+class RefreshTokenUseCase:
+    """リフレッシュトークンを発行し、使うたびに新しいものと取り替える"""
+
+    def __init__(self, refresh_token_repository: RefreshTokenRepository):
+        self.refresh_token_repository = refresh_token_repository
+
+    async def issue(self, user_id: int) -> str:
+        """新しいリフレッシュトークンを発行（DBにはハッシュだけを保存する）"""
+        token = create_refresh_token()
+        await self.refresh_token_repository.create(
+            RefreshToken(
+                id=None,
+                user_id=user_id,
+                token_hash=hash_refresh_token(token),
+                expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        return token
+
+    async def rotate(self, token: str) -> Tuple[int, str]:
+        """
+        リフレッシュトークンを失効させ、同じユーザーに新しいものを発行
+
+        失効済みのトークンが再び使われた場合は盗用とみなし、
+        そのユーザーの全リフレッシュトークンを失効させる。
+
+        Returns:
+            (ユーザーID, 新しいリフレッシュトークン)
+
+        Raises:
+            ValueError: トークンが無効・失効済み・期限切れの場合
+        """
+        record = await self.refresh_token_repository.get_by_token_hash(hash_refresh_token(token))
+        if record is None:
+            raise ValueError("Invalid refresh token")
+        if record.expires_at <= datetime.utcnow():
+            raise ValueError("Refresh token expired")
+        # 同じトークンでの同時リフレッシュは一方だけが失効に成功する
+        if record.is_revoked or not await self.refresh_token_repository.revoke(record.id):
+            await self.refresh_token_repository.revoke_all_for_user(record.user_id)
+            raise ValueError("Refresh token reuse detected")
+        return record.user_id, await self.issue(record.user_id)
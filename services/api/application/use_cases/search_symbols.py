@@ -0,0 +1,23 @@
+from typing import List
+
+from application.dto.stock_dto import SymbolSearchResult
+from domain.services.symbol_search import SymbolIndex
+
+
+class SearchSymbolsUseCase:
+    """銘柄コード・銘柄名・読みで銘柄を検索するユースケース"""
+
+    def __init__(self, symbol_index: SymbolIndex):
+        self.symbol_index = symbol_index
+
+    def execute(self, query: str, limit: int = 10) -> List[SymbolSearchResult]:
+        return [
+            SymbolSearchResult(
+                symbol=symbol.symbol,
+                exchange=symbol.exchange,
+                name=symbol.name_ja,
+                name_en=symbol.name_en,
+                name_kana=symbol.name_kana,
+            )
+            for symbol in self.symbol_index.search(query, limit)
+        ]
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+import numpy as np
+
+from application.services.portfolio_returns import HoldingsReturns, PortfolioReturnsLoader
+from domain.services.monte_carlo import checkpoint_days, simulate_paths, summarize
+from infrastructure.cache.lru_cache import LRUCache
+from presentation.schemas.simulation import SimulationRequest
+
+# 1タスクあたりの経路数（タスク単位で進捗を返す）
+SIMULATION_CHUNK_PATHS = int(os.getenv("SIMULATION_CHUNK_PATHS", "10000"))
+
+
+@dataclass(frozen=True)
+class SimulationJob:
+    cache_key: str
+    request: SimulationRequest
+    holdings: HoldingsReturns
+    cached_result: Optional[Dict] = None
+
+
+class SimulatePortfolioUseCase:
+    """保有株の評価額をモンテカルロ法で予測するユースケース
+
+    経路はチャンクに分けてプロセスプールで並列に生成し、チャンクが終わるたびに進捗を返す。
+    """
+
+    def __init__(
+        self,
+        returns_loader: PortfolioReturnsLoader,
+        executor: Executor,
+        result_cache: LRUCache[Dict],
+        chunk_paths: int = SIMULATION_CHUNK_PATHS,
+    ):
+        self.returns_loader = returns_loader
+        self.executor = executor
+        self.result_cache = result_cache
+        self.chunk_paths = chunk_paths
+
+    async def prepare(
+        self, user_id: int, request: SimulationRequest, as_of: Optional[date] = None
+    ) -> Optional[SimulationJob]:
+        """
+        保有株と株価履歴を読み込む（DBアクセスはここで完了させる）
+
+        Returns:
+            保有株がなければNone
+
+        Raises:
+            ValueError: 株価履歴や為替レートが不足している場合
+        """
+        end = as_of or date.today()
+        start = end - timedelta(days=request.lookback_days)
+        holdings = await self.returns_loader.load(user_id, start, end)
+        if holdings is None:
+            return None
+
+        cache_key = self._cache_key(holdings, request, end)
+        return SimulationJob(cache_key, request, holdings, self.result_cache.get(cache_key))
+
+    async def stream(self, job: SimulationJob) -> AsyncIterator[Dict]:
+        """進捗（type=progress）を返し、最後に結果（type=result）を返す"""
+        if job.cached_result is not None:
+            yield {"type": "result", "cached": True, **job.cached_result}
+            return
+
+        request = job.request
+        checkpoints = checkpoint_days(request.horizon_days)
+        sizes = self._chunk_sizes(request.paths)
+        seeds = np.random.SeedSequence(request.seed).spawn(len(sizes))
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(
+                self.executor,
+                simulate_paths,
+                request.method,
+                job.holdings.returns,
+                job.holdings.values,
+                request.horizon_days,
+                size,
+                checkpoints,
+                seed,
+            )
+            for size, seed in zip(sizes, seeds)
+        ]
+
+        async def indexed(index: int, future: asyncio.Future):
+            return index, await future
+
+        chunks: List[Optional[np.ndarray]] = [None] * len(futures)
+        completed = 0
+        try:
+            for next_done in asyncio.as_completed(
+                [indexed(i, future) for i, future in enumerate(futures)]
+            ):
+                index, recorded = await next_done
+                chunks[index] = recorded
+                completed += len(recorded)
+                yield {"type": "progress", "completed": completed, "total": request.paths}
+        finally:
+            # クライアントの切断などで中断した場合、未着手のチャンクは実行しない
+            for future in futures:
+                future.cancel()
+
+        result = {
+            "method": request.method,
+            "paths": request.paths,
+            "horizon_days": request.horizon_days,
+            "symbols": job.holdings.symbols,
+            **summarize(np.concatenate(chunks), checkpoints),
+        }
+        self.result_cache.put(job.cache_key, result)
+        yield {"type": "result", "cached": False, **result}
+
+    def _chunk_sizes(self, paths: int) -> List[int]:
+        full, rest = divmod(paths, self.chunk_paths)
+        return [self.chunk_paths] * full + ([rest] if rest else [])
+
+    @staticmethod
+    def _cache_key(holdings: HoldingsReturns, request: SimulationRequest, end: date) -> str:
+        payload = {
+            "holdings": sorted(holdings.quantities.items()),
+            "end": end.isoformat(),
+            "params": request.model_dump(),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
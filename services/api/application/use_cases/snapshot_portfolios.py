@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Set, Tuple
+
+from domain.repositories.portfolio_snapshot_repository import PortfolioSnapshotRepository
+from domain.repositories.stock_repository import StockRepository
+from domain.repositories.user_stock_repository import UserStockRepository
+from domain.services.fx_history import FxHistory
+from domain.services.portfolio_snapshot import BASE_CURRENCY, Quotes, snapshot_holdings
+from domain.services.portfolio_valuation import to_price
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotPortfoliosUseCase:
+    """全ユーザーの保有株を評価し、1ユーザー1日1行の評価を保存するユースケース
+
+    株価は保有銘柄ごとに1回だけ取得する。ユーザーはuser_idの昇順にchunk_size人ずつ
+    読み込んで評価・保存するため、使うメモリは銘柄数と1チャンク分の保有株で決まる。
+    """
+
+    def __init__(
+        self,
+        user_stock_repository: UserStockRepository,
+        stock_repository: StockRepository,
+        snapshot_repository: PortfolioSnapshotRepository,
+        fx_history: FxHistory,
+        chunk_size: int = 500,
+        batch_size: int = 100,
+        base_currency: str = BASE_CURRENCY,
+    ):
+        self.user_stock_repository = user_stock_repository
+        self.stock_repository = stock_repository
+        self.snapshot_repository = snapshot_repository
+        self.fx_history = fx_history
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.base_currency = base_currency
+
+    async def execute(self, snapshot_date: date) -> int:
+        """
+        snapshot_dateの評価を保存する
+
+        Returns:
+            保存したユーザー数
+        """
+        quotes = await self._load_quotes()
+        fx_rates = self._fx_rates(snapshot_date, {currency for _, currency in quotes.values()})
+
+        written = 0
+        incomplete = 0
+        after_user_id = 0
+        while True:
+            user_ids = await self.user_stock_repository.list_holder_ids(
+                after_user_id, self.chunk_size
+            )
+            if not user_ids:
+                break
+            holdings = defaultdict(list)
+            for holding in await self.user_stock_repository.get_by_user_ids(user_ids):
+                holdings[holding.user_id].append(holding)
+            snapshots = [
+                snapshot_holdings(
+                    user_id, snapshot_date, holdings[user_id], quotes, fx_rates, self.base_currency
+                )
+                for user_id in user_ids
+            ]
+            await self.snapshot_repository.save_day(snapshot_date, snapshots)
+            written += len(snapshots)
+            incomplete += sum(1 for snapshot in snapshots if snapshot.excluded_holdings)
+            after_user_id = user_ids[-1]
+        if incomplete:
+            logger.warning(
+                "Snapshots saved without some holdings",
+                extra={"date": snapshot_date.isoformat(), "users": incomplete},
+            )
+        return written
+
+    async def _load_quotes(self) -> Quotes:
+        """保有銘柄の株価をバッチごとに並行して取得する（取得できなかった銘柄は含めない）"""
+        quotes: Dict[str, Tuple[Decimal, str]] = {}
+        for symbols in self.user_stock_repository.stream_ticker_symbols(self.batch_size):
+            stocks = await asyncio.gather(
+                *(self.stock_repository.get_stock_price(symbol) for symbol in symbols),
+                return_exceptions=True,
+            )
+            for symbol, stock in zip(symbols, stocks):
+                if stock and not isinstance(stock, BaseException):
+                    quotes[symbol] = (to_price(stock.price), stock.currency)
+                else:
+                    logger.warning("Quote unavailable for snapshot", extra={"symbol": symbol})
+        return quotes
+
+    def _fx_rates(self, snapshot_date: date, currencies: Set[str]) -> Dict[str, Decimal]:
+        """取引通貨ごとのsnapshot_date時点の基準通貨へのレート（引けない通貨は含めない）"""
+        rates: Dict[str, Decimal] = {}
+        for currency in sorted(currencies - {self.base_currency}):
+            try:
+                rate = self.fx_history.convert([1.0], [snapshot_date], currency, self.base_currency)
+            except ValueError:
+                logger.warning(
+                    "FX rate unavailable for snapshot",
+                    extra={"currency": currency, "date": snapshot_date.isoformat()},
+                )
+                continue
+            rates[currency] = Decimal(str(float(rate[0])))
+        return rates
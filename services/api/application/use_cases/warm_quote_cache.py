@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from domain.repositories.portfolio_repository import PortfolioRepository
+from domain.repositories.stock_repository import StockRepository
+from domain.repositories.user_stock_repository import UserStockRepository
+from infrastructure.cache.price_alert_engine import PriceAlertEngine
+from infrastructure.cache.quote_cache import QuoteCache
+from infrastructure.external.exchange_rate_client import ExchangeRateClient
+from infrastructure.repositories.exchange_rate_repository_impl import USD_JPY
+
+
+class WarmQuoteCacheUseCase:
+    """保有されている全銘柄の株価と為替レートを事前にキャッシュへ書き込むユースケース
+
+    portfolio_repositoryを指定した場合、ポートフォリオの明細の銘柄も取得し、取得した
+    株価・為替レートでポートフォリオの評価額も差分更新する。price_alert_engineを指定した場合、
+    アラートが登録された銘柄も取得し、取得した株価でアラートを判定する。
+    """
+
+    def __init__(
+        self,
+        user_stock_repository: UserStockRepository,
+        stock_repository: StockRepository,
+        exchange_rate_client: ExchangeRateClient,
+        quote_cache: QuoteCache,
+        batch_size: int = 100,
+        portfolio_repository: Optional[PortfolioRepository] = None,
+        price_alert_engine: Optional[PriceAlertEngine] = None,
+    ):
+        self.user_stock_repository = user_stock_repository
+        self.stock_repository = stock_repository
+        self.exchange_rate_client = exchange_rate_client
+        self.quote_cache = quote_cache
+        self.batch_size = batch_size
+        self.portfolio_repository = portfolio_repository
+        self.price_alert_engine = price_alert_engine
+
+    async def execute(self) -> int:
+        """
+        キャッシュを更新する
+
+        Returns:
+            キャッシュに書き込んだ株価と為替レートの件数
+        """
+        written = 0
+        warmed = set()
+        for symbols in self.user_stock_repository.stream_ticker_symbols(self.batch_size):
+            written += await self._warm_batch(symbols)
+            warmed.update(symbols)
+
+        if self.portfolio_repository is not None:
+            # 保有株にはないがポートフォリオの明細にある銘柄（評価額を更新するため、
+            # 読み終えてから取得する。カーソルを開いたまま同じセッションで更新しない）
+            remaining = sorted({
+                symbol
+                for symbols in self.portfolio_repository.stream_symbols(self.batch_size)
+                for symbol in symbols
+                if symbol not in warmed
+            })
+            for start in range(0, len(remaining), self.batch_size):
+                written += await self._warm_batch(remaining[start : start + self.batch_size])
+            warmed.update(remaining)
+
+        if self.price_alert_engine is not None:
+            # 保有されていないがアラートが登録されている銘柄
+            remaining = sorted(self.price_alert_engine.symbols - warmed)
+            for start in range(0, len(remaining), self.batch_size):
+                written += await self._warm_batch(remaining[start : start + self.batch_size])
+
+        rate = self.exchange_rate_client.get_usd_jpy_rate()
+        if rate is not None:
+            self.quote_cache.put_fx_rate(USD_JPY, rate, datetime.now())
+            written += 1
+            if self.portfolio_repository is not None:
+                await self.portfolio_repository.apply_fx_tick("USD", "JPY", Decimal(str(rate)))
+
+        return written
+
+    async def _warm_batch(self, symbols: List[str]) -> int:
+        """1バッチ分の銘柄を並行して取得し、取得できたものを書き込む"""
+        stocks = await asyncio.gather(
+            *(self.stock_repository.get_stock_price(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        prices = {}
+        for stock in stocks:
+            if stock and not isinstance(stock, BaseException):
+                self.quote_cache.put_quote(stock)
+                prices[stock.symbol] = Decimal(str(stock.price))
+        if prices and self.portfolio_repository is not None:
+            await self.portfolio_repository.apply_price_ticks(prices)
+        if prices and self.price_alert_engine is not None:
+            self.price_alert_engine.on_prices({s: float(p) for s, p in prices.items()})
+        return len(prices)
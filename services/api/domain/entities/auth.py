@@ -17,3 +17,15 @@ class User:
     is_verified: bool = False
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+
+
+@dataclass
+class RefreshToken:
+    """リフレッシュトークンエンティティ（トークン自体ではなくハッシュを持つ）"""
+
+    id: Optional[int]
+    user_id: int
+    token_hash: str
+    expires_at: datetime
+    is_revoked: bool = False
+    created_at: Optional[datetime] = None
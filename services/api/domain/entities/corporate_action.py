@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+
+
+class CorporateActionType(str, Enum):
+    SPLIT = "SPLIT"
+
+
+@dataclass(frozen=True)
+class CorporateAction:
+    """コーポレートアクション（株式分割・併合）エンティティ
+
+    ratio_from株がratio_to株になる（1:2の分割はratio_from=1, ratio_to=2、10:1の併合はその逆）。
+    """
+
+    symbol: str
+    ex_date: date
+    ratio_from: int
+    ratio_to: int
+    action_type: CorporateActionType = CorporateActionType.SPLIT
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    @property
+    def factor(self) -> float:
+        """権利落ち日より前の株数に掛ける倍率"""
+        return self.ratio_to / self.ratio_from
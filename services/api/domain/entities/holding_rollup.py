@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+
+@dataclass(frozen=True)
+class SymbolHoldingRollup:
+    """銘柄ごとの全ユーザーの保有株の集計"""
+
+    ticker_symbol: str
+    # 保有しているユーザー数（保有株は1ユーザー1銘柄1行）
+    holders: int
+    # 株式分割を反映した合計株数
+    total_quantity: int
+    # 取得価額の合計（取引通貨建て）
+    cost_basis: Decimal
+
+
+@dataclass(frozen=True)
+class LotSummary:
+    """保有株の行を (銘柄, 取得日) ごとに集計したもの（夜間の突き合わせで使う）"""
+
+    ticker_symbol: str
+    acquired_on: date
+    lots: int
+    quantity: int
+    cost_basis: Decimal
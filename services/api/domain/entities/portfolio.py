@@ -26,7 +26,11 @@ class PortfolioItem(BaseModel):
     name: str
     quantity: Decimal
     average_price: Decimal
+    currency: str = "JPY"
     current_price: Optional[Decimal] = None
+    # ポートフォリオ通貨への換算レート（同一通貨なら1）
+    fx_rate: Decimal = Decimal("1")
+    # ポートフォリオ通貨建ての評価額
     market_value: Optional[Decimal] = None
     gain_loss: Optional[Decimal] = None
     gain_loss_percent: Optional[float] = None
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class PortfolioSnapshot:
+    """ユーザーの保有株の1日分の評価（基準通貨建て）"""
+
+    user_id: int
+    snapshot_date: date
+    total_value: Decimal
+    # 取得価額（その日の為替レートで基準通貨に換算した額）
+    cost_basis: Decimal
+    # 取引通貨ごとの評価額（基準通貨に換算した額）
+    exposures: Dict[str, Decimal] = field(default_factory=dict)
+    # 株価または為替レートがなく評価額・取得価額に含めなかった保有株の件数
+    excluded_holdings: int = 0
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class AlertCondition(str, Enum):
+    # 株価がthreshold以上になったら
+    ABOVE = "ABOVE"
+    # 株価がthreshold以下になったら
+    BELOW = "BELOW"
+    # 株価がreference_priceからthreshold%以上動いたら（上下どちらでも）
+    PERCENT_MOVE = "PERCENT_MOVE"
+
+
+class AlertStatus(str, Enum):
+    ACTIVE = "ACTIVE"
+    TRIGGERED = "TRIGGERED"
+
+
+class PriceAlert(BaseModel):
+    id: Optional[int] = None
+    user_id: int
+    symbol: str
+    condition: AlertCondition
+    threshold: Decimal
+    reference_price: Optional[Decimal] = None
+    status: AlertStatus = AlertStatus.ACTIVE
+    triggered_price: Optional[Decimal] = None
+    triggered_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+    def trigger_prices(self) -> Tuple[Optional[float], Optional[float]]:
+        """(この価格以上で発火, この価格以下で発火)。該当しない側はNone"""
+        if self.condition == AlertCondition.ABOVE:
+            return float(self.threshold), None
+        if self.condition == AlertCondition.BELOW:
+            return None, float(self.threshold)
+        # 10%なら100円に対して110円・90円ちょうどで発火するようDecimalで計算する
+        move = self.reference_price * self.threshold / 100
+        return float(self.reference_price + move), float(self.reference_price - move)
+
+
+@dataclass(frozen=True)
+class AlertTrigger:
+    """発火したアラート（配信キューに積む）"""
+
+    alert_id: int
+    user_id: int
+    symbol: str
+    price: float
+    triggered_at: datetime
@@ -9,3 +9,15 @@ class Stock:
     price: float
     currency: str
     timestamp: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ListedSymbol:
+    """上場銘柄マスタの1銘柄"""
+
+    symbol: str
+    exchange: str
+    name_en: str
+    name_ja: str
+    # 銘柄名の読み（カタカナ）
+    name_kana: str
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 
 
@@ -12,6 +13,6 @@ class UserStock:
     user_id: int
     ticker_symbol: str
     quantity: int
-    acquisition_price: float
+    acquisition_price: Decimal
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
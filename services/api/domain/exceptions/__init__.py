@@ -0,0 +1,7 @@
+class DuplicatePortfolioItemError(Exception):
+    """同じポートフォリオに同じ銘柄の明細がすでにある"""
+
+    def __init__(self, portfolio_id: int, symbol: str):
+        super().__init__(f"Symbol {symbol} is already in portfolio {portfolio_id}")
+        self.portfolio_id = portfolio_id
+        self.symbol = symbol
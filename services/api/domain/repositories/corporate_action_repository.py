@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from domain.entities.corporate_action import CorporateAction
+
+
+class CorporateActionRepository(ABC):
+    """コーポレートアクションリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def list_splits(self) -> List[CorporateAction]:
+        """全銘柄の株式分割・併合を取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add(self, action: CorporateAction) -> CorporateAction:
+        """
+        コーポレートアクションを登録する
+
+        Raises:
+            ValueError: 同じ銘柄・種類・権利落ち日のものが登録済みの場合
+        """
+        raise NotImplementedError
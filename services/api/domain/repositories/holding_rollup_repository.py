@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import List, Optional, Sequence
+
+from domain.entities.holding_rollup import LotSummary, SymbolHoldingRollup
+
+
+class HoldingRollupRepository(ABC):
+    """銘柄ごとの保有株の集計のリポジトリのインターフェース
+
+    集計は保有株を書き込むトランザクションの中で差分を反映し、夜間に保有株の
+    テーブルから作り直して突き合わせる。集計を読む処理は保有株のテーブルを読まない。
+    """
+
+    @abstractmethod
+    def apply_new_lot(self, ticker_symbol: str, quantity: int, cost_basis: Decimal) -> None:
+        """保有株1行の追加を反映する（コミットは呼び出し側のトランザクションで行う）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def most_held(self, limit: int) -> List[SymbolHoldingRollup]:
+        """保有ユーザー数の多い順に取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, ticker_symbol: str) -> Optional[SymbolHoldingRollup]:
+        """銘柄の集計を取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_all(self) -> List[SymbolHoldingRollup]:
+        """全銘柄の集計を取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def summarize_lots(self) -> List[LotSummary]:
+        """保有株のテーブルを (銘柄, 取得日) ごとに集計する（夜間の突き合わせでのみ使う）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def replace_all(self, rollups: Sequence[SymbolHoldingRollup]) -> None:
+        """集計をまとめて置き換える"""
+        raise NotImplementedError
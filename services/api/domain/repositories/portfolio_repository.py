@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional
+
+from domain.entities.portfolio import Portfolio, PortfolioItem
+
+
+class PortfolioRepository(ABC):
+    """ポートフォリオリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def create(self, portfolio: Portfolio) -> Portfolio:
+        """ポートフォリオを作成する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id(self, portfolio_id: int) -> Optional[Portfolio]:
+        """IDでポートフォリオを取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_by_user_id(self, user_id: int) -> List[Portfolio]:
+        """ユーザーのポートフォリオを評価額付きで取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, portfolio_id: int) -> None:
+        """ポートフォリオを明細ごと削除する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_items(self, portfolio_id: int) -> List[PortfolioItem]:
+        """ポートフォリオの明細を取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_item(self, item: PortfolioItem) -> PortfolioItem:
+        """
+        明細を追加し、評価額をポートフォリオの合計に加える
+
+        Raises:
+            DuplicatePortfolioItemError: 同じ銘柄の明細がすでにある場合
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def remove_item(self, portfolio_id: int, item_id: int) -> bool:
+        """明細を削除し、評価額をポートフォリオの合計から引く"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_symbols(self, batch_size: int) -> Iterator[List[str]]:
+        """全ポートフォリオの明細の銘柄コードを重複なしでバッチごとに取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def apply_price_ticks(self, prices: Dict[str, Decimal]) -> int:
+        """
+        株価の更新を該当銘柄の明細にのみ反映し、差分をポートフォリオの合計に加える
+
+        Returns:
+            更新した明細の件数
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def apply_fx_tick(
+        self, currency: str, portfolio_currency: str, rate: Decimal
+    ) -> int:
+        """
+        為替レートの更新を該当通貨の明細にのみ反映し、差分をポートフォリオの合計に加える
+
+        Returns:
+            更新した明細の件数
+        """
+        raise NotImplementedError
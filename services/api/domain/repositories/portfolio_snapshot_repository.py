@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Sequence
+
+from domain.entities.portfolio_snapshot import PortfolioSnapshot
+
+
+class PortfolioSnapshotRepository(ABC):
+    """日次のポートフォリオ評価のリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def save_day(self, snapshot_date: date, snapshots: Sequence[PortfolioSnapshot]) -> None:
+        """1日分の評価を保存する（同じユーザー・日付のものがあれば置き換える）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_range(self, user_id: int, start: date, end: date) -> List[PortfolioSnapshot]:
+        """期間内（両端を含む）の評価を日付の昇順で取得する"""
+        raise NotImplementedError
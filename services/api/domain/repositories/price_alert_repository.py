@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Sequence
+
+from domain.entities.price_alert import AlertTrigger, PriceAlert
+
+
+class PriceAlertRepository(ABC):
+    """株価アラートリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def create(self, alert: PriceAlert) -> PriceAlert:
+        """アラートを登録する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id(self, alert_id: int) -> Optional[PriceAlert]:
+        """IDでアラートを取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_by_user_id(self, user_id: int) -> List[PriceAlert]:
+        """ユーザーのアラートを新しい順に取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, alert_id: int) -> None:
+        """アラートを削除する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_active(self, after_id: int, batch_size: int) -> Iterator[List[PriceAlert]]:
+        """after_idより後に登録された有効なアラートをIDの昇順にバッチごとに取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def mark_triggered(self, triggers: Sequence[AlertTrigger]) -> List[AlertTrigger]:
+        """
+        有効なアラートを発火済みにする
+
+        Returns:
+            この呼び出しで発火済みにしたもの（削除済み・発火済みのアラートは除く）
+        """
+        raise NotImplementedError
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Tuple
+
+
+class PriceHistoryRepository(ABC):
+    """日次終値の履歴リポジトリのインターフェース"""
+
+    # 取得元が株式分割を調整済みの終値を返すか（Falseなら読み取り時に調整する）
+    split_adjusted: bool = False
+
+    @abstractmethod
+    async def get_daily_closes(
+        self, symbol: str, start: date, end: date
+    ) -> List[Tuple[date, float]]:
+        """期間内（両端を含む）の日次終値を日付の昇順で取得する"""
+        raise NotImplementedError
@@ -8,3 +8,6 @@ class StockRepository(ABC):
     @abstractmethod
     async def get_stock_price(self, symbol: str) -> Optional[Stock]:
         pass
+
+    async def aclose(self) -> None:
+        """保持している接続を閉じる（接続を持たない実装では何もしない）"""
@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from domain.entities.auth import RefreshToken
+
+
+class RefreshTokenRepository(ABC):
+    """リフレッシュトークンリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def create(self, refresh_token: RefreshToken) -> RefreshToken:
+        """リフレッシュトークンを保存"""
+        pass
+
+    @abstractmethod
+    async def get_by_token_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """トークンのハッシュでリフレッシュトークンを取得"""
+        pass
+
+    @abstractmethod
+    async def revoke(self, refresh_token_id: int) -> bool:
+        """
+        未失効のリフレッシュトークンを失効させる
+
+        Returns:
+            この呼び出しで失効させた場合はTrue（既に失効済みならFalse）
+        """
+        pass
+
+    @abstractmethod
+    async def revoke_all_for_user(self, user_id: int) -> int:
+        """ユーザーの全リフレッシュトークンを失効させ、件数を返す"""
+        pass
+
+
+class RevokedTokenRepository(ABC):
+    """失効させたアクセストークン（jti）のリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def add(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        """アクセストークンを失効リストに追加"""
+        pass
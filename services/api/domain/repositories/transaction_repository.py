@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List
+
+from domain.entities.transaction import Transaction
+
+
+class TransactionRepository(ABC):
+    """取引履歴リポジトリのインターフェース"""
+
+    @abstractmethod
+    async def create(self, transaction: Transaction) -> Transaction:
+        """取引を登録する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_by_user_id(self, user_id: int, batch_size: int) -> Iterator[List[Transaction]]:
+        """ユーザーの取引履歴を全件読み込まずにバッチごとに取得する"""
+        raise NotImplementedError
@@ -1,18 +1,48 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional, Sequence
 
 from domain.entities.user_stock import UserStock
 
 
 class UserStockRepository(ABC):
-    """保有株リポジトリのインターフェース"""
+    """保有株リポジトリのインターフェース
+
+    保有株を書き込む（作成・更新・削除する）実装は、同じトランザクションでそのユーザーの
+    バージョンを上げること。一覧の応答キャッシュはバージョンをキーにして無効化する。
+    銘柄ごとの集計（HoldingRollupRepository）にも同じトランザクションで差分を反映すること。
+    """
 
     @abstractmethod
     async def create(self, user_stock: UserStock) -> UserStock:
         """保有株を作成する"""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_version(self, user_id: int) -> Optional[int]:
+        """ユーザーの保有株のバージョンを取得する（記録がなければNone）"""
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_user_id(self, user_id: int) -> List[UserStock]:
         """ユーザーIDで保有株リストを取得する"""
         raise NotImplementedError
+
+    @abstractmethod
+    async def list_holder_ids(self, after_user_id: int, limit: int) -> List[int]:
+        """保有株のあるユーザーのIDを、after_user_idより大きいものから昇順にlimit件取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_user_ids(self, user_ids: Sequence[int]) -> List[UserStock]:
+        """複数のユーザーの保有株をまとめて取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_by_user_id(self, user_id: int, batch_size: int) -> Iterator[List[UserStock]]:
+        """ユーザーの保有株を全件読み込まずにバッチごとに取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_ticker_symbols(self, batch_size: int) -> Iterator[List[str]]:
+        """全ユーザーが保有する銘柄コードを重複なしでバッチごとに取得する"""
+        raise NotImplementedError
@@ -0,0 +1,151 @@
+"""日次為替レートの履歴
+
+通貨ペアごとに日付（datetime64[D]）とレート（float64）の昇順の配列で持ち、日付からの
+レートの引き当てはnp.searchsortedの二分探索で行う。レートのない日（土日・祝日）は直前の
+日のレートを使う。N件の金額と日付をまとめて換算できるため、取得日ごとに外貨建ての
+保有株を円換算する場合も1件ずつ引いたり、外部APIを呼んだりしなくてよい。
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# 直前のレートをこれ以上古い日付に使わない（更新が止まっていることに気づけるように）
+DEFAULT_MAX_STALE_DAYS = 7
+
+DateLike = Union[date, np.datetime64]
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def as_days(days: Union[Sequence[DateLike], np.ndarray]) -> np.ndarray:
+    """日付の列をdatetime64[D]の配列にする"""
+    if isinstance(days, np.ndarray):
+        return days.astype("datetime64[D]", copy=False)
+    # dateのリストはnp.asarrayより通日（ordinal）経由の方が桁違いに速い
+    try:
+        ordinals = np.fromiter(map(date.toordinal, days), np.int64, len(days))
+    except TypeError:
+        return np.asarray(days, dtype="datetime64[D]")
+    return (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+class FxSeries:
+    """1つの通貨ペアの日次レート（変更せず、更新時は新しい系列を作る）"""
+
+    __slots__ = ("days", "rates")
+
+    def __init__(self, days: np.ndarray, rates: np.ndarray):
+        self.days = as_days(days)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        if len(self.days) != len(self.rates):
+            raise ValueError("days and rates must have the same length")
+        if len(self.days) > 1 and not (self.days[1:] > self.days[:-1]).all():
+            raise ValueError("days must be strictly increasing")
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[date, float]]) -> "FxSeries":
+        """(日付, レート) の組から作る（順不同。同じ日付は後のものを使う）"""
+        by_day = dict(pairs)
+        days = sorted(by_day)
+        return cls(as_days(days), np.array([by_day[d] for d in days]))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def with_rate(self, day: date, rate: float) -> "FxSeries":
+        """1日分のレートを追加（同じ日付があれば置き換え）した系列を返す"""
+        day64 = np.datetime64(day, "D")
+        position = int(np.searchsorted(self.days, day64))
+        if position < len(self.days) and self.days[position] == day64:
+            rates = self.rates.copy()
+            rates[position] = rate
+            return FxSeries(self.days, rates)
+        return FxSeries(
+            np.insert(self.days, position, day64), np.insert(self.rates, position, rate)
+        )
+
+    def rates_on(
+        self,
+        days: Union[Sequence[DateLike], np.ndarray],
+        max_stale_days: int = DEFAULT_MAX_STALE_DAYS,
+    ) -> np.ndarray:
+        """
+        各日付のレート（その日になければ直前の日のレート）をまとめて引く
+
+        Raises:
+            ValueError: 履歴より前の日付、または直前のレートが古すぎる日付がある場合
+        """
+        wanted = as_days(days)
+        positions = np.searchsorted(self.days, wanted, side="right") - 1
+        if (positions < 0).any():
+            raise ValueError(f"No FX rate on or before {wanted[positions < 0].min()}")
+        gaps = (wanted - self.days[positions]).astype(np.int64)
+        if (gaps > max_stale_days).any():
+            raise ValueError(f"FX rate is stale for {wanted[gaps > max_stale_days].min()}")
+        return self.rates[positions]
+
+    def rate_on(self, day: date, max_stale_days: int = DEFAULT_MAX_STALE_DAYS) -> Optional[float]:
+        """1日分のレート（引けなければNone）"""
+        try:
+            return float(self.rates_on([day], max_stale_days)[0])
+        except ValueError:
+            return None
+
+    def between(self, start: date, end: date) -> List[Tuple[date, float]]:
+        """期間内（両端を含む）のレートを日付の昇順で返す"""
+        lo = np.searchsorted(self.days, np.datetime64(start, "D"))
+        hi = np.searchsorted(self.days, np.datetime64(end, "D"), side="right")
+        return [(day.item(), float(rate)) for day, rate in zip(self.days[lo:hi], self.rates[lo:hi])]
+
+
+class FxHistory:
+    """通貨ペア（例: USD/JPY）ごとの日次レートの履歴"""
+
+    def __init__(self, series: Optional[Dict[str, FxSeries]] = None):
+        self._series: Dict[str, FxSeries] = dict(series or {})
+
+    @property
+    def pairs(self) -> List[str]:
+        return sorted(self._series)
+
+    def series(self, pair: str) -> Optional[FxSeries]:
+        return self._series.get(pair)
+
+    def record(self, pair: str, day: date, rate: float) -> None:
+        """1日分のレートを記録する（読み取り中の系列は変更せず差し替える）"""
+        current = self._series.get(pair)
+        if current is None:
+            self._series[pair] = FxSeries.from_pairs([(day, rate)])
+        else:
+            self._series[pair] = current.with_rate(day, rate)
+
+    def convert(
+        self,
+        amounts: Union[Sequence[float], np.ndarray],
+        days: Union[Sequence[DateLike], np.ndarray],
+        from_currency: str,
+        to_currency: str,
+        max_stale_days: int = DEFAULT_MAX_STALE_DAYS,
+    ) -> np.ndarray:
+        """
+        N件の金額をそれぞれの日付のレートでまとめて換算する
+
+        通貨ペアの履歴がなければ逆のペア（JPY/USDに対するUSD/JPY）の逆数を使う。
+
+        Raises:
+            ValueError: 通貨ペアの履歴がない、またはレートを引けない日付がある場合
+        """
+        values = np.asarray(amounts, dtype=np.float64)
+        if len(values) != len(days):
+            raise ValueError("amounts and days must have the same length")
+        if from_currency == to_currency:
+            return values.copy()
+        direct = self._series.get(f"{from_currency}/{to_currency}")
+        if direct is not None:
+            return values * direct.rates_on(days, max_stale_days)
+        inverse = self._series.get(f"{to_currency}/{from_currency}")
+        if inverse is not None:
+            return values / inverse.rates_on(days, max_stale_days)
+        raise ValueError(f"No FX history for {from_currency}/{to_currency}")
@@ -0,0 +1,75 @@
+"""銘柄ごとの保有株の集計の作り直しと、集計からの預かり資産の計算"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from domain.entities.holding_rollup import LotSummary, SymbolHoldingRollup
+from domain.services.split_adjustment import SplitAdjustments
+from domain.value_objects.money import Money
+
+_CENT = Decimal("0.01")
+
+
+def build_rollups(
+    summaries: Sequence[LotSummary], adjustments: SplitAdjustments
+) -> List[SymbolHoldingRollup]:
+    """
+    (銘柄, 取得日) ごとの集計から銘柄ごとの集計を作る
+
+    株数は取得日より後の分割の倍率を掛けてから合計する（1行ずつではなく取得日ごとに
+    切り捨てるため、併合の端株の分だけ保有株一覧の合計と異なることがある）。
+    """
+    by_symbol: Dict[str, List[LotSummary]] = defaultdict(list)
+    for summary in summaries:
+        by_symbol[summary.ticker_symbol].append(summary)
+
+    rollups = []
+    for symbol in sorted(by_symbol):
+        rows = by_symbol[symbol]
+        quantities = np.array([row.quantity for row in rows], dtype=np.float64)
+        if symbol in adjustments.symbols:
+            quantities = np.floor(
+                quantities * adjustments.factors(symbol, [row.acquired_on for row in rows]) + 1e-9
+            )
+        rollups.append(SymbolHoldingRollup(
+            ticker_symbol=symbol,
+            holders=sum(row.lots for row in rows),
+            total_quantity=int(quantities.sum()),
+            cost_basis=sum((row.cost_basis for row in rows), Decimal(0)).quantize(_CENT),
+        ))
+    return rollups
+
+
+def assets_by_currency(
+    rollups: Sequence[SymbolHoldingRollup], quotes: Mapping[str, Tuple[Decimal, str]]
+) -> Tuple[Dict[str, Decimal], Dict[str, Decimal], List[str]]:
+    """
+    取引通貨ごとの評価額と取得価額の合計（換算はしない）
+
+    Returns:
+        (通貨ごとの評価額, 通貨ごとの取得価額, 株価がなく含めなかった銘柄)
+    """
+    values: Dict[str, Money] = {}
+    costs: Dict[str, Money] = {}
+    unpriced = []
+    for rollup in rollups:
+        quote = quotes.get(rollup.ticker_symbol)
+        if quote is None:
+            unpriced.append(rollup.ticker_symbol)
+            continue
+        price, currency = quote
+        zero = Money.zero(currency)
+        values[currency] = values.get(currency, zero) + Money.valuate(
+            rollup.total_quantity, price, currency
+        )
+        costs[currency] = costs.get(currency, zero) + Money.from_decimal(
+            rollup.cost_basis, currency
+        )
+    return (
+        {currency: money.to_decimal() for currency, money in sorted(values.items())},
+        {currency: money.to_decimal() for currency, money in sorted(costs.items())},
+        unpriced,
+    )
@@ -0,0 +1,99 @@
+"""銘柄検索のための文字列の正規化（全角・半角、カタカナ・ひらがな、ローマ字）
+
+ローマ字は訓令式に寄せ、長音を畳んだ形に正規化する。ヘボン式の入力（shi, tsu, fu, ji）や
+長音の表記ゆれ（toukyou / tokyo）も同じ形になるため、読みの前方一致で比較できる。
+"""
+
+import re
+import unicodedata
+
+_KATAKANA_START = ord("ァ")
+_KATAKANA_END = ord("ヶ")
+_KATAKANA_OFFSET = ord("ァ") - ord("ぁ")
+
+_ROMAJI = {
+    "あ": "a", "い": "i", "う": "u", "え": "e", "お": "o",
+    "か": "ka", "き": "ki", "く": "ku", "け": "ke", "こ": "ko",
+    "が": "ga", "ぎ": "gi", "ぐ": "gu", "げ": "ge", "ご": "go",
+    "さ": "sa", "し": "si", "す": "su", "せ": "se", "そ": "so",
+    "ざ": "za", "じ": "zi", "ず": "zu", "ぜ": "ze", "ぞ": "zo",
+    "た": "ta", "ち": "ti", "つ": "tu", "て": "te", "と": "to",
+    "だ": "da", "ぢ": "zi", "づ": "zu", "で": "de", "ど": "do",
+    "な": "na", "に": "ni", "ぬ": "nu", "ね": "ne", "の": "no",
+    "は": "ha", "ひ": "hi", "ふ": "hu", "へ": "he", "ほ": "ho",
+    "ば": "ba", "び": "bi", "ぶ": "bu", "べ": "be", "ぼ": "bo",
+    "ぱ": "pa", "ぴ": "pi", "ぷ": "pu", "ぺ": "pe", "ぽ": "po",
+    "ま": "ma", "み": "mi", "む": "mu", "め": "me", "も": "mo",
+    "や": "ya", "ゆ": "yu", "よ": "yo",
+    "ら": "ra", "り": "ri", "る": "ru", "れ": "re", "ろ": "ro",
+    "わ": "wa", "ゐ": "i", "ゑ": "e", "を": "o", "ん": "n", "ゔ": "vu",
+}
+_SMALL_Y = {"ゃ": "a", "ゅ": "u", "ょ": "o"}
+_SMALL_VOWELS = {"ぁ": "a", "ぃ": "i", "ぅ": "u", "ぇ": "e", "ぉ": "o"}
+
+# ヘボン式などの綴りを訓令式に寄せる（順序に意味がある）
+_SPELLING_RULES = (
+    (re.compile(r"m(?=[bpm])"), "n"),
+    (re.compile(r"sh"), "sy"),
+    (re.compile(r"ch"), "ty"),
+    (re.compile(r"ts"), "t"),
+    (re.compile(r"j"), "zy"),
+    (re.compile(r"f"), "h"),
+    (re.compile(r"([stz])yi"), r"\1i"),
+    # 長音の表記ゆれ（ou, oo, uu）を畳む
+    (re.compile(r"o[ou]"), "o"),
+    (re.compile(r"uu"), "u"),
+)
+
+
+def normalize(text: str) -> str:
+    """全角英数・半角カナを揃え、小文字にする"""
+    return unicodedata.normalize("NFKC", text).strip().lower()
+
+
+def to_hiragana(text: str) -> str:
+    """カタカナをひらがなに変換（それ以外の文字はそのまま）"""
+    return "".join(
+        chr(ord(c) - _KATAKANA_OFFSET) if _KATAKANA_START <= ord(c) <= _KATAKANA_END else c
+        for c in text
+    )
+
+
+def has_kana(text: str) -> bool:
+    return any("ぁ" <= c <= "ゖ" or _KATAKANA_START <= ord(c) <= _KATAKANA_END for c in text)
+
+
+def canonical_romaji(text: str) -> str:
+    """ローマ字を訓令式・長音なしの形に正規化（英字以外は除く）"""
+    romaji = re.sub(r"[^a-z]", "", text)
+    for pattern, replacement in _SPELLING_RULES:
+        romaji = pattern.sub(replacement, romaji)
+    return romaji
+
+
+def kana_to_romaji(text: str) -> str:
+    """かな（カタカナ・ひらがな）を正規化したローマ字に変換（かな以外は読み飛ばす）"""
+    syllables = []
+    double_next = False
+    for c in to_hiragana(normalize(text)):
+        if c == "っ":
+            double_next = True
+            continue
+        if c in _SMALL_Y and syllables and syllables[-1].endswith("i"):
+            # きゃ→kya, しゃ→sya
+            syllables[-1] = syllables[-1][:-1] + "y" + _SMALL_Y[c]
+            continue
+        if c in _SMALL_VOWELS and syllables:
+            # シェ→sye, ファ→ha, ティ→ti
+            last = syllables[-1]
+            stem = last[:-1] + "y" if last[-2:] in ("si", "ti", "zi") else last[:-1]
+            syllables[-1] = stem + _SMALL_VOWELS[c]
+            continue
+        romaji = _ROMAJI.get(c) or _SMALL_Y.get(c) or _SMALL_VOWELS.get(c)
+        if romaji is None:
+            continue
+        if double_next and romaji[0] not in "aiueon":
+            romaji = romaji[0] + romaji
+        double_next = False
+        syllables.append(romaji)
+    return canonical_romaji("".join(syllables))
@@ -0,0 +1,150 @@
+"""取引所の立会時間・休場日と、それに基づく株価キャッシュの鮮度判定"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+TSE = "TSE"
+NYSE = "NYSE"
+
+PRICE_TYPE_LIVE = "live"
+PRICE_TYPE_CLOSE = "close"
+
+# 東証の銘柄コード（例: 7974, 285A, 7974.T）
+_TSE_SYMBOL = re.compile(r"^(\d{3}[0-9A-Z]|\d{4})(\.T)?$")
+
+# 休場日を遡る・先読みする最大日数（年末年始・GWの連休を十分に含む）
+_MAX_SCAN_DAYS = 14
+
+
+@dataclass(frozen=True)
+class Exchange:
+    """取引所の立会時間の定義"""
+
+    code: str
+    timezone: str
+    # (開始, 終了) の組。東証の昼休みのように複数のセッションを持てる
+    sessions: Tuple[Tuple[time, time], ...]
+    # 売買単位（株数）
+    board_lot: int = 1
+
+    @property
+    def tz(self) -> ZoneInfo:
+        return ZoneInfo(self.timezone)
+
+
+DEFAULT_EXCHANGES: Dict[str, Exchange] = {
+    TSE: Exchange(
+        code=TSE,
+        timezone="Asia/Tokyo",
+        sessions=((time(9, 0), time(11, 30)), (time(12, 30), time(15, 30))),
+        board_lot=100,
+    ),
+    NYSE: Exchange(
+        code=NYSE,
+        timezone="America/New_York",
+        sessions=((time(9, 30), time(16, 0)),),
+    ),
+}
+
+
+def _as_aware(value: datetime) -> datetime:
+    """タイムゾーンなしの日時はローカル時刻として扱う"""
+    return value if value.tzinfo else value.astimezone()
+
+
+class MarketCalendar:
+    """取引所ごとの立会時間と休場日を扱うカレンダー"""
+
+    def __init__(
+        self,
+        holidays: Dict[str, Iterable[date]],
+        exchanges: Optional[Dict[str, Exchange]] = None,
+    ):
+        self.exchanges = exchanges or DEFAULT_EXCHANGES
+        self.holidays: Dict[str, FrozenSet[date]] = {
+            code: frozenset(holidays.get(code, ())) for code in self.exchanges
+        }
+
+    def market_for_symbol(self, symbol: str) -> str:
+        """銘柄コードから上場取引所を判定（東証コード以外は米国株として扱う）"""
+        return TSE if _TSE_SYMBOL.match(symbol.upper()) else NYSE
+
+    def board_lot(self, symbol: str) -> int:
+        """銘柄の売買単位（東証は100株、米国株は1株）"""
+        return self.exchanges[self.market_for_symbol(symbol)].board_lot
+
+    def is_trading_day(self, market: str, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays[market]
+
+    def _session_bounds(self, market: str, day: date):
+        exchange = self.exchanges[market]
+        for start, end in exchange.sessions:
+            yield (
+                datetime.combine(day, start, tzinfo=exchange.tz),
+                datetime.combine(day, end, tzinfo=exchange.tz),
+            )
+
+    def is_open(self, market: str, at: Optional[datetime] = None) -> bool:
+        """指定時刻に立会中かどうか"""
+        at = _as_aware(at or datetime.now(timezone.utc))
+        local_day = at.astimezone(self.exchanges[market].tz).date()
+        if not self.is_trading_day(market, local_day):
+            return False
+        return any(start <= at < end for start, end in self._session_bounds(market, local_day))
+
+    def last_close(self, market: str, at: Optional[datetime] = None) -> datetime:
+        """指定時刻以前で最後にセッションが終了した時刻"""
+        at = _as_aware(at or datetime.now(timezone.utc))
+        local_day = at.astimezone(self.exchanges[market].tz).date()
+        for offset in range(_MAX_SCAN_DAYS + 1):
+            day = local_day - timedelta(days=offset)
+            if not self.is_trading_day(market, day):
+                continue
+            for _, end in reversed(list(self._session_bounds(market, day))):
+                if end <= at:
+                    return end
+        raise ValueError(f"No {market} session within {_MAX_SCAN_DAYS} days before {at}")
+
+    def next_open(self, market: str, at: Optional[datetime] = None) -> datetime:
+        """指定時刻より後で最初にセッションが始まる時刻"""
+        at = _as_aware(at or datetime.now(timezone.utc))
+        local_day = at.astimezone(self.exchanges[market].tz).date()
+        for offset in range(_MAX_SCAN_DAYS + 1):
+            day = local_day + timedelta(days=offset)
+            if not self.is_trading_day(market, day):
+                continue
+            for start, _ in self._session_bounds(market, day):
+                if start > at:
+                    return start
+        raise ValueError(f"No {market} session within {_MAX_SCAN_DAYS} days after {at}")
+
+
+class QuoteFreshnessPolicy:
+    """立会時間に応じて株価キャッシュの有効期間を決めるポリシー
+
+    - 立会中: 取得からsession_ttl秒以内のみ有効
+    - 立会時間外: 直近のセッション終了後に取得した価格（終値）は次の寄り付きまで有効
+    """
+
+    def __init__(self, calendar: MarketCalendar, session_ttl_seconds: float):
+        self.calendar = calendar
+        self.session_ttl = timedelta(seconds=session_ttl_seconds)
+
+    def is_fresh(self, symbol: str, quoted_at: datetime, now: Optional[datetime] = None) -> bool:
+        market = self.calendar.market_for_symbol(symbol)
+        now = _as_aware(now or datetime.now(timezone.utc))
+        quoted_at = _as_aware(quoted_at)
+
+        if self.calendar.is_open(market, now):
+            return now - quoted_at <= self.session_ttl
+        return quoted_at >= self.calendar.last_close(market, now)
+
+    def price_type(self, symbol: str, quoted_at: datetime) -> str:
+        """取得時刻が立会中ならlive、それ以外はclose（終値）"""
+        market = self.calendar.market_for_symbol(symbol)
+        if self.calendar.is_open(market, quoted_at):
+            return PRICE_TYPE_LIVE
+        return PRICE_TYPE_CLOSE
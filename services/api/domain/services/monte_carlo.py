@@ -0,0 +1,96 @@
+"""保有株のモンテカルロ・シミュレーション
+
+保有数量を固定したまま（リバランスなし）各銘柄の価格経路を生成し、
+評価額の分布を求める。経路は「経路数×銘柄数」の行列として全経路を一括で進める。
+
+- gbm: 日次対数リターンの平均・共分散を推定した多変量の幾何ブラウン運動
+  （評価額を記録する日の間はまとめて1ステップで進める）
+- bootstrap: 過去の日次リターン（全銘柄の同日の組）を1日ずつ復元抽出
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+GBM = "gbm"
+BOOTSTRAP = "bootstrap"
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def checkpoint_days(horizon_days: int, max_points: int = 30) -> np.ndarray:
+    """分布を記録する営業日（0日目と最終日を含み、最大max_points+1点）"""
+    step = max(1, -(-horizon_days // max_points))
+    days = np.arange(0, horizon_days + 1, step)
+    if days[-1] != horizon_days:
+        days = np.append(days, horizon_days)
+    return days
+
+
+def simulate_paths(
+    method: str,
+    returns: np.ndarray,
+    values: np.ndarray,
+    horizon_days: int,
+    n_paths: int,
+    checkpoints: np.ndarray,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    """
+    評価額の経路を生成する（プロセスプールのワーカーで実行される）
+
+    Args:
+        returns: 日次の単純リターン（観測日数×銘柄数）
+        values: 銘柄ごとの現在の評価額
+        checkpoints: 評価額を記録する日（checkpoint_daysの戻り値）
+
+    Returns:
+        各経路のcheckpointsにおけるポートフォリオ評価額（経路数×記録点数, float32）
+    """
+    rng = np.random.default_rng(seed)
+    log_returns = np.log1p(returns)
+    n_assets = log_returns.shape[1]
+
+    if method == GBM:
+        mean = log_returns.mean(axis=0)
+        covariance = np.atleast_2d(np.cov(log_returns, rowvar=False))
+        # 数値誤差で半正定値にならない場合に備えて対角に微小量を加える
+        cholesky = np.linalg.cholesky(covariance + np.eye(n_assets) * 1e-12)
+    elif method != BOOTSTRAP:
+        raise ValueError(f"Unknown simulation method: {method}")
+
+    cumulative = np.zeros((n_paths, n_assets))
+    recorded = np.empty((n_paths, len(checkpoints)), dtype=np.float32)
+    recorded[:, 0] = values.sum()
+    for index in range(1, len(checkpoints)):
+        days = int(checkpoints[index] - checkpoints[index - 1])
+        if method == GBM:
+            # 独立な正規分布の和も正規分布なので、記録点の間はまとめて1回で進める
+            shocks = rng.standard_normal((n_paths, n_assets)) @ cholesky.T
+            cumulative += days * mean + np.sqrt(days) * shocks
+        else:
+            for _ in range(days):
+                cumulative += log_returns[rng.integers(0, len(log_returns), n_paths)]
+        recorded[:, index] = np.exp(cumulative) @ values
+    return recorded
+
+
+def summarize(
+    recorded: np.ndarray, checkpoints: np.ndarray, percentiles: Sequence[int] = PERCENTILES
+) -> Dict:
+    """全経路の評価額から、記録点ごとのパーセンタイルと最終日の分布の要約を求める"""
+    initial = float(recorded[0, 0])
+    bands = np.percentile(recorded, percentiles, axis=0)
+    terminal = recorded[:, -1].astype(np.float64)
+    return {
+        "initial_value": initial,
+        "days": checkpoints.tolist(),
+        "percentiles": {str(p): band.round().tolist() for p, band in zip(percentiles, bands)},
+        "terminal": {
+            "mean": float(terminal.mean()),
+            "std": float(terminal.std()),
+            "min": float(terminal.min()),
+            "max": float(terminal.max()),
+            "probability_of_loss": float((terminal < initial).mean()),
+        },
+    }
@@ -0,0 +1,81 @@
+"""日次のポートフォリオ評価の計算と間引き
+
+評価額・取得価額は取引通貨の最小単位で数量×価格を丸め、基準通貨の最小単位へ換算して
+丸める（domain.services.portfolio_valuationと同じ丸め）。株価または為替レートのない
+銘柄は評価額・取得価額のどちらにも含めず、含めなかった保有株の件数を評価に残す
+（その日の評価額が実際より低いことを推移の画面で示せるように）。
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from domain.entities.portfolio_snapshot import PortfolioSnapshot
+from domain.entities.user_stock import UserStock
+from domain.value_objects.money import Money
+
+BASE_CURRENCY = "JPY"
+
+# 銘柄コードごとの (株価, 取引通貨)
+Quotes = Mapping[str, Tuple[Decimal, str]]
+
+
+def snapshot_holdings(
+    user_id: int,
+    snapshot_date: date,
+    holdings: Sequence[UserStock],
+    quotes: Quotes,
+    fx_rates: Mapping[str, Decimal],
+    base_currency: str = BASE_CURRENCY,
+) -> PortfolioSnapshot:
+    """
+    1ユーザーの保有株を評価する
+
+    Args:
+        quotes: 銘柄コードごとの (株価, 取引通貨)
+        fx_rates: 取引通貨ごとの基準通貨へのレート（基準通貨自身は不要）
+    """
+    value = Money.zero(base_currency)
+    cost = Money.zero(base_currency)
+    exposures: Dict[str, Money] = {}
+    excluded = 0
+    for holding in holdings:
+        quote = quotes.get(holding.ticker_symbol)
+        if quote is None:
+            excluded += 1
+            continue
+        price, currency = quote
+        rate = Decimal(1) if currency == base_currency else fx_rates.get(currency)
+        if rate is None:
+            excluded += 1
+            continue
+        holding_value = Money.valuate(holding.quantity, price, currency).convert(rate, base_currency)
+        value += holding_value
+        cost += Money.valuate(
+            holding.quantity, holding.acquisition_price, currency
+        ).convert(rate, base_currency)
+        exposures[currency] = exposures.get(currency, Money.zero(base_currency)) + holding_value
+    return PortfolioSnapshot(
+        user_id=user_id,
+        snapshot_date=snapshot_date,
+        total_value=value.to_decimal(),
+        cost_basis=cost.to_decimal(),
+        exposures={currency: money.to_decimal() for currency, money in sorted(exposures.items())},
+        excluded_holdings=excluded,
+    )
+
+
+def downsample(snapshots: Sequence[PortfolioSnapshot], max_points: int) -> List[PortfolioSnapshot]:
+    """
+    日付順の評価をmax_points件以下に間引く
+
+    件数の等しい区間に分け、各区間の最後の日の評価を残す（週次・月次の終値と同じ考え方で、
+    平均のように実在しない値を作らない）。最終日は常に残る。
+    """
+    count = len(snapshots)
+    if max_points <= 0 or count <= max_points:
+        return list(snapshots)
+    ends = np.linspace(0, count, max_points + 1)[1:].astype(np.int64) - 1
+    return [snapshots[i] for i in np.unique(ends)]
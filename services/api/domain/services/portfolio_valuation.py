@@ -0,0 +1,74 @@
+"""ポートフォリオ明細の評価額計算
+
+評価額は取引通貨の最小単位で数量×価格を丸めたうえで、ポートフォリオ通貨の
+最小単位へ換算して丸める。計算は固定小数点の整数演算（domain.value_objects.money）で行う。
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional, Tuple
+
+import numpy as np
+
+from domain.value_objects.money import PRICE_SCALE, Money, MoneyArray
+
+PRICE_QUANTUM = Decimal(1).scaleb(-PRICE_SCALE)
+
+
+def to_price(value) -> Decimal:
+    """株価をDBの精度（小数4桁）のDecimalに揃える"""
+    return Decimal(str(value)).quantize(PRICE_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+def market_value(
+    quantity: Decimal,
+    price: Optional[Decimal],
+    fx_rate: Decimal,
+    currency: str,
+    portfolio_currency: str,
+) -> Optional[Decimal]:
+    """ポートフォリオ通貨建ての評価額（価格未取得ならNone）"""
+    if price is None:
+        return None
+    return Money.valuate(quantity, price, currency).convert(fx_rate, portfolio_currency).to_decimal()
+
+
+def market_values(
+    quantity_units: np.ndarray,
+    price_units: np.ndarray,
+    rate_units: np.ndarray,
+    currency: str,
+    portfolio_currency: str,
+) -> MoneyArray:
+    """同一通貨ペアの明細の評価額をスケール済み整数の配列から一括計算
+
+    market_valueと同じ丸めで計算するため、結果は1件ずつ計算した場合と一致する。
+    """
+    return MoneyArray.valuate(quantity_units, price_units, currency).convert(
+        rate_units, portfolio_currency
+    )
+
+
+def value_delta(old_value: Optional[Decimal], new_value: Optional[Decimal]) -> Decimal:
+    """評価額の変化量（未評価は0として扱う）"""
+    return (new_value or Decimal("0")) - (old_value or Decimal("0"))
+
+
+def gain_loss(
+    quantity: Decimal,
+    average_price: Decimal,
+    fx_rate: Decimal,
+    value: Optional[Decimal],
+    currency: str,
+    portfolio_currency: str,
+) -> Tuple[Optional[Decimal], Optional[float]]:
+    """評価損益と損益率（%）"""
+    if value is None:
+        return None, None
+    cost = (
+        Money.valuate(quantity, average_price, currency)
+        .convert(fx_rate, portfolio_currency)
+        .to_decimal()
+    )
+    gain = value - cost
+    percent = float(gain / cost * 100) if cost else None
+    return gain, percent
@@ -0,0 +1,203 @@
+"""銘柄ごとの株価アラートの閾値索引
+
+有効なアラートを銘柄ごとに「この価格以上で発火」「この価格以下で発火」の2つの昇順の配列
+（閾値・アラートID・ユーザーID）に分けて持つ。発火したアラートは索引から外すため、
+上側の配列には直前の株価より高い閾値、下側には低い閾値だけが残る。新しい株価で発火するのは
+上側の先頭から、下側の末尾からの連続した範囲になり、np.searchsortedで境界を求めて切り出せば
+越えた閾値以外には触れずに済む。
+
+追加は保留リストに積むだけにして、次にその銘柄の株価が届いたときにまとめて配列に挿入する。
+削除（変動率のアラートの反対側を含む）は削除済みの印を付けるだけにして、その閾値が切り出された
+とき、または印が溜まったときにまとめて配列から除く。
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+
+from domain.entities.price_alert import AlertTrigger, PriceAlert
+
+# 削除済みの印がこの数と配列の1/4を超えたら配列を詰め直す
+COMPACT_MIN_REMOVED = 1024
+
+_EMPTY_PRICES = np.empty(0, dtype=np.float64)
+_EMPTY_IDS = np.empty(0, dtype=np.int64)
+
+
+class _ThresholdBook:
+    """1銘柄・片側の閾値の昇順の配列"""
+
+    __slots__ = (
+        "prices", "alert_ids", "user_ids",
+        "_pending_prices", "_pending_alert_ids", "_pending_user_ids", "_removed",
+    )
+
+    def __init__(self):
+        self.prices = _EMPTY_PRICES
+        self.alert_ids = _EMPTY_IDS
+        self.user_ids = _EMPTY_IDS
+        self._pending_prices: List[float] = []
+        self._pending_alert_ids: List[int] = []
+        self._pending_user_ids: List[int] = []
+        self._removed: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.prices) + len(self._pending_prices) - len(self._removed)
+
+    def add(self, price: float, alert_id: int, user_id: int) -> None:
+        self._pending_prices.append(price)
+        self._pending_alert_ids.append(alert_id)
+        self._pending_user_ids.append(user_id)
+
+    def discard(self, alert_id: int) -> None:
+        """アラートに削除済みの印を付ける"""
+        if alert_id in self._pending_alert_ids:
+            position = self._pending_alert_ids.index(alert_id)
+            del self._pending_prices[position]
+            del self._pending_alert_ids[position]
+            del self._pending_user_ids[position]
+            return
+        self._removed.add(alert_id)
+        if len(self._removed) > max(COMPACT_MIN_REMOVED, len(self.prices) // 4):
+            self._compact()
+
+    def _compact(self) -> None:
+        keep = ~np.isin(self.alert_ids, np.fromiter(self._removed, np.int64, len(self._removed)))
+        self.prices = self.prices[keep]
+        self.alert_ids = self.alert_ids[keep]
+        self.user_ids = self.user_ids[keep]
+        self._removed = set()
+
+    def _merge(self) -> None:
+        """保留中の閾値を並べ替えて、既存の配列の該当位置にまとめて挿入する"""
+        if not self._pending_prices:
+            return
+        prices = np.array(self._pending_prices, dtype=np.float64)
+        order = np.argsort(prices, kind="stable")
+        prices = prices[order]
+        alert_ids = np.array(self._pending_alert_ids, dtype=np.int64)[order]
+        user_ids = np.array(self._pending_user_ids, dtype=np.int64)[order]
+        self._pending_prices, self._pending_alert_ids, self._pending_user_ids = [], [], []
+        positions = np.searchsorted(self.prices, prices, side="right")
+        self.prices = np.insert(self.prices, positions, prices)
+        self.alert_ids = np.insert(self.alert_ids, positions, alert_ids)
+        self.user_ids = np.insert(self.user_ids, positions, user_ids)
+
+    def _split(self, taken: slice, kept: slice) -> List[Tuple[int, int]]:
+        alert_ids = self.alert_ids[taken].tolist()
+        user_ids = self.user_ids[taken].tolist()
+        # 残りはビューのまま持ち、次の挿入で新しい配列になる（発火のたびに全体をコピーしない）
+        self.prices = self.prices[kept]
+        self.alert_ids = self.alert_ids[kept]
+        self.user_ids = self.user_ids[kept]
+        if not self._removed:
+            return list(zip(alert_ids, user_ids))
+        taken_entries = []
+        for alert_id, user_id in zip(alert_ids, user_ids):
+            if alert_id in self._removed:
+                self._removed.discard(alert_id)
+            else:
+                taken_entries.append((alert_id, user_id))
+        return taken_entries
+
+    def take_at_or_below(self, price: float) -> List[Tuple[int, int]]:
+        """閾値がprice以下のもの（上抜けで発火する側）を (アラートID, ユーザーID) で取り出す"""
+        self._merge()
+        boundary = int(np.searchsorted(self.prices, price, side="right"))
+        if boundary == 0:
+            return []
+        return self._split(slice(None, boundary), slice(boundary, None))
+
+    def take_at_or_above(self, price: float) -> List[Tuple[int, int]]:
+        """閾値がprice以上のもの（下抜けで発火する側）を (アラートID, ユーザーID) で取り出す"""
+        self._merge()
+        boundary = int(np.searchsorted(self.prices, price, side="left"))
+        if boundary == len(self.prices):
+            return []
+        return self._split(slice(boundary, None), slice(None, boundary))
+
+
+class _SymbolAlerts:
+    __slots__ = ("rising", "falling", "two_sided")
+
+    def __init__(self):
+        # rising: 株価がこの価格以上になったら発火 / falling: この価格以下になったら発火
+        self.rising = _ThresholdBook()
+        self.falling = _ThresholdBook()
+        # 上下両方に載っている（変動率の）アラート
+        self.two_sided: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.rising) + len(self.falling)
+
+
+class PriceAlertIndex:
+    """全銘柄の有効なアラートの索引（スレッドセーフではないため呼び出し側で排他する）"""
+
+    def __init__(self):
+        self._symbols: Dict[str, _SymbolAlerts] = {}
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def __len__(self) -> int:
+        """索引に載っている閾値の数（上下両方に載る変動率のアラートは2と数える）"""
+        return sum(len(alerts) for alerts in self._symbols.values())
+
+    def add(self, alert: PriceAlert) -> None:
+        rising, falling = alert.trigger_prices()
+        alerts = self._symbols.get(alert.symbol)
+        if alerts is None:
+            alerts = self._symbols[alert.symbol] = _SymbolAlerts()
+        if rising is not None:
+            alerts.rising.add(rising, alert.id, alert.user_id)
+        if falling is not None:
+            alerts.falling.add(falling, alert.id, alert.user_id)
+        if rising is not None and falling is not None:
+            alerts.two_sided.add(alert.id)
+
+    def add_many(self, alerts: Iterable[PriceAlert]) -> None:
+        for alert in alerts:
+            self.add(alert)
+
+    def remove(self, alert: PriceAlert) -> None:
+        """削除されたアラートを外す"""
+        alerts = self._symbols.get(alert.symbol)
+        if alerts is None:
+            return
+        rising, falling = alert.trigger_prices()
+        if rising is not None:
+            alerts.rising.discard(alert.id)
+        if falling is not None:
+            alerts.falling.discard(alert.id)
+        alerts.two_sided.discard(alert.id)
+
+    def on_prices(
+        self, prices: Mapping[str, float], now: Optional[datetime] = None
+    ) -> List[AlertTrigger]:
+        """新しい株価で閾値を越えたアラートを索引から外して返す"""
+        now = now or datetime.now()
+        triggers: List[AlertTrigger] = []
+        for symbol, price in prices.items():
+            alerts = self._symbols.get(symbol)
+            if alerts is None:
+                continue
+            price = float(price)
+            crossed = [
+                (entry, alerts.falling) for entry in alerts.rising.take_at_or_below(price)
+            ] + [
+                (entry, alerts.rising) for entry in alerts.falling.take_at_or_above(price)
+            ]
+            for (alert_id, user_id), opposite in crossed:
+                if alert_id in alerts.two_sided:
+                    alerts.two_sided.discard(alert_id)
+                    opposite.discard(alert_id)
+                triggers.append(AlertTrigger(
+                    alert_id=alert_id, user_id=user_id, symbol=symbol, price=price,
+                    triggered_at=now,
+                ))
+            if not len(alerts):
+                del self._symbols[symbol]
+        return triggers
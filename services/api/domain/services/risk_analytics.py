@@ -0,0 +1,91 @@
+"""ポートフォリオのリスク指標の計算
+
+日次リターンは「銘柄×日付」の行列に揃えて保持し、指標はすべて行列演算で計算する。
+リターンは各銘柄の現地通貨建て（為替変動は含まない）。
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from statistics import NormalDist
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass(frozen=True)
+class ReturnMatrix:
+    """全銘柄の終値が揃う日だけを使った日次リターン行列
+
+    returns[t, j] は銘柄 symbols[j] の dates[t] における単純リターン。
+    """
+
+    symbols: Tuple[str, ...]
+    dates: np.ndarray
+    returns: np.ndarray
+    last_closes: np.ndarray
+
+    def column(self, symbol: str) -> np.ndarray:
+        return self.returns[:, self.symbols.index(symbol)]
+
+    def columns(self, symbols: Sequence[str]) -> np.ndarray:
+        return self.returns[:, [self.symbols.index(symbol) for symbol in symbols]]
+
+
+def build_return_matrix(
+    histories: Dict[str, List[Tuple[date, float]]], symbols: Sequence[str]
+) -> ReturnMatrix:
+    """銘柄ごとの終値履歴を共通の取引日に揃えてリターン行列を作る"""
+    series = {
+        symbol: (
+            np.array([day for day, _ in histories[symbol]], dtype="datetime64[D]"),
+            np.array([close for _, close in histories[symbol]], dtype=np.float64),
+        )
+        for symbol in symbols
+    }
+    common = series[symbols[0]][0]
+    for day_array, _ in series.values():
+        common = np.intersect1d(common, day_array, assume_unique=True)
+    if len(common) < 3:
+        raise ValueError("Not enough overlapping price history")
+
+    closes = np.column_stack(
+        [closes[np.searchsorted(days, common)] for days, closes in series.values()]
+    )
+    return ReturnMatrix(
+        symbols=tuple(symbols),
+        dates=common[1:],
+        returns=closes[1:] / closes[:-1] - 1.0,
+        last_closes=closes[-1],
+    )
+
+
+def annualized_volatility(returns: np.ndarray) -> float:
+    """日次リターンの標準偏差を年率換算"""
+    return float(np.std(returns, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR))
+
+
+def covariance_matrix(returns: np.ndarray) -> np.ndarray:
+    return np.atleast_2d(np.cov(returns, rowvar=False))
+
+
+def correlation_matrix(returns: np.ndarray) -> np.ndarray:
+    return np.atleast_2d(np.corrcoef(returns, rowvar=False))
+
+
+def beta(portfolio_returns: np.ndarray, benchmark_returns: np.ndarray) -> float:
+    """ベンチマークに対するベータ（共分散 / ベンチマークの分散）"""
+    covariance = np.cov(portfolio_returns, benchmark_returns)
+    return float(covariance[0, 1] / covariance[1, 1])
+
+
+def historical_var(portfolio_returns: np.ndarray, confidence: float) -> float:
+    """ヒストリカル法による1日VaR（評価額に対する損失率、正の値）"""
+    return float(max(-np.quantile(portfolio_returns, 1.0 - confidence), 0.0))
+
+
+def parametric_var(weights: np.ndarray, covariance: np.ndarray, confidence: float) -> float:
+    """分散共分散法による1日VaR（平均リターンは0とみなす）"""
+    sigma = float(np.sqrt(weights @ covariance @ weights))
+    return NormalDist().inv_cdf(confidence) * sigma
@@ -0,0 +1,145 @@
+"""株式分割・併合による保有株と株価履歴の調整
+
+銘柄ごとに権利落ち日（datetime64[D]）の昇順の配列と、各権利落ち日以降の倍率の累積積を
+前もって求めておき、日付ごとの倍率はnp.searchsortedの二分探索でまとめて引く。
+発表済みでもまだ権利落ちしていない分割は株価にも反映されていないため、評価日（既定で今日）
+までに権利落ちした分割だけを数える。
+保有株や株価履歴の行は書き換えず、読み取り時に倍率を掛けるだけなので、分割が登録されても
+ユーザーごとの一括UPDATEは要らない。
+"""
+
+import hashlib
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from domain.entities.corporate_action import CorporateAction
+from domain.entities.user_stock import UserStock
+from domain.services.fx_history import DateLike, as_days
+
+# 保有株の取得単価の桁（user_stocks.acquisition_priceの小数部に合わせる）
+PRICE_QUANTUM = Decimal("0.01")
+
+# 取得日時がない（登録直後の）保有株は、登録済みの分割の影響を受けない
+_NO_LOT_DATE = date.max
+
+
+class SplitAdjustments:
+    """銘柄ごとの分割の累積倍率（変更せず、分割が登録されたら作り直す）
+
+    as_ofを指定しなければ、呼び出した日を評価日とする（ワーカーが日をまたいで使い続けてもよい）。
+    """
+
+    def __init__(self, actions: Iterable[CorporateAction] = (), as_of: Optional[date] = None):
+        self._as_of = as_of
+        by_symbol: Dict[str, Dict[date, float]] = {}
+        for action in actions:
+            # 同じ日付の分割が重複していても1件として扱う
+            by_symbol.setdefault(action.symbol, {})[action.ex_date] = action.factor
+        self._ex_days: Dict[str, np.ndarray] = {}
+        self._cumulative: Dict[str, np.ndarray] = {}
+        for symbol, factors in by_symbol.items():
+            days = sorted(factors)
+            ratios = np.array([factors[day] for day in days] + [1.0])
+            self._ex_days[symbol] = as_days(days)
+            # cumulative[i]: i番目以降の権利落ち日の倍率の積（末尾は分割なしの1）
+            self._cumulative[symbol] = np.cumprod(ratios[::-1])[::-1]
+        self.key: Tuple = tuple(sorted(
+            (symbol, day, factor) for symbol, factors in by_symbol.items()
+            for day, factor in factors.items()
+        ))
+
+    @property
+    def as_of(self) -> date:
+        """この日までに権利落ちした分割を反映する"""
+        return self._as_of or date.today()
+
+    @property
+    def digest(self) -> str:
+        """プロセスをまたいで同じ値になる短い識別子（応答キャッシュのキーに使う）
+
+        権利落ち日を過ぎると反映する分割が変わるため、評価日も含める。
+        """
+        return hashlib.sha256(repr((self.key, self.as_of)).encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self._ex_days)
+
+    def __bool__(self) -> bool:
+        return bool(self._ex_days)
+
+    def factors(
+        self,
+        symbol: str,
+        days: Union[Sequence[DateLike], np.ndarray],
+        as_of: Optional[date] = None,
+    ) -> np.ndarray:
+        """
+        各日付の時点の株数を評価日の株数に換算する倍率
+
+        その日より後、評価日（省略時はself.as_of）までに権利落ちした分割の累積積。
+        """
+        wanted = as_days(days)
+        ex_days = self._ex_days.get(symbol)
+        if ex_days is None:
+            return np.ones(len(wanted))
+        cumulative = self._cumulative[symbol]
+        until = np.searchsorted(ex_days, as_days([as_of or self.as_of])[0], side="right")
+        since = np.minimum(np.searchsorted(ex_days, wanted, side="right"), until)
+        # 評価日より後の分割の分を割り戻す（評価日以降に取得した分は1になる）
+        return cumulative[since] / cumulative[until]
+
+    def adjust_holdings(self, holdings: List[UserStock]) -> List[UserStock]:
+        """
+        取得日より後の分割を反映した保有株を返す（元の保有株は変更しない）
+
+        株数は倍率を掛けて切り捨て（併合の端株は現金で精算される前提）、取得単価は倍率で割る。
+        """
+        positions: Dict[str, List[int]] = {}
+        for position, holding in enumerate(holdings):
+            if holding.ticker_symbol in self._ex_days:
+                positions.setdefault(holding.ticker_symbol, []).append(position)
+        if not positions:
+            return holdings
+
+        adjusted = list(holdings)
+        as_of = self.as_of
+        for symbol, indexes in positions.items():
+            lots = [holdings[i] for i in indexes]
+            factors = self.factors(
+                symbol,
+                [lot.created_at.date() if lot.created_at else _NO_LOT_DATE for lot in lots],
+                as_of,
+            )
+            # 浮動小数点の誤差で1株減らないよう僅かに足してから切り捨てる
+            quantities = np.floor(np.array([lot.quantity for lot in lots]) * factors + 1e-9)
+            for i, lot, factor, quantity in zip(indexes, lots, factors, quantities):
+                if factor == 1.0:
+                    continue
+                adjusted[i] = replace(
+                    lot,
+                    quantity=int(quantity),
+                    acquisition_price=(
+                        Decimal(lot.acquisition_price) / Decimal(repr(float(factor)))
+                    ).quantize(PRICE_QUANTUM),
+                )
+        return adjusted
+
+    def adjust_closes(
+        self, symbol: str, closes: List[Tuple[date, float]]
+    ) -> List[Tuple[date, float]]:
+        """
+        権利落ち日より前の終値を倍率で割り、分割後の株価の水準に揃える
+
+        評価日より後に権利落ちする分割はまだ終値に反映されていないため割らない。
+        """
+        if symbol not in self._ex_days or not closes:
+            return closes
+        days = [day for day, _ in closes]
+        values = np.fromiter((close for _, close in closes), np.float64, len(closes))
+        adjusted = values / self.factors(symbol, days)
+        return list(zip(days, adjusted.tolist()))
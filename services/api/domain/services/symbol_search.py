@@ -0,0 +1,148 @@
+"""銘柄マスタのメモリ内検索インデックス
+
+銘柄コード・英語名・日本語名・読み（ひらがな・正規化したローマ字）をキーにする。
+前方一致はソート済みのキー配列を二分探索し、部分一致は2文字のn-gramの転置索引で
+候補を絞ってから照合する。転置リストは array('I') で持つため、数千銘柄を読み込んでも
+数MB程度に収まり、ワーカーごとに起動時に構築できる。
+
+結果の順位は「コードの完全一致 > コードの前方一致 > 名称の前方一致 > 名称中の単語の前方一致
+> 部分一致」で、同じ順位の中はキーの辞書順に並ぶ。
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from domain.entities.stock import ListedSymbol
+from domain.services.kana import canonical_romaji, has_kana, kana_to_romaji, normalize, to_hiragana
+
+_WORD_SEPARATOR = re.compile(r"[\s・&,\-]+")
+_ROMAJI_QUERY = re.compile(r"[a-z]{3,}")
+
+
+class _PrefixTable:
+    """ソート済みのキーと銘柄番号の組（前方一致の検索用）"""
+
+    __slots__ = ("keys", "ids")
+
+    def __init__(self, pairs: Iterable[Tuple[str, int]]):
+        ordered = sorted(set(pairs))
+        self.keys = [key for key, _ in ordered]
+        self.ids = array("I", (index for _, index in ordered))
+
+    def scan(self, prefix: str) -> Iterator[int]:
+        for position in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[position].startswith(prefix):
+                return
+            yield self.ids[position]
+
+
+def _search_texts(symbol: ListedSymbol) -> Tuple[str, ...]:
+    """検索対象の文字列（コード, 英語名, 日本語名, 読みのひらがな, 読みのローマ字）"""
+    return (
+        symbol.symbol.lower(),
+        normalize(symbol.name_en),
+        normalize(symbol.name_ja),
+        to_hiragana(normalize(symbol.name_kana)),
+        kana_to_romaji(symbol.name_kana),
+    )
+
+
+def _query_forms(query: str) -> List[str]:
+    """検索語を、キーと比較できる形（入力のまま・ひらがな・ローマ字）に展開する"""
+    plain = normalize(query)
+    if not plain:
+        return []
+    forms = [plain]
+    if has_kana(plain):
+        forms += [to_hiragana(plain), kana_to_romaji(plain)]
+    elif _ROMAJI_QUERY.fullmatch(plain):
+        forms.append(canonical_romaji(plain))
+    return list(dict.fromkeys(form for form in forms if form))
+
+
+class SymbolIndex:
+    """銘柄コード・銘柄名・読みで銘柄を引く検索インデックス"""
+
+    def __init__(self, symbols: Iterable[ListedSymbol]):
+        self.symbols: List[ListedSymbol] = list(symbols)
+        self._by_code: Dict[str, int] = {}
+        self._texts: List[Tuple[str, ...]] = []
+        self._bigrams: Dict[str, array] = {}
+        codes, names, words = [], [], []
+        for index, symbol in enumerate(self.symbols):
+            texts = _search_texts(symbol)
+            self._texts.append(texts)
+            self._by_code[symbol.symbol.upper()] = index
+            codes.append((texts[0], index))
+            names.extend((text, index) for text in texts[1:] if text)
+            for name in texts[1:3]:
+                words.extend((word, index) for word in _WORD_SEPARATOR.split(name)[1:] if word)
+            for bigram in {text[i : i + 2] for text in texts for i in range(len(text) - 1)}:
+                self._bigrams.setdefault(bigram, array("I")).append(index)
+        self._codes = _PrefixTable(codes)
+        self._names = _PrefixTable(names)
+        self._words = _PrefixTable(words)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def get(self, symbol: str) -> Optional[ListedSymbol]:
+        """銘柄コード（東証銘柄は .T 付きでも可）で銘柄を取得"""
+        index = self._code_index(symbol)
+        return None if index is None else self.symbols[index]
+
+    def _code_index(self, symbol: str) -> Optional[int]:
+        code = symbol.strip().upper()
+        index = self._by_code.get(code)
+        if index is None and code.endswith(".T"):
+            index = self._by_code.get(code[:-2])
+        return index
+
+    def search(self, query: str, limit: int = 10) -> List[ListedSymbol]:
+        """検索語に一致する銘柄を順位の高い順に最大limit件返す"""
+        forms = _query_forms(query)
+        if not forms or limit <= 0:
+            return []
+
+        # 挿入順を保つ重複なしの集合として使う
+        found: Dict[int, None] = {}
+        exact = self._code_index(forms[0])
+        if exact is not None:
+            found[exact] = None
+
+        for table in (self._codes, self._names, self._words):
+            for form in forms:
+                for index in table.scan(form):
+                    found[index] = None
+                    if len(found) >= limit:
+                        return [self.symbols[i] for i in found]
+
+        for index in self._substring_matches(forms):
+            found[index] = None
+            if len(found) >= limit:
+                break
+        return [self.symbols[i] for i in found]
+
+    def _substring_matches(self, forms: List[str]) -> List[int]:
+        """n-gramの転置リストで候補を絞り、検索語を部分文字列に含む銘柄を返す"""
+        matches = set()
+        for form in forms:
+            if len(form) < 2:
+                continue
+            postings = []
+            for i in range(len(form) - 1):
+                posting = self._bigrams.get(form[i : i + 2])
+                if posting is None:
+                    break
+                postings.append(posting)
+            else:
+                postings.sort(key=len)
+                candidates = set(postings[0]).intersection(*postings[1:])
+                matches.update(
+                    index
+                    for index in candidates
+                    if any(form in text for text in self._texts[index])
+                )
+        return sorted(matches)
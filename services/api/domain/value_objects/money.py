@@ -0,0 +1,224 @@
+"""固定小数点による金額・価格の演算
+
+金額は通貨ごとの最小単位（円・セント）の整数、数量・価格・為替レートは
+DBの列精度に合わせた10進スケールの整数で保持する。配列版はnumpyのint64で
+一括計算し、int64に収まらない要素だけを多倍長整数で計算するため、
+Decimalで計算した結果と常に一致する。
+"""
+
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, List, Union
+
+import numpy as np
+
+Number = Union[Decimal, int, float, str]
+
+# 通貨ごとの最小単位の桁数（ISO 4217）
+MINOR_UNITS = {"JPY": 0, "KRW": 0, "USD": 2, "EUR": 2, "GBP": 2, "HKD": 2, "CNY": 2}
+DEFAULT_MINOR_UNITS = 2
+
+# DBの列精度に合わせたスケール
+QUANTITY_SCALE = 4  # DECIMAL(18, 4)
+PRICE_SCALE = 4  # DECIMAL(18, 4)
+RATE_SCALE = 6  # DECIMAL(18, 6)
+
+# floatでの見積もり誤差を見込んだint64の安全域
+_INT64_SAFE = float(2**62)
+
+
+def minor_units(currency: str) -> int:
+    """通貨の最小単位の桁数"""
+    return MINOR_UNITS.get(currency, DEFAULT_MINOR_UNITS)
+
+
+def to_units(value: Number, scale: int) -> int:
+    """10進数をスケール済み整数に変換（端数は四捨五入）"""
+    scaled = (value if isinstance(value, Decimal) else Decimal(str(value))).scaleb(scale)
+    units = int(scaled)
+    if units != scaled:
+        units = int(scaled.to_integral_value(rounding=ROUND_HALF_UP))
+    return units
+
+
+def from_units(units: int, scale: int) -> Decimal:
+    """スケール済み整数を10進数に戻す（DBの列へそのまま書き込める）"""
+    return Decimal(int(units)).scaleb(-scale)
+
+
+def units_array(values: Iterable[Number], scale: int) -> np.ndarray:
+    """10進数の列をスケール済み整数の配列に変換"""
+    return _compact(np.array([to_units(value, scale) for value in values], dtype=object))
+
+
+def decimals(units: np.ndarray, scale: int) -> List[Decimal]:
+    """スケール済み整数の配列を10進数のリストに戻す"""
+    return [Decimal(v).scaleb(-scale) for v in units.tolist()]
+
+
+def round_div(numerator: int, denominator: int) -> int:
+    """四捨五入（0から遠い方向）の整数除算"""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder >= denominator - remainder:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def _round_div_array(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    quotient, remainder = np.divmod(np.abs(numerator), denominator)
+    quotient = quotient + (remainder >= denominator - remainder)
+    return np.where(numerator < 0, -quotient, quotient)
+
+
+def _compact(values: np.ndarray) -> np.ndarray:
+    """全要素がint64に収まればint64配列に、収まらなければ多倍長整数の配列のままにする"""
+    if values.dtype != object:
+        return values
+    if len(values) == 0 or max(abs(int(v)) for v in values) < 2**63:
+        return values.astype(np.int64)
+    return values
+
+
+def mul_div(a: np.ndarray, b: np.ndarray, denominator: int) -> np.ndarray:
+    """round(a * b / denominator) を要素ごとに厳密に計算
+
+    積がint64に収まる要素はベクトル演算、収まらない要素のみ多倍長整数で計算する。
+    """
+    estimate = np.abs(a.astype(np.float64)) * np.abs(b.astype(np.float64))
+    overflow = estimate >= _INT64_SAFE
+    if not overflow.any():
+        return _round_div_array(a.astype(np.int64) * b.astype(np.int64), denominator)
+
+    result = np.empty(len(estimate), dtype=object)
+    safe = ~overflow
+    result[safe] = _round_div_array(
+        a[safe].astype(np.int64) * b[safe].astype(np.int64), denominator
+    )
+    result[overflow] = [
+        round_div(int(x) * int(y), denominator) for x, y in zip(a[overflow], b[overflow])
+    ]
+    return _compact(result)
+
+
+@dataclass(frozen=True)
+class Money:
+    """通貨の最小単位の整数で表した金額"""
+
+    minor: int
+    currency: str
+
+    @classmethod
+    def from_decimal(cls, value: Number, currency: str) -> "Money":
+        return cls(to_units(value, minor_units(currency)), currency)
+
+    @classmethod
+    def zero(cls, currency: str) -> "Money":
+        return cls(0, currency)
+
+    @classmethod
+    def valuate(cls, quantity: Number, price: Number, currency: str) -> "Money":
+        """数量×価格を取引通貨の最小単位で計算"""
+        numerator = to_units(quantity, QUANTITY_SCALE) * to_units(price, PRICE_SCALE)
+        return cls(
+            round_div(numerator, 10 ** (QUANTITY_SCALE + PRICE_SCALE - minor_units(currency))),
+            currency,
+        )
+
+    def to_decimal(self) -> Decimal:
+        return from_units(self.minor, minor_units(self.currency))
+
+    def convert(self, rate: Number, currency: str) -> "Money":
+        """為替レート（1単位あたりの換算先通貨の額）で換算"""
+        if currency == self.currency and Decimal(str(rate)) == 1:
+            return self
+        numerator = self.minor * to_units(rate, RATE_SCALE) * 10 ** minor_units(currency)
+        return Money(
+            round_div(numerator, 10 ** (RATE_SCALE + minor_units(self.currency))), currency
+        )
+
+    def _check_currency(self, other: "Money") -> None:
+        if other.currency != self.currency:
+            raise ValueError(f"Currency mismatch: {self.currency} != {other.currency}")
+
+    def __add__(self, other: "Money") -> "Money":
+        self._check_currency(other)
+        return Money(self.minor + other.minor, self.currency)
+
+    def __sub__(self, other: "Money") -> "Money":
+        self._check_currency(other)
+        return Money(self.minor - other.minor, self.currency)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.minor, self.currency)
+
+    def __str__(self) -> str:
+        return f"{self.to_decimal()} {self.currency}"
+
+
+class MoneyArray:
+    """同一通貨の金額の配列（最小単位の整数）"""
+
+    __slots__ = ("minor", "currency")
+
+    def __init__(self, minor: np.ndarray, currency: str):
+        self.minor = _compact(np.asarray(minor))
+        self.currency = currency
+
+    @classmethod
+    def from_decimals(cls, values: Iterable[Number], currency: str) -> "MoneyArray":
+        return cls(units_array(values, minor_units(currency)), currency)
+
+    @classmethod
+    def valuate(
+        cls, quantity_units: np.ndarray, price_units: np.ndarray, currency: str
+    ) -> "MoneyArray":
+        """数量×価格を取引通貨の最小単位で一括計算
+
+        数量・価格はQUANTITY_SCALE/PRICE_SCALEのスケール済み整数の配列で渡す。
+        """
+        return cls(
+            mul_div(
+                np.asarray(quantity_units),
+                np.asarray(price_units),
+                10 ** (QUANTITY_SCALE + PRICE_SCALE - minor_units(currency)),
+            ),
+            currency,
+        )
+
+    def convert(self, rate_units: Union[int, np.ndarray], currency: str) -> "MoneyArray":
+        """為替レート（RATE_SCALEのスケール済み整数。スカラーまたは要素ごと）で一括換算"""
+        rate_units = np.broadcast_to(np.asarray(rate_units), self.minor.shape)
+        scale = RATE_SCALE + minor_units(self.currency) - minor_units(currency)
+        if scale >= 0:
+            converted = mul_div(self.minor, rate_units, 10**scale)
+        else:
+            converted = mul_div(self.minor, rate_units * 10 ** (-scale), 1)
+        return MoneyArray(converted, currency)
+
+    def sum(self) -> Money:
+        if self.minor.dtype == object or (
+            len(self) * float(np.abs(self.minor).max(initial=0)) >= _INT64_SAFE
+        ):
+            return Money(sum(int(v) for v in self.minor), self.currency)
+        return Money(int(self.minor.sum()), self.currency)
+
+    def to_decimals(self) -> List[Decimal]:
+        return decimals(self.minor, minor_units(self.currency))
+
+    def _check_currency(self, other: "MoneyArray") -> None:
+        if other.currency != self.currency:
+            raise ValueError(f"Currency mismatch: {self.currency} != {other.currency}")
+
+    def __add__(self, other: "MoneyArray") -> "MoneyArray":
+        self._check_currency(other)
+        return MoneyArray(self.minor + other.minor, self.currency)
+
+    def __sub__(self, other: "MoneyArray") -> "MoneyArray":
+        self._check_currency(other)
+        return MoneyArray(self.minor - other.minor, self.currency)
+
+    def __len__(self) -> int:
+        return len(self.minor)
+
+    def __getitem__(self, index: int) -> Money:
+        return Money(int(self.minor[index]), self.currency)
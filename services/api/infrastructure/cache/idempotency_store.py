@@ -0,0 +1,222 @@
+"""Idempotency-Keyごとのリクエストの指紋と応答の保存先
+
+REDIS_URLが未設定ならプロセス内のLRUに保存する（同じワーカーへの再送のみ重複を防げる）。
+設定されていればRedisで全ワーカーに共有し、完了済みの応答はプロセス内のLRUにも持って
+再送のたびにRedisへ問い合わせないようにする。
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from infrastructure.cache.lru_cache import LRUCache
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+# 完了した応答を保持する秒数（クライアントが再送し得る期間）
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+# 処理中の予約の有効秒数（処理中にワーカーが落ちても、この時間が過ぎれば再送を受け付ける）
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+_REDIS_PREFIX = "idempotency:"
+_REDIS_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """保存した応答（ステータス、ヘッダー、本文）"""
+
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    """キーに対応する記録（responseがNoneなら最初のリクエストが処理中）"""
+
+    fingerprint: str
+    response: Optional[StoredResponse] = None
+
+
+class IdempotencyStore(ABC):
+    """Idempotency-Keyの記録の保存先のインターフェース"""
+
+    @abstractmethod
+    async def reserve(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        """
+        キーを処理中として予約する
+
+        Returns:
+            予約できた場合はNone、既に記録があればその記録
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        """予約したキーに応答を保存し、待っているリクエストに知らせる"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """予約を取り消す（応答を保存せず、再送をやり直せるようにする）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def wait(self, key: str, timeout: float) -> Optional[IdempotencyRecord]:
+        """処理中のキーが完了または取り消されるまで待ち、その時点の記録を返す"""
+        raise NotImplementedError
+
+
+class InProcessIdempotencyStore(IdempotencyStore):
+    """プロセス内のLRUに保存する実装（イベントループのスレッドからのみ使う）"""
+
+    def __init__(
+        self,
+        maxsize: int = IDEMPOTENCY_MAX_ENTRIES,
+        ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._records: LRUCache[Tuple[IdempotencyRecord, float]] = LRUCache(maxsize)
+        self._pending: Dict[str, asyncio.Event] = {}
+
+    def _get(self, key: str) -> Optional[IdempotencyRecord]:
+        entry = self._records.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def _put(self, key: str, record: IdempotencyRecord, ttl_seconds: float) -> None:
+        self._records.put(key, (record, time.monotonic() + ttl_seconds))
+
+    async def reserve(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        # 確認から予約までの間にawaitを挟まないため、同じワーカー内では競合しない
+        record = self._get(key)
+        if record is not None:
+            return record
+        self._put(key, IdempotencyRecord(fingerprint), self.ttl_seconds)
+        self._pending[key] = asyncio.Event()
+        return None
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        record = self._get(key)
+        if record is not None:
+            self._put(key, IdempotencyRecord(record.fingerprint, response), self.ttl_seconds)
+        self._notify(key)
+
+    async def release(self, key: str) -> None:
+        self._put(key, IdempotencyRecord(""), 0.0)
+        self._notify(key)
+
+    def _notify(self, key: str) -> None:
+        event = self._pending.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def wait(self, key: str, timeout: float) -> Optional[IdempotencyRecord]:
+        event = self._pending.get(key)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._get(key)
+
+
+def _encode(record: IdempotencyRecord) -> str:
+    response = record.response
+    return json.dumps({
+        "fingerprint": record.fingerprint,
+        "response": None if response is None else {
+            "status": response.status,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")]
+                        for name, value in response.headers],
+            "body": base64.b64encode(response.body).decode("ascii"),
+        },
+    })
+
+
+def _decode(raw: bytes) -> IdempotencyRecord:
+    data = json.loads(raw)
+    response = data["response"]
+    return IdempotencyRecord(
+        data["fingerprint"],
+        None if response is None else StoredResponse(
+            status=response["status"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1"))
+                     for name, value in response["headers"]],
+            body=base64.b64decode(response["body"]),
+        ),
+    )
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Redisに保存し、全ワーカーで記録を共有する実装"""
+
+    def __init__(
+        self,
+        client,
+        maxsize: int = IDEMPOTENCY_MAX_ENTRIES,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS,
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        # 完了済みの記録は変わらないため、プロセス内にも持つ
+        self._completed = InProcessIdempotencyStore(maxsize, ttl_seconds)
+
+    async def _load(self, key: str) -> Optional[IdempotencyRecord]:
+        raw = await self.client.get(_REDIS_PREFIX + key)
+        return None if raw is None else _decode(raw)
+
+    async def reserve(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        local = self._completed._get(key)
+        if local is not None:
+            return local
+        reserved = await self.client.set(
+            _REDIS_PREFIX + key, _encode(IdempotencyRecord(fingerprint)),
+            nx=True, ex=self.lock_seconds,
+        )
+        if reserved:
+            return None
+        record = await self._load(key)
+        if record is None:
+            # 確認の間に取り消された。予約からやり直す
+            return await self.reserve(key, fingerprint)
+        return record
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        record = await self._load(key)
+        fingerprint = record.fingerprint if record is not None else ""
+        completed = IdempotencyRecord(fingerprint, response)
+        await self.client.set(_REDIS_PREFIX + key, _encode(completed), ex=self.ttl_seconds)
+        self._completed._put(key, completed, self.ttl_seconds)
+
+    async def release(self, key: str) -> None:
+        await self.client.delete(_REDIS_PREFIX + key)
+
+    async def wait(self, key: str, timeout: float) -> Optional[IdempotencyRecord]:
+        # 他のワーカーの完了は通知されないため、短い間隔で確認する
+        deadline = time.monotonic() + timeout
+        while True:
+            record = await self._load(key)
+            if record is None or record.response is not None or time.monotonic() >= deadline:
+                return record
+            await asyncio.sleep(_REDIS_POLL_SECONDS)
+
+
+@lru_cache
+def get_idempotency_store() -> IdempotencyStore:
+    """REDIS_URLがあればRedis、なければプロセス内の保存先を返す"""
+    if REDIS_URL:
+        import redis.asyncio as redis
+
+        return RedisIdempotencyStore(redis.from_url(REDIS_URL))
+    return InProcessIdempotencyStore()
@@ -0,0 +1,123 @@
+"""共有メモリテーブルへの書き込みを担当するリフレッシュプロセス
+
+ホストごとに1プロセスだけ起動し、上流APIから取得した株価と為替レートを
+共有メモリに書き込む。uvicornワーカーは読み取りのみを行う。
+
+    MARKET_DATA_SHM_NAME=investfolio_md python -m infrastructure.cache.market_data_refresher
+"""
+
+import asyncio
+import os
+import signal
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from domain.repositories.stock_repository import StockRepository
+from infrastructure.cache.shared_market_data import (
+    DEFAULT_CAPACITY,
+    FX_KEY_PREFIX,
+    SharedMarketDataTable,
+)
+from infrastructure.external.exchange_rate_client import ExchangeRateClient
+from infrastructure.leader_lock import leader_lock
+from infrastructure.logging_config import setup_logging
+from infrastructure.repositories.exchange_rate_repository_impl import USD_JPY
+from infrastructure.repositories.hedged_stock_repository import create_quote_upstream
+
+
+def refresh_once(
+    table: SharedMarketDataTable,
+    stock_repository: StockRepository,
+    exchange_rate_client: ExchangeRateClient,
+    symbols: Iterable[str],
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> int:
+    """指定銘柄とテーブル既存銘柄の株価、およびUSD/JPYを1回更新する
+
+    loopを指定した場合はそのイベントループで取得する（株価APIの接続を更新のたびに作り直さない）。
+
+    Returns:
+        書き込んだレコード数
+    """
+    targets = set(symbols)
+    targets.update(key for key in table.keys() if not key.startswith(FX_KEY_PREFIX))
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(stock_repository.get_stock_price(symbol) for symbol in sorted(targets))
+        )
+
+    written = 0
+    stocks = loop.run_until_complete(fetch_all()) if loop else asyncio.run(fetch_all())
+    for stock in stocks:
+        if stock:
+            table.put_quote(stock)
+            written += 1
+
+    rate = exchange_rate_client.get_usd_jpy_rate()
+    if rate is not None:
+        table.put_fx_rate(USD_JPY, rate, datetime.now())
+        written += 1
+
+    return written
+
+
+def run_refresher(
+    name: str,
+    symbols: List[str],
+    interval_seconds: float,
+    capacity: int = DEFAULT_CAPACITY,
+) -> None:
+    """セグメントを作成し、停止シグナルを受けるまで定期的に更新する
+
+    書き込みは常に1プロセスのみとするため、APIワーカーのスケジューラと
+    同じリーダーロックを取得できた場合のみ起動する。
+    """
+    if not leader_lock.try_acquire():
+        raise SystemExit("Another process is already writing market data")
+
+    table = SharedMarketDataTable.create(name=name, capacity=capacity)
+    stock_repository = create_quote_upstream()
+    exchange_rate_client = ExchangeRateClient()
+    # 株価APIの接続とレイテンシの分布を使い続けるため、イベントループは1つだけ作る
+    loop = asyncio.new_event_loop()
+
+    running = True
+
+    def stop(signum, frame):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    try:
+        while running:
+            started = time.monotonic()
+            refresh_once(table, stock_repository, exchange_rate_client, symbols, loop)
+            remaining = interval_seconds - (time.monotonic() - started)
+            while running and remaining > 0:
+                time.sleep(min(remaining, 0.5))
+                remaining -= 0.5
+    finally:
+        loop.run_until_complete(stock_repository.aclose())
+        loop.close()
+        # セグメントは削除せず、次の書き込みプロセスに引き継ぐ
+        table.close()
+        leader_lock.release()
+
+
+def main() -> None:
+    setup_logging()
+    name = os.getenv("MARKET_DATA_SHM_NAME", "investfolio_market_data")
+    symbols = [
+        s.strip() for s in os.getenv("MARKET_DATA_SYMBOLS", "").split(",") if s.strip()
+    ]
+    interval = float(os.getenv("MARKET_DATA_REFRESH_SECONDS", "30"))
+    capacity = int(os.getenv("MARKET_DATA_CAPACITY", str(DEFAULT_CAPACITY)))
+    run_refresher(name, symbols, interval, capacity)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""株価アラートの判定エンジン
+
+有効なアラートはリーダーのワーカーだけがメモリ上の索引に載せ、株価の取得ジョブが新しい株価を
+渡すたびに越えた閾値のアラートを配信キューに積む。索引はidの昇順にDBから差分を読み込むため、
+どのワーカーで登録されたアラートも次のジョブの実行時に反映される。
+
+自動採番のidはコミットの順に並ぶとは限らず、小さいidの登録が後からコミットされると差分の
+読み込みでは取りこぼす。また他のワーカーで削除されたアラートは索引から外れない。
+そのため一定の間隔で有効なアラートを全件読み直して索引を作り直す。
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Mapping, Optional, Set
+
+from domain.entities.price_alert import AlertTrigger, PriceAlert
+from domain.repositories.price_alert_repository import PriceAlertRepository
+from domain.services.price_alert_index import PriceAlertIndex
+
+logger = logging.getLogger(__name__)
+
+# 有効なアラートをDBから読み込むバッチサイズ
+PRICE_ALERT_SYNC_BATCH_SIZE = int(os.getenv("PRICE_ALERT_SYNC_BATCH_SIZE", "10000"))
+# 差分の取りこぼしを直すため、この間隔で有効なアラートを全件読み直して索引を作り直す
+PRICE_ALERT_REBUILD_SECONDS = float(os.getenv("PRICE_ALERT_REBUILD_SECONDS", "300"))
+
+
+class AlertDeliveryQueue:
+    """発火したアラートの配信待ちのキュー（スレッドセーフ）"""
+
+    def __init__(self):
+        self._items: Deque[AlertTrigger] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_many(self, triggers: List[AlertTrigger]) -> None:
+        with self._lock:
+            self._items.extend(triggers)
+
+    def drain(self, max_items: int) -> List[AlertTrigger]:
+        """先頭から最大max_items件を取り出す"""
+        with self._lock:
+            return [self._items.popleft() for _ in range(min(max_items, len(self._items)))]
+
+    def requeue(self, triggers: List[AlertTrigger]) -> None:
+        """配信に失敗したものを先頭に戻す"""
+        with self._lock:
+            self._items.extendleft(reversed(triggers))
+
+
+class PriceAlertEngine:
+    """アラートの索引と配信キューをまとめたもの"""
+
+    def __init__(
+        self,
+        queue: Optional[AlertDeliveryQueue] = None,
+        rebuild_seconds: float = PRICE_ALERT_REBUILD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.queue = queue or AlertDeliveryQueue()
+        self.rebuild_seconds = rebuild_seconds
+        self.clock = clock
+        self._index = PriceAlertIndex()
+        self._last_id = 0
+        self._last_rebuild: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def symbols(self) -> Set[str]:
+        with self._lock:
+            return set(self._index.symbols)
+
+    def sync(
+        self, repository: PriceAlertRepository, batch_size: int = PRICE_ALERT_SYNC_BATCH_SIZE
+    ) -> int:
+        """前回より後に登録された有効なアラートを索引に載せる（作り直しの時期なら全件から作り直す）"""
+        started = self.clock()
+        if self._last_rebuild is None or started - self._last_rebuild >= self.rebuild_seconds:
+            loaded = self._rebuild(repository, batch_size)
+            self._last_rebuild = started
+            return loaded
+
+        loaded = 0
+        for batch in repository.stream_active(self._last_id, batch_size):
+            with self._lock:
+                self._index.add_many(batch)
+                self._last_id = max(self._last_id, batch[-1].id)
+            loaded += len(batch)
+        if loaded:
+            logger.info("Price alerts loaded", extra={"loaded": loaded, "last_id": self._last_id})
+        return loaded
+
+    def _rebuild(self, repository: PriceAlertRepository, batch_size: int) -> int:
+        """有効なアラートを全件読み込んだ索引に差し替える
+
+        読み込み中も古い索引で判定を続ける。読み込み中に削除・発火したアラートが新しい索引に
+        残っても、配信時に有効なものだけを発火済みにするため重複しては通知されない。
+        """
+        index = PriceAlertIndex()
+        last_id = 0
+        loaded = 0
+        for batch in repository.stream_active(0, batch_size):
+            index.add_many(batch)
+            last_id = max(last_id, batch[-1].id)
+            loaded += len(batch)
+        with self._lock:
+            self._index = index
+            self._last_id = last_id
+        logger.info("Price alert index rebuilt", extra={"loaded": loaded, "last_id": last_id})
+        return loaded
+
+    def remove(self, alert: PriceAlert) -> None:
+        """削除されたアラートを索引から外す（索引を持たないワーカーでは何もしない）"""
+        with self._lock:
+            self._index.remove(alert)
+
+    def on_prices(self, prices: Mapping[str, float]) -> int:
+        """
+        新しい株価で発火したアラートを配信キューに積む
+
+        Returns:
+            発火したアラートの件数
+        """
+        with self._lock:
+            triggers = self._index.on_prices(prices)
+        if triggers:
+            self.queue.put_many(triggers)
+        return len(triggers)
+
+
+price_alert_engine = PriceAlertEngine()
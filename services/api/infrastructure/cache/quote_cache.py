@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from domain.entities.stock import Stock
+
+
+class QuoteCache(ABC):
+    """株価・為替レートのキャッシュのインターフェース"""
+
+    @property
+    def read_only(self) -> bool:
+        """Trueの場合、このプロセスからは書き込めない（別プロセスが更新する）"""
+        return False
+
+    @abstractmethod
+    def get_quote(self, symbol: str) -> Optional[Stock]:
+        """銘柄コードでキャッシュ済みの株価を取得"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_quote(self, stock: Stock) -> None:
+        """株価をキャッシュに書き込む"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def quote_symbols(self) -> List[str]:
+        """株価がキャッシュされている銘柄コードの一覧"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_fx_rate(self, pair: str) -> Optional[Tuple[float, datetime]]:
+        """通貨ペア（例: USD/JPY）でキャッシュ済みのレートと取得時刻を取得"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_fx_rate(self, pair: str, rate: float, timestamp: datetime) -> None:
+        """為替レートをキャッシュに書き込む"""
+        raise NotImplementedError
+
+
+class InProcessQuoteCache(QuoteCache):
+    """プロセス内の辞書に保持するキャッシュ（単一ワーカー・開発環境向け）"""
+
+    def __init__(self):
+        self._quotes: Dict[str, Stock] = {}
+        self._fx_rates: Dict[str, Tuple[float, datetime]] = {}
+
+    def get_quote(self, symbol: str) -> Optional[Stock]:
+        return self._quotes.get(symbol)
+
+    def put_quote(self, stock: Stock) -> None:
+        self._quotes[stock.symbol] = stock
+
+    def quote_symbols(self) -> List[str]:
+        return list(self._quotes)
+
+    def get_fx_rate(self, pair: str) -> Optional[Tuple[float, datetime]]:
+        return self._fx_rates.get(pair)
+
+    def put_fx_rate(self, pair: str, rate: float, timestamp: datetime) -> None:
+        self._fx_rates[pair] = (rate, timestamp)
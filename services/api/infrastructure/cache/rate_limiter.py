@@ -0,0 +1,166 @@
+"""トークンバケットによるレート制限
+
+キーごとに容量capacityのバケットを持ち、1秒あたりrefill_per_second個ずつ補充する。
+REDIS_URLが未設定ならプロセス内に持ち（ワーカーごとの制限になる）、設定されていれば
+Redis上のバケットをLuaスクリプトで原子的に更新して全ワーカーで共有する。
+"""
+
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Tuple
+
+from infrastructure.cache.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+# ログイン試行の制限（IPアドレスごと・メールアドレスごと）
+LOGIN_RATE_LIMIT_IP_BURST = int(os.getenv("LOGIN_RATE_LIMIT_IP_BURST", "20"))
+LOGIN_RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("LOGIN_RATE_LIMIT_IP_PER_MINUTE", "20"))
+LOGIN_RATE_LIMIT_EMAIL_BURST = int(os.getenv("LOGIN_RATE_LIMIT_EMAIL_BURST", "5"))
+LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE = float(os.getenv("LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE", "5"))
+# プロセス内に持つバケットの最大数
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+_REDIS_PREFIX = "ratelimit:"
+
+# KEYS[1]: バケット, ARGV: 容量, 1秒あたりの補充数, 消費数。待つべき秒数（0なら許可）を返す
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class TokenBucketLimiter(ABC):
+    """キーごとのトークンバケットのインターフェース"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        if capacity <= 0 or refill_per_second <= 0:
+            raise ValueError("capacity and refill_per_second must be positive")
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    @abstractmethod
+    async def take(self, key: str, cost: float = 1.0) -> float:
+        """
+        バケットからトークンを取り出す
+
+        Returns:
+            取り出せた場合は0、足りない場合は取り出せるようになるまでの秒数（消費はしない）
+        """
+        raise NotImplementedError
+
+
+class InProcessTokenBucketLimiter(TokenBucketLimiter):
+    """プロセス内のLRUにバケットを持つ実装（イベントループのスレッドからのみ使う）"""
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        maxsize: int = RATE_LIMIT_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(capacity, refill_per_second)
+        self.clock = clock
+        # (残りのトークン, 最後に補充した時刻)
+        self._buckets: LRUCache[Tuple[float, float]] = LRUCache(maxsize)
+
+    async def take(self, key: str, cost: float = 1.0) -> float:
+        now = self.clock()
+        tokens, updated_at = self._buckets.get(key) or (self.capacity, now)
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / self.refill_per_second
+        self._buckets.put(key, (tokens, now))
+        return retry_after
+
+
+class RedisTokenBucketLimiter(TokenBucketLimiter):
+    """Redisにバケットを持ち、全ワーカーで共有する実装"""
+
+    def __init__(self, client, capacity: float, refill_per_second: float, prefix: str = ""):
+        super().__init__(capacity, refill_per_second)
+        self.client = client
+        self.prefix = _REDIS_PREFIX + prefix
+
+    async def take(self, key: str, cost: float = 1.0) -> float:
+        result = await self.client.eval(
+            _TAKE_SCRIPT, 1, self.prefix + key, self.capacity, self.refill_per_second, cost
+        )
+        return float(result)
+
+
+class LoginThrottle:
+    """ログイン試行をIPアドレスごと・メールアドレスごとのバケットで制限する
+
+    制限の確認はパスワードの検証（bcrypt）より前に行い、制限を超えた試行では検証しない。
+    バケットの保存先に接続できない場合は制限せずに通す。
+    """
+
+    def __init__(self, by_ip: TokenBucketLimiter, by_email: TokenBucketLimiter):
+        self.by_ip = by_ip
+        self.by_email = by_email
+
+    async def check(self, ip: str, email: str) -> float:
+        """
+        試行を1回分数える
+
+        Returns:
+            許可する場合は0、制限中なら再試行までの秒数
+        """
+        try:
+            retry_after = await self.by_ip.take(ip)
+            if retry_after > 0:
+                return retry_after
+            return await self.by_email.take(email.strip().lower())
+        except Exception:
+            logger.warning("Login rate limiter unavailable", exc_info=True)
+            return 0.0
+
+
+def retry_after_header(seconds: float) -> str:
+    """Retry-Afterヘッダーの値（切り上げた整数の秒数）"""
+    return str(max(1, math.ceil(seconds)))
+
+
+@lru_cache
+def get_login_throttle() -> LoginThrottle:
+    """REDIS_URLがあればRedis、なければプロセス内のバケットで制限する"""
+    ip_rate = LOGIN_RATE_LIMIT_IP_PER_MINUTE / 60
+    email_rate = LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE / 60
+    if REDIS_URL:
+        import redis.asyncio as redis
+
+        client = redis.from_url(REDIS_URL)
+        return LoginThrottle(
+            RedisTokenBucketLimiter(client, LOGIN_RATE_LIMIT_IP_BURST, ip_rate, "login:ip:"),
+            RedisTokenBucketLimiter(client, LOGIN_RATE_LIMIT_EMAIL_BURST, email_rate, "login:email:"),
+        )
+    return LoginThrottle(
+        InProcessTokenBucketLimiter(LOGIN_RATE_LIMIT_IP_BURST, ip_rate),
+        InProcessTokenBucketLimiter(LOGIN_RATE_LIMIT_EMAIL_BURST, email_rate),
+    )
@@ -0,0 +1,104 @@
+"""書き込んだ利用者の記録（書き込み直後の読み取りをプライマリに向けるため）
+
+利用者（アクセストークンのsub）ごとに最後に書き込んでから一定秒数の間を記録する。
+クライアントにCookieやヘッダーを送り返してもらう必要はない。
+
+REDIS_URLが未設定ならプロセス内に持つ（同じワーカーに来た読み取りだけがプライマリに向く）。
+設定されていればRedisにTTL付きで保存し、全ワーカーで共有する。
+"""
+
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable
+
+from infrastructure.cache.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+# 書き込み後にその利用者の読み取りをプライマリで処理する秒数
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+# プロセス内に記録する利用者の最大数
+RECENT_WRITERS_MAX_KEYS = int(os.getenv("RECENT_WRITERS_MAX_KEYS", "100000"))
+
+_REDIS_PREFIX = "recent-write:"
+
+
+class RecentWrites(ABC):
+    """利用者ごとの最後の書き込みの記録のインターフェース"""
+
+    def __init__(self, window_seconds: float = READ_YOUR_WRITES_SECONDS):
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    async def mark(self, principal: str) -> None:
+        """書き込みがコミットされたことを記録する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def is_recent(self, principal: str) -> bool:
+        """window_seconds以内に書き込んだか"""
+        raise NotImplementedError
+
+
+class InProcessRecentWrites(RecentWrites):
+    """プロセス内のLRUに期限を持つ実装"""
+
+    def __init__(
+        self,
+        window_seconds: float = READ_YOUR_WRITES_SECONDS,
+        maxsize: int = RECENT_WRITERS_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(window_seconds)
+        self.clock = clock
+        self._until: LRUCache[float] = LRUCache(maxsize)
+
+    async def mark(self, principal: str) -> None:
+        self._until.put(principal, self.clock() + self.window_seconds)
+
+    async def is_recent(self, principal: str) -> bool:
+        until = self._until.get(principal)
+        return until is not None and until > self.clock()
+
+    def clear(self) -> None:
+        self._until.clear()
+
+
+class RedisRecentWrites(RecentWrites):
+    """RedisにTTL付きのキーで記録し、全ワーカーで共有する実装
+
+    Redisに接続できなければ書き込みは記録せず、読み取りは念のためプライマリに向ける。
+    """
+
+    def __init__(self, client, window_seconds: float = READ_YOUR_WRITES_SECONDS):
+        super().__init__(window_seconds)
+        self.client = client
+
+    async def mark(self, principal: str) -> None:
+        try:
+            await self.client.set(
+                _REDIS_PREFIX + principal, b"1", px=int(self.window_seconds * 1000)
+            )
+        except Exception:
+            logger.warning("Recent writes store unavailable", exc_info=True)
+
+    async def is_recent(self, principal: str) -> bool:
+        try:
+            return bool(await self.client.exists(_REDIS_PREFIX + principal))
+        except Exception:
+            logger.warning("Recent writes store unavailable", exc_info=True)
+            return True
+
+
+@lru_cache
+def get_recent_writes() -> RecentWrites:
+    """REDIS_URLがあればRedis、なければプロセス内に記録する"""
+    if REDIS_URL:
+        import redis.asyncio as redis
+
+        return RedisRecentWrites(redis.from_url(REDIS_URL))
+    return InProcessRecentWrites()
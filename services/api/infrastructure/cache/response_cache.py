@@ -0,0 +1,110 @@
+"""シリアライズ済みの応答（JSONのバイト列）のキャッシュ
+
+キーにはデータのバージョンを含め、書き込みで無効化するのではなくバージョンが上がったら
+別のキーを引くようにする。同じキーの内容は変わらないため、古いエントリーはLRUやTTLで
+追い出されるのを待つだけでよい。
+
+REDIS_URLが未設定ならプロセス内のLRUに保存する。設定されていればRedisで全ワーカーに
+共有し、取得したエントリーはプロセス内のLRUにも持ってRedisへの問い合わせを減らす。
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional
+
+from infrastructure.cache.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+# Redisに保持する秒数（古いバージョンのエントリーが残り続けないように）
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+# これより大きい応答は保存しない
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", "262144"))
+
+_REDIS_PREFIX = "response:"
+
+
+class ResponseCache(ABC):
+    """応答のバイト列のキャッシュのインターフェース"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def put(self, key: str, body: bytes) -> None:
+        raise NotImplementedError
+
+
+class InProcessResponseCache(ResponseCache):
+    """プロセス内のLRUに保存する実装"""
+
+    def __init__(
+        self,
+        maxsize: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self._entries: LRUCache[bytes] = LRUCache(maxsize)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def put(self, key: str, body: bytes) -> None:
+        if len(body) <= self.max_bytes:
+            self._entries.put(key, body)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisResponseCache(ResponseCache):
+    """Redisに保存し、全ワーカーで共有する実装（Redisに接続できなければキャッシュなしで動く）"""
+
+    def __init__(
+        self,
+        client,
+        maxsize: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._local = InProcessResponseCache(maxsize, max_bytes)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        body = await self._local.get(key)
+        if body is not None:
+            return body
+        try:
+            body = await self.client.get(_REDIS_PREFIX + key)
+        except Exception:
+            logger.warning("Response cache unavailable", exc_info=True)
+            return None
+        if body is not None:
+            await self._local.put(key, body)
+        return body
+
+    async def put(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        await self._local.put(key, body)
+        try:
+            await self.client.set(_REDIS_PREFIX + key, body, ex=self.ttl_seconds)
+        except Exception:
+            logger.warning("Response cache unavailable", exc_info=True)
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    """REDIS_URLがあればRedis、なければプロセス内のキャッシュを返す"""
+    if REDIS_URL:
+        import redis.asyncio as redis
+
+        return RedisResponseCache(redis.from_url(REDIS_URL))
+    return InProcessResponseCache()
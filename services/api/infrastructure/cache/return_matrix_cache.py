@@ -0,0 +1,27 @@
+import os
+from datetime import date
+from typing import Sequence, Tuple
+
+from domain.services.risk_analytics import ReturnMatrix
+from infrastructure.cache.lru_cache import LRUCache
+
+RETURN_MATRIX_CACHE_SIZE = int(os.getenv("RETURN_MATRIX_CACHE_SIZE", "256"))
+
+CacheKey = Tuple[Tuple[str, ...], date, date]
+
+
+class ReturnMatrixCache(LRUCache[ReturnMatrix]):
+    """銘柄の組み合わせと期間ごとにリターン行列を保持するLRUキャッシュ
+
+    期間の終了日をキーに含めるため、日付が変われば自然に再計算される。
+    """
+
+    def __init__(self, maxsize: int = RETURN_MATRIX_CACHE_SIZE):
+        super().__init__(maxsize)
+
+    @staticmethod
+    def key(symbols: Sequence[str], start: date, end: date) -> CacheKey:
+        return tuple(sorted(set(symbols))), start, end
+
+
+return_matrix_cache = ReturnMatrixCache()
@@ -0,0 +1,200 @@
+"""失効させたアクセストークン（jti）のメモリ内フィルター
+
+get_current_userは全リクエストで通るため、失効の確認でDBを引かない。各ワーカーは
+revoked_tokensの差分を失効日時（created_at）の順に一定間隔で読み込み、jtiをブルームフィルターに
+登録する。idや失効日時は挿入時に決まりコミットの順とは一致しないため、前回読んだ最新の失効日時から
+REVOCATION_SYNC_OVERLAP_SECONDSだけ遡って読み直し、遅れてコミットされた行も取りこぼさない。
+確認はjtiから求めたビットを数か所見るだけで、失効が1件もなければ即座にFalseを返す。
+
+ブルームフィルターには偽陽性があり得る（既定で100万分の1）。偽陽性になったトークンは
+401になるが、クライアントがリフレッシュトークンで別のjtiのトークンを取り直せば解消する。
+要素は削除できないため、定期的に期限内の行だけでフィルターを作り直し、期限切れの分を落とす。
+他のワーカーで失効させたトークンは、次の同期（既定5秒）までは通る。
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Set, Tuple
+
+from infrastructure.database import get_session_local
+from infrastructure.models.token import RevokedTokenModel
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+# 差分を読むとき、前回読んだ最新の失効日時から遡る秒数（失効のトランザクションの長さより十分長く）
+REVOCATION_SYNC_OVERLAP_SECONDS = float(os.getenv("REVOCATION_SYNC_OVERLAP_SECONDS", "30"))
+# 期限切れのjtiを落とすため、この間隔で期限内の行だけから作り直す
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "300"))
+REVOCATION_FILTER_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_FILTER_ERROR_RATE = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", "1e-6"))
+
+_MASK64 = (1 << 64) - 1
+
+# (since, now) -> since以降に失効した期限内の (失効日時, jti) を失効日時の昇順で（sinceがNoneなら全件）
+Loader = Callable[[Optional[datetime], datetime], List[Tuple[datetime, str]]]
+
+
+def jti_key(jti: str) -> int:
+    """jtiを128ビットの整数に変換（uuid4の16進表記はそのまま、それ以外はハッシュする）"""
+    if len(jti) == 32:
+        try:
+            return int(jti, 16)
+        except ValueError:
+            pass
+    return int.from_bytes(hashlib.blake2b(jti.encode("utf-8"), digest_size=16).digest(), "big")
+
+
+class BloomFilter:
+    """128ビットの乱数キー用のブルームフィルター
+
+    キー自体が一様な乱数なので、上位・下位64ビットをそのまま二重ハッシュの2つのハッシュ値に使う。
+    """
+
+    __slots__ = ("bits", "size", "hashes", "count")
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, key: int) -> None:
+        h1, h2 = key & _MASK64, (key >> 64) | 1
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % self.size
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        bits, size = self.bits, self.size
+        h1, h2 = key & _MASK64, (key >> 64) | 1
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+def load_revoked_jtis(since: Optional[datetime], now: datetime) -> List[Tuple[datetime, str]]:
+    """revoked_tokensからsince以降に失効した期限内の行を読み込む（レプリカの遅延を避けプライマリから）"""
+    db = get_session_local()()
+    try:
+        query = db.query(RevokedTokenModel.created_at, RevokedTokenModel.jti).filter(
+            RevokedTokenModel.expires_at > now
+        )
+        if since is not None:
+            query = query.filter(RevokedTokenModel.created_at >= since)
+        rows = query.order_by(RevokedTokenModel.created_at).all()
+        return [(revoked_at, jti) for revoked_at, jti in rows]
+    finally:
+        db.close()
+
+
+class RevocationList:
+    """ワーカーごとに保持する失効済みアクセストークンの集合"""
+
+    def __init__(
+        self,
+        loader: Loader = load_revoked_jtis,
+        capacity: int = REVOCATION_FILTER_CAPACITY,
+        error_rate: float = REVOCATION_FILTER_ERROR_RATE,
+        sync_seconds: float = REVOCATION_SYNC_SECONDS,
+        rebuild_seconds: float = REVOCATION_REBUILD_SECONDS,
+        overlap_seconds: float = REVOCATION_SYNC_OVERLAP_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loader = loader
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.clock = clock
+        self._filter = BloomFilter(capacity, error_rate)
+        # 読み込んだ行の最新の失効日時（DBの時刻。アプリとDBの時計のずれに影響されない）
+        self._last_revoked_at: Optional[datetime] = None
+        self._last_rebuild: Optional[float] = None
+        # 直近の作り直し以降にこのワーカーで追加したキー（作り直し中の追加を取りこぼさないため）
+        self._added: Set[int] = set()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """失効済みならTrue（jtiのない旧形式のトークンは期限まで有効とみなす）"""
+        bloom = self._filter
+        if not bloom.count or not jti:
+            return False
+        return jti_key(jti) in bloom
+
+    def add(self, jti: str) -> None:
+        """このワーカーで失効させたjtiを同期を待たずに反映する（DBへの保存後に呼ぶ）"""
+        key = jti_key(jti)
+        with self._lock:
+            self._filter.add(key)
+            self._added.add(key)
+
+    def sync(self) -> int:
+        """DBから差分を読み込む（作り直しの時期なら期限内の全件）。新たに反映した件数を返す"""
+        now = datetime.utcnow()
+        started = self.clock()
+        if self._last_rebuild is None or started - self._last_rebuild >= self.rebuild_seconds:
+            rows = self.loader(None, now)
+            bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+            for _, jti in rows:
+                bloom.add(jti_key(jti))
+            with self._lock:
+                for key in self._added:
+                    bloom.add(key)
+                self._added = set()
+                self._filter = bloom
+                self._last_revoked_at = rows[-1][0] if rows else None
+            self._last_rebuild = started
+            return len(rows)
+
+        since = self._last_revoked_at
+        rows = self.loader(None if since is None else since - self.overlap, now)
+        added = 0
+        if rows:
+            with self._lock:
+                for _, jti in rows:
+                    key = jti_key(jti)
+                    # 遡って読み直した行は反映済み
+                    if key not in self._filter:
+                        self._filter.add(key)
+                        added += 1
+                latest = rows[-1][0]
+                self._last_revoked_at = latest if since is None else max(since, latest)
+        return added
+
+    def start(self) -> None:
+        """実行中のイベントループ上で定期的な同期を始める"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception:
+                logger.exception("Failed to sync token revocations")
+            await asyncio.sleep(self.sync_seconds)
+
+
+revocation_list = RevocationList()
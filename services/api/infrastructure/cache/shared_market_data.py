@@ -0,0 +1,406 @@
+"""ワーカー間で共有する株価・為替レートの共有メモリテーブル
+
+1つのリフレッシュプロセスが書き込み、複数のuvicornワーカーが読み取る。
+各スロットはシーケンスカウンタ（seqlock）で保護されており、
+読み取り側はロックを取らずに一貫したレコードを取得できる。
+
+レイアウト:
+    ヘッダー(24バイト) + スロット × capacity
+    ヘッダー = magic(4s) + version(u32) + capacity(u32) + slot_size(u32) + instance(u64)
+    スロット = seq(uint64) + key(24s) + name(96s) + price(f64) + currency(8s) + timestamp(f64)
+
+instanceはセグメントを作成するたびに変わる値で、読み取り側はこれを定期的に確かめ、
+セグメントが作り直されていれば新しいセグメントにアタッチし直す。
+"""
+
+import logging
+import os
+import secrets
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from domain.entities.stock import Stock
+from infrastructure.cache.quote_cache import InProcessQuoteCache, QuoteCache
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"IFMD"
+LAYOUT_VERSION = 2
+
+_HEADER = struct.Struct("<4sIIIQ")
+_SEQ = struct.Struct("<Q")
+_BODY = struct.Struct("<24s96sd8sd")
+
+HEADER_SIZE = _HEADER.size
+SLOT_SIZE = _SEQ.size + _BODY.size
+
+DEFAULT_CAPACITY = 4096
+FX_KEY_PREFIX = "FX:"
+
+# 読み取り中に書き込みと衝突した場合の再試行回数
+_MAX_READ_RETRIES = 1000
+
+
+@dataclass(frozen=True)
+class MarketDataRecord:
+    """共有メモリ上の1レコード"""
+
+    key: str
+    name: str
+    price: float
+    currency: str
+    timestamp: float
+
+
+def _encode(value: str, size: int) -> bytes:
+    """UTF-8で固定長に切り詰める（マルチバイト文字の途中では切らない）"""
+    raw = value.encode("utf-8")
+    if len(raw) > size:
+        raw = raw[:size].decode("utf-8", errors="ignore").encode("utf-8")
+    return raw
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\x00").decode("utf-8", errors="ignore")
+
+
+def _open_untracked(name: Optional[str], create: bool = False, size: int = 0):
+    """resource_trackerに登録せずにセグメントを開く
+
+    Python 3.12以前では、セグメントを開いたプロセスの終了時に
+    resource_trackerがセグメントを削除してしまう。書き込みプロセスが交代しても
+    読み取り側が同じセグメントを参照し続けられるよう、登録を解除する。
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+def _unlink_untracked(shm: shared_memory.SharedMemory) -> None:
+    if sys.version_info < (3, 13):
+        # unlink()は登録解除も行うため、解除済みの登録を戻しておく
+        resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+
+class SharedMarketDataTable(QuoteCache):
+    """共有メモリ上のオープンアドレス法ハッシュテーブル
+
+    書き込みは単一プロセス（create()で開いた所有者）のみが行う。
+    セグメントは書き込みプロセスの終了後も残り、次の書き込みプロセスが引き継ぐ。
+    キーは削除されないため、一度見つけたスロット位置は読み取り側でキャッシュできる。
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+
+        magic, version, capacity, slot_size, instance = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION or slot_size != SLOT_SIZE:
+            raise ValueError(f"Incompatible market data segment: {shm.name}")
+
+        self.capacity = capacity
+        self.instance = instance
+        self._mask = capacity - 1
+        self._slot_index: Dict[str, int] = {}
+
+    @classmethod
+    def create(
+        cls, name: Optional[str] = None, capacity: int = DEFAULT_CAPACITY
+    ) -> "SharedMarketDataTable":
+        """書き込み所有者として開く（capacityは2の累乗）
+
+        同名のセグメントが既にあれば（前の書き込みプロセスが終了した場合など）
+        内容を引き継いで開き、書き込みの途中で止まったスロットを直す。レイアウトが
+        異なる古いセグメントは削除して作り直す（読み取り側は次の確認でアタッチし直す）。
+        単一書き込みの保証は呼び出し側（LeaderLock）で行う。
+        """
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+
+        size = HEADER_SIZE + SLOT_SIZE * capacity
+        try:
+            shm = _open_untracked(name, create=True, size=size)
+        except FileExistsError:
+            existing = _open_untracked(name)
+            try:
+                table = cls(existing, owner=True)
+            except ValueError:
+                logger.warning("Recreating incompatible market data segment %s", name)
+                existing.close()
+                _unlink_untracked(existing)
+                shm = _open_untracked(name, create=True, size=size)
+            else:
+                repaired = table._repair_torn_slots()
+                if repaired:
+                    logger.warning(
+                        "Repaired market data slots left mid-write", extra={"slots": repaired}
+                    )
+                return table
+
+        shm.buf[:size] = bytes(size)
+        _HEADER.pack_into(
+            shm.buf, 0, MAGIC, LAYOUT_VERSION, capacity, SLOT_SIZE, secrets.randbits(64)
+        )
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMarketDataTable":
+        """既存セグメントに読み取り専用としてアタッチ"""
+        return cls(_open_untracked(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def read_only(self) -> bool:
+        return not self._owner
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """セグメントを削除（所有者のみ）"""
+        if self._owner:
+            _unlink_untracked(self._shm)
+
+    def _repair_torn_slots(self) -> int:
+        """前の書き込みプロセスが書き込みの途中で終了し、seqが奇数のまま残ったスロットを直す
+
+        seqを偶数に戻さないと読み取りが常に再試行の上限に達する。内容は途中までしか
+        書かれていない可能性があるため、キー（探索の連鎖を保つ）以外は使わず、取得時刻を
+        0にして鮮度切れとして扱わせる（次の取得で上書きされる）。
+
+        Returns:
+            直したスロットの数
+        """
+        repaired = 0
+        for index in range(self.capacity):
+            offset = self._slot_offset(index)
+            seq = _SEQ.unpack_from(self._buf, offset)[0]
+            if not seq & 1:
+                continue
+            key, name, _, currency, _ = _BODY.unpack_from(self._buf, offset + _SEQ.size)
+            _BODY.pack_into(self._buf, offset + _SEQ.size, key, name, 0.0, currency, 0.0)
+            _SEQ.pack_into(self._buf, offset, seq + 1)
+            repaired += 1
+        return repaired
+
+    # --- 低レベルAPI ---
+
+    def _slot_offset(self, index: int) -> int:
+        return HEADER_SIZE + index * SLOT_SIZE
+
+    def _read_slot(self, index: int) -> Tuple[int, tuple]:
+        """seqlockで一貫したスロット内容を読み取る"""
+        offset = self._slot_offset(index)
+        buf = self._buf
+        for _ in range(_MAX_READ_RETRIES):
+            seq_before = _SEQ.unpack_from(buf, offset)[0]
+            if seq_before & 1:
+                continue
+            body = _BODY.unpack_from(buf, offset + _SEQ.size)
+            if _SEQ.unpack_from(buf, offset)[0] == seq_before:
+                return seq_before, body
+        raise TimeoutError("market data slot is being rewritten continuously")
+
+    def _find_slot(self, key: str, encoded: bytes) -> Tuple[Optional[int], Optional[tuple]]:
+        """キーのスロット位置と内容を探す。見つからなければ空きスロット位置を返す"""
+        cached = self._slot_index.get(key)
+        if cached is not None:
+            return cached, self._read_slot(cached)[1]
+
+        index = zlib.crc32(encoded) & self._mask
+        for _ in range(self.capacity):
+            seq, body = self._read_slot(index)
+            if seq == 0:
+                return index, None
+            if body[0].rstrip(b"\x00") == encoded:
+                self._slot_index[key] = index
+                return index, body
+            index = (index + 1) & self._mask
+        return None, None
+
+    def read(self, key: str) -> Optional[MarketDataRecord]:
+        """キーでレコードを取得"""
+        encoded = _encode(key, 24)
+        _, body = self._find_slot(key, encoded)
+        if body is None:
+            return None
+        return MarketDataRecord(
+            key=key,
+            name=_decode(body[1]),
+            price=body[2],
+            currency=_decode(body[3]),
+            timestamp=body[4],
+        )
+
+    def write(self, record: MarketDataRecord) -> None:
+        """レコードを書き込む（所有者のみ）"""
+        if not self._owner:
+            raise PermissionError("Only the owner process may write market data")
+
+        encoded = _encode(record.key, 24)
+        index, _ = self._find_slot(record.key, encoded)
+        if index is None:
+            raise RuntimeError("market data table is full")
+
+        offset = self._slot_offset(index)
+        seq = _SEQ.unpack_from(self._buf, offset)[0]
+        _SEQ.pack_into(self._buf, offset, seq + 1)
+        _BODY.pack_into(
+            self._buf,
+            offset + _SEQ.size,
+            encoded,
+            _encode(record.name, 96),
+            float(record.price),
+            _encode(record.currency, 8),
+            float(record.timestamp),
+        )
+        _SEQ.pack_into(self._buf, offset, seq + 2)
+        self._slot_index[record.key] = index
+
+    def keys(self) -> Iterator[str]:
+        """書き込み済みのキーを列挙（書き込みと衝突し続けたスロットは飛ばす）"""
+        for index in range(self.capacity):
+            try:
+                seq, body = self._read_slot(index)
+            except TimeoutError:
+                continue
+            if seq:
+                yield _decode(body[0])
+
+    def _read_or_miss(self, key: str) -> Optional[MarketDataRecord]:
+        """キャッシュとしての読み取り（書き込みと衝突し続けた場合はミスとして扱う）"""
+        try:
+            return self.read(key)
+        except TimeoutError:
+            logger.warning("Market data slot unreadable; treating as miss", extra={"key": key})
+            return None
+
+    # --- QuoteCache ---
+
+    def get_quote(self, symbol: str) -> Optional[Stock]:
+        record = self._read_or_miss(symbol)
+        if record is None:
+            return None
+        return Stock(
+            symbol=record.key,
+            name=record.name,
+            price=record.price,
+            currency=record.currency,
+            timestamp=datetime.fromtimestamp(record.timestamp),
+        )
+
+    def put_quote(self, stock: Stock) -> None:
+        self.write(
+            MarketDataRecord(
+                key=stock.symbol,
+                name=stock.name,
+                price=stock.price,
+                currency=stock.currency,
+                timestamp=stock.timestamp.timestamp(),
+            )
+        )
+
+    def quote_symbols(self) -> List[str]:
+        return [key for key in self.keys() if not key.startswith(FX_KEY_PREFIX)]
+
+    def get_fx_rate(self, pair: str) -> Optional[Tuple[float, datetime]]:
+        record = self._read_or_miss(FX_KEY_PREFIX + pair)
+        if record is None:
+            return None
+        return record.price, datetime.fromtimestamp(record.timestamp)
+
+    def put_fx_rate(self, pair: str, rate: float, timestamp: datetime) -> None:
+        self.write(
+            MarketDataRecord(
+                key=FX_KEY_PREFIX + pair,
+                name=pair,
+                price=rate,
+                currency=pair.split("/")[-1],
+                timestamp=timestamp.timestamp(),
+            )
+        )
+
+
+# セグメント名が設定されている場合のみ共有メモリを使用する
+MARKET_DATA_SHM_NAME = os.getenv("MARKET_DATA_SHM_NAME")
+
+# 書き込みプロセスがまだセグメントを作成していない場合の再試行間隔（秒）。
+# アタッチ済みのセグメントが作り直されていないかもこの間隔で確かめる
+_ATTACH_RETRY_SECONDS = 5.0
+
+_shared_table: Optional[SharedMarketDataTable] = None
+_next_attach_attempt = 0.0
+
+# 共有メモリを使わない場合のプロセス内キャッシュ
+_local_cache = InProcessQuoteCache()
+
+
+def get_shared_market_data() -> Optional[SharedMarketDataTable]:
+    """ワーカープロセスから共有メモリテーブルを取得（未設定・未作成ならNone）"""
+    global _shared_table, _next_attach_attempt
+
+    if not MARKET_DATA_SHM_NAME:
+        return None
+
+    now = time.monotonic()
+    if now < _next_attach_attempt:
+        return _shared_table
+    _next_attach_attempt = now + _ATTACH_RETRY_SECONDS
+
+    if _shared_table is not None and not _shared_table.read_only:
+        # 書き込み所有者は自分のセグメントを使い続ける
+        return _shared_table
+
+    try:
+        latest = SharedMarketDataTable.attach(MARKET_DATA_SHM_NAME)
+    except (FileNotFoundError, ValueError):
+        # 削除された（作り直し中の）場合は、古いハンドルを手放してプロセス内キャッシュを使う
+        _shared_table = None
+        return None
+    if _shared_table is not None and _shared_table.instance == latest.instance:
+        latest.close()
+        return _shared_table
+    # 初回、またはセグメントが作り直された。古いハンドルは他スレッドが使用中の可能性があるため閉じない
+    _shared_table = latest
+    return _shared_table
+
+
+def promote_to_writer(capacity: int = DEFAULT_CAPACITY) -> Optional[SharedMarketDataTable]:
+    """リーダーに選出されたプロセスを共有メモリの書き込み所有者にする
+
+    共有メモリが未設定の場合はNone（プロセス内キャッシュに書き込む）。
+    """
+    global _shared_table
+
+    if not MARKET_DATA_SHM_NAME:
+        return None
+    if _shared_table is not None and not _shared_table.read_only:
+        return _shared_table
+
+    # 読み取り用ハンドルは他スレッドが使用中の可能性があるため閉じずに置き換える
+    _shared_table = SharedMarketDataTable.create(MARKET_DATA_SHM_NAME, capacity)
+    return _shared_table
+
+
+def get_quote_cache() -> QuoteCache:
+    """このプロセスで使用する株価キャッシュ（共有メモリ優先）を取得"""
+    shared = get_shared_market_data()
+    return shared if shared is not None else _local_cache
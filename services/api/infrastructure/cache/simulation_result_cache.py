@@ -0,0 +1,8 @@
+import os
+
+from infrastructure.cache.lru_cache import LRUCache
+
+SIMULATION_CACHE_SIZE = int(os.getenv("SIMULATION_CACHE_SIZE", "64"))
+
+# 保有株とパラメータのハッシュをキーにしたシミュレーション結果
+simulation_result_cache: LRUCache[dict] = LRUCache(SIMULATION_CACHE_SIZE)
@@ -0,0 +1,68 @@
+import logging
+import os
+import time
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.cache.return_matrix_cache import return_matrix_cache
+from infrastructure.repositories.corporate_action_repository_impl import (
+    SQLCorporateActionRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# コーポレートアクションのテーブルを読み直す間隔（秒）
+CORPORATE_ACTIONS_RELOAD_SECONDS = float(os.getenv("CORPORATE_ACTIONS_RELOAD_SECONDS", "60"))
+
+
+class SplitAdjustmentCache:
+    """分割の累積倍率をワーカーごとにメモリに持ち、確認間隔ごとにテーブルから作り直す
+
+    分割が追加・変更されたら、調整前の終値から作ったキャッシュをon_changeで破棄する。
+    """
+
+    def __init__(
+        self,
+        reload_seconds: float = CORPORATE_ACTIONS_RELOAD_SECONDS,
+        on_change: Iterable[Callable[[], None]] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.reload_seconds = reload_seconds
+        self.on_change = list(on_change)
+        self.clock = clock
+        self._adjustments: Optional[SplitAdjustments] = None
+        self._checked_at = 0.0
+
+    async def get(self, session_local: sessionmaker) -> SplitAdjustments:
+        """
+        分割の累積倍率を取得する
+
+        Raises:
+            Exception: 一度も読み込めていない状態でテーブルを読めなかった場合
+        """
+        now = self.clock()
+        if self._adjustments is not None and now - self._checked_at < self.reload_seconds:
+            return self._adjustments
+        db = session_local()
+        try:
+            adjustments = SplitAdjustments(await SQLCorporateActionRepository(db).list_splits())
+        except Exception:
+            if self._adjustments is None:
+                raise
+            # 読めなければ前回の倍率を使い続ける
+            logger.warning("Failed to reload corporate actions", exc_info=True)
+            return self._adjustments
+        finally:
+            db.close()
+        self._checked_at = now
+        previous, self._adjustments = self._adjustments, adjustments
+        if adjustments.key != (previous.key if previous is not None else ()):
+            logger.info("Split adjustments loaded", extra={"symbols": adjustments.symbols})
+            for callback in self.on_change:
+                callback()
+        return adjustments
+
+
+split_adjustment_cache = SplitAdjustmentCache(on_change=[return_matrix_cache.clear])
@@ -0,0 +1,207 @@
+"""レイテンシに応じて上限を調整する同時実行数の制限（ワーカーごと）
+
+過負荷時にすべてのリクエストを受け入れると、イベントループとDB接続・スレッドプールの奪い合いで
+全ルートのレイテンシが伸び続ける。ルートの種類（認証・DB・外部API・軽量）ごとに同時実行数の
+上限を持ち、上限を超えたリクエストは長さと待ち時間に上限のある待ち行列で待たせ、溢れたものや
+期限までに順番が来なかったものは処理せずにすぐ拒否する。
+
+上限はAIMDで調整する。上限まで使われているときに完了したリクエストのレイテンシが目標以下なら
+上限を少しずつ（1往復あたり約1）上げ、目標を超えたら一定の割合で下げる。余裕があるときの
+遅いリクエストは混雑によるものではない（処理自体が遅い）ため、上限は変えない。下げるのは
+直前に下げてから目標レイテンシ分の時間が経ってからにし、同じ混雑で何度も下げないようにする。
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+CONCURRENCY_LIMIT_ENABLED = os.getenv("CONCURRENCY_LIMIT_ENABLED", "true").lower() != "false"
+# 待ち行列で順番を待つ最大秒数
+CONCURRENCY_QUEUE_TIMEOUT_SECONDS = float(os.getenv("CONCURRENCY_QUEUE_TIMEOUT_SECONDS", "2"))
+# 上限を超えたときに下げる割合
+CONCURRENCY_BACKOFF_RATIO = float(os.getenv("CONCURRENCY_BACKOFF_RATIO", "0.9"))
+
+AUTH = "auth"
+DB = "db"
+UPSTREAM = "upstream"
+CHEAP = "cheap"
+
+
+@dataclass(frozen=True)
+class LimitConfig:
+    """ルートの種類ごとの設定"""
+
+    initial_limit: int
+    max_limit: int
+    # 待ち行列の長さの上限
+    max_queue: int
+    # これを超えたら上限を下げるレイテンシ（秒）
+    target_latency: float
+    min_limit: int = 1
+
+
+# 認証はbcryptがCPUを使うため小さく、外部APIを待つルートは待ち時間が長いため目標を緩くとる
+DEFAULT_LIMITS: Dict[str, LimitConfig] = {
+    AUTH: LimitConfig(initial_limit=4, max_limit=16, max_queue=16, target_latency=0.5),
+    DB: LimitConfig(initial_limit=32, max_limit=128, max_queue=64, target_latency=0.25),
+    UPSTREAM: LimitConfig(initial_limit=16, max_limit=64, max_queue=32, target_latency=2.0),
+    CHEAP: LimitConfig(initial_limit=64, max_limit=256, max_queue=128, target_latency=0.05),
+}
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """待ち行列が満杯、または期限までに順番が来なかった"""
+
+
+class AdaptiveConcurrencyLimiter:
+    """1種類のルートの同時実行数の制限（イベントループのスレッドからのみ使う）"""
+
+    def __init__(
+        self,
+        name: str,
+        config: LimitConfig,
+        queue_timeout: float = CONCURRENCY_QUEUE_TIMEOUT_SECONDS,
+        backoff_ratio: float = CONCURRENCY_BACKOFF_RATIO,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.config = config
+        self.queue_timeout = queue_timeout
+        self.backoff_ratio = backoff_ratio
+        self.clock = clock
+        self.limit = float(config.initial_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = float("-inf")
+        # 統計
+        self.accepted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    async def acquire(self) -> None:
+        """
+        実行枠を確保する（空きがなければ待ち行列で待つ）
+
+        Raises:
+            ConcurrencyLimitExceeded: 待ち行列が満杯、または期限までに枠が空かなかった場合
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.accepted += 1
+            return
+        if len(self._waiters) >= self.config.max_queue:
+            self.rejected_queue_full += 1
+            raise ConcurrencyLimitExceeded(self.name)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        started = self.clock()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # 期限と同時に枠を譲られていた場合はそのまま実行する
+                pass
+            else:
+                waiter.cancel()
+                self._remove_waiter(waiter)
+                self.rejected_timeout += 1
+                raise ConcurrencyLimitExceeded(self.name)
+        except BaseException:
+            # 待っている間にクライアントが切断した等。譲られた枠は返す
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            else:
+                waiter.cancel()
+                self._remove_waiter(waiter)
+            raise
+        waited = self.clock() - started
+        self.queue_wait_total += waited
+        self.queue_wait_max = max(self.queue_wait_max, waited)
+        self.accepted += 1
+
+    def release(self, latency: float) -> None:
+        """
+        実行枠を返し、レイテンシから上限を調整して待っているリクエストに枠を譲る
+
+        Args:
+            latency: 応答の開始までの秒数（ストリーミングの本文の送信時間は含めない）
+        """
+        self._adjust(latency)
+        self.in_flight -= 1
+        self._wake()
+
+    def _adjust(self, latency: float) -> None:
+        config = self.config
+        # 上限まで使われているときだけ調整する（余裕があるのに上げ続けたり、
+        # 同時実行と関係なく遅いリクエストで下げ続けたりしない）
+        if self.in_flight < int(self.limit):
+            return
+        if latency > config.target_latency:
+            now = self.clock()
+            if now - self._last_decrease >= config.target_latency:
+                self.limit = max(float(config.min_limit), self.limit * self.backoff_ratio)
+                self._last_decrease = now
+        else:
+            self.limit = min(float(config.max_limit), self.limit + 1.0 / self.limit)
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_length": len(self._waiters),
+            "accepted": self.accepted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "queue_wait_avg_ms": round(
+                self.queue_wait_total / max(1, self.queued - self.rejected_timeout) * 1000, 2
+            ),
+            "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+        }
+
+
+class ConcurrencyLimiters:
+    """ルートの種類ごとの制限をまとめたもの"""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, LimitConfig]] = None,
+        queue_timeout: float = CONCURRENCY_QUEUE_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limiters = {
+            name: AdaptiveConcurrencyLimiter(name, config, queue_timeout, clock=clock)
+            for name, config in (limits or DEFAULT_LIMITS).items()
+        }
+
+    def get(self, route_class: str) -> AdaptiveConcurrencyLimiter:
+        return self.limiters[route_class]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+concurrency_limiters = ConcurrencyLimiters()
@@ -0,0 +1,43 @@
+import json
+import os
+from datetime import date
+from functools import lru_cache
+
+from domain.services.market_calendar import MarketCalendar, QuoteFreshnessPolicy
+
+# 休場日データ（年1回、取引所の公表に合わせて更新する）
+MARKET_HOLIDAYS_FILE = os.getenv(
+    "MARKET_HOLIDAYS_FILE",
+    os.path.join(os.path.dirname(__file__), "..", "data", "market_holidays.json"),
+)
+
+# 立会中に保有銘柄の株価をキャッシュへ事前取得する間隔（分）
+QUOTE_WARM_INTERVAL_MINUTES = int(os.getenv("QUOTE_WARM_INTERVAL_MINUTES", "5"))
+# 事前取得のジョブの実行にかかる時間や開始の遅れの分の余裕（秒）
+QUOTE_WARM_GRACE_SECONDS = float(os.getenv("QUOTE_WARM_GRACE_SECONDS", "60"))
+
+# 立会中にキャッシュ済み株価をそのまま返してよい秒数。
+# 事前取得の間隔より短いと、取得した株価が次の取得までに期限切れになり、ほとんどの
+# リクエストが上流へ問い合わせることになる。そのため事前取得の間隔の方を優先し、
+# QUOTE_SESSION_TTL_SECONDSがそれより短く設定されていても「間隔 + 余裕」まで延ばす。
+# より新しい株価が必要な場合はQUOTE_WARM_INTERVAL_MINUTESを短くする。
+QUOTE_SESSION_TTL_SECONDS = max(
+    float(os.getenv("QUOTE_SESSION_TTL_SECONDS", "0")),
+    QUOTE_WARM_INTERVAL_MINUTES * 60 + QUOTE_WARM_GRACE_SECONDS,
+)
+
+
+@lru_cache(maxsize=1)
+def get_market_calendar() -> MarketCalendar:
+    """休場日ファイルを読み込んだカレンダーを取得（プロセス内で1度だけ読み込む）"""
+    with open(MARKET_HOLIDAYS_FILE, encoding="utf-8") as f:
+        data = json.load(f)
+    holidays = {
+        market: [date.fromisoformat(day) for day in days] for market, days in data.items()
+    }
+    return MarketCalendar(holidays)
+
+
+@lru_cache(maxsize=1)
+def get_quote_freshness_policy() -> QuoteFreshnessPolicy:
+    return QuoteFreshnessPolicy(get_market_calendar(), QUOTE_SESSION_TTL_SECONDS)
@@ -1,6 +1,9 @@
+import logging
 import requests
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 class ExchangeRateClient:
     def __init__(self):
         # Note: This endpoint uses HTTP, not HTTPS.
@@ -15,11 +18,11 @@ class ExchangeRateClient:
             if "jpy" in data and "rate" in data["jpy"]:
                 return data["jpy"]["rate"]
             else:
-                print("Rate for JPY not found in FloatRates response")
+                logger.warning("Rate for JPY not found in FloatRates response")
                 return None
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching from FloatRates: {e}")
+            logger.warning("Error fetching from FloatRates: %s", e)
             return None
         except (KeyError, TypeError, ValueError) as e:
-            print(f"Error parsing response from FloatRates: {e}")
+            logger.warning("Error parsing response from FloatRates: %s", e)
             return None
@@ -0,0 +1,221 @@
+"""依存先の状態をバックグラウンドで確認し、判定結果をキャッシュするヘルスモニター
+
+プローブ（/health/live, /health/ready）のたびにDBや外部APIを確認すると、
+オーケストレーターの問い合わせがそのまま依存先への負荷になる。
+各ワーカーは一定間隔で依存先を確認し、判定結果を事前にJSONへ変換して保持する。
+プローブへの応答はキャッシュしたバイト列を返すだけになる。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from infrastructure.cache.shared_market_data import (
+    MARKET_DATA_SHM_NAME,
+    get_quote_cache,
+    get_shared_market_data,
+)
+from infrastructure.config.market_calendar import get_quote_freshness_policy
+from infrastructure.database import get_engine
+from infrastructure.repositories.exchange_rate_repository_impl import USD_JPY
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "10"))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "3"))
+# イベントループの遅延がこれを超えたら応答できていないとみなす
+HEALTH_MAX_LOOP_LAG_SECONDS = float(os.getenv("HEALTH_MAX_LOOP_LAG_SECONDS", "0.5"))
+# キャッシュ済みUSD/JPYの許容経過秒数（取得ジョブは立会時間中のみ動くため長めにとる）
+HEALTH_FX_MAX_AGE_SECONDS = float(os.getenv("HEALTH_FX_MAX_AGE_SECONDS", "3600"))
+# キャッシュ済み株価のうち古いものの許容割合
+HEALTH_MAX_STALE_QUOTE_RATIO = float(os.getenv("HEALTH_MAX_STALE_QUOTE_RATIO", "0.5"))
+# 異常ならreadyを落とすコンポーネント（それ以外はdegradedとして報告のみ）
+HEALTH_CRITICAL_COMPONENTS = frozenset(
+    name.strip()
+    for name in os.getenv("HEALTH_CRITICAL_COMPONENTS", "database,event_loop").split(",")
+    if name.strip()
+)
+
+EVENT_LOOP = "event_loop"
+
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"
+STATUS_UNAVAILABLE = "unavailable"
+STATUS_STARTING = "starting"
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """1コンポーネントの確認結果"""
+
+    healthy: bool
+    detail: Dict[str, Any] = field(default_factory=dict)
+
+
+Probe = Callable[[], Awaitable[CheckResult]]
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class HealthMonitor:
+    """依存先を定期的に確認し、liveness/readinessの応答を保持する"""
+
+    def __init__(
+        self,
+        probes: Dict[str, Probe],
+        critical: frozenset = HEALTH_CRITICAL_COMPONENTS,
+        interval_seconds: float = HEALTH_CHECK_INTERVAL_SECONDS,
+        timeout_seconds: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+        max_loop_lag_seconds: float = HEALTH_MAX_LOOP_LAG_SECONDS,
+    ):
+        self.probes = probes
+        self.critical = critical
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_loop_lag_seconds = max_loop_lag_seconds
+        self.loop_lag_seconds = 0.0
+        self.last_checked: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Tuple[int, bytes] = (
+            503,
+            _encode({"status": STATUS_STARTING, "ready": False, "components": {}}),
+        )
+
+    def start(self) -> None:
+        """実行中のイベントループ上で確認を始める"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await self.check_once()
+            except Exception:
+                logger.exception("Health check failed")
+            # 指定時刻から実際に再開するまでの遅れをイベントループの遅延とみなす
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            self.loop_lag_seconds = max(0.0, loop.time() - expected)
+
+    async def _probe(self, name: str, probe: Probe) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(probe(), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            result = CheckResult(False, {"error": "timeout"})
+        except Exception as e:
+            logger.warning("Health probe %s failed", name, exc_info=True)
+            result = CheckResult(False, {"error": type(e).__name__})
+        detail = {"latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+        detail.update(result.detail)
+        return CheckResult(result.healthy, detail)
+
+    async def check_once(self) -> Dict[str, Any]:
+        """全コンポーネントを並行して確認し、readinessの応答を更新する"""
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._probe(name, self.probes[name]) for name in names))
+        components = dict(zip(names, results))
+        components[EVENT_LOOP] = CheckResult(
+            self.loop_lag_seconds <= self.max_loop_lag_seconds,
+            {"lag_ms": round(self.loop_lag_seconds * 1000, 2)},
+        )
+
+        unhealthy = [name for name, result in components.items() if not result.healthy]
+        ready = not any(name in self.critical for name in unhealthy)
+        if not unhealthy:
+            status = STATUS_OK
+        else:
+            status = STATUS_DEGRADED if ready else STATUS_UNAVAILABLE
+        payload = {
+            "status": status,
+            "ready": ready,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "components": {
+                name: {
+                    "healthy": result.healthy,
+                    "critical": name in self.critical,
+                    **result.detail,
+                }
+                for name, result in components.items()
+            },
+        }
+        self._ready = (200 if ready else 503, _encode(payload))
+        self.last_checked = time.monotonic()
+        if unhealthy:
+            logger.warning("Unhealthy components", extra={"components": unhealthy})
+        return payload
+
+    def readiness(self) -> Tuple[int, bytes]:
+        """直近の判定結果（ステータスコードとJSON）"""
+        return self._ready
+
+    def liveness(self) -> Tuple[int, bytes]:
+        """確認処理が止まっていなければ生存とみなす（イベントループの停止・ハングの検知）"""
+        if self.last_checked is not None:
+            silent = time.monotonic() - self.last_checked
+            if silent > 3 * self.interval_seconds + self.timeout_seconds:
+                return 503, _encode({"status": "stalled", "seconds_since_check": round(silent, 1)})
+        return 200, b'{"status":"alive"}'
+
+
+async def check_database() -> CheckResult:
+    """コネクションプールから接続を借りてSELECT 1を実行する"""
+
+    def ping() -> Dict[str, Any]:
+        engine = get_engine()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        pool = engine.pool
+        return {"pool": pool.status()} if hasattr(pool, "status") else {}
+
+    return CheckResult(True, await asyncio.to_thread(ping))
+
+
+async def check_fx_cache() -> CheckResult:
+    """キャッシュ済みのUSD/JPYが許容時間内に更新されているか"""
+    cached = get_quote_cache().get_fx_rate(USD_JPY)
+    if cached is None:
+        return CheckResult(False, {"error": "missing"})
+    rate, timestamp = cached
+    age = (datetime.now() - timestamp).total_seconds()
+    return CheckResult(age <= HEALTH_FX_MAX_AGE_SECONDS, {"rate": rate, "age_seconds": round(age)})
+
+
+async def check_quote_cache() -> CheckResult:
+    """共有メモリに接続できているか、キャッシュ済み株価の多くが古くなっていないか"""
+    if MARKET_DATA_SHM_NAME and get_shared_market_data() is None:
+        return CheckResult(False, {"error": "shared memory not attached"})
+    cache = get_quote_cache()
+    policy = get_quote_freshness_policy()
+    symbols: List[str] = cache.quote_symbols()
+    stale = 0
+    for symbol in symbols:
+        quote = cache.get_quote(symbol)
+        if quote is None or not policy.is_fresh(symbol, quote.timestamp):
+            stale += 1
+    healthy = not symbols or stale / len(symbols) <= HEALTH_MAX_STALE_QUOTE_RATIO
+    return CheckResult(healthy, {"quotes": len(symbols), "stale": stale})
+
+
+health_monitor = HealthMonitor(
+    {"database": check_database, "fx_cache": check_fx_cache, "quote_cache": check_quote_cache}
+)
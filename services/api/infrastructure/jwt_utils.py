@@ -1,6 +1,9 @@
 """JWT token management utilities"""
 
+import hashlib
 import os
+import secrets
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -10,6 +13,7 @@ from jose import JWTError, jwt
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -31,13 +35,28 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    # jtiは失効リストのキー（128ビットの乱数を16進32文字で表す）
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
 
     # JWTトークンの生成
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def create_refresh_token() -> str:
+    """
+    リフレッシュトークン（推測できない不透明な文字列）を生成
+
+    DBにはhash_refresh_tokenで変換した値だけを保存する。
+    """
+    return secrets.token_urlsafe(48)
+
+
+def hash_refresh_token(token: str) -> str:
+    """リフレッシュトークンを保存・照合用のSHA-256（16進）に変換"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def verify_token(token: str) -> Optional[dict]:
     """
     JWTトークンを検証してデコード
@@ -0,0 +1,78 @@
+"""レイテンシの分布を対数間隔のバケットで数えるヒストグラム
+
+1桁（10倍）をbuckets_per_decade個に分けたバケットに観測値を数え、分位点はそのバケットの
+上端で返す（誤差は1バケット分、既定で約26%以内）。観測の合計がdecay_everyに達するたびに
+全バケットを半分にして、古い観測の重みを下げ、最近の上流の状態に追従させる。
+"""
+
+import math
+from typing import Dict, List
+
+
+class LatencyHistogram:
+    """1つの上流のレイテンシ（秒）の分布（イベントループのスレッドからのみ使う）"""
+
+    def __init__(
+        self,
+        min_seconds: float = 0.001,
+        max_seconds: float = 60.0,
+        buckets_per_decade: int = 10,
+        decay_every: int = 1000,
+    ):
+        if min_seconds <= 0 or max_seconds <= min_seconds:
+            raise ValueError("0 < min_seconds < max_seconds is required")
+        self.min_seconds = min_seconds
+        self.buckets_per_decade = buckets_per_decade
+        self.decay_every = decay_every
+        decades = math.log10(max_seconds / min_seconds)
+        size = math.ceil(decades * buckets_per_decade) + 1
+        # bounds[i]: i番目のバケットの上端（最初のバケットはmin_seconds以下をすべて含む）
+        self.bounds: List[float] = [
+            min_seconds * 10 ** (i / buckets_per_decade) for i in range(size)
+        ]
+        self.counts: List[float] = [0.0] * size
+        self.total = 0.0
+        # 減衰させずに数えた観測数
+        self.observed = 0
+
+    def observe(self, seconds: float) -> None:
+        if seconds <= self.min_seconds:
+            index = 0
+        else:
+            index = math.ceil(
+                math.log10(seconds / self.min_seconds) * self.buckets_per_decade - 1e-9
+            )
+            index = min(index, len(self.counts) - 1)
+        self.counts[index] += 1
+        self.total += 1
+        self.observed += 1
+        if self.total >= self.decay_every:
+            self.counts = [count / 2 for count in self.counts]
+            self.total /= 2
+
+    def quantile(self, q: float) -> float:
+        """
+        分位点（q=0.95なら95パーセンタイル）を含むバケットの上端
+
+        Raises:
+            ValueError: まだ観測がない場合
+        """
+        if self.total <= 0:
+            raise ValueError("No observations")
+        threshold = q * self.total
+        cumulative = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return bound
+        return self.bounds[-1]
+
+    def stats(self) -> Dict[str, float]:
+        if self.total <= 0:
+            return {"observed": self.observed}
+        return {
+            "observed": self.observed,
+            "p50_ms": round(self.quantile(0.5) * 1000, 2),
+            "p95_ms": round(self.quantile(0.95) * 1000, 2),
+            "p99_ms": round(self.quantile(0.99) * 1000, 2),
+        }
@@ -0,0 +1,55 @@
+"""同一ホスト上のワーカー間でリーダーを1つに絞るためのファイルロック"""
+
+import fcntl
+import os
+import threading
+from typing import Optional
+
+LEADER_LOCK_PATH = os.getenv("LEADER_LOCK_PATH", "/tmp/investfolio-leader.lock")
+
+
+class LeaderLock:
+    """flockによるリーダー選出
+
+    ロックはプロセスが終了すると（異常終了を含めて）OSが解放するため、
+    他のワーカーが次回のtry_acquire()でリーダーを引き継げる。
+    """
+
+    def __init__(self, path: str = LEADER_LOCK_PATH):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._mutex = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """ロックの取得を試みる（取得済みなら何もせずTrue）"""
+        with self._mutex:
+            if self._fd is not None:
+                return True
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+            self._fd = fd
+            return True
+
+    def release(self) -> None:
+        with self._mutex:
+            if self._fd is None:
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+# このプロセスのリーダーロック（スケジューラと共有メモリ書き込みで共用）
+leader_lock = LeaderLock()
@@ -0,0 +1,184 @@
+"""構造化JSONログの設定
+
+リクエスト処理スレッドではログレコードをキューに積むだけにし、
+JSON整形と出力はQueueListenerのスレッドで行う。
+
+出力形式はFilebeat（docker/filebeat/filebeat.yml）のmultiline設定
+`^\\d{4}-\\d{2}-\\d{2}` に合わせ、1行ごとに先頭へISO8601タイムスタンプを付ける:
+
+    2024-01-01T12:00:00.000+00:00 {"level": "INFO", "logger": "...", "message": "...", ...}
+"""
+
+import atexit
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from pythonjsonlogger.json import JsonFormatter
+
+SERVICE_NAME = "investfolio-api"
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# 例: /var/log/app/api.log（未設定なら標準出力のみ）
+LOG_FILE = os.getenv("LOG_FILE")
+# 例: "uvicorn.access=0.1,investfolio.access=0.5"
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+
+# リクエストごとの相関ID（RequestIdMiddlewareで設定）
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class RequestIdFilter(logging.Filter):
+    """ログレコードに現在のリクエストIDを付与する
+
+    contextvarはリクエスト処理スレッドでしか読めないため、
+    キューに積む前（QueueHandler側）で評価する。
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """ロガー名ごとに一定割合のみ通過させる（WARNING以上は常に通過）
+
+    rates はロガー名（前方一致）から通過率（0.0〜1.0）への対応。
+    乱数ではなくカウンタで間引くため、通過率は正確に保たれる。
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self._rates = dict(rates)
+        # 長い名前を優先して一致させる
+        self._names = sorted(rates, key=len, reverse=True)
+        self._counters: Dict[str, itertools.count] = {
+            name: itertools.count() for name in rates
+        }
+
+    def _rule_for(self, logger_name: str) -> Optional[str]:
+        for name in self._names:
+            if logger_name == name or logger_name.startswith(name + "."):
+                return name
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rule = self._rule_for(record.name)
+        if rule is None:
+            return True
+        rate = self._rates[rule]
+        if rate <= 0:
+            return False
+        if rate >= 1:
+            return True
+        every = max(1, round(1 / rate))
+        return next(self._counters[rule]) % every == 0
+
+
+def parse_sampling_rates(spec: str) -> Dict[str, float]:
+    """"name=rate,name=rate" 形式の設定を解析"""
+    rates = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, rate = item.split("=", 1)
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+class FilebeatJsonFormatter(JsonFormatter):
+    """先頭にタイムスタンプを付けた1行JSONを出力するフォーマッタ"""
+
+    def __init__(self):
+        super().__init__(
+            "%(levelname)s %(name)s %(message)s",
+            rename_fields={"levelname": "level", "name": "logger"},
+            static_fields={"service": SERVICE_NAME},
+            timestamp=True,
+            json_ensure_ascii=False,
+        )
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.fromtimestamp(record.created, tz=timezone.utc)
+        return f"{timestamp.isoformat(timespec='milliseconds')} {super().format(record)}"
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """整形を行わずにレコードをキューへ渡すハンドラ
+
+    標準のQueueHandler.prepare()は呼び出し元スレッドで例外のトレースバックまで
+    整形してしまうため、メッセージの引数展開のみ行い残りはリスナーに任せる。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging() -> None:
+    """ルートロガーをキュー経由のJSON出力に設定する（複数回呼んでも1度だけ有効）"""
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        formatter = FilebeatJsonFormatter()
+        handlers = []
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+
+        if LOG_FILE:
+            os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+            file_handler = logging.handlers.WatchedFileHandler(LOG_FILE, encoding="utf-8")
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        queue_handler.addFilter(RequestIdFilter())
+        rates = parse_sampling_rates(LOG_SAMPLING)
+        if rates:
+            queue_handler.addFilter(SamplingFilter(rates))
+
+        root = logging.getLogger()
+        root.handlers = [queue_handler]
+        root.setLevel(LOG_LEVEL)
+
+        # uvicornのロガーもルート経由で同じ形式に揃える
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.propagate = True
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """キューに残ったログを書き出してリスナーを停止する"""
+    global _listener
+
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,48 @@
+
+-- +migrate Up
+-- ポートフォリオテーブルの作成
+-- total_value は portfolio_items.market_value の合計を差分更新で保持する
+CREATE TABLE IF NOT EXISTS portfolios (
+    id INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    portfolio_id INT NULL,
+    user_id INT NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    description VARCHAR(500),
+    currency VARCHAR(3) NOT NULL DEFAULT 'JPY',
+    total_value DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    INDEX idx_portfolio_id (portfolio_id),
+    INDEX idx_user_id (user_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ポートフォリオ明細テーブルの作成
+-- market_value はポートフォリオ通貨建て（quantity * current_price * fx_rate）
+CREATE TABLE IF NOT EXISTS portfolio_items (
+    id INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    portfolio_item_id INT NULL,
+    portfolio_id INT NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    quantity DECIMAL(18, 4) NOT NULL CHECK (quantity >= 0),
+    average_price DECIMAL(18, 4) NOT NULL,
+    currency VARCHAR(3) NOT NULL DEFAULT 'JPY',
+    current_price DECIMAL(18, 4) NULL,
+    fx_rate DECIMAL(18, 6) NOT NULL DEFAULT 1,
+    market_value DECIMAL(20, 2) NULL,
+    asset_type VARCHAR(20) NOT NULL DEFAULT 'stock',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    UNIQUE(portfolio_id, symbol),
+    INDEX idx_portfolio_item_id (portfolio_item_id),
+    INDEX idx_symbol (symbol),
+    INDEX idx_currency (currency),
+    FOREIGN KEY (portfolio_id) REFERENCES portfolios(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- +migrate Down
+DROP TABLE IF EXISTS portfolio_items;
+DROP TABLE IF EXISTS portfolios;
@@ -0,0 +1,30 @@
+
+-- +migrate Up
+-- 取引履歴テーブルの作成
+-- エクスポートはユーザー単位でid順に読み出すため (user_id, id) の索引を持つ
+CREATE TABLE IF NOT EXISTS transactions (
+    id INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    transaction_id INT NULL,
+    user_id INT NOT NULL,
+    portfolio_id INT NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    transaction_type ENUM('BUY', 'SELL', 'DIVIDEND', 'DEPOSIT', 'WITHDRAWAL') NOT NULL,
+    quantity DECIMAL(18, 4) NOT NULL,
+    price DECIMAL(18, 4) NOT NULL,
+    total_amount DECIMAL(20, 2) NOT NULL,
+    fee DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    tax DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    currency VARCHAR(3) NOT NULL DEFAULT 'JPY',
+    transaction_date DATETIME NOT NULL,
+    notes VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    INDEX idx_transaction_id (transaction_id),
+    INDEX idx_user_id_id (user_id, id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (portfolio_id) REFERENCES portfolios(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- +migrate Down
+DROP TABLE IF EXISTS transactions;
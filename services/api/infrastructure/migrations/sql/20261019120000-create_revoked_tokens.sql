@@ -0,0 +1,16 @@
+-- +migrate Up
+-- 失効させたアクセストークン（jti）のテーブルの作成
+-- 各ワーカーはidの昇順に差分を読み込み、メモリ上の失効フィルターに反映する
+-- 期限切れの行は読み込まないため、expires_atで絞り込めるよう索引を持つ
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    id INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    jti VARCHAR(64) NOT NULL UNIQUE,
+    user_id INT NOT NULL,
+    expires_at DATETIME NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX idx_expires_at (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- +migrate Down
+DROP TABLE IF EXISTS revoked_tokens;
@@ -0,0 +1,18 @@
+-- +migrate Up
+-- コーポレートアクション（株式分割・併合）のテーブルの作成
+-- 保有株や株価履歴の行は書き換えず、読み取り時にここから求めた累積の倍率で調整する
+CREATE TABLE IF NOT EXISTS corporate_actions (
+    id INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    symbol VARCHAR(20) NOT NULL,
+    action_type ENUM('SPLIT') NOT NULL,
+    ex_date DATE NOT NULL,
+    ratio_from INT NOT NULL,
+    ratio_to INT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE KEY uq_symbol_action_ex_date (symbol, action_type, ex_date),
+    CHECK (ratio_from > 0 AND ratio_to > 0)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- +migrate Down
+DROP TABLE IF EXISTS corporate_actions;
@@ -0,0 +1,22 @@
+-- +migrate Up
+-- 株価アラートのテーブルの作成
+-- 有効なアラートはリーダーのワーカーがidの昇順に差分を読み込み、銘柄ごとの索引に載せる
+CREATE TABLE IF NOT EXISTS price_alerts (
+    id INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    user_id INT NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    `condition` ENUM('ABOVE', 'BELOW', 'PERCENT_MOVE') NOT NULL,
+    threshold DECIMAL(15, 4) NOT NULL,
+    reference_price DECIMAL(15, 4) NULL,
+    status ENUM('ACTIVE', 'TRIGGERED') NOT NULL DEFAULT 'ACTIVE',
+    triggered_price DECIMAL(15, 4) NULL,
+    triggered_at DATETIME NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    INDEX idx_user_id (user_id),
+    INDEX idx_status_id (status, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- +migrate Down
+DROP TABLE IF EXISTS price_alerts;
@@ -0,0 +1,17 @@
+-- +migrate Up
+-- ユーザーごとの保有株のバージョンのテーブルの作成
+-- 保有株を書き込むたびに同じトランザクションで1つ上げ、一覧の応答キャッシュのキーに使う
+CREATE TABLE IF NOT EXISTS user_stock_versions (
+    user_id INT NOT NULL PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 既存の保有株のあるユーザーの行を作る（行のないユーザーの一覧はキャッシュしない）
+INSERT INTO user_stock_versions (user_id, version)
+SELECT DISTINCT user_id, 1 FROM user_stocks;
+
+-- +migrate Down
+DROP TABLE IF EXISTS user_stock_versions;
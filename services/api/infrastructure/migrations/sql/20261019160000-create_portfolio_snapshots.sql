@@ -0,0 +1,18 @@
+-- +migrate Up
+-- 日次のポートフォリオ評価のテーブルの作成
+-- 金額は基準通貨（円）の最小単位の整数で持ち、(user_id, snapshot_date) の主キー順に
+-- 格納されるため、1ユーザーの期間の読み出しは連続した範囲の走査になる
+CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+    user_id INT NOT NULL,
+    snapshot_date DATE NOT NULL,
+    total_value BIGINT NOT NULL,
+    cost_basis BIGINT NOT NULL,
+    -- 取引通貨ごとの評価額 {"JPY": 1200000, "USD": 450000}
+    exposures JSON NOT NULL,
+
+    PRIMARY KEY (user_id, snapshot_date),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- +migrate Down
+DROP TABLE IF EXISTS portfolio_snapshots;
@@ -0,0 +1,21 @@
+-- +migrate Up
+-- 銘柄ごとの全ユーザーの保有株の集計テーブルの作成
+-- 保有株の登録と同じトランザクションで差分を反映し、夜間に保有株のテーブルから作り直す
+CREATE TABLE IF NOT EXISTS symbol_holding_rollups (
+    ticker_symbol VARCHAR(20) NOT NULL PRIMARY KEY,
+    holders INT NOT NULL DEFAULT 0,
+    total_quantity BIGINT NOT NULL DEFAULT 0,
+    cost_basis DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    INDEX idx_holders (holders)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 既存の保有株から初期値を作る（分割の反映は初回の夜間の突き合わせで行う）
+INSERT INTO symbol_holding_rollups (ticker_symbol, holders, total_quantity, cost_basis)
+SELECT ticker_symbol, COUNT(*), SUM(quantity), SUM(quantity * acquisition_price)
+FROM user_stocks
+GROUP BY ticker_symbol;
+
+-- +migrate Down
+DROP TABLE IF EXISTS symbol_holding_rollups;
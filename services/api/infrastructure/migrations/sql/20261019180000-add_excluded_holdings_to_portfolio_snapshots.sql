@@ -0,0 +1,7 @@
+-- +migrate Up
+-- 株価または為替レートがなく評価に含めなかった保有株の件数
+ALTER TABLE portfolio_snapshots
+    ADD COLUMN excluded_holdings INT NOT NULL DEFAULT 0 AFTER exposures;
+
+-- +migrate Down
+ALTER TABLE portfolio_snapshots DROP COLUMN excluded_holdings;
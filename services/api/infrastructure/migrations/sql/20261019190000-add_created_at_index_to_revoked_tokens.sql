@@ -0,0 +1,6 @@
+-- +migrate Up
+-- 各ワーカーは失効日時（created_at）を遡って差分を読み込むため、created_atの索引を追加する
+CREATE INDEX idx_created_at ON revoked_tokens (created_at);
+
+-- +migrate Down
+DROP INDEX idx_created_at ON revoked_tokens;
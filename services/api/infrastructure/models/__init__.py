@@ -1,3 +1,25 @@
+from .corporate_action import CorporateActionModel
+from .holding_rollup import SymbolHoldingRollupModel
+from .portfolio import PortfolioItemModel, PortfolioModel
+from .portfolio_snapshot import PortfolioSnapshotModel
+from .price_alert import PriceAlertModel
+from .token import RefreshTokenModel, RevokedTokenModel
+from .transaction import TransactionModel
 from .user import UserModel
+from .user_stock import UserStockModel
+from .user_stock_version import UserStockVersionModel
 
-__all__ = ["UserModel"]
+__all__ = [
+    "CorporateActionModel",
+    "PortfolioItemModel",
+    "PortfolioModel",
+    "PortfolioSnapshotModel",
+    "PriceAlertModel",
+    "RefreshTokenModel",
+    "RevokedTokenModel",
+    "SymbolHoldingRollupModel",
+    "TransactionModel",
+    "UserModel",
+    "UserStockModel",
+    "UserStockVersionModel",
+]
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Date, DateTime, Enum, Integer, String, UniqueConstraint
+from sqlalchemy.sql import func
+
+from infrastructure.database import Base
+
+
+class CorporateActionModel(Base):
+    """コーポレートアクション（株式分割・併合）テーブルのモデル"""
+
+    __tablename__ = "corporate_actions"
+    __table_args__ = (
+        UniqueConstraint("symbol", "action_type", "ex_date", name="uq_symbol_action_ex_date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(20), nullable=False)
+    action_type = Column(Enum("SPLIT", name="corporate_action_type"), nullable=False)
+    ex_date = Column(Date, nullable=False)
+    ratio_from = Column(Integer, nullable=False)
+    ratio_to = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, Numeric, String
+from sqlalchemy.sql import func
+
+from infrastructure.database import Base
+
+
+class SymbolHoldingRollupModel(Base):
+    """銘柄ごとの全ユーザーの保有株の集計テーブルのモデル"""
+
+    __tablename__ = "symbol_holding_rollups"
+    __table_args__ = (Index("idx_holders", "holders"),)
+
+    ticker_symbol = Column(String(20), primary_key=True)
+    holders = Column(Integer, nullable=False, default=0)
+    total_quantity = Column(BigInteger, nullable=False, default=0)
+    cost_basis = Column(Numeric(20, 2), nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
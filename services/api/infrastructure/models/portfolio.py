@@ -0,0 +1,43 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.sql import func
+
+from infrastructure.database import Base
+
+
+class PortfolioModel(Base):
+    """ポートフォリオテーブルのモデル"""
+
+    __tablename__ = "portfolios"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    portfolio_id = Column(Integer, nullable=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    description = Column(String(500))
+    currency = Column(String(3), nullable=False, default="JPY")
+    total_value = Column(Numeric(20, 2), nullable=False, default=0)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class PortfolioItemModel(Base):
+    """ポートフォリオ明細テーブルのモデル"""
+
+    __tablename__ = "portfolio_items"
+    # マイグレーションのUNIQUE(portfolio_id, symbol)には名前がないため、MySQLが付ける名前に合わせる
+    __table_args__ = (UniqueConstraint("portfolio_id", "symbol", name="portfolio_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    portfolio_item_id = Column(Integer, nullable=True)
+    portfolio_id = Column(Integer, ForeignKey("portfolios.id"), nullable=False)
+    symbol = Column(String(20), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    quantity = Column(Numeric(18, 4), nullable=False)
+    average_price = Column(Numeric(18, 4), nullable=False)
+    currency = Column(String(3), nullable=False, default="JPY", index=True)
+    current_price = Column(Numeric(18, 4), nullable=True)
+    fx_rate = Column(Numeric(18, 6), nullable=False, default=1)
+    market_value = Column(Numeric(20, 2), nullable=True)
+    asset_type = Column(String(20), nullable=False, default="stock")
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,16 @@
+from sqlalchemy import JSON, BigInteger, Column, Date, ForeignKey, Integer
+
+from infrastructure.database import Base
+
+
+class PortfolioSnapshotModel(Base):
+    """日次のポートフォリオ評価テーブルのモデル（金額は基準通貨の最小単位の整数）"""
+
+    __tablename__ = "portfolio_snapshots"
+
+    user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True, autoincrement=False)
+    snapshot_date = Column(Date, primary_key=True)
+    total_value = Column(BigInteger, nullable=False)
+    cost_basis = Column(BigInteger, nullable=False)
+    exposures = Column(JSON, nullable=False)
+    excluded_holdings = Column(Integer, nullable=False, default=0)
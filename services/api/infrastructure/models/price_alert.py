@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.sql import func
+
+from infrastructure.database import Base
+
+
+class PriceAlertModel(Base):
+    """株価アラートテーブルのモデル"""
+
+    __tablename__ = "price_alerts"
+    __table_args__ = (Index("idx_status_id", "status", "id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
+    symbol = Column(String(20), nullable=False)
+    condition = Column(
+        Enum("ABOVE", "BELOW", "PERCENT_MOVE", name="price_alert_condition"), nullable=False
+    )
+    threshold = Column(Numeric(15, 4), nullable=False)
+    reference_price = Column(Numeric(15, 4), nullable=True)
+    status = Column(
+        Enum("ACTIVE", "TRIGGERED", name="price_alert_status"), nullable=False, default="ACTIVE"
+    )
+    triggered_price = Column(Numeric(15, 4), nullable=True)
+    triggered_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
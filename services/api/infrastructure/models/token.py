@@ -0,0 +1,32 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from infrastructure.database import Base
+
+
+class RefreshTokenModel(Base):
+    """リフレッシュトークンテーブルのモデル（tokenにはSHA-256のハッシュを保存する）"""
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    refresh_token_id = Column(Integer, nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
+    token = Column(String(500), unique=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    is_revoked = Column(Boolean, default=False)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class RevokedTokenModel(Base):
+    """失効させたアクセストークンのテーブルのモデル"""
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (Index("idx_created_at", "created_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String(64), unique=True, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.sql import func
+
+from domain.entities.transaction import TransactionType
+from infrastructure.database import Base
+
+
+class TransactionModel(Base):
+    """取引履歴テーブルのモデル"""
+
+    __tablename__ = "transactions"
+    __table_args__ = (Index("idx_user_id_id", "user_id", "id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    transaction_id = Column(Integer, nullable=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    portfolio_id = Column(Integer, ForeignKey("portfolios.id"), nullable=False)
+    symbol = Column(String(20), nullable=False)
+    transaction_type = Column(
+        Enum(TransactionType, values_callable=lambda e: [m.value for m in e]), nullable=False
+    )
+    quantity = Column(Numeric(18, 4), nullable=False)
+    price = Column(Numeric(18, 4), nullable=False)
+    total_amount = Column(Numeric(20, 2), nullable=False)
+    fee = Column(Numeric(20, 2), nullable=False, default=0)
+    tax = Column(Numeric(20, 2), nullable=False, default=0)
+    currency = Column(String(3), nullable=False, default="JPY")
+    transaction_date = Column(DateTime, nullable=False)
+    notes = Column(String(500))
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+
+from infrastructure.database import Base
+
+
+class UserStockVersionModel(Base):
+    """ユーザーごとの保有株のバージョン（保有株の書き込みのたびに上がる）テーブルのモデル"""
+
+    __tablename__ = "user_stock_versions"
+
+    user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
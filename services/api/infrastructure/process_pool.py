@@ -0,0 +1,36 @@
+"""CPU負荷の高い計算用のプロセスプール
+
+ワーカーはspawnで起動する（スケジューラやログ出力のスレッドを持つ
+プロセスをforkすると、ロックを保持したまま複製される恐れがあるため）。
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", str(os.cpu_count() or 1)))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """プロセスプールを取得（初回呼び出し時に起動し、以降は使い回す）"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PROCESS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_process_pool() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
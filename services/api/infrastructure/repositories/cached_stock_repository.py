@@ -0,0 +1,44 @@
+import os
+from datetime import datetime
+from typing import Optional
+
+from domain.entities.stock import Stock
+from domain.repositories.stock_repository import StockRepository
+from domain.services.market_calendar import QuoteFreshnessPolicy
+from infrastructure.cache.quote_cache import QuoteCache
+
+# 鮮度ポリシーを指定しない場合に、キャッシュ済み株価をそのまま返してよい最大経過秒数
+QUOTE_MAX_AGE_SECONDS = float(os.getenv("QUOTE_MAX_AGE_SECONDS", "120"))
+
+
+class CachedStockRepository(StockRepository):
+    """キャッシュを優先し、ミス時のみ上流リポジトリへ問い合わせる株価リポジトリ"""
+
+    def __init__(
+        self,
+        upstream: StockRepository,
+        cache: Optional[QuoteCache] = None,
+        max_age_seconds: float = QUOTE_MAX_AGE_SECONDS,
+        freshness_policy: Optional[QuoteFreshnessPolicy] = None,
+    ):
+        self.upstream = upstream
+        self.cache = cache
+        self.max_age_seconds = max_age_seconds
+        self.freshness_policy = freshness_policy
+
+    async def get_stock_price(self, symbol: str) -> Optional[Stock]:
+        if self.cache is not None:
+            cached = self.cache.get_quote(symbol)
+            if cached and self._is_fresh(cached):
+                return cached
+
+        stock = await self.upstream.get_stock_price(symbol)
+        if stock and self.cache is not None and not self.cache.read_only:
+            self.cache.put_quote(stock)
+        return stock
+
+    def _is_fresh(self, stock: Stock) -> bool:
+        if self.freshness_policy is not None:
+            return self.freshness_policy.is_fresh(stock.symbol, stock.timestamp)
+        age = (datetime.now() - stock.timestamp).total_seconds()
+        return age <= self.max_age_seconds
@@ -0,0 +1,54 @@
+from typing import List
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from domain.entities.corporate_action import CorporateAction, CorporateActionType
+from domain.repositories.corporate_action_repository import CorporateActionRepository
+from infrastructure.models.corporate_action import CorporateActionModel
+
+
+class SQLCorporateActionRepository(CorporateActionRepository):
+    """SQLAlchemyを使用したコーポレートアクションリポジトリの実装"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def list_splits(self) -> List[CorporateAction]:
+        """株式分割・併合を銘柄・権利落ち日の順に取得"""
+        models = self.db.query(CorporateActionModel).filter(
+            CorporateActionModel.action_type == CorporateActionType.SPLIT.value
+        ).order_by(CorporateActionModel.symbol, CorporateActionModel.ex_date).all()
+        return [self._model_to_entity(model) for model in models]
+
+    async def add(self, action: CorporateAction) -> CorporateAction:
+        """コーポレートアクションを登録"""
+        model = CorporateActionModel(
+            symbol=action.symbol,
+            action_type=action.action_type.value,
+            ex_date=action.ex_date,
+            ratio_from=action.ratio_from,
+            ratio_to=action.ratio_to,
+        )
+        self.db.add(model)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise ValueError(
+                f"{action.action_type.value} for {action.symbol} on {action.ex_date} already exists"
+            )
+        self.db.refresh(model)
+        return self._model_to_entity(model)
+
+    def _model_to_entity(self, model: CorporateActionModel) -> CorporateAction:
+        """モデルをエンティティに変換"""
+        return CorporateAction(
+            id=model.id,
+            symbol=model.symbol,
+            action_type=CorporateActionType(model.action_type),
+            ex_date=model.ex_date,
+            ratio_from=model.ratio_from,
+            ratio_to=model.ratio_to,
+            created_at=model.created_at,
+        )
@@ -1,16 +1,46 @@
+import os
+from datetime import datetime
 from typing import Optional, Dict
 from domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from infrastructure.cache.quote_cache import QuoteCache
 from infrastructure.external.exchange_rate_client import ExchangeRateClient
 
+USD_JPY = "USD/JPY"
+
+# キャッシュ済みレートをそのまま返してよい最大経過秒数
+FX_MAX_AGE_SECONDS = float(os.getenv("FX_MAX_AGE_SECONDS", "300"))
+
 class ExchangeRateRepositoryImpl(ExchangeRateRepository):
-    def __init__(self, client: ExchangeRateClient):
+    def __init__(
+        self,
+        client: ExchangeRateClient,
+        cache: Optional[QuoteCache] = None,
+        max_age_seconds: float = FX_MAX_AGE_SECONDS,
+    ):
         self.client = client
+        self.cache = cache
+        self.max_age_seconds = max_age_seconds
 
     def get_usd_jpy_rate(self) -> Optional[Dict]:
-        rate = self.client.get_usd_jpy_rate()
+        rate = self._get_cached_rate(USD_JPY)
+        if rate is None:
+            rate = self.client.get_usd_jpy_rate()
+            if rate is not None and self.cache is not None and not self.cache.read_only:
+                self.cache.put_fx_rate(USD_JPY, rate, datetime.now())
         if rate is not None:
             return {
-                "symbol": "USD/JPY",
+                "symbol": USD_JPY,
                 "last": f"{rate:.2f}",
             }
         return None
+
+    def _get_cached_rate(self, pair: str) -> Optional[float]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get_fx_rate(pair)
+        if cached is None:
+            return None
+        rate, timestamp = cached
+        if (datetime.now() - timestamp).total_seconds() > self.max_age_seconds:
+            return None
+        return rate
@@ -0,0 +1,98 @@
+import csv
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from domain.services.fx_history import FxHistory, FxSeries
+
+logger = logging.getLogger(__name__)
+
+# 日次為替レートの履歴（date,pair,rate のCSV）。日次ジョブが追記する（必須。ファイルがなければ作る）
+FX_HISTORY_FILE = os.getenv("FX_HISTORY_FILE", "")
+# 他のワーカーによる追記を確認する間隔（秒）
+FX_HISTORY_RELOAD_SECONDS = float(os.getenv("FX_HISTORY_RELOAD_SECONDS", "60"))
+
+_FIELDS = ["date", "pair", "rate"]
+
+
+def load_fx_history(path: str) -> FxHistory:
+    """CSVを読み込み、通貨ペアごとに日付順の配列にする（同じ日付は後の行を使う）"""
+    pairs: Dict[str, List[Tuple[date, float]]] = defaultdict(list)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                pairs[row["pair"]].append((date.fromisoformat(row["date"]), float(row["rate"])))
+    return FxHistory({pair: FxSeries.from_pairs(rows) for pair, rows in pairs.items()})
+
+
+class FxHistoryStore:
+    """ファイルに保存した為替レートの履歴
+
+    読み込んだ履歴はワーカーごとにメモリに持つ。追記はリーダーのワーカーの日次ジョブが行い、
+    他のワーカーはファイルの更新時刻が変わっていれば読み直す。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        reload_seconds: float = FX_HISTORY_RELOAD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self.clock = clock
+        self._history: Optional[FxHistory] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def history(self) -> FxHistory:
+        """履歴を取得（確認間隔ごとにファイルの更新を確かめる）"""
+        now = self.clock()
+        if self._history is not None and now - self._checked_at < self.reload_seconds:
+            return self._history
+        with self._lock:
+            self._checked_at = now
+            mtime = self._file_mtime()
+            if self._history is None or mtime != self._mtime:
+                self._history = load_fx_history(self.path)
+                self._mtime = mtime
+                logger.info("FX history loaded", extra={"pairs": self._history.pairs})
+            return self._history
+
+    def append(self, pair: str, day: date, rate: float) -> None:
+        """1日分のレートをファイルに追記し、このワーカーの履歴にも反映する"""
+        history = self.history()
+        with self._lock:
+            new_file = not os.path.exists(self.path)
+            with open(self.path, "a", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(_FIELDS)
+                writer.writerow([day.isoformat(), pair, f"{rate:.6g}"])
+            history.record(pair, day, rate)
+            self._mtime = self._file_mtime()
+
+
+@lru_cache
+def get_fx_history_store() -> FxHistoryStore:
+    """
+    為替レート履歴の保存先（プロセス内で共有する）
+
+    Raises:
+        RuntimeError: FX_HISTORY_FILEが設定されていない場合（サンプルのレートで換算しないように）
+    """
+    if not FX_HISTORY_FILE:
+        raise RuntimeError("FX_HISTORY_FILE is not set")
+    return FxHistoryStore(FX_HISTORY_FILE)
@@ -0,0 +1,200 @@
+"""複数の株価APIへの予備リクエスト（ヘッジ）とフェイルオーバー
+
+上流を優先順に並べ、まず先頭に問い合わせる。問い合わせ中の上流がその上流のレイテンシの
+p95を過ぎても応答しなければ、次の上流にも同じ問い合わせを送り、先に届いた有効な応答
+（例外でもNoneでもないもの）を使って残りは取り消す。上流がエラーや「銘柄なし」を返した
+場合は待たずにすぐ次の上流へ問い合わせる。
+
+待つ時間は上流ごとのヒストグラムから求めるため、普段から遅い上流には長く、速い上流には
+短く待つ。予備の問い合わせは遅い方の5%程度にしか送られないため、上流の負荷はほぼ増えない。
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from domain.entities.stock import Stock
+from domain.repositories.stock_repository import StockRepository
+from infrastructure.latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# 優先順の株価APIのURL（カンマ区切り）。未設定ならモックを使う
+QUOTE_PROVIDER_URLS = [
+    url.strip() for url in os.getenv("QUOTE_PROVIDER_URLS", "").split(",") if url.strip()
+]
+# 次の上流に予備の問い合わせを送るまで待つレイテンシの分位点
+QUOTE_HEDGE_QUANTILE = float(os.getenv("QUOTE_HEDGE_QUANTILE", "0.95"))
+QUOTE_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("QUOTE_HEDGE_MIN_DELAY_SECONDS", "0.01"))
+# 観測が少ないうちもこの秒数だけ待つ
+QUOTE_HEDGE_MAX_DELAY_SECONDS = float(os.getenv("QUOTE_HEDGE_MAX_DELAY_SECONDS", "1.0"))
+# 分位点を使い始めるまでに必要な観測数
+QUOTE_HEDGE_MIN_SAMPLES = int(os.getenv("QUOTE_HEDGE_MIN_SAMPLES", "20"))
+
+
+@dataclass
+class QuoteProvider:
+    """優先順に並べる上流の1つと、そのレイテンシの分布・統計"""
+
+    name: str
+    repository: StockRepository
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    requests: int = 0
+    wins: int = 0
+    errors: int = 0
+    cancelled: int = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "wins": self.wins,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            **self.histogram.stats(),
+        }
+
+
+class HedgedStockRepository(StockRepository):
+    """優先順の上流に、遅延に応じて予備の問い合わせを送る株価リポジトリ"""
+
+    def __init__(
+        self,
+        providers: Sequence[QuoteProvider],
+        quantile: float = QUOTE_HEDGE_QUANTILE,
+        min_delay: float = QUOTE_HEDGE_MIN_DELAY_SECONDS,
+        max_delay: float = QUOTE_HEDGE_MAX_DELAY_SECONDS,
+        min_samples: int = QUOTE_HEDGE_MIN_SAMPLES,
+    ):
+        if not providers:
+            raise ValueError("At least one provider is required")
+        self.providers: List[QuoteProvider] = list(providers)
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        # 統計
+        self.lookups = 0
+        self.hedged = 0
+        self.failed_over = 0
+
+    def hedge_delay(self, provider: QuoteProvider) -> float:
+        """この上流の応答を待ってから次の上流に問い合わせるまでの秒数"""
+        if provider.histogram.observed < self.min_samples:
+            return self.max_delay
+        delay = provider.histogram.quantile(self.quantile)
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    async def get_stock_price(self, symbol: str) -> Optional[Stock]:
+        self.lookups += 1
+        started: Dict[asyncio.Task, float] = {}
+        owners: Dict[asyncio.Task, QuoteProvider] = {}
+        next_index = 0
+
+        def launch() -> None:
+            nonlocal next_index
+            provider = self.providers[next_index]
+            next_index += 1
+            provider.requests += 1
+            task = asyncio.create_task(provider.repository.get_stock_price(symbol))
+            started[task] = time.monotonic()
+            owners[task] = provider
+
+        launch()
+        last_launched = self.providers[0]
+        try:
+            while owners:
+                timeout = (
+                    self.hedge_delay(last_launched) if next_index < len(self.providers) else None
+                )
+                done, _ = await asyncio.wait(
+                    owners, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # 応答が遅いので、待っている問い合わせはそのままに次の上流にも送る
+                    self.hedged += 1
+                    last_launched = self.providers[next_index]
+                    launch()
+                    continue
+
+                for task in done:
+                    provider = owners.pop(task)
+                    latency = time.monotonic() - started.pop(task)
+                    try:
+                        stock = task.result()
+                    except Exception as e:
+                        provider.errors += 1
+                        logger.warning(
+                            "Quote provider failed",
+                            extra={"provider": provider.name, "symbol": symbol, "error": str(e)},
+                        )
+                        continue
+                    provider.histogram.observe(latency)
+                    if stock is not None:
+                        provider.wins += 1
+                        return stock
+
+                # エラーか「銘柄なし」だった。待っている問い合わせがなければ次の上流へすぐ送る
+                if not owners and next_index < len(self.providers):
+                    self.failed_over += 1
+                    last_launched = self.providers[next_index]
+                    launch()
+            return None
+        finally:
+            for task, provider in owners.items():
+                if task.done():
+                    # 有効な応答と同時に終わっていたもの。例外は取り出しておく
+                    if not task.cancelled():
+                        task.exception()
+                    continue
+                task.cancel()
+                provider.cancelled += 1
+                # 取り消した問い合わせも少なくともここまではかかっている（速い側だけで分布を作らない）
+                provider.histogram.observe(time.monotonic() - started[task])
+
+    async def aclose(self) -> None:
+        for provider in self.providers:
+            await provider.repository.aclose()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "lookups": self.lookups,
+            "hedged": self.hedged,
+            "failed_over": self.failed_over,
+            "providers": {
+                provider.name: {
+                    "hedge_delay_ms": round(self.hedge_delay(provider) * 1000, 2),
+                    **provider.stats(),
+                }
+                for provider in self.providers
+            },
+        }
+
+
+def create_quote_upstream() -> StockRepository:
+    """QUOTE_PROVIDER_URLSがあればそれらをヘッジしながら使い、なければモックを使う
+
+    httpxのAsyncClientは作成後に最初に使ったイベントループでしか使えないため、
+    asyncio.runで実行するジョブは実行ごとに作り、同じループの中でacloseする。
+    """
+    if not QUOTE_PROVIDER_URLS:
+        from infrastructure.repositories.mock_stock_repository import MockStockRepository
+
+        return MockStockRepository()
+
+    from infrastructure.repositories.http_stock_repository import HttpStockRepository
+
+    return HedgedStockRepository([
+        QuoteProvider(urlsplit(url).netloc or url, HttpStockRepository(url))
+        for url in QUOTE_PROVIDER_URLS
+    ])
+
+
+@lru_cache
+def get_quote_upstream() -> StockRepository:
+    """APIワーカーのイベントループで使い回す上流（ヒストグラムと接続を共有するため1つだけ作る）"""
+    return create_quote_upstream()
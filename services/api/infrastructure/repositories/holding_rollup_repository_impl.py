@@ -0,0 +1,130 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from domain.entities.holding_rollup import LotSummary, SymbolHoldingRollup
+from domain.repositories.holding_rollup_repository import HoldingRollupRepository
+from infrastructure.models.holding_rollup import SymbolHoldingRollupModel
+from infrastructure.models.user_stock import UserStockModel
+
+_ROLLUP_COLUMNS = (
+    SymbolHoldingRollupModel.ticker_symbol,
+    SymbolHoldingRollupModel.holders,
+    SymbolHoldingRollupModel.total_quantity,
+    SymbolHoldingRollupModel.cost_basis,
+)
+
+
+class SQLHoldingRollupRepository(HoldingRollupRepository):
+    """SQLAlchemyを使用した銘柄ごとの保有株の集計リポジトリの実装"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_new_lot(self, ticker_symbol: str, quantity: int, cost_basis: Decimal) -> None:
+        """銘柄の行に差分を加える（行がなければ作る）"""
+        increment = (
+            update(SymbolHoldingRollupModel)
+            .where(SymbolHoldingRollupModel.ticker_symbol == ticker_symbol)
+            .values(
+                holders=SymbolHoldingRollupModel.holders + 1,
+                total_quantity=SymbolHoldingRollupModel.total_quantity + quantity,
+                cost_basis=SymbolHoldingRollupModel.cost_basis + cost_basis,
+            )
+        )
+        if self.db.execute(increment).rowcount:
+            return
+        try:
+            with self.db.begin_nested():
+                self.db.add(SymbolHoldingRollupModel(
+                    ticker_symbol=ticker_symbol, holders=1, total_quantity=quantity,
+                    cost_basis=cost_basis,
+                ))
+        except IntegrityError:
+            # 同時に同じ銘柄の最初の行を別のリクエストが作った
+            self.db.execute(increment)
+
+    async def most_held(self, limit: int) -> List[SymbolHoldingRollup]:
+        """保有ユーザー数の索引の降順に取得"""
+        rows = self.db.execute(
+            select(*_ROLLUP_COLUMNS)
+            .where(SymbolHoldingRollupModel.holders > 0)
+            .order_by(
+                SymbolHoldingRollupModel.holders.desc(), SymbolHoldingRollupModel.ticker_symbol
+            )
+            .limit(limit)
+        )
+        return [self._to_entity(row) for row in rows]
+
+    async def get(self, ticker_symbol: str) -> Optional[SymbolHoldingRollup]:
+        row = self.db.execute(
+            select(*_ROLLUP_COLUMNS).where(SymbolHoldingRollupModel.ticker_symbol == ticker_symbol)
+        ).first()
+        return self._to_entity(row) if row else None
+
+    async def list_all(self) -> List[SymbolHoldingRollup]:
+        rows = self.db.execute(
+            select(*_ROLLUP_COLUMNS).order_by(SymbolHoldingRollupModel.ticker_symbol)
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def summarize_lots(self) -> List[LotSummary]:
+        """保有株のテーブルを1回のGROUP BYで (銘柄, 取得日) ごとに集計"""
+        acquired_on = func.date(UserStockModel.created_at)
+        rows = self.db.execute(
+            select(
+                UserStockModel.ticker_symbol,
+                acquired_on,
+                func.count(),
+                func.sum(UserStockModel.quantity),
+                func.sum(UserStockModel.quantity * UserStockModel.acquisition_price),
+            ).group_by(UserStockModel.ticker_symbol, acquired_on)
+        )
+        return [
+            LotSummary(
+                ticker_symbol=symbol,
+                acquired_on=_as_date(day),
+                lots=int(lots),
+                quantity=int(quantity),
+                cost_basis=Decimal(str(cost)),
+            )
+            for symbol, day, lots, quantity, cost in rows
+        ]
+
+    async def replace_all(self, rollups: Sequence[SymbolHoldingRollup]) -> None:
+        """全行を1つのトランザクションで置き換える"""
+        self.db.execute(delete(SymbolHoldingRollupModel))
+        if rollups:
+            self.db.execute(insert(SymbolHoldingRollupModel), [
+                {
+                    "ticker_symbol": rollup.ticker_symbol,
+                    "holders": rollup.holders,
+                    "total_quantity": rollup.total_quantity,
+                    "cost_basis": rollup.cost_basis,
+                }
+                for rollup in rollups
+            ])
+        self.db.commit()
+
+    @staticmethod
+    def _to_entity(row) -> SymbolHoldingRollup:
+        symbol, holders, total_quantity, cost_basis = row
+        return SymbolHoldingRollup(
+            ticker_symbol=symbol,
+            holders=int(holders),
+            total_quantity=int(total_quantity),
+            cost_basis=Decimal(str(cost_basis)).quantize(Decimal("0.01")),
+        )
+
+
+def _as_date(value) -> date:
+    """DATE()の結果（ドライバーによっては文字列）を日付にする。取得日がなければ分割を反映しない"""
+    if value is None:
+        return date.max
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
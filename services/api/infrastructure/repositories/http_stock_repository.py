@@ -0,0 +1,48 @@
+import os
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote
+
+import httpx
+
+from domain.entities.stock import Stock
+from domain.repositories.stock_repository import StockRepository
+
+# 株価APIへの1回の問い合わせの上限秒数
+QUOTE_PROVIDER_TIMEOUT_SECONDS = float(os.getenv("QUOTE_PROVIDER_TIMEOUT_SECONDS", "5"))
+
+
+class HttpStockRepository(StockRepository):
+    """HTTPのJSON APIから株価を取得するリポジトリ
+
+    GET {base_url}/quotes/{symbol} が {"symbol", "name", "price", "currency", "timestamp"}
+    を返すAPIを想定する。銘柄がなければ（404）Noneを返し、通信エラーや5xx、
+    解釈できない応答は例外のまま呼び出し側（フェイルオーバーする側）に伝える。
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = QUOTE_PROVIDER_TIMEOUT_SECONDS,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.client = client or httpx.AsyncClient(timeout=timeout)
+
+    async def get_stock_price(self, symbol: str) -> Optional[Stock]:
+        response = await self.client.get(f"{self.base_url}/quotes/{quote(symbol, safe='')}")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        data = response.json()
+        timestamp = data.get("timestamp")
+        return Stock(
+            symbol=data.get("symbol") or symbol,
+            name=data["name"],
+            price=float(data["price"]),
+            currency=data.get("currency") or "JPY",
+            timestamp=datetime.fromisoformat(timestamp) if timestamp else datetime.now(),
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
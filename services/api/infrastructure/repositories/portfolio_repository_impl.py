@@ -0,0 +1,376 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.portfolio import Portfolio, PortfolioItem
+from domain.exceptions import DuplicatePortfolioItemError
+from domain.repositories.portfolio_repository import PortfolioRepository
+from domain.services.portfolio_valuation import (
+    gain_loss,
+    market_value,
+    market_values,
+    to_price,
+    value_delta,
+)
+from domain.services.split_adjustment import SplitAdjustments
+from domain.value_objects.money import (
+    PRICE_SCALE,
+    QUANTITY_SCALE,
+    RATE_SCALE,
+    MoneyArray,
+    decimals,
+    minor_units,
+    round_div,
+    to_units,
+)
+from infrastructure.models.portfolio import PortfolioItemModel, PortfolioModel
+from sqlalchemy import BigInteger, bindparam, cast, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# portfolio_items.market_value の列精度（DECIMAL(20, 2)）
+MARKET_VALUE_SCALE = 2
+
+# 合計評価額への差分加算（executemanyで一括実行する）
+_ADD_TO_TOTAL = (
+    PortfolioModel.__table__.update()
+    .where(PortfolioModel.__table__.c.id == bindparam("target_id"))
+    .values(total_value=PortfolioModel.__table__.c.total_value + bindparam("delta"))
+)
+
+
+def _units(column, scale: int):
+    """数値列をスケール済み整数として読み込む（ドライバーでDecimalを生成させない）"""
+    return cast(func.round(column * 10**scale), BigInteger)
+
+
+class SQLPortfolioRepository(PortfolioRepository):
+    """SQLAlchemyを使用したポートフォリオリポジトリの実装
+
+    portfolios.total_value は明細の market_value の合計と常に一致するよう、
+    明細を変更する処理と同じトランザクションで差分のみを加算する。
+    差分のもとにした明細をコミットまでに他の処理が変更・削除すると合計がずれ続けるため、
+    差分を求める明細は行ロック付き（SELECT ... FOR UPDATE）で読み込む。
+
+    adjustmentsを指定した場合、株価・為替の更新では明細の登録日より後に権利落ちした
+    分割・併合を株数に反映して評価する（保存済みの株数は書き換えない）。
+    """
+
+    def __init__(self, db: Session, adjustments: Optional[SplitAdjustments] = None):
+        self.db = db
+        self.adjustments = adjustments
+
+    async def create(self, portfolio: Portfolio) -> Portfolio:
+        """ポートフォリオを作成"""
+        portfolio_model = PortfolioModel(
+            user_id=portfolio.user_id,
+            name=portfolio.name,
+            description=portfolio.description,
+            currency=portfolio.currency,
+            total_value=Decimal("0"),
+        )
+
+        self.db.add(portfolio_model)
+        self.db.flush()
+
+        # portfolio_idにidと同じ値を設定
+        portfolio_model.portfolio_id = portfolio_model.id
+        self.db.commit()
+        self.db.refresh(portfolio_model)
+
+        return Portfolio.model_validate(portfolio_model)
+
+    async def get_by_id(self, portfolio_id: int) -> Optional[Portfolio]:
+        """IDでポートフォリオを取得"""
+        model = self.db.get(PortfolioModel, portfolio_id)
+        return Portfolio.model_validate(model) if model else None
+
+    async def list_by_user_id(self, user_id: int) -> List[Portfolio]:
+        """ユーザーのポートフォリオ一覧を取得（user_idの索引のみを使う1回の読み取り）"""
+        models = self.db.execute(
+            select(PortfolioModel)
+            .where(PortfolioModel.user_id == user_id)
+            .order_by(PortfolioModel.id)
+        ).scalars()
+        return [Portfolio.model_validate(model) for model in models]
+
+    async def delete(self, portfolio_id: int) -> None:
+        """ポートフォリオを明細ごと削除"""
+        self.db.query(PortfolioItemModel).filter(
+            PortfolioItemModel.portfolio_id == portfolio_id
+        ).delete(synchronize_session=False)
+        self.db.query(PortfolioModel).filter(PortfolioModel.id == portfolio_id).delete(
+            synchronize_session=False
+        )
+        self.db.commit()
+
+    async def list_items(self, portfolio_id: int) -> List[PortfolioItem]:
+        """ポートフォリオの明細を取得"""
+        portfolio_currency = self._portfolio_currency(portfolio_id)
+        models = self.db.execute(
+            select(PortfolioItemModel)
+            .where(PortfolioItemModel.portfolio_id == portfolio_id)
+            .order_by(PortfolioItemModel.id)
+        ).scalars()
+        return [self._item_to_entity(model, portfolio_currency) for model in models]
+
+    async def add_item(self, item: PortfolioItem) -> PortfolioItem:
+        """
+        明細を追加
+
+        Raises:
+            DuplicatePortfolioItemError: 同じ銘柄の明細がすでにある場合
+        """
+        portfolio_currency = self._portfolio_currency(item.portfolio_id)
+        current_price = (
+            to_price(item.current_price) if item.current_price is not None else None
+        )
+        value = market_value(
+            item.quantity, current_price, item.fx_rate, item.currency, portfolio_currency
+        )
+        item_model = PortfolioItemModel(
+            portfolio_id=item.portfolio_id,
+            symbol=item.symbol,
+            name=item.name,
+            quantity=item.quantity,
+            average_price=item.average_price,
+            currency=item.currency,
+            current_price=current_price,
+            fx_rate=item.fx_rate,
+            market_value=value,
+            asset_type=item.asset_type,
+        )
+
+        self.db.add(item_model)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            self.db.rollback()
+            raise DuplicatePortfolioItemError(item.portfolio_id, item.symbol)
+
+        # portfolio_item_idにidと同じ値を設定
+        item_model.portfolio_item_id = item_model.id
+        self._add_to_totals({item.portfolio_id: value_delta(None, value)})
+        self.db.commit()
+        self.db.refresh(item_model)
+
+        return self._item_to_entity(item_model, portfolio_currency)
+
+    async def remove_item(self, portfolio_id: int, item_id: int) -> bool:
+        """明細を削除"""
+        item_model = (
+            self.db.query(PortfolioItemModel)
+            .filter(
+                PortfolioItemModel.id == item_id,
+                PortfolioItemModel.portfolio_id == portfolio_id,
+            )
+            .with_for_update()
+            .first()
+        )
+        if item_model is None:
+            return False
+
+        self._add_to_totals({portfolio_id: value_delta(item_model.market_value, None)})
+        self.db.delete(item_model)
+        self.db.commit()
+        return True
+
+    def stream_symbols(self, batch_size: int) -> Iterator[List[str]]:
+        """明細の銘柄コードを1回のSELECT DISTINCTでサーバーサイドカーソルから取得"""
+        result = self.db.execute(
+            select(PortfolioItemModel.symbol)
+            .distinct()
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.scalars().partitions():
+            yield list(partition)
+
+    async def apply_price_ticks(self, prices: Dict[str, Decimal]) -> int:
+        """株価の更新を反映
+
+        数値列はスケール済み整数として読み込み、評価額は通貨ペアごとに整数配列で一括計算する。
+        """
+        if not prices:
+            return 0
+        prices = {symbol: to_price(price) for symbol, price in prices.items()}
+        price_units = {symbol: to_units(price, PRICE_SCALE) for symbol, price in prices.items()}
+
+        rows = self.db.execute(
+            self._locked_valuation_rows(PortfolioItemModel.symbol.in_(prices))
+        )
+
+        groups: Dict[Tuple[str, str], list] = defaultdict(list)
+        for row in rows:
+            if row.current_price != price_units[row.symbol]:
+                groups[(row.currency, row.portfolio_currency)].append(row)
+
+        item_updates = []
+        deltas: Dict[int, Decimal] = defaultdict(Decimal)
+        for (currency, portfolio_currency), changed in groups.items():
+            values = market_values(
+                self._split_adjusted_quantities(changed),
+                np.array([price_units[row.symbol] for row in changed]),
+                np.array([row.fx_rate for row in changed]),
+                currency,
+                portfolio_currency,
+            )
+            for row, value, delta in self._with_deltas(changed, values, portfolio_currency):
+                deltas[row.portfolio_id] += delta
+                item_updates.append(
+                    {"id": row.id, "current_price": prices[row.symbol], "market_value": value}
+                )
+
+        return self._apply_item_updates(item_updates, deltas)
+
+    async def apply_fx_tick(
+        self, currency: str, portfolio_currency: str, rate: Decimal
+    ) -> int:
+        """為替レートの更新を反映"""
+        rate = Decimal(str(rate))
+        rate_units = to_units(rate, RATE_SCALE)
+        rows = self.db.execute(
+            self._locked_valuation_rows(
+                PortfolioItemModel.currency == currency,
+                PortfolioModel.currency == portfolio_currency,
+            )
+        )
+
+        changed = [row for row in rows if row.fx_rate != rate_units]
+        # 価格未取得の明細はレートのみ更新する（評価額はNULLのまま）
+        item_updates = [
+            {"id": row.id, "fx_rate": rate, "market_value": None}
+            for row in changed
+            if row.current_price is None
+        ]
+        priced = [row for row in changed if row.current_price is not None]
+        deltas: Dict[int, Decimal] = defaultdict(Decimal)
+        if priced:
+            values = market_values(
+                self._split_adjusted_quantities(priced),
+                np.array([row.current_price for row in priced]),
+                rate_units,
+                currency,
+                portfolio_currency,
+            )
+            for row, value, delta in self._with_deltas(priced, values, portfolio_currency):
+                deltas[row.portfolio_id] += delta
+                item_updates.append({"id": row.id, "fx_rate": rate, "market_value": value})
+
+        return self._apply_item_updates(item_updates, deltas)
+
+    @staticmethod
+    def _valuation_columns():
+        """評価額の再計算に使う列（数値列はスケール済み整数）"""
+        return select(
+            PortfolioItemModel.id,
+            PortfolioItemModel.portfolio_id,
+            PortfolioItemModel.symbol,
+            PortfolioItemModel.created_at,
+            PortfolioItemModel.currency,
+            PortfolioModel.currency.label("portfolio_currency"),
+            _units(PortfolioItemModel.quantity, QUANTITY_SCALE).label("quantity"),
+            _units(PortfolioItemModel.current_price, PRICE_SCALE).label("current_price"),
+            _units(PortfolioItemModel.fx_rate, RATE_SCALE).label("fx_rate"),
+            _units(PortfolioItemModel.market_value, MARKET_VALUE_SCALE).label("market_value"),
+        )
+
+    @classmethod
+    def _locked_valuation_rows(cls, *conditions):
+        """条件に合う明細の評価額の列を、明細の行ロック付きで読み込むSELECT
+
+        ロックの順序を揃えてデッドロックを避けるため、明細のID順に読み込む。
+        """
+        return (
+            cls._valuation_columns()
+            .join(PortfolioModel, PortfolioModel.id == PortfolioItemModel.portfolio_id)
+            .where(*conditions)
+            .order_by(PortfolioItemModel.id)
+            .with_for_update(of=PortfolioItemModel)
+        )
+
+    def _split_adjusted_quantities(self, rows: list) -> np.ndarray:
+        """明細の株数（スケール済み整数）に、登録日より後に権利落ちした分割の倍率を掛ける
+
+        まだ権利落ちしていない分割は株価にも反映されていないため含めない。
+        """
+        quantities = np.array([row.quantity for row in rows], dtype=np.int64)
+        if not self.adjustments:
+            return quantities
+        as_of = self.adjustments.as_of
+        positions: Dict[str, List[int]] = defaultdict(list)
+        for position, row in enumerate(rows):
+            positions[row.symbol].append(position)
+        for symbol, indexes in positions.items():
+            lot_days = [
+                rows[i].created_at.date() if rows[i].created_at else as_of for i in indexes
+            ]
+            factors = self.adjustments.factors(symbol, lot_days, as_of)
+            if (factors == 1.0).all():
+                continue
+            # 浮動小数点の誤差で端数が減らないよう僅かに足してから切り捨てる
+            quantities[indexes] = np.floor(quantities[indexes] * factors + 1e-6)
+        return quantities
+
+    @staticmethod
+    def _with_deltas(rows: list, values: MoneyArray, portfolio_currency: str):
+        """新しい評価額（Decimal）と、保存済みの評価額からの差分（Decimal）を明細ごとに返す"""
+        scale = minor_units(portfolio_currency)
+        old = MoneyArray(
+            [
+                round_div((row.market_value or 0) * 10**scale, 10**MARKET_VALUE_SCALE)
+                for row in rows
+            ],
+            portfolio_currency,
+        )
+        return zip(rows, values.to_decimals(), decimals((values - old).minor, scale))
+
+    def _apply_item_updates(self, item_updates: List[dict], deltas: Dict[int, Decimal]) -> int:
+        """明細の一括更新と合計への差分加算を1トランザクションで行う"""
+        if not item_updates:
+            return 0
+        self.db.execute(update(PortfolioItemModel), item_updates)
+        self._add_to_totals(deltas)
+        self.db.commit()
+        return len(item_updates)
+
+    def _add_to_totals(self, deltas: Dict[int, Decimal]) -> None:
+        params = [
+            {"target_id": portfolio_id, "delta": delta}
+            for portfolio_id, delta in deltas.items()
+            if delta
+        ]
+        if params:
+            self.db.execute(_ADD_TO_TOTAL, params)
+
+    def _portfolio_currency(self, portfolio_id: int) -> str:
+        return self.db.get(PortfolioModel, portfolio_id).currency
+
+    def _item_to_entity(self, model: PortfolioItemModel, portfolio_currency: str) -> PortfolioItem:
+        """モデルをエンティティに変換"""
+        gain, percent = gain_loss(
+            model.quantity,
+            model.average_price,
+            model.fx_rate,
+            model.market_value,
+            model.currency,
+            portfolio_currency,
+        )
+        return PortfolioItem(
+            id=model.id,
+            portfolio_id=model.portfolio_id,
+            symbol=model.symbol,
+            name=model.name,
+            quantity=model.quantity,
+            average_price=model.average_price,
+            currency=model.currency,
+            current_price=model.current_price,
+            fx_rate=model.fx_rate,
+            market_value=model.market_value,
+            gain_loss=gain,
+            gain_loss_percent=percent,
+            asset_type=model.asset_type,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+        )
@@ -0,0 +1,78 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from domain.entities.portfolio_snapshot import PortfolioSnapshot
+from domain.repositories.portfolio_snapshot_repository import PortfolioSnapshotRepository
+from domain.services.portfolio_snapshot import BASE_CURRENCY
+from domain.value_objects.money import from_units, minor_units, to_units
+from infrastructure.models.portfolio_snapshot import PortfolioSnapshotModel
+
+
+class SQLPortfolioSnapshotRepository(PortfolioSnapshotRepository):
+    """SQLAlchemyを使用した日次のポートフォリオ評価リポジトリの実装"""
+
+    def __init__(self, db: Session, currency: str = BASE_CURRENCY):
+        self.db = db
+        self.scale = minor_units(currency)
+
+    async def save_day(self, snapshot_date: date, snapshots: Sequence[PortfolioSnapshot]) -> None:
+        """1日分の評価をまとめて保存（再実行した場合は同じユーザー・日付の行を置き換える）"""
+        if not snapshots:
+            return
+        self.db.execute(
+            delete(PortfolioSnapshotModel).where(
+                PortfolioSnapshotModel.snapshot_date == snapshot_date,
+                PortfolioSnapshotModel.user_id.in_([s.user_id for s in snapshots]),
+            )
+        )
+        self.db.execute(insert(PortfolioSnapshotModel), [
+            {
+                "user_id": snapshot.user_id,
+                "snapshot_date": snapshot_date,
+                "total_value": to_units(snapshot.total_value, self.scale),
+                "cost_basis": to_units(snapshot.cost_basis, self.scale),
+                "exposures": {
+                    currency: to_units(value, self.scale)
+                    for currency, value in snapshot.exposures.items()
+                },
+                "excluded_holdings": snapshot.excluded_holdings,
+            }
+            for snapshot in snapshots
+        ])
+        self.db.commit()
+
+    async def list_range(self, user_id: int, start: date, end: date) -> List[PortfolioSnapshot]:
+        """期間内の評価を主キーの範囲で取得"""
+        rows = self.db.execute(
+            select(
+                PortfolioSnapshotModel.snapshot_date,
+                PortfolioSnapshotModel.total_value,
+                PortfolioSnapshotModel.cost_basis,
+                PortfolioSnapshotModel.exposures,
+                PortfolioSnapshotModel.excluded_holdings,
+            )
+            .where(
+                PortfolioSnapshotModel.user_id == user_id,
+                PortfolioSnapshotModel.snapshot_date >= start,
+                PortfolioSnapshotModel.snapshot_date <= end,
+            )
+            .order_by(PortfolioSnapshotModel.snapshot_date)
+        )
+        return [
+            PortfolioSnapshot(
+                user_id=user_id,
+                snapshot_date=snapshot_date,
+                total_value=from_units(total_value, self.scale),
+                cost_basis=from_units(cost_basis, self.scale),
+                exposures=self._exposures(exposures),
+                excluded_holdings=excluded_holdings,
+            )
+            for snapshot_date, total_value, cost_basis, exposures, excluded_holdings in rows
+        ]
+
+    def _exposures(self, exposures: Dict[str, int]) -> Dict[str, Decimal]:
+        return {currency: from_units(units, self.scale) for currency, units in exposures.items()}
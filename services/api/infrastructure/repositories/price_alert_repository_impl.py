@@ -0,0 +1,83 @@
+from decimal import Decimal
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from domain.entities.price_alert import AlertStatus, AlertTrigger, PriceAlert
+from domain.repositories.price_alert_repository import PriceAlertRepository
+from infrastructure.models.price_alert import PriceAlertModel
+
+
+class SQLPriceAlertRepository(PriceAlertRepository):
+    """SQLAlchemyを使用した株価アラートリポジトリの実装"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def create(self, alert: PriceAlert) -> PriceAlert:
+        """アラートを登録"""
+        model = PriceAlertModel(
+            user_id=alert.user_id,
+            symbol=alert.symbol,
+            condition=alert.condition.value,
+            threshold=alert.threshold,
+            reference_price=alert.reference_price,
+            status=alert.status.value,
+        )
+        self.db.add(model)
+        self.db.commit()
+        self.db.refresh(model)
+        return PriceAlert.model_validate(model)
+
+    async def get_by_id(self, alert_id: int) -> Optional[PriceAlert]:
+        """IDでアラートを取得"""
+        model = self.db.get(PriceAlertModel, alert_id)
+        return PriceAlert.model_validate(model) if model else None
+
+    async def list_by_user_id(self, user_id: int) -> List[PriceAlert]:
+        """ユーザーのアラートを新しい順に取得"""
+        models = self.db.query(PriceAlertModel).filter(
+            PriceAlertModel.user_id == user_id
+        ).order_by(PriceAlertModel.id.desc()).all()
+        return [PriceAlert.model_validate(model) for model in models]
+
+    async def delete(self, alert_id: int) -> None:
+        """アラートを削除"""
+        self.db.query(PriceAlertModel).filter(PriceAlertModel.id == alert_id).delete()
+        self.db.commit()
+
+    def stream_active(self, after_id: int, batch_size: int) -> Iterator[List[PriceAlert]]:
+        """有効なアラートを(status, id)の索引順にサーバーサイドカーソルから取得"""
+        result = self.db.execute(
+            select(PriceAlertModel)
+            .where(
+                PriceAlertModel.status == AlertStatus.ACTIVE.value,
+                PriceAlertModel.id > after_id,
+            )
+            .order_by(PriceAlertModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.scalars().partitions():
+            yield [PriceAlert.model_validate(model) for model in partition]
+
+    async def mark_triggered(self, triggers: Sequence[AlertTrigger]) -> List[AlertTrigger]:
+        """有効なものだけを更新し、削除・発火済みのアラートは通知しない"""
+        marked = []
+        for trigger in triggers:
+            result = self.db.execute(
+                update(PriceAlertModel)
+                .where(
+                    PriceAlertModel.id == trigger.alert_id,
+                    PriceAlertModel.status == AlertStatus.ACTIVE.value,
+                )
+                .values(
+                    status=AlertStatus.TRIGGERED.value,
+                    triggered_price=Decimal(str(trigger.price)),
+                    triggered_at=trigger.triggered_at,
+                )
+            )
+            if result.rowcount == 1:
+                marked.append(trigger)
+        self.db.commit()
+        return marked
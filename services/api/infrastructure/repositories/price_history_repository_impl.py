@@ -0,0 +1,96 @@
+import asyncio
+import csv
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from domain.repositories.price_history_repository import PriceHistoryRepository
+from domain.services.market_calendar import TSE, MarketCalendar
+from infrastructure.config.market_calendar import get_market_calendar
+
+logger = logging.getLogger(__name__)
+
+# 株価履歴の取得元（fixture: 同梱のサンプルデータ, yfinance: Yahoo Finance）
+PRICE_HISTORY_SOURCE = os.getenv("PRICE_HISTORY_SOURCE", "fixture")
+PRICE_HISTORY_FILE = os.getenv(
+    "PRICE_HISTORY_FILE",
+    os.path.join(os.path.dirname(__file__), "..", "data", "price_history_sample.csv"),
+)
+
+
+class FixturePriceHistoryRepository(PriceHistoryRepository):
+    """CSV（date,symbol,close）から株価履歴を返すリポジトリ（開発・テスト用）"""
+
+    def __init__(self, path: str = PRICE_HISTORY_FILE):
+        self.path = path
+        self._histories: Optional[Dict[str, List[Tuple[date, float]]]] = None
+        self._dates: Dict[str, List[date]] = {}
+
+    async def get_daily_closes(
+        self, symbol: str, start: date, end: date
+    ) -> List[Tuple[date, float]]:
+        history = self._load().get(symbol, [])
+        days = self._dates.get(symbol, [])
+        return history[bisect_left(days, start) : bisect_right(days, end)]
+
+    def _load(self) -> Dict[str, List[Tuple[date, float]]]:
+        """初回アクセス時にファイル全体を読み込み、銘柄ごとに日付順で保持する"""
+        if self._histories is None:
+            histories: Dict[str, List[Tuple[date, float]]] = defaultdict(list)
+            with open(self.path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    histories[row["symbol"]].append(
+                        (date.fromisoformat(row["date"]), float(row["close"]))
+                    )
+            for symbol, history in histories.items():
+                history.sort()
+                self._dates[symbol] = [day for day, _ in history]
+            self._histories = dict(histories)
+        return self._histories
+
+
+class YFinancePriceHistoryRepository(PriceHistoryRepository):
+    """Yahoo Financeから株価履歴を取得するリポジトリ
+
+    東証の銘柄コードはYahoo Financeの表記（例: 7974.T）に変換して問い合わせる。
+    終値はauto_adjustで分割調整済みのものを取得する。
+    """
+
+    split_adjusted = True
+
+    def __init__(self, calendar: MarketCalendar):
+        self.calendar = calendar
+
+    async def get_daily_closes(
+        self, symbol: str, start: date, end: date
+    ) -> List[Tuple[date, float]]:
+        return await asyncio.to_thread(self._download, symbol, start, end)
+
+    def _download(self, symbol: str, start: date, end: date) -> List[Tuple[date, float]]:
+        import yfinance as yf
+
+        ticker = f"{symbol}.T" if self.calendar.market_for_symbol(symbol) == TSE else symbol
+        try:
+            frame = yf.Ticker(ticker).history(
+                start=start.isoformat(), end=(end + timedelta(days=1)).isoformat(), auto_adjust=True
+            )
+        except Exception:
+            logger.warning("Failed to download price history", extra={"symbol": symbol})
+            return []
+        return [
+            (timestamp.date(), float(close))
+            for timestamp, close in frame["Close"].items()
+            if close == close  # NaNを除外
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_price_history_repository() -> PriceHistoryRepository:
+    """設定された取得元の株価履歴リポジトリを取得（プロセス内で共有する）"""
+    if PRICE_HISTORY_SOURCE == "yfinance":
+        return YFinancePriceHistoryRepository(get_market_calendar())
+    return FixturePriceHistoryRepository()
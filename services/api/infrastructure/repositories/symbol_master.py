@@ -0,0 +1,39 @@
+import csv
+import logging
+import os
+from functools import lru_cache
+from typing import List
+
+from domain.entities.stock import ListedSymbol
+from domain.services.symbol_search import SymbolIndex
+
+logger = logging.getLogger(__name__)
+
+# 上場銘柄マスタ（symbol,exchange,name_en,name_ja,name_kana のCSV）
+SYMBOL_LISTING_FILE = os.getenv(
+    "SYMBOL_LISTING_FILE",
+    os.path.join(os.path.dirname(__file__), "..", "data", "symbol_listing.csv"),
+)
+
+
+def load_listed_symbols(path: str = SYMBOL_LISTING_FILE) -> List[ListedSymbol]:
+    """上場銘柄マスタのCSVを読み込む"""
+    with open(path, encoding="utf-8", newline="") as f:
+        return [
+            ListedSymbol(
+                symbol=row["symbol"],
+                exchange=row["exchange"],
+                name_en=row["name_en"],
+                name_ja=row["name_ja"],
+                name_kana=row["name_kana"],
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+@lru_cache
+def get_symbol_index() -> SymbolIndex:
+    """銘柄検索インデックス（プロセスごとに1度だけ構築する）"""
+    index = SymbolIndex(load_listed_symbols())
+    logger.info("Symbol index loaded", extra={"symbols": len(index)})
+    return index
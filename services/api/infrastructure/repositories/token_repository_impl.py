@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from domain.entities.auth import RefreshToken
+from domain.repositories.token_repository import RefreshTokenRepository, RevokedTokenRepository
+from infrastructure.models.token import RefreshTokenModel, RevokedTokenModel
+
+
+class SQLRefreshTokenRepository(RefreshTokenRepository):
+    """SQLAlchemyを使用したリフレッシュトークンリポジトリの実装"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def create(self, refresh_token: RefreshToken) -> RefreshToken:
+        """リフレッシュトークンを保存"""
+        model = RefreshTokenModel(
+            user_id=refresh_token.user_id,
+            token=refresh_token.token_hash,
+            expires_at=refresh_token.expires_at,
+            is_revoked=refresh_token.is_revoked,
+        )
+        self.db.add(model)
+        self.db.flush()
+        # refresh_token_idにidと同じ値を設定
+        model.refresh_token_id = model.id
+        self.db.commit()
+        self.db.refresh(model)
+        return self._model_to_entity(model)
+
+    async def get_by_token_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """トークンのハッシュでリフレッシュトークンを取得"""
+        model = self.db.query(RefreshTokenModel).filter(
+            RefreshTokenModel.token == token_hash
+        ).first()
+        return self._model_to_entity(model) if model else None
+
+    async def revoke(self, refresh_token_id: int) -> bool:
+        """未失効のものだけを更新し、同じトークンでの同時リフレッシュは一方だけを通す"""
+        result = self.db.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.id == refresh_token_id, RefreshTokenModel.is_revoked.is_(False))
+            .values(is_revoked=True)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    async def revoke_all_for_user(self, user_id: int) -> int:
+        """ユーザーの全リフレッシュトークンを失効させる"""
+        result = self.db.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.user_id == user_id, RefreshTokenModel.is_revoked.is_(False))
+            .values(is_revoked=True)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def _model_to_entity(self, model: RefreshTokenModel) -> RefreshToken:
+        return RefreshToken(
+            id=model.id,
+            user_id=model.user_id,
+            token_hash=model.token,
+            expires_at=model.expires_at,
+            is_revoked=bool(model.is_revoked),
+            created_at=model.created_at,
+        )
+
+
+class SQLRevokedTokenRepository(RevokedTokenRepository):
+    """SQLAlchemyを使用した失効アクセストークンリポジトリの実装"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def add(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        """失効リストに追加（既に追加済みなら何もしない）"""
+        self.db.add(RevokedTokenModel(jti=jti, user_id=user_id, expires_at=expires_at))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
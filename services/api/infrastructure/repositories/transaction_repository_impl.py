@@ -0,0 +1,41 @@
+from typing import Iterator, List
+
+from domain.entities.transaction import Transaction
+from domain.repositories.transaction_repository import TransactionRepository
+from infrastructure.models.transaction import TransactionModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+class SQLTransactionRepository(TransactionRepository):
+    """SQLAlchemyを使用した取引履歴リポジトリの実装"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def create(self, transaction: Transaction) -> Transaction:
+        """取引を登録"""
+        transaction_model = TransactionModel(
+            **transaction.model_dump(exclude={"id", "created_at", "updated_at"})
+        )
+
+        self.db.add(transaction_model)
+        self.db.flush()
+
+        # transaction_idにidと同じ値を設定
+        transaction_model.transaction_id = transaction_model.id
+        self.db.commit()
+        self.db.refresh(transaction_model)
+
+        return Transaction.model_validate(transaction_model)
+
+    def stream_by_user_id(self, user_id: int, batch_size: int) -> Iterator[List[Transaction]]:
+        """ユーザーの取引履歴をサーバーサイドカーソルからid順に取得"""
+        result = self.db.execute(
+            select(TransactionModel)
+            .where(TransactionModel.user_id == user_id)
+            .order_by(TransactionModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.scalars().partitions():
+            yield [Transaction.model_validate(model) for model in partition]
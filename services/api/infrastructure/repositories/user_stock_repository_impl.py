@@ -1,8 +1,13 @@
-from typing import List
+from decimal import Decimal
+from typing import Iterator, List, Optional, Sequence
 
 from domain.entities.user_stock import UserStock
 from domain.repositories.user_stock_repository import UserStockRepository
 from infrastructure.models.user_stock import UserStockModel
+from infrastructure.repositories.holding_rollup_repository_impl import SQLHoldingRollupRepository
+from infrastructure.models.user_stock_version import UserStockVersionModel
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 
@@ -22,6 +27,13 @@ class SQLUserStockRepository(UserStockRepository):
         )
 
         self.db.add(user_stock_model)
+        self.db.flush()
+        self._bump_version(user_stock.user_id)
+        SQLHoldingRollupRepository(self.db).apply_new_lot(
+            user_stock.ticker_symbol,
+            user_stock.quantity,
+            user_stock.quantity * Decimal(str(user_stock.acquisition_price)),
+        )
         self.db.commit()
         self.db.refresh(user_stock_model)
 
@@ -32,6 +44,28 @@ class SQLUserStockRepository(UserStockRepository):
 
         return self._model_to_entity(user_stock_model)
 
+    async def get_version(self, user_id: int) -> Optional[int]:
+        """ユーザーの保有株のバージョンを取得"""
+        return self.db.execute(
+            select(UserStockVersionModel.version).where(UserStockVersionModel.user_id == user_id)
+        ).scalar_one_or_none()
+
+    def _bump_version(self, user_id: int) -> None:
+        """保有株の書き込みと同じトランザクションでユーザーのバージョンを上げる"""
+        increment = (
+            update(UserStockVersionModel)
+            .where(UserStockVersionModel.user_id == user_id)
+            .values(version=UserStockVersionModel.version + 1)
+        )
+        if self.db.execute(increment).rowcount:
+            return
+        try:
+            with self.db.begin_nested():
+                self.db.add(UserStockVersionModel(user_id=user_id, version=1))
+        except IntegrityError:
+            # 同時に最初の書き込みをした別のリクエストが行を作った
+            self.db.execute(increment)
+
     async def get_by_user_id(self, user_id: int) -> List[UserStock]:
         """ユーザーIDで保有株リストを取得"""
         user_stocks = self.db.query(UserStockModel).filter(
@@ -40,6 +74,48 @@ class SQLUserStockRepository(UserStockRepository):
 
         return [self._model_to_entity(stock) for stock in user_stocks]
 
+    async def list_holder_ids(self, after_user_id: int, limit: int) -> List[int]:
+        """保有株のあるユーザーのIDを(user_id, ticker_symbol)の索引順に取得"""
+        return list(self.db.execute(
+            select(UserStockModel.user_id)
+            .where(UserStockModel.user_id > after_user_id)
+            .distinct()
+            .order_by(UserStockModel.user_id)
+            .limit(limit)
+        ).scalars())
+
+    async def get_by_user_ids(self, user_ids: Sequence[int]) -> List[UserStock]:
+        """複数のユーザーの保有株を1回のSELECTで取得"""
+        if not user_ids:
+            return []
+        models = self.db.execute(
+            select(UserStockModel)
+            .where(UserStockModel.user_id.in_(user_ids))
+            .order_by(UserStockModel.user_id, UserStockModel.ticker_symbol)
+        ).scalars()
+        return [self._model_to_entity(model) for model in models]
+
+    def stream_by_user_id(self, user_id: int, batch_size: int) -> Iterator[List[UserStock]]:
+        """ユーザーの保有株をサーバーサイドカーソルから(user_id, ticker_symbol)の索引順に取得"""
+        result = self.db.execute(
+            select(UserStockModel)
+            .where(UserStockModel.user_id == user_id)
+            .order_by(UserStockModel.ticker_symbol)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.scalars().partitions():
+            yield [self._model_to_entity(model) for model in partition]
+
+    def stream_ticker_symbols(self, batch_size: int) -> Iterator[List[str]]:
+        """保有銘柄コードを1回のSELECT DISTINCTでサーバーサイドカーソルから取得"""
+        result = self.db.execute(
+            select(UserStockModel.ticker_symbol)
+            .distinct()
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.scalars().partitions():
+            yield list(partition)
+
     def _model_to_entity(self, model: UserStockModel) -> UserStock:
         """モデルをエンティティに変換"""
         return UserStock(
@@ -48,7 +124,7 @@ class SQLUserStockRepository(UserStockRepository):
             user_id=model.user_id,
             ticker_symbol=model.ticker_symbol,
             quantity=model.quantity,
-            acquisition_price=float(model.acquisition_price),  # DECIMALをfloatに変換
+            acquisition_price=model.acquisition_price,
             created_at=model.created_at,
             updated_at=model.updated_at,
         )
@@ -0,0 +1,254 @@
+"""バックグラウンドジョブのスケジューラ
+
+アプリのlifespanから全ワーカーで起動するが、ジョブはリーダーロックを
+取得できたワーカーでのみ実行される。リーダーが終了した場合は、
+別のワーカーが次回のジョブ実行時にロックを取得して引き継ぐ。
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Awaitable, Optional, TypeVar
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from application.use_cases.deliver_price_alerts import DeliverPriceAlertsUseCase
+from application.services.split_adjusted_repositories import SplitAdjustedUserStockRepository
+from application.use_cases.reconcile_holding_rollups import ReconcileHoldingRollupsUseCase
+from application.use_cases.record_fx_rate import RecordFxRateUseCase
+from application.use_cases.snapshot_portfolios import SnapshotPortfoliosUseCase
+from application.use_cases.warm_quote_cache import WarmQuoteCacheUseCase
+from domain.repositories.stock_repository import StockRepository
+from domain.services.market_calendar import NYSE, TSE
+from infrastructure.cache.price_alert_engine import price_alert_engine
+from infrastructure.cache.shared_market_data import get_quote_cache, promote_to_writer
+from infrastructure.cache.split_adjustment_cache import split_adjustment_cache
+from infrastructure.config.market_calendar import QUOTE_WARM_INTERVAL_MINUTES, get_market_calendar
+from infrastructure.database import get_session_local
+from infrastructure.external.exchange_rate_client import ExchangeRateClient
+from infrastructure.leader_lock import leader_lock
+from infrastructure.repositories.fx_history_store import get_fx_history_store
+from infrastructure.repositories.hedged_stock_repository import create_quote_upstream
+from infrastructure.repositories.holding_rollup_repository_impl import SQLHoldingRollupRepository
+from infrastructure.repositories.portfolio_repository_impl import SQLPortfolioRepository
+from infrastructure.repositories.portfolio_snapshot_repository_impl import (
+    SQLPortfolioSnapshotRepository,
+)
+from infrastructure.repositories.price_alert_repository_impl import SQLPriceAlertRepository
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+QUOTE_WARM_BATCH_SIZE = int(os.getenv("QUOTE_WARM_BATCH_SIZE", "100"))
+# 日次のポートフォリオ評価で1回に読み込むユーザー数
+PORTFOLIO_SNAPSHOT_CHUNK_SIZE = int(os.getenv("PORTFOLIO_SNAPSHOT_CHUNK_SIZE", "500"))
+
+TSE_TIMEZONE = "Asia/Tokyo"
+NYSE_TIMEZONE = "America/New_York"
+
+T = TypeVar("T")
+
+
+def run_as_leader(job_name: str) -> bool:
+    """リーダーでなければジョブをスキップする（リーダーになった時点で共有メモリの書き込み権限を得る）"""
+    if not leader_lock.try_acquire():
+        logger.debug("Skipping %s: not the leader", job_name)
+        return False
+    promote_to_writer()
+    return True
+
+
+async def _closing_upstream(job: Awaitable[T], stock_repository: StockRepository) -> T:
+    """ジョブを実行し、株価APIの接続を同じイベントループの中で閉じる"""
+    try:
+        return await job
+    finally:
+        await stock_repository.aclose()
+
+
+def warm_quote_cache_job(market: Optional[str] = None) -> None:
+    """保有銘柄の株価と為替レートをキャッシュへ事前取得し、ポートフォリオ評価額と株価アラートに反映する
+
+    marketを指定した場合、その取引所の休場日には実行しない。
+    """
+    if market is not None:
+        calendar = get_market_calendar()
+        today = datetime.now(calendar.exchanges[market].tz).date()
+        if not calendar.is_trading_day(market, today):
+            return
+
+    if not run_as_leader("warm_quote_cache"):
+        return
+
+    cache = get_quote_cache()
+    session_local = get_session_local()
+    db = session_local()
+    try:
+        adjustments = asyncio.run(split_adjustment_cache.get(session_local))
+        price_alert_engine.sync(SQLPriceAlertRepository(db))
+        # 接続はasyncio.runのイベントループごとに作る（APIワーカーの上流とは共有しない）
+        stock_repository = create_quote_upstream()
+        use_case = WarmQuoteCacheUseCase(
+            user_stock_repository=SQLUserStockRepository(db),
+            stock_repository=stock_repository,
+            exchange_rate_client=ExchangeRateClient(),
+            quote_cache=cache,
+            batch_size=QUOTE_WARM_BATCH_SIZE,
+            portfolio_repository=SQLPortfolioRepository(db, adjustments),
+            price_alert_engine=price_alert_engine,
+        )
+        written = asyncio.run(_closing_upstream(use_case.execute(), stock_repository))
+        logger.info("Quote cache warmed", extra={"written": written})
+        delivered = asyncio.run(
+            DeliverPriceAlertsUseCase(SQLPriceAlertRepository(db), price_alert_engine.queue).execute()
+        )
+        if delivered:
+            logger.info("Price alerts delivered", extra={"delivered": len(delivered)})
+    except Exception:
+        logger.exception("Failed to warm quote cache")
+    finally:
+        db.close()
+
+
+def record_fx_history_job() -> None:
+    """当日のUSD/JPYを日次為替レートの履歴に追記する"""
+    if not run_as_leader("record_fx_history"):
+        return
+
+    today = datetime.now(get_market_calendar().exchanges[TSE].tz).date()
+    try:
+        rate = RecordFxRateUseCase(ExchangeRateClient(), get_fx_history_store()).execute(today)
+        if rate is None:
+            logger.warning("USD/JPY rate unavailable; FX history not recorded")
+        else:
+            logger.info("FX history recorded", extra={"rate": rate})
+    except Exception:
+        logger.exception("Failed to record FX history")
+
+
+def snapshot_portfolios_job() -> None:
+    """前日（東証の日付）の終値で全ユーザーの保有株を評価し、日次の評価として保存する
+
+    東証の大引けとNYSEの引け（日本時間の翌朝）の両方が済んだ後に実行する。
+    """
+    if not run_as_leader("snapshot_portfolios"):
+        return
+
+    snapshot_date = datetime.now(get_market_calendar().exchanges[TSE].tz).date() - timedelta(days=1)
+    session_local = get_session_local()
+    db = session_local()
+    try:
+        adjustments = asyncio.run(split_adjustment_cache.get(session_local))
+        stock_repository = create_quote_upstream()
+        use_case = SnapshotPortfoliosUseCase(
+            user_stock_repository=SplitAdjustedUserStockRepository(
+                SQLUserStockRepository(db), adjustments
+            ),
+            stock_repository=stock_repository,
+            snapshot_repository=SQLPortfolioSnapshotRepository(db),
+            fx_history=get_fx_history_store().history(),
+            chunk_size=PORTFOLIO_SNAPSHOT_CHUNK_SIZE,
+            batch_size=QUOTE_WARM_BATCH_SIZE,
+        )
+        written = asyncio.run(
+            _closing_upstream(use_case.execute(snapshot_date), stock_repository)
+        )
+        logger.info(
+            "Portfolio snapshots recorded",
+            extra={"date": snapshot_date.isoformat(), "users": written},
+        )
+    except Exception:
+        logger.exception("Failed to record portfolio snapshots")
+    finally:
+        db.close()
+
+
+def reconcile_holding_rollups_job() -> None:
+    """保有株のテーブルから銘柄ごとの集計を作り直す（利用の少ない深夜に実行）"""
+    if not run_as_leader("reconcile_holding_rollups"):
+        return
+
+    session_local = get_session_local()
+    db = session_local()
+    try:
+        adjustments = asyncio.run(split_adjustment_cache.get(session_local))
+        drifted = asyncio.run(
+            ReconcileHoldingRollupsUseCase(SQLHoldingRollupRepository(db), adjustments).execute()
+        )
+        logger.info("Holding rollups reconciled", extra={"drifted": drifted})
+    except Exception:
+        logger.exception("Failed to reconcile holding rollups")
+    finally:
+        db.close()
+
+
+def create_scheduler() -> BackgroundScheduler:
+    """ジョブを登録したスケジューラを作成（起動はしない）"""
+    scheduler = BackgroundScheduler(
+        timezone=TSE_TIMEZONE,
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 300},
+    )
+
+    interval = f"*/{QUOTE_WARM_INTERVAL_MINUTES}"
+
+    # 起動直後に1回（日中の再起動でもキャッシュを温める）
+    scheduler.add_job(
+        warm_quote_cache_job, id="warm_quotes_startup", next_run_time=datetime.now()
+    )
+    # 東証: 寄り付き前と立会時間中
+    scheduler.add_job(
+        warm_quote_cache_job,
+        CronTrigger(day_of_week="mon-fri", hour=8, minute=30, timezone=TSE_TIMEZONE),
+        kwargs={"market": TSE},
+        id="warm_quotes_tse_pre_open",
+    )
+    scheduler.add_job(
+        warm_quote_cache_job,
+        CronTrigger(day_of_week="mon-fri", hour="9-15", minute=interval, timezone=TSE_TIMEZONE),
+        kwargs={"market": TSE},
+        id="warm_quotes_tse_session",
+    )
+    # NYSE: 寄り付き前と立会時間中
+    scheduler.add_job(
+        warm_quote_cache_job,
+        CronTrigger(day_of_week="mon-fri", hour=9, minute=0, timezone=NYSE_TIMEZONE),
+        kwargs={"market": NYSE},
+        id="warm_quotes_nyse_pre_open",
+    )
+    scheduler.add_job(
+        warm_quote_cache_job,
+        CronTrigger(day_of_week="mon-fri", hour="9-15", minute=interval, timezone=NYSE_TIMEZONE),
+        kwargs={"market": NYSE},
+        id="warm_quotes_nyse_session",
+    )
+    # 為替レートの履歴: 東証の大引け後に当日分を記録
+    scheduler.add_job(
+        record_fx_history_job,
+        CronTrigger(day_of_week="mon-fri", hour=16, minute=0, timezone=TSE_TIMEZONE),
+        id="record_fx_history",
+    )
+    # 日次のポートフォリオ評価: NYSEの引け後（日本時間の火〜土の朝）に前日分を保存
+    scheduler.add_job(
+        snapshot_portfolios_job,
+        CronTrigger(day_of_week="tue-sat", hour=7, minute=0, timezone=TSE_TIMEZONE),
+        id="snapshot_portfolios",
+    )
+    # 銘柄ごとの保有株の集計: 毎日深夜に保有株のテーブルから作り直す
+    scheduler.add_job(
+        reconcile_holding_rollups_job,
+        CronTrigger(hour=3, minute=0, timezone=TSE_TIMEZONE),
+        id="reconcile_holding_rollups",
+    )
+    return scheduler
+
+
+def start_scheduler() -> Optional[BackgroundScheduler]:
+    """設定で有効な場合のみスケジューラを起動する"""
+    if not SCHEDULER_ENABLED:
+        return None
+    scheduler = create_scheduler()
+    scheduler.start()
+    return scheduler
@@ -1,8 +1,18 @@
+import asyncio
+import os
+
 from passlib.context import CryptContext
 
 # パスワードハッシュ化の設定
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# ワーカーごとに同時に行うパスワード検証（bcrypt）の上限
+PASSWORD_VERIFY_MAX_CONCURRENCY = int(
+    os.getenv("PASSWORD_VERIFY_MAX_CONCURRENCY", str(os.cpu_count() or 2))
+)
+# 上限に達しているときに空きを待つ最大秒数（過ぎたら429を返す）
+PASSWORD_VERIFY_WAIT_SECONDS = float(os.getenv("PASSWORD_VERIFY_WAIT_SECONDS", "0.5"))
+
 
 def hash_password(password: str) -> str:
     """パスワードをハッシュ化"""
@@ -12,3 +22,52 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """パスワードを検証"""
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordVerificationBusy(Exception):
+    """同時に行うパスワード検証が上限に達している"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Too many concurrent password verifications")
+        self.retry_after = retry_after
+
+
+class PasswordVerifier:
+    """同時実行数を制限してパスワードを検証する
+
+    bcryptはイベントループを止めないようスレッドで実行し、同時に実行する数はセマフォで
+    上限を設ける。空きを待てなかった試行は検証せずにPasswordVerificationBusyを送出する。
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = PASSWORD_VERIFY_MAX_CONCURRENCY,
+        wait_seconds: float = PASSWORD_VERIFY_WAIT_SECONDS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.wait_seconds = wait_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        パスワードを検証する
+
+        Raises:
+            PasswordVerificationBusy: wait_seconds以内に空きができなかった場合
+        """
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.wait_seconds)
+        except asyncio.TimeoutError:
+            raise PasswordVerificationBusy(retry_after=1.0)
+        try:
+            return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+        finally:
+            self._semaphore.release()
+
+
+password_verifier = PasswordVerifier()
+
+
+def get_password_verifier() -> PasswordVerifier:
+    """ワーカー内で共有するパスワード検証の同時実行の制限"""
+    return password_verifier
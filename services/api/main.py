@@ -1,28 +1,76 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from presentation.routes import health, auth, stock, exchange_rate, user_stock
+from infrastructure.cache.revocation_filter import revocation_list
+from infrastructure.health_monitor import health_monitor
+from infrastructure.logging_config import setup_logging
+from infrastructure.process_pool import shutdown_process_pool
+from infrastructure.repositories.fx_history_store import get_fx_history_store
+from infrastructure.repositories.symbol_master import get_symbol_index
+from infrastructure.scheduler import start_scheduler
+from presentation.middlewares.concurrency_limit import ConcurrencyLimitMiddleware
+from presentation.middlewares.idempotency import IdempotencyMiddleware
+from presentation.middlewares.request_id import RequestIdMiddleware
+from presentation.routes import health, auth, stock, exchange_rate, user_stock, portfolio, transaction, risk, simulation, rebalance, price_alert, dashboard, portfolio_history, admin
+
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 為替レート履歴の保存先が設定されていなければ起動しない
+    get_fx_history_store()
+    scheduler = start_scheduler()
+    # 銘柄検索の初回リクエストで構築を待たないよう起動時に読み込む
+    get_symbol_index()
+    health_monitor.start()
+    revocation_list.start()
+    yield
+    await revocation_list.stop()
+    await health_monitor.stop()
+    if scheduler:
+        scheduler.shutdown(wait=False)
+    shutdown_process_pool()
+
 
 app = FastAPI(
     title="InvestFolio API",
     description="資産管理システムのバックエンドAPI",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# 再送への応答にもCORSヘッダーが付くよう、CORSより内側に置く
+app.add_middleware(IdempotencyMiddleware)
+# 503にもCORSヘッダーとリクエストIDが付くよう、CORSより内側に置く
+app.add_middleware(ConcurrencyLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000", "*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(stock.router)
 app.include_router(exchange_rate.router)
 app.include_router(user_stock.router)
+app.include_router(portfolio.router)
+app.include_router(transaction.router)
+app.include_router(risk.router)
+app.include_router(simulation.router)
+app.include_router(rebalance.router)
+app.include_router(price_alert.router)
+app.include_router(dashboard.router)
+app.include_router(portfolio_history.router)
+app.include_router(admin.router)
 
 @app.get("/")
 async def root():
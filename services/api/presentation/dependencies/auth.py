@@ -1,5 +1,6 @@
 """認証関連の依存性注入"""
 
+import os
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
@@ -7,17 +8,55 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from domain.entities.auth import User
-from infrastructure.database import get_db
+from infrastructure.cache.revocation_filter import revocation_list
+from infrastructure.database import get_read_db
 from infrastructure.repositories.user_repository import SQLUserRepository
 from infrastructure.jwt_utils import verify_token
 
 # Bearer認証スキームの定義
 security = HTTPBearer()
 
+# 管理者のユーザーID（カンマ区切り）
+ADMIN_USER_IDS = frozenset(
+    int(user_id) for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip()
+)
+
+
+def _decode_token(token: str) -> dict:
+    """トークンを検証し、失効済みでないことを確かめてペイロードを返す"""
+    payload = verify_token(token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 失効の確認はメモリ上のフィルターだけで行い、DBは引かない
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+async def get_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict:
+    """
+    検証済みのアクセストークンのペイロードを取得（ログアウトなどjtiが必要な処理用）
+
+    Raises:
+        HTTPException: トークンが無効または失効済みの場合
+    """
+    return _decode_token(credentials.credentials)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> User:
     """
     現在認証されているユーザーを取得
@@ -30,18 +69,9 @@ async def get_current_user(
         認証されたユーザーオブジェクト
 
     Raises:
-        HTTPException: トークンが無効な場合
+        HTTPException: トークンが無効または失効済みの場合
     """
-    token = credentials.credentials
-
-    # トークンを検証
-    payload = verify_token(token)
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    payload = _decode_token(credentials.credentials)
 
     # トークンからユーザーIDを取得
     user_id = payload.get("sub")
@@ -73,11 +103,23 @@ async def get_current_user(
     return user
 
 
+async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    """
+    管理者として認証されたユーザーを取得
+
+    Raises:
+        HTTPException: 管理者でない場合は403
+    """
+    if current_user.id not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user
+
+
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(
         HTTPBearer(auto_error=False)
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Optional[User]:
     """
     オプショナルな認証（認証がなくてもアクセス可能）
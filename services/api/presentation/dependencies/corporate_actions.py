@@ -0,0 +1,15 @@
+"""株式分割の調整に関する依存性注入"""
+
+from fastapi import Depends
+from sqlalchemy.orm import sessionmaker
+
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.cache.split_adjustment_cache import split_adjustment_cache
+from infrastructure.database import get_read_session_local
+
+
+async def get_split_adjustments(
+    session_local: sessionmaker = Depends(get_read_session_local),
+) -> SplitAdjustments:
+    """読み取り時に保有株・株価履歴に掛ける分割の累積倍率"""
+    return await split_adjustment_cache.get(session_local)
@@ -0,0 +1,144 @@
+"""一覧データのストリーミングエクスポート
+
+リポジトリからバッチごとに取得した行をその場でCSV/NDJSONへ変換して送出する。
+全件をメモリに載せないため、件数に関わらずメモリ使用量は一定になる。
+"""
+
+import csv
+import io
+import json
+import os
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+
+# 1回のフェッチで読み込む行数（＝1チャンクに含まれる行数）
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _value(value: Any) -> Any:
+    """JSON/CSVで表現できる値に変換（金額は精度を落とさないよう文字列にする）"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_rows(
+    batches: Iterable[List[Any]], columns: Sequence[str], export_format: ExportFormat
+) -> Iterator[bytes]:
+    """バッチごとにエンコードしたチャンクを返す
+
+    CSVはヘッダーをクエリ実行前に返すため、最初のバイトは結果を待たずに送出される。
+    """
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        # Excelで文字化けしないようBOMを付ける
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+        for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            for row in batch:
+                writer.writerow(
+                    ["" if (v := _value(getattr(row, c))) is None else v for c in columns]
+                )
+            yield buffer.getvalue().encode("utf-8")
+    else:
+        for batch in batches:
+            yield "".join(
+                json.dumps({c: _value(getattr(row, c)) for c in columns}, ensure_ascii=False)
+                + "\n"
+                for row in batch
+            ).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """チャンクを逐次gzip圧縮する（バッチごとにフラッシュしてストリーミングを保つ）"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(request: Request) -> bool:
+    """
+    Accept-Encodingがgzipを受け付けるか
+
+    q値が0（または解釈できない値）のコーディングは拒否とみなす。gzipの指定がなければ
+    「*」のq値に従う。
+    """
+    qualities = {}
+    for part in request.headers.get("accept-encoding", "").lower().split(","):
+        coding, *params = [token.strip() for token in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def export_response(
+    session_local: sessionmaker,
+    fetch_batches: Callable[[Session], Iterable[List[Any]]],
+    columns: Sequence[str],
+    export_format: ExportFormat,
+    filename: str,
+    gzip: bool = False,
+) -> StreamingResponse:
+    """エクスポート用のStreamingResponseを作成
+
+    get_dbのセッションはレスポンス送出前に閉じられるため、
+    ストリーミング中に使うセッションはジェネレーター自身が開いて閉じる。
+    """
+
+    def batches() -> Iterator[List[Any]]:
+        db = session_local()
+        try:
+            yield from fetch_batches(db)
+        finally:
+            db.close()
+
+    body = encode_rows(batches(), columns, export_format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=_MEDIA_TYPES[export_format], headers=headers)
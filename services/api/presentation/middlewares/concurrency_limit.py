@@ -0,0 +1,93 @@
+"""ルートの種類ごとに同時実行数を制限し、溢れたリクエストを早めに503で返すミドルウェア"""
+
+import json
+import logging
+import time
+from typing import Optional, Tuple
+
+from infrastructure.concurrency_limiter import (
+    AUTH,
+    CHEAP,
+    CONCURRENCY_LIMIT_ENABLED,
+    DB,
+    UPSTREAM,
+    ConcurrencyLimiters,
+    ConcurrencyLimitExceeded,
+    concurrency_limiters,
+)
+
+logger = logging.getLogger(__name__)
+
+# パスの前方一致によるルートの種類（先に一致したものを使う。どれにも一致しなければ軽量）
+ROUTE_CLASSES: Tuple[Tuple[str, str], ...] = (
+    ("/health", CHEAP),
+    ("/api/stocks/search", CHEAP),
+    ("/api/exchange-rates/usd-jpy/history", CHEAP),
+    ("/api/auth/", AUTH),
+    ("/api/stocks/", UPSTREAM),
+    ("/api/exchange-rates/", UPSTREAM),
+    ("/api/dashboard", UPSTREAM),
+    ("/api/risk", UPSTREAM),
+    ("/api/portfolio/", UPSTREAM),
+    ("/api/", DB),
+)
+
+_BUSY_BODY = json.dumps({"detail": "Server is busy, please retry"}).encode("utf-8")
+
+
+def route_class(path: str) -> str:
+    for prefix, name in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return name
+    return CHEAP
+
+
+class ConcurrencyLimitMiddleware:
+    """同時実行数の上限と待ち行列を超えたリクエストを処理せずに503で返す
+
+    ルートには届かないため、DB接続やbcrypt・外部APIの呼び出しは行わない。
+    実行枠は本文を送り終えるまで持つが、上限の調整に使うレイテンシは応答の開始までとする
+    （エクスポートなどのストリーミングの本文の送信時間で上限を下げない）。
+    """
+
+    def __init__(self, app, limiters: ConcurrencyLimiters = concurrency_limiters):
+        self.app = app
+        self.limiters = limiters
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not CONCURRENCY_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters.get(route_class(scope["path"]))
+        try:
+            await limiter.acquire()
+        except ConcurrencyLimitExceeded:
+            logger.warning(
+                "Request shed", extra={"route_class": limiter.name, "path": scope["path"]}
+            )
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_BUSY_BODY)).encode("latin-1")),
+                    (b"retry-after", b"1"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": _BUSY_BODY})
+            return
+
+        started = time.monotonic()
+        response_started: Optional[float] = None
+
+        async def send_timed(message):
+            nonlocal response_started
+            if response_started is None and message["type"] == "http.response.start":
+                response_started = time.monotonic()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            limiter.release((response_started or time.monotonic()) - started)
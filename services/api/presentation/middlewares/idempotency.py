@@ -0,0 +1,203 @@
+"""Idempotency-Keyヘッダーによる書き込みリクエストの重複排除を行うミドルウェア
+
+タイムアウト後の再送で同じ保有株が二重に登録されたり、ユーザー登録のパスワードハッシュと
+コミットが繰り返されたりしないよう、キーごとに最初の応答を保存して再送にはそれを返す。
+再送はルートに届く前に応答するため、DBには触れない。処理中に届いた同じキーのリクエストは
+最初のリクエストの完了を待ってから、その応答を返す。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Iterable, Optional
+
+from infrastructure.cache.idempotency_store import (
+    IdempotencyStore,
+    StoredResponse,
+    get_idempotency_store,
+)
+from infrastructure.cache.revocation_filter import revocation_list
+from infrastructure.jwt_utils import verify_token
+
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+
+# 対象とするPOSTのパス
+IDEMPOTENT_PATHS = ("/api/user-stocks/", "/api/auth/register")
+# 処理中の同じキーのリクエストが完了を待つ最大秒数
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+# これより大きい応答は保存しない
+IDEMPOTENCY_MAX_RESPONSE_BYTES = int(os.getenv("IDEMPOTENCY_MAX_RESPONSE_BYTES", "65536"))
+
+_VALID_KEY = re.compile(r"^[\x21-\x7e]{1,255}$")
+# 再送すれば結果が変わり得る応答は保存しない（5xxも同様）
+_RETRYABLE_STATUSES = frozenset({401, 403, 408, 409, 425, 429})
+
+logger = logging.getLogger(__name__)
+
+
+def _principal(authorization: Optional[bytes]) -> Optional[str]:
+    """キーの名前空間（ユーザーごと）。トークンが無効ならNone"""
+    if authorization is None:
+        return "anonymous"
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None or revocation_list.is_revoked(payload.get("jti")):
+        return None
+    return f"user:{payload['sub']}"
+
+
+def _fingerprint(scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b"")):
+        digest.update(part + b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def _send_json(send, status_code: int, payload: dict, headers=()) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _replay(send, response: StoredResponse) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": response.status,
+        "headers": [*response.headers, (REPLAYED_HEADER.encode("latin-1"), b"true")],
+    })
+    await send({"type": "http.response.body", "body": response.body})
+
+
+class IdempotencyMiddleware:
+    """対象パスへのIdempotency-Key付きPOSTについて、最初の応答を保存して再送に返す"""
+
+    def __init__(
+        self,
+        app,
+        paths: Iterable[str] = IDEMPOTENT_PATHS,
+        store: Optional[IdempotencyStore] = None,
+        wait_seconds: float = IDEMPOTENCY_WAIT_SECONDS,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self._store = store
+        self.wait_seconds = wait_seconds
+
+    @property
+    def store(self) -> IdempotencyStore:
+        return self._store if self._store is not None else get_idempotency_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        raw_key = headers.get(IDEMPOTENCY_KEY_HEADER.encode("latin-1"))
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        key = raw_key.decode("latin-1")
+        if not _VALID_KEY.match(key):
+            await _send_json(send, 400, {"detail": "Invalid Idempotency-Key header"})
+            return
+        principal = _principal(headers.get(b"authorization"))
+        if principal is None:
+            # 認証エラーはルートに任せる（保存はしない）
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        fingerprint = _fingerprint(scope, body)
+        store_key = f"{principal}:{key}"
+
+        store = self.store
+        try:
+            while True:
+                record = await store.reserve(store_key, fingerprint)
+                if record is not None and record.response is None:
+                    record = await store.wait(store_key, self.wait_seconds)
+                    if record is None:
+                        # 最初のリクエストが失敗して予約が取り消された。予約からやり直す
+                        continue
+                break
+        except Exception:
+            logger.warning("Idempotency store unavailable", exc_info=True)
+            record, store = None, None
+
+        if record is not None:
+            if record.fingerprint != fingerprint:
+                await _send_json(
+                    send, 422, {"detail": "Idempotency-Key was used with a different request"}
+                )
+            elif record.response is None:
+                await _send_json(
+                    send, 409,
+                    {"detail": "A request with this Idempotency-Key is still in progress"},
+                    headers=[(b"retry-after", b"1")],
+                )
+            else:
+                await _replay(send, record.response)
+            return
+
+        body_sent = False
+
+        async def receive_body():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        response_headers = []
+        response_body = []
+
+        async def capture(message):
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        finally:
+            if store is not None:
+                await self._finish(store, store_key, status_code, response_headers, response_body)
+
+    async def _finish(self, store, store_key, status_code, headers, chunks) -> None:
+        body = b"".join(chunks)
+        try:
+            if (
+                status_code < 500
+                and status_code not in _RETRYABLE_STATUSES
+                and len(body) <= IDEMPOTENCY_MAX_RESPONSE_BYTES
+            ):
+                await store.complete(store_key, StoredResponse(status_code, headers, body))
+            else:
+                await store.release(store_key)
+        except Exception:
+            logger.warning("Failed to record idempotent response", exc_info=True)
@@ -0,0 +1,70 @@
+"""リクエストIDの付与とアクセスログ出力を行うミドルウェア"""
+
+import logging
+import re
+import time
+import uuid
+
+from infrastructure.logging_config import request_id_var
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# 上流（nginx等）から渡されたIDのうち、ログに載せても安全なもののみ引き継ぐ
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+access_logger = logging.getLogger("investfolio.access")
+
+
+class RequestIdMiddleware:
+    """X-Request-IDを引き継ぎ（なければ生成し）、ログとレスポンスヘッダーに付与する
+
+    BaseHTTPMiddlewareを使わない素のASGIミドルウェアとして実装し、
+    リクエストごとのオーバーヘッドを抑える。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER.encode("latin-1"):
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (REQUEST_ID_HEADER.encode("latin-1"), request_id.encode("latin-1"))
+                )
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            access_logger.info(
+                "request completed",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "response_time_ms": round((time.perf_counter() - started) * 1000, 2),
+                },
+            )
+            request_id_var.reset(token)
@@ -0,0 +1,49 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from application.dto.admin_stats_dto import AssetsUnderManagementDTO, SymbolHoldingStatsDTO
+from application.use_cases.get_holding_stats import GetHoldingStatsUseCase
+from infrastructure.cache.shared_market_data import get_quote_cache
+from infrastructure.database import get_read_db
+from infrastructure.repositories.holding_rollup_repository_impl import SQLHoldingRollupRepository
+from presentation.dependencies.auth import get_admin_user
+
+# 集計テーブルだけを読み、保有株のテーブルは走査しない
+router = APIRouter(
+    prefix="/api/admin/stats", tags=["Admin"], dependencies=[Depends(get_admin_user)]
+)
+
+
+def get_holding_stats_use_case(db: Session = Depends(get_read_db)) -> GetHoldingStatsUseCase:
+    return GetHoldingStatsUseCase(SQLHoldingRollupRepository(db), get_quote_cache())
+
+
+@router.get("/most-held", response_model=List[SymbolHoldingStatsDTO])
+async def most_held_symbols(
+    limit: int = Query(20, ge=1, le=500),
+    use_case: GetHoldingStatsUseCase = Depends(get_holding_stats_use_case),
+):
+    """保有ユーザー数の多い銘柄"""
+    return await use_case.most_held(limit)
+
+
+@router.get("/symbols/{ticker_symbol}", response_model=SymbolHoldingStatsDTO)
+async def symbol_holding_stats(
+    ticker_symbol: str,
+    use_case: GetHoldingStatsUseCase = Depends(get_holding_stats_use_case),
+):
+    """銘柄の保有ユーザー数・合計株数・取得価額の合計"""
+    stats = await use_case.symbol(ticker_symbol)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Symbol not held")
+    return stats
+
+
+@router.get("/aum", response_model=AssetsUnderManagementDTO)
+async def assets_under_management(
+    use_case: GetHoldingStatsUseCase = Depends(get_holding_stats_use_case),
+):
+    """取引通貨ごとの預かり資産（キャッシュ済みの株価による評価額と取得価額）"""
+    return await use_case.assets_under_management()
@@ -1,15 +1,38 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
 from application.use_cases.register_user import RegisterUserUseCase
 from application.use_cases.login_user import LoginUserUseCase
-from fastapi import APIRouter, Depends, HTTPException, status
+from application.use_cases.logout_user import LogoutUserUseCase
+from application.use_cases.refresh_token import RefreshTokenUseCase
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from infrastructure.cache.rate_limiter import (
+    LoginThrottle,
+    get_login_throttle,
+    retry_after_header,
+)
+from infrastructure.cache.revocation_filter import revocation_list
 from infrastructure.database import get_db
+from infrastructure.repositories.token_repository_impl import (
+    SQLRefreshTokenRepository,
+    SQLRevokedTokenRepository,
+)
 from infrastructure.repositories.user_repository import SQLUserRepository
 from infrastructure.jwt_utils import create_access_token
+from infrastructure.security import (
+    PasswordVerificationBusy,
+    PasswordVerifier,
+    get_password_verifier,
+)
 from sqlalchemy.orm import Session
 
-from presentation.dependencies.auth import get_current_user
+from presentation.dependencies.auth import get_current_user, get_token_payload
 from presentation.schemas.auth import (
     LoginRequest,
     LoginResponse,
+    LogoutRequest,
+    RefreshRequest,
     UserCreateRequest,
     UserResponse,
 )
@@ -17,6 +40,8 @@ from domain.entities.auth import User
 
 router = APIRouter(prefix="/api/auth")
 
+logger = logging.getLogger(__name__)
+
 
 @router.post(
     "/register",
@@ -55,9 +80,7 @@ async def register_user(request: UserCreateRequest, db: Session = Depends(get_db
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Unexpected error in register")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}",
@@ -70,15 +93,30 @@ async def register_user(request: UserCreateRequest, db: Session = Depends(get_db
     status_code=status.HTTP_200_OK,
     tags=["Authentication"],
 )
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(
+    request: LoginRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    throttle: LoginThrottle = Depends(get_login_throttle),
+    password_verifier: PasswordVerifier = Depends(get_password_verifier),
+):
     """ユーザーログインエンドポイント"""
+    # パスワードの検証（bcrypt）より前に試行回数を制限する
+    client_ip = http_request.client.host if http_request.client else ""
+    retry_after = await throttle.check(client_ip, request.email)
+    if retry_after > 0:
+        raise _too_many_attempts(retry_after)
+
     try:
         # リポジトリとユースケースの初期化
         user_repository = SQLUserRepository(db)
-        use_case = LoginUserUseCase(user_repository)
+        use_case = LoginUserUseCase(user_repository, password_verifier)
 
         # ユーザー認証
-        user = await use_case.execute(email=request.email, password=request.password)
+        try:
+            user = await use_case.execute(email=request.email, password=request.password)
+        except PasswordVerificationBusy as e:
+            raise _too_many_attempts(e.retry_after)
 
         if not user:
             raise HTTPException(
@@ -87,38 +125,78 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # アクセストークンを生成
+        # アクセストークンとリフレッシュトークンを生成
         access_token = create_access_token(data={"sub": str(user.id)})
+        refresh_token = await RefreshTokenUseCase(SQLRefreshTokenRepository(db)).issue(user.id)
 
         # レスポンスを作成
-        return LoginResponse(
-            access_token=access_token,
-            token_type="bearer",
-            user=UserResponse(
-                id=user.id,
-                user_id=user.user_id,
-                username=user.username,
-                email=user.email,
-                full_name=user.full_name,
-                is_active=user.is_active,
-                is_verified=user.is_verified,
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-            ),
-        )
+        return _login_response(user, access_token, refresh_token)
 
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Unexpected error in login")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}",
         )
 
 
+@router.post(
+    "/refresh",
+    response_model=LoginResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["Authentication"],
+)
+async def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """リフレッシュトークンを新しいものと取り替え、アクセストークンを再発行するエンドポイント"""
+    use_case = RefreshTokenUseCase(SQLRefreshTokenRepository(db))
+    try:
+        user_id, refresh_token = await use_case.rotate(request.refresh_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user = await SQLUserRepository(db).get_by_id(user_id)
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Inactive user",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token = create_access_token(data={"sub": str(user.id)})
+    return _login_response(user, access_token, refresh_token)
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["Authentication"],
+)
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    payload: dict = Depends(get_token_payload),
+    db: Session = Depends(get_db),
+):
+    """使用中のアクセストークン（と指定したリフレッシュトークン）を失効させるエンドポイント"""
+    jti = payload.get("jti")
+    use_case = LogoutUserUseCase(SQLRefreshTokenRepository(db), SQLRevokedTokenRepository(db))
+    await use_case.execute(
+        user_id=int(payload["sub"]),
+        jti=jti,
+        expires_at=datetime.utcfromtimestamp(payload["exp"]),
+        refresh_token=request.refresh_token if request else None,
+    )
+    # 他のワーカーは次の同期で反映する。このワーカーでは直ちに弾く
+    if jti:
+        revocation_list.add(jti)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.get(
     "/me",
     response_model=UserResponse,
@@ -140,6 +218,33 @@ async def get_me(current_user: User = Depends(get_current_user)):
     )
 
 
+def _login_response(user: User, access_token: str, refresh_token: str) -> LoginResponse:
+    return LoginResponse(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=refresh_token,
+        user=UserResponse(
+            id=user.id,
+            user_id=user.user_id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        ),
+    )
+
+
+def _too_many_attempts(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts",
+        headers={"Retry-After": retry_after_header(retry_after)},
+    )
+
+
 @router.get("/test", tags=["Test"])
 async def test_auth():
     """認証APIの動作確認用エンドポイント"""
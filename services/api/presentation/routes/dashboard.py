@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from application.dto.dashboard_dto import DashboardDTO
+from application.services.split_adjusted_repositories import SplitAdjustedUserStockRepository
+from application.use_cases.get_dashboard import GetDashboardUseCase
+from domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from domain.repositories.stock_repository import StockRepository
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.config.market_calendar import get_quote_freshness_policy
+from infrastructure.database import get_read_db
+from infrastructure.repositories.user_repository import SQLUserRepository
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from presentation.dependencies.auth import get_token_payload
+from presentation.dependencies.corporate_actions import get_split_adjustments
+from presentation.routes.exchange_rate import get_exchange_rate_repository
+from presentation.routes.stock import get_stock_repository
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+
+@router.get("", response_model=DashboardDTO)
+async def get_dashboard(
+    payload: dict = Depends(get_token_payload),
+    db: Session = Depends(get_read_db),
+    adjustments: SplitAdjustments = Depends(get_split_adjustments),
+    stock_repository: StockRepository = Depends(get_stock_repository),
+    exchange_rate_repository: ExchangeRateRepository = Depends(get_exchange_rate_repository),
+):
+    """
+    ダッシュボードの表示に必要なデータを1回のリクエストで取得する
+
+    /api/auth/me、/api/user-stocks/、保有銘柄ごとの/api/stocks/{code}、
+    /api/exchange-rates/usd-jpyの結果をまとめて返す。トークンの検証は1回だけ行い、
+    ユーザーの取得は保有株・株価・為替レートの取得と並行して行う。
+    """
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate user",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    use_case = GetDashboardUseCase(
+        SQLUserRepository(db),
+        SplitAdjustedUserStockRepository(SQLUserStockRepository(db), adjustments),
+        stock_repository,
+        exchange_rate_repository,
+        get_quote_freshness_policy(),
+    )
+    dashboard = await use_case.execute(int(payload["sub"]))
+    if dashboard is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return dashboard
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
 
-from application.dto.exchange_rate_dto import ExchangeRateDTO
+from application.dto.exchange_rate_dto import ExchangeRateDTO, FxHistoryDTO
+from application.use_cases.get_fx_history import GetFxHistoryUseCase
 from application.use_cases.get_usd_jpy_rate import GetUsdJpyRateUseCase
 from domain.repositories.exchange_rate_repository import ExchangeRateRepository
-from infrastructure.repositories.exchange_rate_repository_impl import ExchangeRateRepositoryImpl
+from domain.services.fx_history import FxHistory
+from infrastructure.cache.shared_market_data import get_quote_cache
+from infrastructure.repositories.exchange_rate_repository_impl import USD_JPY, ExchangeRateRepositoryImpl
+from infrastructure.repositories.fx_history_store import get_fx_history_store
 from infrastructure.external.exchange_rate_client import ExchangeRateClient
 
 router = APIRouter(prefix="/api/exchange-rates", tags=["Exchange Rates"])
@@ -12,7 +17,10 @@ router = APIRouter(prefix="/api/exchange-rates", tags=["Exchange Rates"])
 # Dependency
 def get_exchange_rate_repository() -> ExchangeRateRepository:
     client = ExchangeRateClient()
-    return ExchangeRateRepositoryImpl(client)
+    return ExchangeRateRepositoryImpl(client, get_quote_cache())
+
+def get_fx_history() -> FxHistory:
+    return get_fx_history_store().history()
 
 @router.get("/usd-jpy", response_model=Optional[ExchangeRateDTO])
 def get_usd_jpy_rate(
@@ -26,3 +34,21 @@ def get_usd_jpy_rate(
     if not result:
         raise HTTPException(status_code=404, detail="USD/JPY rate not found or API error")
     return result
+
+@router.get("/usd-jpy/history", response_model=FxHistoryDTO)
+def get_usd_jpy_history(
+    start: Optional[date] = Query(None, description="開始日（省略時は終了日の1年前）"),
+    end: Optional[date] = Query(None, description="終了日（省略時は今日）"),
+    fx_history: FxHistory = Depends(get_fx_history),
+):
+    """
+    Get daily USD/JPY rates between start and end (inclusive).
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    result = GetFxHistoryUseCase(fx_history).execute(USD_JPY, start, end)
+    if result is None:
+        raise HTTPException(status_code=404, detail="USD/JPY history not found")
+    return result
@@ -1,12 +1,71 @@
-from fastapi import APIRouter
+import json
+
+from fastapi import APIRouter, Response
 from datetime import datetime
 
+from infrastructure.concurrency_limiter import concurrency_limiters
+from infrastructure.health_monitor import health_monitor
+from infrastructure.repositories.hedged_stock_repository import (
+    HedgedStockRepository,
+    get_quote_upstream,
+)
+
 router = APIRouter(tags=["health"])
 
+_NO_STORE = {"Cache-Control": "no-store"}
+
 @router.get("/health")
 async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "service": "investfolio-api"
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/health/live")
+async def liveness_probe():
+    """
+    生存確認（Liveness Probe）
+
+    依存先は見ず、バックグラウンドの確認処理が止まっていないかのみを返す。
+    """
+    status_code, body = health_monitor.liveness()
+    return Response(body, status_code, _NO_STORE, media_type="application/json")
+
+
+@router.get("/health/ready")
+async def readiness_probe():
+    """
+    トラフィック受け入れ可否（Readiness Probe）
+
+    バックグラウンドで定期的に確認したDB・為替/株価キャッシュ・イベントループの
+    判定結果を返す。重要なコンポーネントに異常があれば503を返す。
+    """
+    status_code, body = health_monitor.readiness()
+    return Response(body, status_code, _NO_STORE, media_type="application/json")
+
+
+@router.get("/health/load")
+async def load_stats():
+    """
+    同時実行数の制限の状態（このワーカー分）
+
+    ルートの種類ごとの現在の上限・実行中・待ち行列の長さと、受け入れ・待機・拒否の件数を返す。
+    """
+    return Response(
+        json.dumps(concurrency_limiters.stats()), 200, _NO_STORE, media_type="application/json"
+    )
+
+
+@router.get("/health/quotes")
+async def quote_provider_stats():
+    """
+    株価APIの状態（このワーカー分）
+
+    上流ごとのレイテンシの分位点・予備の問い合わせまで待つ秒数と、問い合わせ・採用・エラー・
+    取り消しの件数を返す。QUOTE_PROVIDER_URLSが未設定（モック）なら空を返す。
+    """
+    upstream = get_quote_upstream()
+    stats = upstream.stats() if isinstance(upstream, HedgedStockRepository) else {}
+    return Response(json.dumps(stats), 200, _NO_STORE, media_type="application/json")
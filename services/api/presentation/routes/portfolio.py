@@ -0,0 +1,132 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from application.use_cases.add_portfolio_item import AddPortfolioItemUseCase
+from domain.entities.auth import User
+from domain.entities.portfolio import Portfolio
+from domain.exceptions import DuplicatePortfolioItemError
+from infrastructure.database import get_db, get_read_db
+from infrastructure.repositories.portfolio_repository_impl import SQLPortfolioRepository
+from presentation.dependencies.auth import get_current_user
+from presentation.routes.exchange_rate import get_exchange_rate_repository
+from presentation.routes.stock import get_stock_repository
+from presentation.schemas.portfolio import (
+    PortfolioCreateRequest,
+    PortfolioDetailResponse,
+    PortfolioItemCreateRequest,
+    PortfolioItemResponse,
+    PortfolioResponse,
+)
+
+router = APIRouter(prefix="/api/portfolios", tags=["Portfolios"])
+
+
+async def _get_owned_portfolio(
+    repository: SQLPortfolioRepository, portfolio_id: int, user: User
+) -> Portfolio:
+    """ログインユーザーのポートフォリオを取得（他ユーザーのものは存在しない扱い）"""
+    portfolio = await repository.get_by_id(portfolio_id)
+    if portfolio is None or portfolio.user_id != user.user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found")
+    return portfolio
+
+
+@router.get("/", response_model=List[PortfolioResponse])
+async def list_portfolios(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    ログインユーザーのポートフォリオ一覧を評価額付きで取得する
+
+    評価額は株価・為替の更新時に差分更新されているため、再評価は行わない。
+    """
+    repository = SQLPortfolioRepository(db)
+    return await repository.list_by_user_id(current_user.user_id)
+
+
+@router.post("/", response_model=PortfolioResponse, status_code=status.HTTP_201_CREATED)
+async def create_portfolio(
+    request: PortfolioCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """ポートフォリオを作成する"""
+    repository = SQLPortfolioRepository(db)
+    return await repository.create(
+        Portfolio(
+            user_id=current_user.user_id,
+            name=request.name,
+            description=request.description,
+            currency=request.currency,
+        )
+    )
+
+
+@router.get("/{portfolio_id}", response_model=PortfolioDetailResponse)
+async def get_portfolio(
+    portfolio_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """ポートフォリオを明細付きで取得する"""
+    repository = SQLPortfolioRepository(db)
+    portfolio = await _get_owned_portfolio(repository, portfolio_id, current_user)
+    items = await repository.list_items(portfolio_id)
+    return PortfolioDetailResponse(
+        **portfolio.model_dump(),
+        items=[PortfolioItemResponse.model_validate(item) for item in items],
+    )
+
+
+@router.delete("/{portfolio_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_portfolio(
+    portfolio_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """ポートフォリオを削除する"""
+    repository = SQLPortfolioRepository(db)
+    await _get_owned_portfolio(repository, portfolio_id, current_user)
+    await repository.delete(portfolio_id)
+
+
+@router.post(
+    "/{portfolio_id}/items",
+    response_model=PortfolioItemResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_portfolio_item(
+    portfolio_id: int,
+    request: PortfolioItemCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """ポートフォリオに明細を追加する（同じ銘柄の明細がすでにあれば409）"""
+    repository = SQLPortfolioRepository(db)
+    portfolio = await _get_owned_portfolio(repository, portfolio_id, current_user)
+    use_case = AddPortfolioItemUseCase(
+        repository, get_stock_repository(), get_exchange_rate_repository()
+    )
+    try:
+        return await use_case.execute(portfolio, request)
+    except DuplicatePortfolioItemError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/{portfolio_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_portfolio_item(
+    portfolio_id: int,
+    item_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """ポートフォリオから明細を削除する"""
+    repository = SQLPortfolioRepository(db)
+    await _get_owned_portfolio(repository, portfolio_id, current_user)
+    if not await repository.remove_item(portfolio_id, item_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from application.dto.portfolio_history_dto import PortfolioHistoryDTO
+from application.use_cases.get_portfolio_history import GetPortfolioHistoryUseCase
+from domain.entities.auth import User
+from infrastructure.database import get_read_db
+from infrastructure.repositories.portfolio_snapshot_repository_impl import (
+    SQLPortfolioSnapshotRepository,
+)
+from presentation.dependencies.auth import get_current_user
+
+router = APIRouter(prefix="/api/portfolio-history", tags=["Portfolio History"])
+
+
+@router.get("", response_model=PortfolioHistoryDTO)
+async def get_portfolio_history(
+    start: Optional[date] = Query(None, description="開始日（省略時は終了日の1年前）"),
+    end: Optional[date] = Query(None, description="終了日（省略時は今日）"),
+    max_points: int = Query(365, ge=2, le=5000, description="返す点数の上限（超える分は間引く）"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    ログインユーザーの日次の評価額・取得価額・通貨別の評価額の推移を取得する
+
+    大引け後のジョブが保存した評価を返す。期間内の件数がmax_pointsを超える場合は、
+    件数の等しい区間ごとに最後の日の評価だけを返す。excluded_holdingsが0でない日は、
+    株価または為替レートがなかった保有株を含めずに評価している。
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    use_case = GetPortfolioHistoryUseCase(SQLPortfolioSnapshotRepository(db))
+    return await use_case.execute(current_user.user_id, start, end, max_points)
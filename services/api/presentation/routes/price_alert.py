@@ -0,0 +1,64 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from application.use_cases.create_price_alert import CreatePriceAlertUseCase
+from domain.entities.auth import User
+from domain.entities.price_alert import AlertStatus
+from infrastructure.cache.price_alert_engine import price_alert_engine
+from infrastructure.database import get_db, get_read_db
+from infrastructure.repositories.price_alert_repository_impl import SQLPriceAlertRepository
+from presentation.dependencies.auth import get_current_user
+from presentation.routes.stock import get_stock_repository
+from presentation.schemas.price_alert import PriceAlertCreateRequest, PriceAlertResponse
+
+router = APIRouter(prefix="/api/alerts", tags=["Price Alerts"])
+
+
+@router.get("/", response_model=List[PriceAlertResponse])
+async def list_price_alerts(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    ログインユーザーの株価アラートを新しい順に取得する
+
+    発火したアラートはstatusがTRIGGEREDになり、発火時の株価と日時が入る。
+    """
+    return await SQLPriceAlertRepository(db).list_by_user_id(current_user.user_id)
+
+
+@router.post("/", response_model=PriceAlertResponse, status_code=status.HTTP_201_CREATED)
+async def create_price_alert(
+    request: PriceAlertCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    株価アラートを登録する
+
+    株価の取得ジョブの次回以降の実行から判定され、発火は1回限り。
+    """
+    use_case = CreatePriceAlertUseCase(SQLPriceAlertRepository(db), get_stock_repository())
+    try:
+        return await use_case.execute(current_user.user_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_price_alert(
+    alert_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """株価アラートを削除する"""
+    repository = SQLPriceAlertRepository(db)
+    alert = await repository.get_by_id(alert_id)
+    if alert is None or alert.user_id != current_user.user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Alert not found")
+    await repository.delete(alert_id)
+    # 索引を持つワーカー（リーダー）では直ちに外す。他のワーカーでは発火しても記録時に除かれる
+    if alert.status == AlertStatus.ACTIVE:
+        price_alert_engine.remove(alert)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from application.dto.rebalance_dto import RebalanceDTO
+from application.services.split_adjusted_repositories import (
+    SplitAdjustedUserStockRepository,
+    split_adjusted_price_history,
+)
+from application.use_cases.rebalance_portfolio import RebalancePortfolioUseCase
+from domain.entities.auth import User
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.config.market_calendar import get_market_calendar
+from infrastructure.database import get_read_db
+from infrastructure.repositories.price_history_repository_impl import (
+    get_price_history_repository,
+)
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from presentation.dependencies.auth import get_current_user
+from presentation.dependencies.corporate_actions import get_split_adjustments
+from presentation.routes.exchange_rate import get_exchange_rate_repository
+from presentation.routes.stock import get_stock_repository
+from presentation.schemas.rebalance import RebalanceRequest
+
+router = APIRouter(prefix="/api/portfolio", tags=["Rebalance"])
+
+
+# Dependency
+def get_rebalance_use_case(
+    db: Session = Depends(get_read_db),
+    adjustments: SplitAdjustments = Depends(get_split_adjustments),
+) -> RebalancePortfolioUseCase:
+    return RebalancePortfolioUseCase(
+        SplitAdjustedUserStockRepository(SQLUserStockRepository(db), adjustments),
+        get_stock_repository(),
+        split_adjusted_price_history(get_price_history_repository(), adjustments),
+        get_exchange_rate_repository(),
+        get_market_calendar(),
+    )
+
+
+@router.post("/rebalance", response_model=RebalanceDTO)
+async def rebalance_portfolio(
+    request: RebalanceRequest,
+    current_user: User = Depends(get_current_user),
+    use_case: RebalancePortfolioUseCase = Depends(get_rebalance_use_case),
+):
+    """
+    保有株を目標配分に近づける売買を求める
+
+    目標構成比からの乖離の二乗和と手数料の合計が最小になるよう、
+    売買単位（東証は100株）の整数倍で、現金の範囲内の売買を返す。
+    """
+    try:
+        return await use_case.execute(current_user.user_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
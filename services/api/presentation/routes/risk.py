@@ -0,0 +1,64 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from application.dto.risk_dto import PortfolioRiskDTO
+from application.services.portfolio_returns import PortfolioReturnsLoader
+from application.services.split_adjusted_repositories import (
+    SplitAdjustedUserStockRepository,
+    split_adjusted_price_history,
+)
+from application.use_cases.get_portfolio_risk import GetPortfolioRiskUseCase
+from domain.entities.auth import User
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.cache.return_matrix_cache import return_matrix_cache
+from infrastructure.config.market_calendar import get_market_calendar
+from infrastructure.database import get_read_db
+from infrastructure.repositories.price_history_repository_impl import (
+    get_price_history_repository,
+)
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from presentation.dependencies.auth import get_current_user
+from presentation.dependencies.corporate_actions import get_split_adjustments
+from presentation.routes.exchange_rate import get_exchange_rate_repository
+
+router = APIRouter(prefix="/api/risk", tags=["Risk"])
+
+
+# Dependency
+def get_portfolio_returns_loader(
+    db: Session = Depends(get_read_db),
+    adjustments: SplitAdjustments = Depends(get_split_adjustments),
+) -> PortfolioReturnsLoader:
+    return PortfolioReturnsLoader(
+        SplitAdjustedUserStockRepository(SQLUserStockRepository(db), adjustments),
+        split_adjusted_price_history(get_price_history_repository(), adjustments),
+        get_exchange_rate_repository(),
+        return_matrix_cache,
+        get_market_calendar(),
+    )
+
+
+@router.get("/", response_model=PortfolioRiskDTO)
+async def get_portfolio_risk(
+    benchmark: Literal["TOPIX", "SP500"] = "TOPIX",
+    lookback_days: int = Query(365, ge=30, le=1825, description="計算に使う期間（日数）"),
+    confidence: float = Query(0.95, gt=0.5, lt=1.0, description="VaRの信頼水準"),
+    current_user: User = Depends(get_current_user),
+    returns_loader: PortfolioReturnsLoader = Depends(get_portfolio_returns_loader),
+):
+    """
+    ログインユーザーの保有株のリスク指標を取得する
+
+    年率ボラティリティ、ベンチマークに対するベータ、保有銘柄間の相関行列、
+    ヒストリカル法・分散共分散法による1日VaRを返す。
+    """
+    use_case = GetPortfolioRiskUseCase(returns_loader)
+    try:
+        risk = await use_case.execute(current_user.user_id, benchmark, lookback_days, confidence)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    if risk is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No holdings found")
+    return risk
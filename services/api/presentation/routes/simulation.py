@@ -0,0 +1,55 @@
+import json
+import logging
+from typing import AsyncIterator, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from application.services.portfolio_returns import PortfolioReturnsLoader
+from application.use_cases.simulate_portfolio import SimulatePortfolioUseCase
+from domain.entities.auth import User
+from infrastructure.cache.simulation_result_cache import simulation_result_cache
+from infrastructure.process_pool import get_process_pool
+from presentation.dependencies.auth import get_current_user
+from presentation.routes.risk import get_portfolio_returns_loader
+from presentation.schemas.simulation import SimulationRequest
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/portfolio", tags=["Simulation"])
+
+
+async def _ndjson(events: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    try:
+        async for event in events:
+            yield (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+    except Exception:
+        # ステータスコードは送信済みのため、エラーも1行として返す
+        logger.exception("Simulation failed")
+        yield (json.dumps({"type": "error", "detail": "Simulation failed"}) + "\n").encode()
+
+
+@router.post("/simulate")
+async def simulate_portfolio(
+    request: SimulationRequest,
+    current_user: User = Depends(get_current_user),
+    returns_loader: PortfolioReturnsLoader = Depends(get_portfolio_returns_loader),
+):
+    """
+    保有株の評価額をモンテカルロ法で予測する
+
+    レスポンスはNDJSONで、チャンクごとの進捗（type=progress）の後に
+    パーセンタイル推移と最終日の分布（type=result）を返す。
+    同じ保有株・パラメータの結果はキャッシュから返す。
+    """
+    use_case = SimulatePortfolioUseCase(
+        returns_loader, get_process_pool(), simulation_result_cache
+    )
+    try:
+        job = await use_case.prepare(current_user.user_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No holdings found")
+
+    return StreamingResponse(_ndjson(use_case.stream(job)), media_type="application/x-ndjson")
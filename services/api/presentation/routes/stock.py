@@ -1,13 +1,47 @@
-from fastapi import APIRouter, HTTPException
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from application.dto.stock_dto import SymbolSearchResult
 from application.use_cases.get_stock_price import GetStockPriceUseCase
-from infrastructure.repositories.mock_stock_repository import MockStockRepository
+from application.use_cases.search_symbols import SearchSymbolsUseCase
+from domain.repositories.stock_repository import StockRepository
+from domain.services.symbol_search import SymbolIndex
+from infrastructure.cache.shared_market_data import get_quote_cache
+from infrastructure.config.market_calendar import get_quote_freshness_policy
+from infrastructure.repositories.cached_stock_repository import CachedStockRepository
+from infrastructure.repositories.hedged_stock_repository import get_quote_upstream
+from infrastructure.repositories.symbol_master import get_symbol_index
 
 router = APIRouter(prefix="/api/stocks", tags=["stocks"])
 
+# Dependency
+def get_stock_repository() -> StockRepository:
+    return CachedStockRepository(
+        get_quote_upstream(),
+        get_quote_cache(),
+        freshness_policy=get_quote_freshness_policy(),
+    )
+
+@router.get("/search", response_model=List[SymbolSearchResult])
+async def search_symbols(
+    q: str = Query(..., min_length=1, max_length=50, description="銘柄コード・銘柄名・読み"),
+    limit: int = Query(10, ge=1, le=50),
+    symbol_index: SymbolIndex = Depends(get_symbol_index),
+):
+    """
+    銘柄を検索する（入力補完用）
+
+    銘柄コード、英語名、日本語名、読み（カタカナ・ひらがな・ローマ字）の
+    前方一致と部分一致で、一致度の高い順に返す。
+    """
+    return SearchSymbolsUseCase(symbol_index).execute(q, limit)
+
 @router.get("/{stock_code}")
-async def get_stock_price(stock_code: str):
-    repository = MockStockRepository()
-    use_case = GetStockPriceUseCase(repository)
+async def get_stock_price(
+    stock_code: str,
+    repository: StockRepository = Depends(get_stock_repository),
+):
+    use_case = GetStockPriceUseCase(repository, get_quote_freshness_policy())
     
     result = await use_case.execute(stock_code)
     
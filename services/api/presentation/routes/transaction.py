@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import sessionmaker
+
+from domain.entities.auth import User
+from infrastructure.database import get_read_session_local
+from infrastructure.repositories.transaction_repository_impl import SQLTransactionRepository
+from presentation.dependencies.auth import get_current_user
+from presentation.export import EXPORT_BATCH_SIZE, ExportFormat, accepts_gzip, export_response
+
+router = APIRouter(prefix="/api/transactions", tags=["Transactions"])
+
+TRANSACTION_EXPORT_COLUMNS = (
+    "id",
+    "portfolio_id",
+    "transaction_date",
+    "transaction_type",
+    "symbol",
+    "quantity",
+    "price",
+    "total_amount",
+    "fee",
+    "tax",
+    "currency",
+    "notes",
+)
+
+
+@router.get("/export")
+def export_transactions(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    current_user: User = Depends(get_current_user),
+    session_local: sessionmaker = Depends(get_read_session_local),
+):
+    """
+    ログインユーザーの取引履歴をCSVまたはNDJSONでエクスポートする
+
+    全件を読み込まずにサーバーサイドカーソルから逐次送出する。
+    Accept-Encodingにgzipを含む場合は圧縮して返す。
+    """
+    user_id = current_user.user_id
+    return export_response(
+        session_local,
+        lambda db: SQLTransactionRepository(db).stream_by_user_id(user_id, EXPORT_BATCH_SIZE),
+        TRANSACTION_EXPORT_COLUMNS,
+        export_format,
+        filename="transactions",
+        gzip=accepts_gzip(request),
+    )
@@ -1,22 +1,37 @@
 from datetime import datetime
 from typing import List
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Session, sessionmaker
 
+from application.services.split_adjusted_repositories import SplitAdjustedUserStockRepository
 from application.use_cases.register_user_stock import RegisterUserStockUseCase
 from domain.entities.auth import User
-from infrastructure.database import get_db
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.cache.response_cache import ResponseCache, get_response_cache
+from infrastructure.database import get_db, get_read_db, get_read_session_local
 from infrastructure.repositories.user_stock_repository_impl import (
     SQLUserStockRepository,
 )
 from presentation.dependencies.auth import get_current_user
+from presentation.dependencies.corporate_actions import get_split_adjustments
+from presentation.export import EXPORT_BATCH_SIZE, ExportFormat, accepts_gzip, export_response
 from presentation.schemas.user_stock import UserStockCreateRequest
 
 
 router = APIRouter(prefix="/api/user-stocks", tags=["User Stocks"])
 
+USER_STOCK_EXPORT_COLUMNS = (
+    "id",
+    "ticker_symbol",
+    "quantity",
+    "acquisition_price",
+    "created_at",
+    "updated_at",
+)
+
 
 class UserStockResponse(BaseModel):
     id: int
@@ -32,20 +47,47 @@ class UserStockResponse(BaseModel):
         from_attributes = True
 
 
+_USER_STOCK_LIST = TypeAdapter(List[UserStockResponse])
+
+
 @router.get("/", response_model=List[UserStockResponse])
 async def get_user_stocks(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    adjustments: SplitAdjustments = Depends(get_split_adjustments),
+    cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     ログインユーザーの保有株一覧を取得する
 
     認証が必要です。ログインユーザーの保有株情報のみ取得できます。
+    株数と取得単価は取得日より後の株式分割を反映した値を返す。
+    シリアライズした応答を (ユーザー, 保有株のバージョン, 評価日, 分割, クエリ) をキーにキャッシュし、
+    保有株を書き込むとバージョンが上がるため次の取得から新しい内容を返す。
     """
     try:
-        repository = SQLUserStockRepository(db)
+        repository = SplitAdjustedUserStockRepository(SQLUserStockRepository(db), adjustments)
+        # 行より先にバージョンを読む（間に書き込みがあっても、古い行を新しいキーで保存しない）
+        version = await repository.get_version(current_user.user_id)
+        key = None
+        if version is not None:
+            query = urlencode(sorted(request.query_params.multi_items()))
+            key = (
+                f"user-stocks:{current_user.user_id}:{version}:"
+                f"{adjustments.as_of.isoformat()}:{adjustments.digest}:{query}"
+            )
+            body = await cache.get(key)
+            if body is not None:
+                return Response(body, media_type="application/json")
+
         user_stocks = await repository.get_by_user_id(current_user.user_id)
-        return user_stocks
+        body = _USER_STOCK_LIST.dump_json(
+            _USER_STOCK_LIST.validate_python(user_stocks, from_attributes=True)
+        )
+        if key is not None:
+            await cache.put(key, body)
+        return Response(body, media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -53,6 +95,33 @@ async def get_user_stocks(
         )
 
 
+@router.get("/export")
+def export_user_stocks(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    current_user: User = Depends(get_current_user),
+    session_local: sessionmaker = Depends(get_read_session_local),
+    adjustments: SplitAdjustments = Depends(get_split_adjustments),
+):
+    """
+    ログインユーザーの保有株をCSVまたはNDJSONでエクスポートする
+
+    全件を読み込まずにサーバーサイドカーソルから逐次送出する。
+    Accept-Encodingにgzipを含む場合は圧縮して返す。
+    """
+    user_id = current_user.user_id
+    return export_response(
+        session_local,
+        lambda db: SplitAdjustedUserStockRepository(
+            SQLUserStockRepository(db), adjustments
+        ).stream_by_user_id(user_id, EXPORT_BATCH_SIZE),
+        USER_STOCK_EXPORT_COLUMNS,
+        export_format,
+        filename="user_stocks",
+        gzip=accepts_gzip(request),
+    )
+
+
 @router.post(
     "/", response_model=UserStockResponse, status_code=status.HTTP_201_CREATED
 )
@@ -61,4 +61,21 @@ class LoginResponse(BaseModel):
 
     access_token: str = Field(..., description="アクセストークン")
     token_type: str = Field(default="bearer", description="トークンタイプ")
+    refresh_token: Optional[str] = Field(
+        default=None, description="リフレッシュトークン（使うたびに新しいものに替わる）"
+    )
     user: UserResponse = Field(..., description="ユーザー情報")
+
+
+class RefreshRequest(BaseModel):
+    """トークン再発行リクエストスキーマ"""
+
+    refresh_token: str = Field(..., min_length=1, max_length=200, description="リフレッシュトークン")
+
+
+class LogoutRequest(BaseModel):
+    """ログアウトリクエストスキーマ"""
+
+    refresh_token: Optional[str] = Field(
+        default=None, max_length=200, description="あわせて失効させるリフレッシュトークン"
+    )
@@ -0,0 +1,69 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PortfolioCreateRequest(BaseModel):
+    """ポートフォリオ作成リクエストスキーマ"""
+
+    name: str = Field(..., min_length=1, max_length=100, description="ポートフォリオ名")
+    description: Optional[str] = Field(default=None, max_length=500, description="説明")
+    currency: str = Field(default="JPY", pattern=r"^[A-Z]{3}$", description="評価通貨")
+
+
+class PortfolioItemCreateRequest(BaseModel):
+    """ポートフォリオ明細追加リクエストスキーマ"""
+
+    symbol: str = Field(..., min_length=1, max_length=20, description="銘柄コード")
+    quantity: Decimal = Field(..., gt=0, description="保有数量")
+    average_price: Decimal = Field(..., gt=0, description="平均取得単価")
+    name: Optional[str] = Field(default=None, max_length=100, description="銘柄名")
+    currency: str = Field(
+        default="JPY", pattern=r"^[A-Z]{3}$", description="取引通貨（株価が取得できない場合に使用）"
+    )
+    asset_type: str = Field(default="stock", max_length=20, description="資産種別")
+
+
+class PortfolioResponse(BaseModel):
+    """ポートフォリオレスポンススキーマ"""
+
+    id: int
+    user_id: int
+    name: str
+    description: Optional[str]
+    currency: str
+    total_value: float
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PortfolioItemResponse(BaseModel):
+    """ポートフォリオ明細レスポンススキーマ"""
+
+    id: int
+    portfolio_id: int
+    symbol: str
+    name: str
+    quantity: float
+    average_price: float
+    currency: str
+    current_price: Optional[float]
+    fx_rate: float
+    market_value: Optional[float]
+    gain_loss: Optional[float]
+    gain_loss_percent: Optional[float]
+    asset_type: str
+
+    class Config:
+        from_attributes = True
+
+
+class PortfolioDetailResponse(PortfolioResponse):
+    """明細付きポートフォリオレスポンススキーマ"""
+
+    items: List[PortfolioItemResponse]
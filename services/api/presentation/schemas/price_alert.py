@@ -0,0 +1,37 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from domain.entities.price_alert import AlertCondition, AlertStatus
+
+
+class PriceAlertCreateRequest(BaseModel):
+    """株価アラート登録リクエストスキーマ"""
+
+    symbol: str = Field(..., min_length=1, max_length=20, description="銘柄コード")
+    condition: AlertCondition = Field(..., description="ABOVE / BELOW / PERCENT_MOVE")
+    threshold: Decimal = Field(
+        ..., gt=0, description="株価（ABOVE・BELOW）または変動率の%（PERCENT_MOVE）"
+    )
+    reference_price: Optional[Decimal] = Field(
+        default=None, gt=0, description="変動率の基準の株価（省略時は現在値）"
+    )
+
+
+class PriceAlertResponse(BaseModel):
+    """株価アラートレスポンススキーマ"""
+
+    id: int
+    symbol: str
+    condition: AlertCondition
+    threshold: float
+    reference_price: Optional[float]
+    status: AlertStatus
+    triggered_price: Optional[float]
+    triggered_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,23 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class RebalanceRequest(BaseModel):
+    """リバランスのリクエストスキーマ"""
+
+    target_weights: Dict[str, float] = Field(
+        ..., description="銘柄コードごとの目標構成比（合計が1未満なら残りを現金で持つ）"
+    )
+    cash: float = Field(default=0, ge=0, description="買付に使える現金（円）")
+    cost_rate: float = Field(default=0.001, ge=0, le=0.05, description="売買代金に対する手数料率")
+
+    @field_validator("target_weights")
+    @classmethod
+    def validate_target_weights(cls, value: Dict[str, float]) -> Dict[str, float]:
+        weights = {symbol.strip().upper(): weight for symbol, weight in value.items()}
+        if any(weight < 0 or weight > 1 for weight in weights.values()):
+            raise ValueError("Each target weight must be between 0 and 1")
+        if sum(weights.values()) > 1 + 1e-9:
+            raise ValueError("Target weights must not sum to more than 1")
+        return weights
@@ -0,0 +1,13 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SimulationRequest(BaseModel):
+    """モンテカルロ・シミュレーションのリクエストスキーマ"""
+
+    method: Literal["gbm", "bootstrap"] = Field(default="gbm", description="経路の生成方法")
+    horizon_days: int = Field(default=252, ge=1, le=1260, description="予測期間（営業日）")
+    paths: int = Field(default=10000, ge=100, le=200000, description="経路数")
+    lookback_days: int = Field(default=365, ge=30, le=1825, description="推定に使う期間（日数）")
+    seed: Optional[int] = Field(default=None, ge=0, description="乱数シード（再現用）")
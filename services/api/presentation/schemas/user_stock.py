@@ -1,6 +1,8 @@
+from decimal import Decimal
+
 from pydantic import BaseModel, Field
 
 class UserStockCreateRequest(BaseModel):
     ticker_symbol: str = Field(..., description="銘柄コード")
     quantity: int = Field(..., gt=0, description="保有株数")
-    acquisition_price: float = Field(..., gt=0, description="取得単価")
+    acquisition_price: Decimal = Field(..., gt=0, decimal_places=2, description="取得単価")
@@ -212,4 +212,70 @@ export const userStocksAPI = {
       requireAuth: true,
     })
   },
-}
\ No newline at end of file
+}
+// Dashboard types
+export interface StockQuote {
+  symbol: string
+  name: string
+  price: number
+  currency: string
+  timestamp: string
+  price_type: string
+  message: string
+}
+
+export interface ExchangeRate {
+  symbol: string
+  ask?: string | null
+  bid?: string | null
+  high?: string | null
+  low?: string | null
+  last?: string | null
+}
+
+export interface Dashboard {
+  user: User
+  holdings: UserStock[]
+  quotes: StockQuote[]
+  usd_jpy: ExchangeRate | null
+}
+
+// Dashboard API (user, holdings, quotes and USD/JPY in one request)
+export const dashboardAPI = {
+  get: async (): Promise<Dashboard> => {
+    return apiCall<Dashboard>('/api/dashboard', {
+      method: 'GET',
+      requireAuth: true,
+    })
+  },
+}
+
+// Portfolio history types (amounts are decimal strings in the base currency)
+export interface PortfolioHistoryPoint {
+  date: string
+  total_value: string
+  cost_basis: string
+  exposures: Record<string, string>
+  // Holdings left out of the day's totals because no quote or FX rate was available
+  excluded_holdings: number
+}
+
+export interface PortfolioHistory {
+  currency: string
+  points: PortfolioHistoryPoint[]
+}
+
+// Portfolio history API (end-of-day snapshots, downsampled on the server)
+export const portfolioHistoryAPI = {
+  get: async (params: { start?: string; end?: string; maxPoints?: number } = {}): Promise<PortfolioHistory> => {
+    const query = new URLSearchParams()
+    if (params.start) query.set('start', params.start)
+    if (params.end) query.set('end', params.end)
+    if (params.maxPoints) query.set('max_points', String(params.maxPoints))
+    const suffix = query.toString() ? `?${query.toString()}` : ''
+    return apiCall<PortfolioHistory>(`/api/portfolio-history${suffix}`, {
+      method: 'GET',
+      requireAuth: true,
+    })
+  },
+}
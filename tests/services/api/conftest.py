@@ -2,11 +2,38 @@ import pytest
 import sys
 import os
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # services/apiディレクトリをパスに追加
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../services/api'))
 
+# テストではバックグラウンドジョブを起動しない
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+# 為替レート履歴はテスト用のサンプルを使う
+os.environ.setdefault(
+    "FX_HISTORY_FILE", os.path.join(os.path.dirname(__file__), "data", "fx_history_sample.csv")
+)
+
 from main import app
+from infrastructure.database import Base
+import infrastructure.models  # noqa: F401  テーブル定義をBase.metadataに登録
+from infrastructure.cache.rate_limiter import get_login_throttle
+from infrastructure.cache.recent_writes import get_recent_writes
+from infrastructure.cache.response_cache import get_response_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    """ログイン試行の制限・応答キャッシュ・書き込みの記録をテストごとに初期化する（DBはテストごとに作り直すため）"""
+    get_login_throttle.cache_clear()
+    get_response_cache.cache_clear()
+    get_recent_writes.cache_clear()
+    yield
+    get_login_throttle.cache_clear()
+    get_response_cache.cache_clear()
+    get_recent_writes.cache_clear()
 
 
 @pytest.fixture
@@ -18,4 +45,29 @@ def client():
 @pytest.fixture
 def test_base_url():
     """テスト用のベースURL"""
-    return "http://testserver"
\ No newline at end of file
+    return "http://testserver"
+
+@pytest.fixture
+def session_factory():
+    """テスト用のインメモリSQLiteに接続するセッションファクトリ"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def db_session(session_factory):
+    """テスト用のデータベースセッション"""
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
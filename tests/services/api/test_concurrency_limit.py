@@ -0,0 +1,205 @@
+"""ルートの種類ごとの同時実行数の制限と503による負荷遮断のテスト"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from infrastructure.concurrency_limiter import (
+    DB,
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiters,
+    ConcurrencyLimitExceeded,
+    LimitConfig,
+)
+from presentation.middlewares.concurrency_limit import ConcurrencyLimitMiddleware, route_class
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_route_classes():
+    assert route_class("/health/ready") == "cheap"
+    assert route_class("/api/stocks/search") == "cheap"
+    assert route_class("/api/stocks/7203.T") == "upstream"
+    assert route_class("/api/portfolio/simulate") == "upstream"
+    assert route_class("/api/portfolios/") == "db"
+    assert route_class("/api/auth/login") == "auth"
+    assert route_class("/docs") == "cheap"
+
+
+def test_waiters_get_freed_slots_and_overflow_is_rejected():
+    limiter = AdaptiveConcurrencyLimiter(
+        "db", LimitConfig(initial_limit=1, max_limit=1, max_queue=1, target_latency=1.0),
+        queue_timeout=1.0,
+    )
+
+    async def run():
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(ConcurrencyLimitExceeded):
+            await limiter.acquire()
+        limiter.release(0.01)
+        await waiting
+        limiter.release(0.01)
+
+    asyncio.run(run())
+    stats = limiter.stats()
+    assert stats["in_flight"] == 0 and stats["queue_length"] == 0
+    assert (stats["accepted"], stats["queued"], stats["rejected_queue_full"]) == (2, 1, 1)
+
+
+def test_queue_deadline_rejects_without_leaking_slots():
+    limiter = AdaptiveConcurrencyLimiter(
+        "db", LimitConfig(initial_limit=1, max_limit=1, max_queue=4, target_latency=1.0),
+        queue_timeout=0.01,
+    )
+
+    async def run():
+        await limiter.acquire()
+        with pytest.raises(ConcurrencyLimitExceeded):
+            await limiter.acquire()
+        limiter.release(0.01)
+        await limiter.acquire()
+        limiter.release(0.01)
+
+    asyncio.run(run())
+    stats = limiter.stats()
+    assert stats["rejected_timeout"] == 1
+    assert stats["in_flight"] == 0 and stats["queue_length"] == 0
+
+
+def test_limit_decreases_on_slow_responses_and_grows_when_saturated():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(
+        "db", LimitConfig(initial_limit=10, max_limit=20, max_queue=4, target_latency=0.1),
+        clock=clock,
+    )
+
+    limiter.in_flight = 10
+    limiter._adjust(0.5)
+    limiter._adjust(0.5)
+    # 同じ混雑で続けて下げない
+    assert limiter.limit == pytest.approx(9.0)
+    clock.now = 0.2
+    limiter._adjust(0.5)
+    assert limiter.limit == pytest.approx(8.1)
+
+    # 余裕があるときは上げず、上限まで使われていれば1往復あたり約1上げる
+    limiter.in_flight = 1
+    limiter._adjust(0.01)
+    assert limiter.limit == pytest.approx(8.1)
+    limiter.in_flight = 8
+    for _ in range(8):
+        limiter._adjust(0.01)
+    assert 8.9 < limiter.limit < 9.2
+
+
+def test_sequential_slow_requests_do_not_lower_the_limit():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(
+        "db", LimitConfig(initial_limit=32, max_limit=128, max_queue=64, target_latency=0.25),
+        clock=clock,
+    )
+
+    async def run():
+        # 同時実行のない3秒のリクエストが続いても、混雑ではないので上限は下げない
+        for _ in range(40):
+            await limiter.acquire()
+            clock.now += 3.0
+            limiter.release(3.0)
+        held = [asyncio.create_task(limiter.acquire()) for _ in range(4)]
+        await asyncio.gather(*held)
+
+    asyncio.run(run())
+
+    assert limiter.limit == pytest.approx(32.0)
+    stats = limiter.stats()
+    assert stats["queued"] == 0 and stats["in_flight"] == 4
+
+
+def test_middleware_times_streaming_responses_to_their_start():
+    limiters = ConcurrencyLimiters(
+        {DB: LimitConfig(initial_limit=1, max_limit=1, max_queue=0, target_latency=1.0),
+         "cheap": LimitConfig(initial_limit=1, max_limit=1, max_queue=0, target_latency=1.0)},
+    )
+    released = []
+    limiter = limiters.get(DB)
+    original_release = limiter.release
+    limiter.release = lambda latency: (released.append(latency), original_release(latency))
+
+    app = FastAPI()
+    app.add_middleware(ConcurrencyLimitMiddleware, limiters=limiters)
+
+    @app.get("/api/export")
+    async def export():
+        async def body():
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                yield b"row\n"
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/export")
+
+    response = asyncio.run(run())
+
+    assert response.text == "row\n" * 3
+    # 本文の送信（約150ms）ではなく応答の開始までを計る
+    assert len(released) == 1 and released[0] < 0.1
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_middleware_sheds_with_503_before_reaching_route():
+    limiters = ConcurrencyLimiters(
+        {DB: LimitConfig(initial_limit=1, max_limit=1, max_queue=0, target_latency=1.0),
+         "cheap": LimitConfig(initial_limit=1, max_limit=1, max_queue=0, target_latency=1.0)},
+    )
+    app = FastAPI()
+    app.add_middleware(ConcurrencyLimitMiddleware, limiters=limiters)
+    calls = []
+
+    @app.get("/api/slow")
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(
+                client.get("/api/slow"), client.get("/api/slow"), client.get("/health")
+            )
+
+    first, second, health_response = asyncio.run(run())
+
+    assert first.status_code == 200
+    assert second.status_code == 503 and second.headers["Retry-After"] == "1"
+    # 軽量なルートは別の枠のため遮断されない
+    assert health_response.status_code == 200
+    assert len(calls) == 1
+    assert limiters.get(DB).stats()["rejected_queue_full"] == 1
+
+
+def test_load_stats_endpoint(client: TestClient):
+    response = client.get("/health/load")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"auth", "db", "upstream", "cheap"}
+    assert response.json()["cheap"]["in_flight"] >= 1
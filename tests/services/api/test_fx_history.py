@@ -0,0 +1,137 @@
+"""日次為替レートの履歴と取得日ごとの一括換算のテスト"""
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import infrastructure.repositories.fx_history_store as fx_history_store
+from application.use_cases.record_fx_rate import RecordFxRateUseCase
+from domain.services.fx_history import FxHistory, FxSeries
+from infrastructure.repositories.fx_history_store import FxHistoryStore, load_fx_history
+from main import app
+from presentation.routes.exchange_rate import get_fx_history
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeExchangeRateClient:
+    def __init__(self, rate):
+        self.rate = rate
+
+    def get_usd_jpy_rate(self):
+        return self.rate
+
+
+@pytest.fixture
+def usd_jpy():
+    # 2026-01-02(金), 01-05(月), 01-06(火)
+    return FxSeries.from_pairs([
+        (date(2026, 1, 6), 152.0), (date(2026, 1, 2), 150.0), (date(2026, 1, 5), 151.0),
+    ])
+
+
+def test_rates_fall_back_to_previous_day(usd_jpy):
+    rates = usd_jpy.rates_on([date(2026, 1, 5), date(2026, 1, 3), date(2026, 1, 4), date(2026, 1, 9)])
+
+    # 土日は金曜日、履歴の最終日以降は最終日のレート
+    np.testing.assert_array_equal(rates, [151.0, 150.0, 150.0, 152.0])
+    assert usd_jpy.rate_on(date(2026, 1, 1)) is None
+    with pytest.raises(ValueError):
+        usd_jpy.rates_on([date(2026, 1, 5), date(2025, 12, 31)])
+    with pytest.raises(ValueError):
+        usd_jpy.rates_on([date(2026, 1, 20)])
+    assert usd_jpy.rate_on(date(2026, 1, 20), max_stale_days=30) == 152.0
+
+
+def test_with_rate_inserts_in_order_and_replaces_same_day(usd_jpy):
+    updated = usd_jpy.with_rate(date(2026, 1, 3), 149.0).with_rate(date(2026, 1, 6), 153.0)
+
+    assert updated.between(date(2026, 1, 1), date(2026, 1, 31)) == [
+        (date(2026, 1, 2), 150.0), (date(2026, 1, 3), 149.0),
+        (date(2026, 1, 5), 151.0), (date(2026, 1, 6), 153.0),
+    ]
+    # 元の系列は変わらない
+    assert len(usd_jpy) == 3 and usd_jpy.rate_on(date(2026, 1, 6)) == 152.0
+
+
+def test_bulk_convert_uses_direct_or_inverse_pair(usd_jpy):
+    history = FxHistory({"USD/JPY": usd_jpy})
+    days = [date(2026, 1, 2), date(2026, 1, 4), date(2026, 1, 6)]
+
+    np.testing.assert_allclose(
+        history.convert([10.0, 20.0, 30.0], days, "USD", "JPY"), [1500.0, 3000.0, 4560.0]
+    )
+    np.testing.assert_allclose(
+        history.convert(np.array([1500.0, 1520.0]), days[::2], "JPY", "USD"), [10.0, 10.0]
+    )
+    np.testing.assert_array_equal(history.convert([5.0], days[:1], "JPY", "JPY"), [5.0])
+    with pytest.raises(ValueError):
+        history.convert([1.0], days[:1], "EUR", "JPY")
+    with pytest.raises(ValueError):
+        history.convert([1.0, 2.0], days[:1], "USD", "JPY")
+
+
+def test_store_appends_and_other_workers_reload(tmp_path):
+    path = str(tmp_path / "fx.csv")
+    clock = FakeClock()
+    leader = FxHistoryStore(path, reload_seconds=60, clock=clock)
+    follower = FxHistoryStore(path, reload_seconds=60, clock=clock)
+    assert follower.history().series("USD/JPY") is None
+
+    rate = RecordFxRateUseCase(FakeExchangeRateClient(150.25), leader).execute(date(2026, 1, 5))
+    RecordFxRateUseCase(FakeExchangeRateClient(150.5), leader).execute(date(2026, 1, 5))
+    leader.append("USD/JPY", date(2026, 1, 2), 149.75)
+
+    assert rate == 150.25
+    assert leader.history().series("USD/JPY").between(date(2026, 1, 1), date(2026, 1, 5)) == [
+        (date(2026, 1, 2), 149.75), (date(2026, 1, 5), 150.5),
+    ]
+    # 確認間隔が過ぎるまでは読み直さない
+    assert follower.history().series("USD/JPY") is None
+    clock.now = 60
+    assert follower.history().series("USD/JPY").rate_on(date(2026, 1, 6)) == 150.5
+    assert RecordFxRateUseCase(FakeExchangeRateClient(None), leader).execute(date(2026, 1, 6)) is None
+
+
+def test_sample_history_covers_price_fixture_period():
+    # conftestがテスト用のサンプルを指定している
+    series = load_fx_history(os.environ["FX_HISTORY_FILE"]).series("USD/JPY")
+
+    assert series.rate_on(date(2025, 10, 1)) is not None
+    assert series.rate_on(date(2026, 10, 16)) is not None
+
+
+def test_store_requires_configured_file(monkeypatch):
+    monkeypatch.setattr(fx_history_store, "FX_HISTORY_FILE", "")
+    fx_history_store.get_fx_history_store.cache_clear()
+    try:
+        with pytest.raises(RuntimeError):
+            fx_history_store.get_fx_history_store()
+    finally:
+        fx_history_store.get_fx_history_store.cache_clear()
+
+
+def test_history_route(client: TestClient, usd_jpy):
+    app.dependency_overrides[get_fx_history] = lambda: FxHistory({"USD/JPY": usd_jpy})
+    try:
+        response = client.get(
+            "/api/exchange-rates/usd-jpy/history", params={"start": "2026-01-03", "end": "2026-01-06"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "pair": "USD/JPY",
+            "rates": [{"date": "2026-01-05", "rate": 151.0}, {"date": "2026-01-06", "rate": 152.0}],
+        }
+        assert client.get(
+            "/api/exchange-rates/usd-jpy/history", params={"start": "2026-02-01", "end": "2026-01-01"}
+        ).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
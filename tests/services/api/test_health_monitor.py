@@ -0,0 +1,111 @@
+"""バックグラウンドのヘルスモニターと/health/live, /health/readyのテスト"""
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.entities.stock import Stock
+from infrastructure import health_monitor as monitor_module
+from infrastructure.cache.quote_cache import InProcessQuoteCache
+from infrastructure.health_monitor import CheckResult, HealthMonitor
+from presentation.routes import health as health_route
+
+
+def _probe(healthy=True, delay=0.0, error=None, **detail):
+    async def probe():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return CheckResult(healthy, detail)
+
+    return probe
+
+
+def _monitor(**probes):
+    return HealthMonitor(probes, critical=frozenset({"database", "event_loop"}),
+                         interval_seconds=0.01, timeout_seconds=0.05)
+
+
+def test_verdict_reflects_component_criticality():
+    monitor = _monitor(database=_probe(), fx_cache=_probe(healthy=False, age_seconds=7200))
+
+    payload = asyncio.run(monitor.check_once())
+    status_code, body = monitor.readiness()
+
+    # 重要でないコンポーネントの異常はdegradedとして報告するがトラフィックは受ける
+    assert status_code == 200
+    assert payload["status"] == "degraded"
+    assert json.loads(body)["components"]["fx_cache"] == {
+        "healthy": False, "critical": False, "latency_ms": pytest.approx(0, abs=50),
+        "age_seconds": 7200,
+    }
+
+    monitor.probes["database"] = _probe(error=ConnectionError("refused"))
+    asyncio.run(monitor.check_once())
+    status_code, body = monitor.readiness()
+    assert status_code == 503
+    assert json.loads(body)["status"] == "unavailable"
+    assert json.loads(body)["components"]["database"]["error"] == "ConnectionError"
+
+
+def test_slow_probe_times_out_and_loop_lag_is_reported():
+    monitor = _monitor(database=_probe(delay=1.0))
+    monitor.loop_lag_seconds = 2.0
+
+    payload = asyncio.run(monitor.check_once())
+
+    assert payload["components"]["database"]["error"] == "timeout"
+    assert payload["components"]["event_loop"] == {
+        "healthy": False, "critical": True, "lag_ms": 2000.0,
+    }
+    assert monitor.readiness()[0] == 503
+
+
+def test_background_loop_refreshes_and_liveness_detects_stall():
+    monitor = _monitor(database=_probe())
+    assert monitor.readiness()[0] == 503  # 初回の確認前
+
+    async def run_briefly():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(run_briefly())
+
+    assert monitor.readiness()[0] == 200
+    assert monitor.liveness()[0] == 200
+    monitor.last_checked = time.monotonic() - 10
+    assert monitor.liveness()[0] == 503
+
+
+def test_cache_probes(monkeypatch):
+    cache = InProcessQuoteCache()
+    monkeypatch.setattr(monitor_module, "get_quote_cache", lambda: cache)
+
+    assert asyncio.run(monitor_module.check_fx_cache()).healthy is False
+    cache.put_fx_rate("USD/JPY", 150.0, datetime.now() - timedelta(minutes=5))
+    assert asyncio.run(monitor_module.check_fx_cache()) == CheckResult(
+        True, {"rate": 150.0, "age_seconds": 300}
+    )
+
+    cache.put_quote(Stock(symbol="7974", name="任天堂", price=8000.0, currency="JPY",
+                          timestamp=datetime(2020, 1, 6, 10, 0)))
+    result = asyncio.run(monitor_module.check_quote_cache())
+    assert result == CheckResult(False, {"quotes": 1, "stale": 1})
+
+
+def test_probe_routes_serve_cached_verdict(client: TestClient, monkeypatch):
+    monitor = _monitor(database=_probe())
+    monkeypatch.setattr(health_route, "health_monitor", monitor)
+
+    assert client.get("/health/ready").json()["status"] == "starting"
+
+    asyncio.run(monitor.check_once())
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
+    assert response.json()["components"]["database"]["healthy"] is True
+    assert client.get("/health/live").json() == {"status": "alive"}
@@ -0,0 +1,223 @@
+"""複数の株価APIへの予備リクエストとフェイルオーバーのテスト（ローカルの代役HTTPサーバーを使う）"""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import infrastructure.repositories.hedged_stock_repository as hedged_stock_repository
+import infrastructure.scheduler as scheduler
+from infrastructure.cache.quote_cache import InProcessQuoteCache
+from infrastructure.latency_histogram import LatencyHistogram
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from infrastructure.repositories.hedged_stock_repository import (
+    HedgedStockRepository,
+    QuoteProvider,
+)
+from infrastructure.repositories.http_stock_repository import HttpStockRepository
+
+
+class StandInQuoteServer:
+    """遅延と応答ステータスを指定できる株価APIの代役"""
+
+    def __init__(self, name: str, delay: float = 0.0, status: int = 200):
+        self.name = name
+        self.delay = delay
+        self.status = status
+        self.hits = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.hits += 1
+                time.sleep(server.delay)
+                symbol = self.path.rsplit("/", 1)[-1]
+                body = json.dumps({
+                    "symbol": symbol,
+                    "name": server.name,
+                    "price": 8150.0,
+                    "currency": "JPY",
+                    "timestamp": datetime.now().isoformat(),
+                }).encode("utf-8")
+                try:
+                    self.send_response(server.status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    # 取り消された問い合わせは接続が切られている
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def trained(seconds: float, samples: int = 50) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    for _ in range(samples):
+        histogram.observe(seconds)
+    return histogram
+
+
+def lookup(providers, symbol="7974", **kwargs):
+    """代役サーバーに問い合わせ、(株価, 経過秒数, リポジトリ) を返す"""
+
+    async def run():
+        async with httpx.AsyncClient(timeout=5) as client:
+            repository = HedgedStockRepository(
+                [
+                    QuoteProvider(server.name, HttpStockRepository(server.url, client), histogram)
+                    for server, histogram in providers
+                ],
+                **kwargs,
+            )
+            started = time.monotonic()
+            stock = await repository.get_stock_price(symbol)
+            return stock, time.monotonic() - started, repository
+
+    return asyncio.run(run())
+
+
+def test_histogram_quantiles_follow_log_buckets():
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.observe(0.010)
+    for _ in range(10):
+        histogram.observe(0.500)
+    assert histogram.quantile(0.5) == pytest.approx(0.010, rel=0.26)
+    assert histogram.quantile(0.95) == pytest.approx(0.500, rel=0.26)
+    assert histogram.stats()["observed"] == 100
+
+    with pytest.raises(ValueError):
+        LatencyHistogram().quantile(0.95)
+
+
+def test_histogram_decays_old_observations():
+    histogram = LatencyHistogram(decay_every=100)
+    for _ in range(99):
+        histogram.observe(1.0)
+    for _ in range(300):
+        histogram.observe(0.010)
+    # 遅かった頃の観測は半減を繰り返して5%未満になっている
+    assert histogram.quantile(0.95) == pytest.approx(0.010, rel=0.26)
+
+
+def test_fast_primary_is_not_hedged():
+    with StandInQuoteServer("primary") as primary, StandInQuoteServer("secondary") as secondary:
+        stock, _, repository = lookup(
+            [(primary, trained(0.2)), (secondary, trained(0.2))], max_delay=1.0
+        )
+
+    assert stock.name == "primary"
+    assert secondary.hits == 0
+    assert repository.hedged == 0
+
+
+def test_slow_primary_is_hedged_after_its_p95():
+    with StandInQuoteServer("primary", delay=1.5) as primary, \
+            StandInQuoteServer("secondary", delay=0.01) as secondary:
+        stock, elapsed, repository = lookup(
+            [(primary, trained(0.05)), (secondary, trained(0.05))], max_delay=1.0
+        )
+
+    assert stock.name == "secondary"
+    assert stock.price == 8150.0
+    # 最大の待ち時間（1秒）ではなくp95（約50ms）で予備を送っている
+    assert elapsed < 0.8
+    assert primary.hits == 1 and secondary.hits == 1
+    stats = repository.stats()
+    assert stats["hedged"] == 1
+    assert stats["providers"]["primary"]["cancelled"] == 1
+    assert stats["providers"]["secondary"]["wins"] == 1
+
+
+def test_untrained_provider_waits_max_delay_before_hedging():
+    with StandInQuoteServer("primary", delay=0.3) as primary, \
+            StandInQuoteServer("secondary") as secondary:
+        stock, _, repository = lookup(
+            [(primary, LatencyHistogram()), (secondary, LatencyHistogram())], max_delay=1.0
+        )
+
+    assert stock.name == "primary"
+    assert secondary.hits == 0
+    assert repository.hedge_delay(repository.providers[0]) == 1.0
+
+
+def test_errors_fail_over_without_waiting_for_hedge_delay():
+    with StandInQuoteServer("primary", status=503) as primary, \
+            StandInQuoteServer("secondary", status=404) as secondary, \
+            StandInQuoteServer("tertiary") as tertiary:
+        stock, elapsed, repository = lookup(
+            [(primary, LatencyHistogram()), (secondary, LatencyHistogram()),
+             (tertiary, LatencyHistogram())],
+            max_delay=2.0,
+        )
+
+    assert stock.name == "tertiary"
+    assert elapsed < 1.0
+    assert repository.failed_over == 2
+    assert repository.providers[0].errors == 1
+
+
+def test_returns_none_when_every_provider_fails():
+    with StandInQuoteServer("primary", status=500) as primary, \
+            StandInQuoteServer("secondary", status=404) as secondary:
+        stock, _, repository = lookup(
+            [(primary, LatencyHistogram()), (secondary, LatencyHistogram())]
+        )
+
+    assert stock is None
+    assert primary.hits == 1 and secondary.hits == 1
+
+
+def test_quote_stats_endpoint_is_empty_with_mock_upstream(client: TestClient):
+    response = client.get("/health/quotes")
+    assert response.status_code == 200
+    assert response.json() == {}
+
+
+def test_warm_job_fetches_from_configured_provider(monkeypatch, session_factory):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.add(UserStockModel(user_id=1, ticker_symbol="7974", quantity=100, acquisition_price=1000))
+    db.commit()
+    db.close()
+
+    class StubExchangeRateClient:
+        def get_usd_jpy_rate(self):
+            return None
+
+    cache = InProcessQuoteCache()
+    monkeypatch.setattr(scheduler, "run_as_leader", lambda job_name: True)
+    monkeypatch.setattr(scheduler, "get_session_local", lambda: session_factory)
+    monkeypatch.setattr(scheduler, "get_quote_cache", lambda: cache)
+    monkeypatch.setattr(scheduler, "ExchangeRateClient", StubExchangeRateClient)
+
+    with StandInQuoteServer("configured") as provider:
+        monkeypatch.setattr(hedged_stock_repository, "QUOTE_PROVIDER_URLS", [provider.url])
+        # asyncio.runのたびに新しいイベントループになっても、接続を作り直して取得できる
+        scheduler.warm_quote_cache_job()
+        scheduler.warm_quote_cache_job()
+
+    assert provider.hits == 2
+    assert cache.get_quote("7974").name == "configured"
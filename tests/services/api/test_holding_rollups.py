@@ -0,0 +1,136 @@
+"""銘柄ごとの保有株の集計と管理者向け統計のテスト"""
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from application.use_cases.get_holding_stats import GetHoldingStatsUseCase
+from application.use_cases.reconcile_holding_rollups import ReconcileHoldingRollupsUseCase
+from domain.entities.corporate_action import CorporateAction
+from domain.entities.holding_rollup import SymbolHoldingRollup
+from domain.entities.stock import Stock
+from domain.entities.user_stock import UserStock
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.cache.quote_cache import InProcessQuoteCache
+from infrastructure.database import get_session_local
+from infrastructure.jwt_utils import create_access_token
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from infrastructure.repositories.holding_rollup_repository_impl import SQLHoldingRollupRepository
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from main import app
+from presentation.dependencies import auth
+from presentation.routes.admin import get_holding_stats_use_case
+
+
+def _seed_users(db, count):
+    for user_id in range(1, count + 1):
+        db.add(UserModel(id=user_id, user_id=user_id, username=f"u{user_id}",
+                         email=f"u{user_id}@example.com", password_hash="x"))
+    db.commit()
+
+
+def _create(db, user_id, symbol, quantity, price):
+    asyncio.run(SQLUserStockRepository(db).create(UserStock(
+        id=None, user_stock_id=None, user_id=user_id, ticker_symbol=symbol, quantity=quantity,
+        acquisition_price=Decimal(price),
+    )))
+
+
+def test_rollups_are_updated_with_each_new_lot(db_session):
+    _seed_users(db_session, 3)
+    _create(db_session, 1, "7974", 100, "8000.00")
+    _create(db_session, 2, "7974", 50, "7500.50")
+    _create(db_session, 3, "7974", 10, "9000.00")
+    _create(db_session, 1, "AAPL", 10, "150.25")
+    rollups = SQLHoldingRollupRepository(db_session)
+
+    assert asyncio.run(rollups.most_held(10)) == [
+        SymbolHoldingRollup("7974", 3, 160, Decimal("1265025.00")),
+        SymbolHoldingRollup("AAPL", 1, 10, Decimal("1502.50")),
+    ]
+    assert asyncio.run(rollups.most_held(1))[0].ticker_symbol == "7974"
+    assert asyncio.run(rollups.get("6758")) is None
+
+
+def test_reconcile_rebuilds_from_base_table_with_splits(db_session):
+    _seed_users(db_session, 2)
+    _create(db_session, 1, "7974", 100, "8000.00")
+    # 集計を通さずに入った行と、取得後に分割された銘柄
+    db_session.add(UserStockModel(user_id=2, ticker_symbol="6758", quantity=30,
+                                  acquisition_price=Decimal("3000"),
+                                  created_at=datetime(2026, 1, 5)))
+    db_session.add(UserStockModel(user_id=2, ticker_symbol="7974", quantity=20,
+                                  acquisition_price=Decimal("7000"),
+                                  created_at=datetime(2026, 1, 5)))
+    db_session.commit()
+    rollups = SQLHoldingRollupRepository(db_session)
+    adjustments = SplitAdjustments([CorporateAction("6758", date(2026, 3, 1), 1, 5)])
+    use_case = ReconcileHoldingRollupsUseCase(rollups, adjustments)
+
+    assert asyncio.run(use_case.execute()) == 2
+    assert asyncio.run(rollups.list_all()) == [
+        SymbolHoldingRollup("6758", 1, 150, Decimal("90000.00")),
+        SymbolHoldingRollup("7974", 2, 120, Decimal("940000.00")),
+    ]
+    assert asyncio.run(use_case.execute()) == 0
+
+
+@pytest.fixture
+def admin_client(session_factory, monkeypatch):
+    db = session_factory()
+    _seed_users(db, 2)
+    _create(db, 1, "7974", 100, "8000.00")
+    _create(db, 2, "7974", 100, "8000.00")
+    _create(db, 2, "AAPL", 10, "150.00")
+    _create(db, 2, "TSLA", 5, "200.00")
+    db.close()
+
+    quotes = InProcessQuoteCache()
+    quotes.put_quote(Stock("7974", "Nintendo", 9000.0, "JPY", datetime.now()))
+    quotes.put_quote(Stock("AAPL", "Apple", 200.5, "USD", datetime.now()))
+
+    def use_case():
+        db = session_factory()
+        try:
+            yield GetHoldingStatsUseCase(SQLHoldingRollupRepository(db), quotes)
+        finally:
+            db.close()
+
+    monkeypatch.setattr(auth, "ADMIN_USER_IDS", frozenset({1}))
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_holding_stats_use_case] = use_case
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _headers(user_id):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def test_admin_stats_read_rollups(admin_client):
+    most_held = admin_client.get("/api/admin/stats/most-held?limit=2", headers=_headers(1))
+    aum = admin_client.get("/api/admin/stats/aum", headers=_headers(1))
+
+    assert most_held.status_code == 200
+    assert [(s["ticker_symbol"], s["holders"]) for s in most_held.json()] == [
+        ("7974", 2), ("AAPL", 1),
+    ]
+    assert admin_client.get("/api/admin/stats/symbols/AAPL", headers=_headers(1)).json() == {
+        "ticker_symbol": "AAPL", "holders": 1, "total_quantity": 10, "cost_basis": "1500.00",
+    }
+    assert admin_client.get("/api/admin/stats/symbols/6758", headers=_headers(1)).status_code == 404
+    assert aum.json() == {
+        "market_value": {"JPY": "1800000", "USD": "2005.00"},
+        "cost_basis": {"JPY": "1600000", "USD": "1500.00"},
+        "unpriced_symbols": ["TSLA"],
+    }
+
+
+def test_admin_stats_require_admin(admin_client):
+    assert admin_client.get("/api/admin/stats/aum", headers=_headers(2)).status_code == 403
+    assert admin_client.get("/api/admin/stats/aum").status_code in (401, 403)
@@ -0,0 +1,163 @@
+"""Idempotency-Keyによる書き込みリクエストの重複排除のテスト"""
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.entities.auth import User
+from infrastructure.cache.idempotency_store import (
+    InProcessIdempotencyStore,
+    RedisIdempotencyStore,
+    StoredResponse,
+)
+from infrastructure.database import get_db, get_session_local
+from infrastructure.jwt_utils import create_access_token
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from main import app
+from presentation.dependencies.auth import get_current_user
+from presentation.middlewares.idempotency import IdempotencyMiddleware
+
+
+class FakeRedis:
+    """get/set(nx, ex)/deleteだけを持つRedisクライアントの代役"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode()
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def stock_client(session_factory):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"
+    )
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token({'sub': '1'})}"
+    try:
+        yield client, session_factory
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _post_stock(client, key, quantity=100):
+    return client.post(
+        "/api/user-stocks/",
+        json={"ticker_symbol": "7974", "quantity": quantity, "acquisition_price": "8000.00"},
+        headers={"Idempotency-Key": key},
+    )
+
+
+def test_retry_returns_original_response_without_second_insert(stock_client):
+    client, session_factory = stock_client
+    key = uuid.uuid4().hex
+
+    first = _post_stock(client, key)
+    retry = _post_stock(client, key)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    db = session_factory()
+    assert db.query(UserStockModel).count() == 1
+    db.close()
+
+    # 同じキーで内容の違うリクエストは拒否し、キーがなければ毎回処理する
+    assert _post_stock(client, key, quantity=200).status_code == 422
+    assert _post_stock(client, uuid.uuid4().hex).status_code == 201
+    assert client.post("/api/user-stocks/", json={
+        "ticker_symbol": "6758", "quantity": 1, "acquisition_price": "1.00",
+    }).status_code == 201
+    assert _post_stock(client, "bad key").status_code == 400
+
+
+def _counting_app(status_codes, delay=0.0):
+    calls = []
+
+    async def app(scope, receive, send):
+        message = await receive()
+        calls.append(message["body"])
+        await asyncio.sleep(delay)
+        status_code = status_codes[min(len(calls), len(status_codes)) - 1]
+        await send({"type": "http.response.start", "status": status_code,
+                    "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": f"call {len(calls)}".encode()})
+
+    return app, calls
+
+
+async def _post_concurrently(middleware, count, key="k1"):
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(
+            client.post("/api/auth/register", content=b"{}", headers={"Idempotency-Key": key})
+            for _ in range(count)
+        ))
+
+
+def test_concurrent_duplicates_wait_for_the_first_request():
+    app_, calls = _counting_app([201], delay=0.05)
+    middleware = IdempotencyMiddleware(app_, store=InProcessIdempotencyStore())
+
+    responses = asyncio.run(_post_concurrently(middleware, 3))
+
+    assert len(calls) == 1
+    assert [response.text for response in responses] == ["call 1"] * 3
+    assert sorted(response.headers.get("idempotent-replayed", "") for response in responses) == [
+        "", "true", "true"
+    ]
+
+
+def test_failed_request_releases_the_key():
+    app_, calls = _counting_app([500, 201])
+    middleware = IdempotencyMiddleware(app_, store=InProcessIdempotencyStore())
+
+    first = asyncio.run(_post_concurrently(middleware, 1))[0]
+    second = asyncio.run(_post_concurrently(middleware, 1))[0]
+
+    assert (first.status_code, second.status_code) == (500, 201)
+    assert len(calls) == 2
+
+
+def test_redis_store_shares_records_between_workers():
+    redis = FakeRedis()
+    worker1, worker2 = RedisIdempotencyStore(redis), RedisIdempotencyStore(redis)
+    response = StoredResponse(201, [(b"content-type", b"application/json")], b'{"id": 1}')
+
+    async def scenario():
+        assert await worker1.reserve("user:1:k", "fp") is None
+        assert (await worker2.reserve("user:1:k", "fp")).response is None
+        await worker1.complete("user:1:k", response)
+        return await worker2.wait("user:1:k", timeout=1)
+
+    record = asyncio.run(scenario())
+    assert record.fingerprint == "fp"
+    assert record.response == response
@@ -0,0 +1,88 @@
+"""構造化ログ設定のテスト"""
+import json
+import logging
+import re
+
+from fastapi.testclient import TestClient
+
+from infrastructure.logging_config import (
+    FilebeatJsonFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+    parse_sampling_rates,
+    request_id_var,
+)
+
+
+def _make_record(name="investfolio.test", level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_formatter_emits_filebeat_compatible_line():
+    """Filebeatのmultilineパターンに一致する1行JSONが出力されることを確認"""
+    record = _make_record()
+    record.request_id = "abc123"
+
+    line = FilebeatJsonFormatter().format(record)
+
+    assert re.match(r"^\d{4}-\d{2}-\d{2}T", line)
+    assert "\n" not in line
+    timestamp, payload = line.split(" ", 1)
+    data = json.loads(payload)
+    assert data["level"] == "INFO"
+    assert data["logger"] == "investfolio.test"
+    assert data["message"] == "hello world"
+    assert data["request_id"] == "abc123"
+    assert data["service"] == "investfolio-api"
+
+
+def test_formatter_keeps_traceback_on_one_line():
+    try:
+        raise ValueError("失敗")
+    except ValueError:
+        import sys
+
+        record = logging.LogRecord("x", logging.ERROR, __file__, 1, "boom", None, sys.exc_info())
+
+    line = FilebeatJsonFormatter().format(record)
+
+    assert "\n" not in line
+    assert "ValueError: 失敗" in json.loads(line.split(" ", 1)[1])["exc_info"]
+
+
+def test_request_id_filter_reads_context():
+    token = request_id_var.set("req-1")
+    try:
+        record = _make_record()
+        RequestIdFilter().filter(record)
+        assert record.request_id == "req-1"
+    finally:
+        request_id_var.reset(token)
+
+
+def test_sampling_filter_keeps_exact_ratio_and_warnings():
+    sampler = SamplingFilter(parse_sampling_rates("noisy=0.25, noisy.child=1"))
+
+    passed = sum(sampler.filter(_make_record(name="noisy")) for _ in range(100))
+    assert passed == 25
+    assert all(sampler.filter(_make_record(name="noisy.child")) for _ in range(10))
+    assert all(sampler.filter(_make_record(name="other")) for _ in range(10))
+    assert sampler.filter(_make_record(name="noisy", level=logging.WARNING))
+
+
+def test_request_id_header_is_generated(client: TestClient):
+    response = client.get("/health")
+
+    assert re.match(r"^[0-9a-f]{32}$", response.headers["x-request-id"])
+
+
+def test_request_id_header_is_propagated(client: TestClient):
+    response = client.get("/health", headers={"X-Request-ID": "upstream-42"})
+
+    assert response.headers["x-request-id"] == "upstream-42"
+
+
+def test_invalid_request_id_header_is_replaced(client: TestClient):
+    response = client.get("/health", headers={"X-Request-ID": "bad id\twith spaces"})
+
+    assert response.headers["x-request-id"] != "bad id\twith spaces"
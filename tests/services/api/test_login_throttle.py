@@ -0,0 +1,148 @@
+"""ログイン試行の制限とパスワード検証の同時実行数の制限のテスト"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from infrastructure.cache.rate_limiter import (
+    InProcessTokenBucketLimiter,
+    LoginThrottle,
+    get_login_throttle,
+)
+from infrastructure.database import get_db
+from infrastructure.models.user import UserModel
+from infrastructure.security import (
+    PasswordVerificationBusy,
+    PasswordVerifier,
+    get_password_verifier,
+    hash_password,
+)
+from main import app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class BrokenLimiter:
+    async def take(self, key, cost=1.0):
+        raise ConnectionError("redis is down")
+
+
+class BusyVerifier:
+    def __init__(self):
+        self.calls = 0
+
+    async def verify(self, plain_password, hashed_password):
+        self.calls += 1
+        raise PasswordVerificationBusy(retry_after=0.2)
+
+
+@pytest.fixture
+def login_client(session_factory):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com",
+                     password_hash=hash_password("Password123")))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _login(client, email="u1@example.com", password="Password123"):
+    return client.post("/api/auth/login", json={"email": email, "password": password})
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    limiter = InProcessTokenBucketLimiter(capacity=2, refill_per_second=0.5, clock=clock)
+
+    async def run():
+        results = [await limiter.take("a") for _ in range(3)]
+        results.append(await limiter.take("b"))
+        clock.now = 1.0
+        results.append(await limiter.take("a"))
+        clock.now = 2.0
+        results.append(await limiter.take("a"))
+        return results
+
+    # 3回目は1トークン分（2秒）待つ必要があり、拒否された試行は消費しない
+    assert asyncio.run(run()) == [0.0, 0.0, 2.0, 0.0, 1.0, 0.0]
+
+
+def test_throttle_checks_ip_then_normalized_email_and_fails_open():
+    clock = FakeClock()
+    throttle = LoginThrottle(
+        InProcessTokenBucketLimiter(10, 1.0, clock=clock),
+        InProcessTokenBucketLimiter(1, 0.1, clock=clock),
+    )
+
+    async def run():
+        return [
+            await throttle.check("10.0.0.1", "U1@example.com"),
+            await throttle.check("10.0.0.2", " u1@example.com"),
+            await throttle.check("10.0.0.1", "u2@example.com"),
+        ]
+
+    assert asyncio.run(run()) == [0.0, 10.0, 0.0]
+    broken = LoginThrottle(BrokenLimiter(), BrokenLimiter())
+    assert asyncio.run(broken.check("10.0.0.1", "u1@example.com")) == 0.0
+
+
+def test_verifier_rejects_when_saturated():
+    verifier = PasswordVerifier(max_concurrency=1, wait_seconds=0.01)
+    password_hash = hash_password("Password123")
+
+    async def run():
+        assert await verifier.verify("Password123", password_hash)
+        await verifier._semaphore.acquire()
+        try:
+            await verifier.verify("Password123", password_hash)
+        finally:
+            verifier._semaphore.release()
+
+    with pytest.raises(PasswordVerificationBusy):
+        asyncio.run(run())
+
+
+def test_login_returns_429_with_retry_after_before_verifying(login_client):
+    throttle = LoginThrottle(
+        InProcessTokenBucketLimiter(10, 1.0), InProcessTokenBucketLimiter(2, 1 / 60)
+    )
+    app.dependency_overrides[get_login_throttle] = lambda: throttle
+
+    assert _login(login_client, password="WrongPassword").status_code == 401
+    assert _login(login_client).status_code == 200
+    limited = _login(login_client)
+    assert limited.status_code == 429
+    assert 55 <= int(limited.headers["Retry-After"]) <= 60
+    # 別のメールアドレスは制限されない
+    assert _login(login_client, email="u2@example.com").status_code == 401
+
+
+def test_login_returns_429_when_verification_is_busy(login_client):
+    verifier = BusyVerifier()
+    app.dependency_overrides[get_password_verifier] = lambda: verifier
+
+    response = _login(login_client)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    # 存在しないユーザーは検証せずに401
+    assert _login(login_client, email="u2@example.com").status_code == 401
+    assert verifier.calls == 1
@@ -0,0 +1,104 @@
+"""取引所カレンダーと株価鮮度ポリシーのテスト"""
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from domain.services.market_calendar import (
+    NYSE,
+    PRICE_TYPE_CLOSE,
+    PRICE_TYPE_LIVE,
+    TSE,
+    MarketCalendar,
+    QuoteFreshnessPolicy,
+)
+from infrastructure.config.market_calendar import (
+    QUOTE_WARM_INTERVAL_MINUTES,
+    get_market_calendar,
+    get_quote_freshness_policy,
+)
+
+JST = ZoneInfo("Asia/Tokyo")
+EST = ZoneInfo("America/New_York")
+
+
+@pytest.fixture
+def calendar():
+    return MarketCalendar({TSE: [date(2026, 1, 12)], NYSE: [date(2026, 1, 19)]})
+
+
+@pytest.fixture
+def policy(calendar):
+    return QuoteFreshnessPolicy(calendar, session_ttl_seconds=15)
+
+
+@pytest.mark.parametrize(
+    "symbol, market",
+    [("7974", TSE), ("7974.T", TSE), ("285A", TSE), ("AAPL", NYSE), ("BRK.B", NYSE)],
+)
+def test_market_for_symbol(calendar, symbol, market):
+    assert calendar.market_for_symbol(symbol) == market
+
+
+def test_tse_sessions_and_lunch_break(calendar):
+    assert calendar.is_open(TSE, datetime(2026, 1, 13, 9, 0, tzinfo=JST))
+    assert not calendar.is_open(TSE, datetime(2026, 1, 13, 12, 0, tzinfo=JST))
+    assert calendar.is_open(TSE, datetime(2026, 1, 13, 15, 29, tzinfo=JST))
+    assert not calendar.is_open(TSE, datetime(2026, 1, 13, 15, 30, tzinfo=JST))
+    # 成人の日（休場）
+    assert not calendar.is_open(TSE, datetime(2026, 1, 12, 10, 0, tzinfo=JST))
+
+
+def test_last_close_and_next_open_skip_weekend_and_holiday(calendar):
+    # 2026-01-10(土) → 直近の終値は 01-09(金) 15:30、次の寄り付きは 01-13(火) 9:00
+    saturday = datetime(2026, 1, 10, 12, 0, tzinfo=JST)
+    assert calendar.last_close(TSE, saturday) == datetime(2026, 1, 9, 15, 30, tzinfo=JST)
+    assert calendar.next_open(TSE, saturday) == datetime(2026, 1, 13, 9, 0, tzinfo=JST)
+
+
+def test_closing_price_stays_fresh_until_next_open(policy):
+    close_fetch = datetime(2026, 1, 9, 15, 45, tzinfo=JST)
+    assert policy.is_fresh("7974", close_fetch, now=datetime(2026, 1, 12, 20, 0, tzinfo=JST))
+    assert not policy.is_fresh("7974", close_fetch, now=datetime(2026, 1, 13, 9, 1, tzinfo=JST))
+    assert policy.price_type("7974", close_fetch) == PRICE_TYPE_CLOSE
+
+
+def test_live_price_expires_after_session_ttl(policy):
+    now = datetime(2026, 1, 13, 10, 0, tzinfo=JST)
+    assert policy.is_fresh("7974", now - timedelta(seconds=10), now=now)
+    assert not policy.is_fresh("7974", now - timedelta(seconds=30), now=now)
+    assert policy.price_type("7974", now) == PRICE_TYPE_LIVE
+
+
+def test_warmed_price_stays_fresh_until_next_warm_run():
+    # 立会中の事前取得の直前にも、前回取得した株価がキャッシュから返せる
+    policy = get_quote_freshness_policy()
+    warmed = datetime(2026, 1, 13, 10, 0, tzinfo=JST)
+    next_run = warmed + timedelta(minutes=QUOTE_WARM_INTERVAL_MINUTES, seconds=30)
+    assert policy.is_fresh("7974", warmed, now=next_run)
+
+
+def test_price_fetched_before_close_is_stale_after_close(policy):
+    fetched = datetime(2026, 1, 13, 15, 25, tzinfo=JST)
+    assert not policy.is_fresh("7974", fetched, now=datetime(2026, 1, 13, 16, 0, tzinfo=JST))
+
+
+def test_nyse_uses_its_own_timezone(policy):
+    fetched = datetime(2026, 1, 16, 16, 5, tzinfo=EST)
+    # MLKデー（01-19）を挟んで 01-20 の寄り付きまで終値が有効
+    assert policy.is_fresh("AAPL", fetched, now=datetime(2026, 1, 19, 12, 0, tzinfo=EST))
+    assert not policy.is_fresh("AAPL", fetched, now=datetime(2026, 1, 20, 9, 31, tzinfo=EST))
+
+
+def test_holiday_file_is_loaded():
+    calendar = get_market_calendar()
+    assert not calendar.is_trading_day(TSE, date(2026, 1, 1))
+    assert not calendar.is_trading_day(NYSE, date(2026, 7, 3))
+    assert calendar.is_trading_day(TSE, date(2026, 7, 3))
+
+
+def test_stock_route_tags_price_type(client):
+    response = client.get("/api/stocks/7974")
+
+    assert response.status_code == 200
+    assert response.json()["price_type"] in (PRICE_TYPE_LIVE, PRICE_TYPE_CLOSE)
@@ -0,0 +1,78 @@
+"""固定小数点の金額演算のテスト"""
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from domain.services.portfolio_valuation import market_value, market_values
+from domain.value_objects.money import (
+    PRICE_SCALE,
+    QUANTITY_SCALE,
+    RATE_SCALE,
+    Money,
+    MoneyArray,
+    from_units,
+    to_units,
+    units_array,
+)
+
+
+def _reference(quantity, price, fx_rate, currency, portfolio_currency):
+    """Decimalによる参照実装（取引通貨で丸めてから換算して丸める）"""
+    local_quantum = Decimal("1") if currency == "JPY" else Decimal("0.01")
+    target_quantum = Decimal("1") if portfolio_currency == "JPY" else Decimal("0.01")
+    local = (quantity * price).quantize(local_quantum, rounding=ROUND_HALF_UP)
+    return (local * fx_rate).quantize(target_quantum, rounding=ROUND_HALF_UP)
+
+
+def test_decimal_round_trip_is_lossless():
+    for value in ["0", "1234.50", "-0.01", "99999999.99"]:
+        assert Money.from_decimal(Decimal(value), "USD").to_decimal() == Decimal(value)
+    assert from_units(to_units(Decimal("150.123456"), 6), 6) == Decimal("150.123456")
+    assert Money.from_decimal(Decimal("1500"), "JPY").minor == 1500
+
+
+def test_rounding_is_half_away_from_zero():
+    assert Money.valuate(Decimal("1"), Decimal("100.5"), "JPY").minor == 101
+    assert Money.valuate(Decimal("-1"), Decimal("100.5"), "JPY").minor == -101
+    assert Money.valuate(Decimal("1"), Decimal("100.4999"), "JPY").minor == 100
+
+
+def test_vectorized_valuation_matches_decimal_reference():
+    rng = random.Random(42)
+    quantities = [Decimal(rng.randint(1, 10**7)).scaleb(-4) for _ in range(2000)]
+    prices = [Decimal(rng.randint(1, 10**9)).scaleb(-4) for _ in range(2000)]
+    rates = [Decimal(rng.randint(10**8, 2 * 10**8)).scaleb(-6) for _ in range(2000)]
+
+    values = market_values(
+        units_array(quantities, QUANTITY_SCALE),
+        units_array(prices, PRICE_SCALE),
+        units_array(rates, RATE_SCALE),
+        "USD",
+        "JPY",
+    ).to_decimals()
+
+    expected = [_reference(q, p, r, "USD", "JPY") for q, p, r in zip(quantities, prices, rates)]
+    assert values == expected
+    assert values[:10] == [
+        market_value(q, p, r, "USD", "JPY") for q, p, r in zip(quantities, prices, rates)
+    ][:10]
+
+
+def test_int64_overflow_falls_back_to_exact_arithmetic():
+    quantities = [Decimal("100000000"), Decimal("10")]
+    prices = [Decimal("99999999.9999"), Decimal("1500")]
+
+    values = MoneyArray.valuate(
+        units_array(quantities, QUANTITY_SCALE), units_array(prices, PRICE_SCALE), "JPY"
+    )
+
+    assert values.to_decimals() == [Decimal("9999999999990000"), Decimal("15000")]
+    assert values.sum() == Money(9999999999990000 + 15000, "JPY")
+
+
+def test_currency_mismatch_raises():
+    with pytest.raises(ValueError):
+        Money(100, "JPY") + Money(100, "USD")
+    with pytest.raises(ValueError):
+        MoneyArray.from_decimals([1], "JPY") - MoneyArray.from_decimals([1], "USD")
@@ -0,0 +1,87 @@
+"""モンテカルロ・シミュレーションのテスト"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+import pytest
+
+from application.services.portfolio_returns import PortfolioReturnsLoader
+from application.use_cases.simulate_portfolio import SimulatePortfolioUseCase
+from domain.entities.user_stock import UserStock
+from domain.services.monte_carlo import BOOTSTRAP, GBM, checkpoint_days, simulate_paths
+from infrastructure.cache.lru_cache import LRUCache
+from infrastructure.cache.return_matrix_cache import ReturnMatrixCache
+from infrastructure.config.market_calendar import get_market_calendar
+from infrastructure.repositories.price_history_repository_impl import (
+    FixturePriceHistoryRepository,
+)
+from presentation.schemas.simulation import SimulationRequest
+
+
+class StubUserStockRepository:
+    def __init__(self, holdings):
+        self.holdings = holdings
+
+    async def get_by_user_id(self, user_id):
+        return [
+            UserStock(id=i, user_stock_id=i, user_id=user_id, ticker_symbol=symbol,
+                      quantity=quantity, acquisition_price=1)
+            for i, (symbol, quantity) in enumerate(self.holdings)
+        ]
+
+
+class StubExchangeRateRepository:
+    def get_usd_jpy_rate(self):
+        return {"symbol": "USD/JPY", "last": "150.00"}
+
+
+def test_checkpoint_days_include_start_and_horizon():
+    assert checkpoint_days(10, max_points=30).tolist() == list(range(11))
+    days = checkpoint_days(252, max_points=30)
+    assert days[0] == 0 and days[-1] == 252 and len(days) <= 32
+
+
+@pytest.mark.parametrize("method", [GBM, BOOTSTRAP])
+def test_constant_returns_grow_deterministically(method):
+    returns = np.full((50, 2), 0.01)
+    values = np.array([1000.0, 2000.0])
+    checkpoints = checkpoint_days(20)
+
+    recorded = simulate_paths(
+        method, returns, values, 20, 100, checkpoints, np.random.SeedSequence(0)
+    )
+
+    assert recorded.shape == (100, len(checkpoints))
+    np.testing.assert_allclose(recorded[:, -1], 3000.0 * 1.01**20, rtol=1e-5)
+
+
+def test_simulation_streams_progress_and_caches_result():
+    loader = PortfolioReturnsLoader(
+        StubUserStockRepository([("7974", 100), ("AAPL", 50)]),
+        FixturePriceHistoryRepository(),
+        StubExchangeRateRepository(),
+        ReturnMatrixCache(),
+        get_market_calendar(),
+    )
+    request = SimulationRequest(method="bootstrap", horizon_days=60, paths=2500, seed=7)
+
+    async def run(use_case):
+        job = await use_case.prepare(1, request, as_of=date(2026, 10, 16))
+        return [event async for event in use_case.stream(job)]
+
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        use_case = SimulatePortfolioUseCase(loader, pool, LRUCache(4), chunk_paths=1000)
+        events = asyncio.run(run(use_case))
+        cached = asyncio.run(run(use_case))
+
+    progress = [e for e in events if e["type"] == "progress"]
+    assert [e["completed"] for e in progress][-1] == 2500 and len(progress) == 3
+    result = events[-1]
+    assert result["type"] == "result" and not result["cached"]
+    assert result["days"][-1] == 60
+    assert result["percentiles"]["5"][-1] <= result["percentiles"]["50"][-1] <= result["percentiles"]["95"][-1]
+    assert 0 <= result["terminal"]["probability_of_loss"] <= 1
+
+    assert cached == [{**result, "cached": True}]
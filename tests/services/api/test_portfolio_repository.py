@@ -0,0 +1,140 @@
+"""ポートフォリオ評価額の差分更新のテスト"""
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event, update
+from sqlalchemy.dialects import mysql
+
+from domain.entities.corporate_action import CorporateAction
+from domain.entities.portfolio import Portfolio, PortfolioItem
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.models.portfolio import PortfolioItemModel
+from infrastructure.models.user import UserModel
+from infrastructure.repositories.portfolio_repository_impl import SQLPortfolioRepository
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _setup(db):
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.commit()
+    repository = SQLPortfolioRepository(db)
+    portfolio = _run(repository.create(Portfolio(user_id=1, name="main")))
+    return repository, portfolio
+
+
+def _item(portfolio_id, symbol, quantity, price, currency="JPY", fx_rate="1"):
+    return PortfolioItem(
+        portfolio_id=portfolio_id,
+        symbol=symbol,
+        name=symbol,
+        quantity=Decimal(quantity),
+        average_price=Decimal("100"),
+        currency=currency,
+        current_price=Decimal(price) if price is not None else None,
+        fx_rate=Decimal(fx_rate),
+        asset_type="stock",
+    )
+
+
+def _assert_total_matches_items(repository, portfolio_id):
+    portfolio = _run(repository.get_by_id(portfolio_id))
+    items = _run(repository.list_items(portfolio_id))
+    assert portfolio.total_value == sum(
+        (item.market_value or Decimal("0") for item in items), Decimal("0")
+    )
+    return portfolio.total_value
+
+
+def test_add_and_remove_item_keep_total_in_sync(db_session):
+    repository, portfolio = _setup(db_session)
+
+    item = _run(repository.add_item(_item(portfolio.id, "7974", "10", "1500")))
+    _run(repository.add_item(_item(portfolio.id, "AAPL", "2", "200", "USD", "150")))
+
+    assert item.market_value == Decimal("15000.00")
+    assert _assert_total_matches_items(repository, portfolio.id) == Decimal("75000.00")
+
+    assert _run(repository.remove_item(portfolio.id, item.id))
+    assert _assert_total_matches_items(repository, portfolio.id) == Decimal("60000.00")
+    assert not _run(repository.remove_item(portfolio.id, item.id))
+
+
+def test_price_and_fx_ticks_update_only_affected_items(db_session):
+    repository, portfolio = _setup(db_session)
+    _run(repository.add_item(_item(portfolio.id, "7974", "10", "1500")))
+    _run(repository.add_item(_item(portfolio.id, "AAPL", "2", "200", "USD", "150")))
+    _run(repository.add_item(_item(portfolio.id, "6758", "5", None)))
+
+    updated = _run(repository.apply_price_ticks(
+        {"7974": Decimal("1600"), "6758": Decimal("3000"), "9999": Decimal("1")}
+    ))
+    assert updated == 2
+    assert _assert_total_matches_items(repository, portfolio.id) == Decimal("91000.00")
+
+    # 同じ値の再通知では更新しない
+    assert _run(repository.apply_price_ticks({"7974": Decimal("1600")})) == 0
+
+    assert _run(repository.apply_fx_tick("USD", "JPY", Decimal("155.5"))) == 1
+    assert _assert_total_matches_items(repository, portfolio.id) == Decimal("93200.00")
+    assert _run(repository.apply_fx_tick("USD", "JPY", Decimal("155.5"))) == 0
+
+
+def test_ticks_and_removal_lock_the_items_they_compute_deltas_from(db_session):
+    repository, portfolio = _setup(db_session)
+    item = _run(repository.add_item(_item(portfolio.id, "7974", "10", "1500")))
+    _run(repository.add_item(_item(portfolio.id, "AAPL", "2", "200", "USD", "150")))
+    reads = []
+
+    @event.listens_for(db_session, "do_orm_execute")
+    def record(state):
+        if state.is_select:
+            reads.append(str(state.statement.compile(dialect=mysql.dialect())))
+
+    _run(repository.apply_price_ticks({"7974": Decimal("1600")}))
+    _run(repository.apply_fx_tick("USD", "JPY", Decimal("155")))
+    _run(repository.remove_item(portfolio.id, item.id))
+
+    # 差分のもとにした明細を、コミットまで他の処理に変更・削除させない
+    item_reads = [sql for sql in reads if "portfolio_items" in sql]
+    assert len(item_reads) == 3
+    assert all("FOR UPDATE" in sql for sql in item_reads)
+    assert _assert_total_matches_items(repository, portfolio.id) == Decimal("62000.00")
+
+
+def test_ticks_value_items_with_splits_after_their_created_date(db_session):
+    today = date.today()
+    adjustments = SplitAdjustments([
+        CorporateAction(symbol="7974", ex_date=today - timedelta(days=5), ratio_from=1, ratio_to=4),
+        # まだ権利落ちしていない分割は株価にも反映されていない
+        CorporateAction(symbol="7974", ex_date=today + timedelta(days=5), ratio_from=1, ratio_to=2),
+    ])
+    _setup(db_session)
+    repository = SQLPortfolioRepository(db_session, adjustments)
+    portfolio = _run(repository.create(Portfolio(user_id=1, name="split")))
+    other = _run(repository.create(Portfolio(user_id=1, name="after-split")))
+    before = _run(repository.add_item(_item(portfolio.id, "7974", "10", "8000")))
+    after = _run(repository.add_item(_item(other.id, "7974", "40", "2000")))
+    db_session.execute(
+        update(PortfolioItemModel)
+        .where(PortfolioItemModel.id == before.id)
+        .values(created_at=datetime.combine(today - timedelta(days=30), datetime.min.time()))
+    )
+    db_session.commit()
+
+    assert _run(repository.apply_price_ticks({"7974": Decimal("2100")})) == 2
+
+    [split] = _run(repository.list_items(portfolio.id))
+    [unsplit] = _run(repository.list_items(other.id))
+    # 分割前に登録した10株は40株として評価する（保存済みの株数は変えない）
+    assert split.market_value == Decimal("84000.00")
+    assert split.quantity == Decimal("10")
+    assert unsplit.market_value == Decimal("84000.00")
+    assert _assert_total_matches_items(repository, portfolio.id) == Decimal("84000.00")
+    assert _assert_total_matches_items(repository, other.id) == Decimal("84000.00")
+
+    assert _run(repository.apply_fx_tick("JPY", "JPY", Decimal("1.5"))) == 2
+    assert _assert_total_matches_items(repository, portfolio.id) == Decimal("126000.00")
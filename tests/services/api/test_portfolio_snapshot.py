@@ -0,0 +1,176 @@
+"""日次のポートフォリオ評価ジョブと推移の取得のテスト"""
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from application.use_cases.snapshot_portfolios import SnapshotPortfoliosUseCase
+from domain.entities.portfolio_snapshot import PortfolioSnapshot
+from domain.entities.stock import Stock
+from domain.entities.user_stock import UserStock
+from domain.services.fx_history import FxHistory, FxSeries
+from domain.services.portfolio_snapshot import downsample, snapshot_holdings
+from infrastructure.database import get_session_local
+from infrastructure.jwt_utils import create_access_token
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from infrastructure.repositories.portfolio_snapshot_repository_impl import (
+    SQLPortfolioSnapshotRepository,
+)
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from main import app
+
+DAY = date(2026, 10, 16)
+
+PRICES = {"7974": (8000.0, "JPY"), "AAPL": (200.5, "USD")}
+
+
+class FakeStockRepository:
+    def __init__(self):
+        self.requested = []
+
+    async def get_stock_price(self, symbol):
+        self.requested.append(symbol)
+        if symbol not in PRICES:
+            return None
+        price, currency = PRICES[symbol]
+        return Stock(symbol, f"name-{symbol}", price, currency, datetime.now())
+
+
+class ChunkRecordingRepository(SQLUserStockRepository):
+    def __init__(self, db):
+        super().__init__(db)
+        self.chunks = []
+
+    async def get_by_user_ids(self, user_ids):
+        self.chunks.append(list(user_ids))
+        return await super().get_by_user_ids(user_ids)
+
+
+def _holding(symbol, quantity, price):
+    return UserStock(id=None, user_stock_id=None, user_id=1, ticker_symbol=symbol,
+                     quantity=quantity, acquisition_price=Decimal(price))
+
+
+def test_snapshot_converts_and_skips_unpriced_holdings():
+    quotes = {"7974": (Decimal("8000"), "JPY"), "AAPL": (Decimal("200.50"), "USD"),
+              "SAP": (Decimal("150"), "EUR")}
+    holdings = [_holding("7974", 100, "7000"), _holding("AAPL", 10, "150.25"),
+                _holding("0000", 100, "1000"), _holding("SAP", 10, "100")]
+
+    snapshot = snapshot_holdings(1, DAY, holdings, quotes, {"USD": Decimal("150")})
+
+    # 7974: 800,000円 / AAPL: 2,005ドル×150 = 300,750円。株価・レートのない銘柄は含めない
+    assert snapshot.total_value == Decimal("1100750")
+    assert snapshot.cost_basis == Decimal("700000") + Decimal("225375")
+    assert snapshot.exposures == {"JPY": Decimal("800000"), "USD": Decimal("300750")}
+    # 含めなかった保有株（株価のない0000とレートのないSAP）の件数を残す
+    assert snapshot.excluded_holdings == 2
+
+
+def test_downsample_keeps_last_of_each_bucket():
+    snapshots = [
+        PortfolioSnapshot(1, DAY + timedelta(days=i), Decimal(i), Decimal(0)) for i in range(10)
+    ]
+
+    assert downsample(snapshots, 20) == snapshots
+    assert [s.total_value for s in downsample(snapshots, 3)] == [2, 5, 9]
+    assert [s.total_value for s in downsample(snapshots, 2)] == [4, 9]
+
+
+def _seed(db, user_count):
+    for user_id in range(1, user_count + 1):
+        db.add(UserModel(id=user_id, user_id=user_id, username=f"u{user_id}",
+                         email=f"u{user_id}@example.com", password_hash="x"))
+        db.add(UserStockModel(user_id=user_id, ticker_symbol="7974",
+                              quantity=user_id, acquisition_price=Decimal("7000")))
+        if user_id % 2:
+            db.add(UserStockModel(user_id=user_id, ticker_symbol="AAPL",
+                                  quantity=10, acquisition_price=Decimal("150")))
+        if user_id == 4:
+            # 株価が取得できない銘柄
+            db.add(UserStockModel(user_id=user_id, ticker_symbol="0000",
+                                  quantity=10, acquisition_price=Decimal("1000")))
+    # 保有株のないユーザーは評価しない
+    db.add(UserModel(id=99, user_id=99, username="u99", email="u99@example.com",
+                     password_hash="x"))
+    db.commit()
+
+
+def test_job_processes_users_in_chunks_and_replaces_on_rerun(db_session):
+    _seed(db_session, 5)
+    stocks = FakeStockRepository()
+    user_stocks = ChunkRecordingRepository(db_session)
+    snapshots = SQLPortfolioSnapshotRepository(db_session)
+    fx_history = FxHistory({"USD/JPY": FxSeries.from_pairs([(DAY - timedelta(days=1), 150.0)])})
+    use_case = SnapshotPortfoliosUseCase(
+        user_stocks, stocks, snapshots, fx_history, chunk_size=2, batch_size=1
+    )
+
+    assert asyncio.run(use_case.execute(DAY)) == 5
+    assert asyncio.run(use_case.execute(DAY)) == 5
+
+    assert user_stocks.chunks[:3] == [[1, 2], [3, 4], [5]]
+    assert sorted(stocks.requested) == ["0000", "0000", "7974", "7974", "AAPL", "AAPL"]
+    saved = asyncio.run(snapshots.list_range(3, DAY - timedelta(days=7), DAY))
+    assert saved == [PortfolioSnapshot(
+        user_id=3, snapshot_date=DAY,
+        total_value=Decimal("24000") + Decimal("300750"),
+        cost_basis=Decimal("21000") + Decimal("225000"),
+        exposures={"JPY": Decimal("24000"), "USD": Decimal("300750")},
+    )]
+    assert asyncio.run(snapshots.list_range(2, DAY, DAY))[0].exposures == {"JPY": Decimal("16000")}
+    unpriced = asyncio.run(snapshots.list_range(4, DAY, DAY))[0]
+    assert (unpriced.total_value, unpriced.excluded_holdings) == (Decimal("32000"), 1)
+    assert asyncio.run(snapshots.list_range(99, DAY, DAY)) == []
+
+
+@pytest.fixture
+def history_client(session_factory):
+    db = session_factory()
+    _seed(db, 1)
+    db.close()
+    db = session_factory()
+    repository = SQLPortfolioSnapshotRepository(db)
+    for offset in range(30):
+        day = DAY - timedelta(days=29 - offset)
+        asyncio.run(repository.save_day(day, [
+            PortfolioSnapshot(1, day, Decimal(1000 + offset), Decimal(900), {"JPY": Decimal(1000 + offset)}),
+        ]))
+    db.close()
+
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_history_route_downsamples_range(history_client):
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+    response = history_client.get(
+        "/api/portfolio-history",
+        params={"start": "2026-09-01", "end": DAY.isoformat(), "max_points": 3},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["currency"] == "JPY"
+    assert [point["date"] for point in body["points"]] == ["2026-09-26", "2026-10-06", "2026-10-16"]
+    assert body["points"][-1] == {
+        "date": "2026-10-16", "total_value": "1029", "cost_basis": "900", "exposures": {"JPY": "1029"},
+        "excluded_holdings": 0,
+    }
+    full = history_client.get(
+        "/api/portfolio-history",
+        params={"start": "2026-10-10", "end": DAY.isoformat()},
+        headers=headers,
+    )
+    assert len(full.json()["points"]) == 7
+    assert history_client.get(
+        "/api/portfolio-history", params={"start": "2026-10-17", "end": "2026-10-16"}, headers=headers,
+    ).status_code == 422
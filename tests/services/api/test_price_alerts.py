@@ -0,0 +1,208 @@
+"""銘柄ごとの閾値索引による株価アラートの判定と配信のテスト"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from application.use_cases.deliver_price_alerts import DeliverPriceAlertsUseCase
+from application.use_cases.warm_quote_cache import WarmQuoteCacheUseCase
+from domain.entities.auth import User
+from domain.entities.price_alert import AlertCondition, AlertStatus, PriceAlert
+from domain.entities.stock import Stock
+from domain.services.price_alert_index import PriceAlertIndex
+from infrastructure.cache.price_alert_engine import PriceAlertEngine
+from infrastructure.cache.quote_cache import InProcessQuoteCache
+from infrastructure.database import get_db, get_session_local
+from infrastructure.models.price_alert import PriceAlertModel
+from infrastructure.models.user import UserModel
+from infrastructure.repositories.price_alert_repository_impl import SQLPriceAlertRepository
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from main import app
+from presentation.dependencies.auth import get_current_user
+
+
+class FixedPriceStockRepository:
+    def __init__(self, prices):
+        self.prices = prices
+
+    async def get_stock_price(self, symbol):
+        price = self.prices.get(symbol)
+        if price is None:
+            return None
+        return Stock(symbol, f"name-{symbol}", price, "JPY", datetime.now())
+
+
+class StubExchangeRateClient:
+    def get_usd_jpy_rate(self):
+        return None
+
+
+def _alert(alert_id, condition, threshold, symbol="7974", reference_price=None, user_id=1):
+    return PriceAlert(
+        id=alert_id, user_id=user_id, symbol=symbol, condition=condition,
+        threshold=Decimal(threshold),
+        reference_price=Decimal(reference_price) if reference_price else None,
+    )
+
+
+def _fired(triggers):
+    return sorted(trigger.alert_id for trigger in triggers)
+
+
+@pytest.fixture
+def user(session_factory):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.commit()
+    db.close()
+
+
+def test_index_fires_only_crossed_thresholds_once():
+    index = PriceAlertIndex()
+    index.add_many([
+        _alert(1, AlertCondition.ABOVE, "110"),
+        _alert(2, AlertCondition.ABOVE, "120"),
+        _alert(3, AlertCondition.BELOW, "90"),
+        _alert(4, AlertCondition.BELOW, "80"),
+        # 100円から10%以上動いたら（110円以上または90円以下）
+        _alert(5, AlertCondition.PERCENT_MOVE, "10", reference_price="100"),
+        _alert(6, AlertCondition.ABOVE, "50", symbol="6758"),
+    ])
+
+    assert index.on_prices({"7974": 105.0, "9999": 1.0}) == []
+    assert _fired(index.on_prices({"7974": 110.0})) == [1, 5]
+    # 発火したアラートは戻ってきても再び発火しない（変動率の下側も外れる）
+    assert _fired(index.on_prices({"7974": 85.0})) == [3]
+    assert _fired(index.on_prices({"7974": 125.0, "6758": 49.0})) == [2]
+
+    index.add(_alert(7, AlertCondition.BELOW, "100"))
+    index.remove(_alert(4, AlertCondition.BELOW, "80"))
+    triggers = index.on_prices({"7974": 70.0})
+    assert _fired(triggers) == [7]
+    assert (triggers[0].user_id, triggers[0].symbol, triggers[0].price) == (1, "7974", 70.0)
+    assert len(index) == 1
+    assert index.symbols == ["6758"]
+
+
+def test_removed_percent_move_alert_never_fires():
+    index = PriceAlertIndex()
+    alert = _alert(1, AlertCondition.PERCENT_MOVE, "5", reference_price="200")
+    index.add(alert)
+    index.on_prices({"7974": 200.0})
+
+    index.remove(alert)
+
+    assert index.on_prices({"7974": 300.0}) == []
+    assert index.on_prices({"7974": 100.0}) == []
+    assert len(index) == 0
+
+
+def test_engine_syncs_new_alerts_and_delivers_once(session_factory, user):
+    db = session_factory()
+    repository = SQLPriceAlertRepository(db)
+    engine = PriceAlertEngine()
+
+    async def scenario():
+        above = await repository.create(_alert(None, AlertCondition.ABOVE, "1100"))
+        deleted = await repository.create(_alert(None, AlertCondition.BELOW, "900", symbol="6758"))
+        assert engine.sync(repository) == 2
+        later = await repository.create(_alert(None, AlertCondition.BELOW, "950"))
+        assert engine.sync(repository) == 1
+        await repository.delete(deleted.id)
+
+        warm = WarmQuoteCacheUseCase(
+            SQLUserStockRepository(db),
+            FixedPriceStockRepository({"7974": 1200.0, "6758": 800.0}),
+            StubExchangeRateClient(),
+            InProcessQuoteCache(),
+            price_alert_engine=engine,
+        )
+        # 保有されていなくてもアラートのある銘柄は取得する
+        assert await warm.execute() == 2
+        delivered = await DeliverPriceAlertsUseCase(repository, engine.queue).execute()
+        return above, later, delivered
+
+    above, later, delivered = asyncio.run(scenario())
+    try:
+        assert [trigger.alert_id for trigger in delivered] == [above.id]
+        assert len(engine.queue) == 0
+        stored = asyncio.run(repository.get_by_id(above.id))
+        assert stored.status == AlertStatus.TRIGGERED
+        assert stored.triggered_price == Decimal("1200")
+        assert asyncio.run(repository.get_by_id(later.id)).status == AlertStatus.ACTIVE
+        assert engine.sync(repository) == 0
+    finally:
+        db.close()
+
+
+def test_engine_rebuild_picks_up_alerts_committed_behind_the_cursor(session_factory, user):
+    db = session_factory()
+    repository = SQLPriceAlertRepository(db)
+    now = [0.0]
+    engine = PriceAlertEngine(rebuild_seconds=60, clock=lambda: now[0])
+
+    def set_status(alert_id, status):
+        db.execute(
+            update(PriceAlertModel).where(PriceAlertModel.id == alert_id).values(status=status)
+        )
+        db.commit()
+
+    async def create_three():
+        return [
+            await repository.create(_alert(None, AlertCondition.ABOVE, threshold))
+            for threshold in ("1100", "1200", "1300")
+        ]
+
+    try:
+        first, late, last = asyncio.run(create_three())
+        # 小さいidの登録がまだコミットされていない状態を、有効でない行で再現する
+        set_status(late.id, AlertStatus.TRIGGERED.value)
+        assert engine.sync(repository) == 2
+        set_status(late.id, AlertStatus.ACTIVE.value)
+
+        # 差分の読み込みはidがカーソルより小さいものを拾わない
+        now[0] = 30.0
+        assert engine.sync(repository) == 0
+        assert len(engine) == 2
+
+        now[0] = 61.0
+        assert engine.sync(repository) == 3
+        assert len(engine) == 3
+        assert engine.on_prices({"7974": 1250.0}) == 2
+    finally:
+        db.close()
+
+
+def test_alert_routes(client: TestClient, session_factory, user):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"
+    )
+    try:
+        created = client.post("/api/alerts/", json={
+            "symbol": "7974", "condition": "PERCENT_MOVE", "threshold": "5", "reference_price": "8000",
+        })
+        assert created.status_code == 201
+        assert created.json()["status"] == "ACTIVE"
+        assert client.post("/api/alerts/", json={
+            "symbol": "7974", "condition": "ABOVE", "threshold": "0",
+        }).status_code == 422
+
+        listed = client.get("/api/alerts/")
+        assert [alert["id"] for alert in listed.json()] == [created.json()["id"]]
+        assert client.delete(f"/api/alerts/{created.json()['id']}").status_code == 204
+        assert client.delete(f"/api/alerts/{created.json()['id']}").status_code == 404
+        assert client.get("/api/alerts/").json() == []
+    finally:
+        app.dependency_overrides.clear()
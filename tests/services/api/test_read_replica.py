@@ -0,0 +1,158 @@
+"""読み取りレプリカへの振り分けのテスト（プライマリとレプリカを別々のSQLiteファイルで用意する）"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from infrastructure import database
+from infrastructure.cache.recent_writes import InProcessRecentWrites
+from infrastructure.database import Base, ReplicaRouter
+from infrastructure.jwt_utils import create_access_token
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from main import app
+
+
+class FakeLagProbe:
+    def __init__(self, lags):
+        self.lags = lags
+        self.calls = 0
+
+    def __call__(self, engine):
+        self.calls += 1
+        lag = self.lags[str(engine.url)]
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sqlite_engine(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = _sqlite_engine(tmp_path / "primary.db")
+    replica = _sqlite_engine(tmp_path / "replica.db")
+    try:
+        yield primary, replica
+    finally:
+        primary.dispose()
+        replica.dispose()
+
+
+def test_round_robin_skips_lagging_and_failing_replicas(tmp_path):
+    replicas = [_sqlite_engine(tmp_path / f"replica{i}.db") for i in range(3)]
+    urls = [str(engine.url) for engine in replicas]
+    probe = FakeLagProbe({urls[0]: 0.0, urls[1]: 0.5, urls[2]: 30.0})
+    clock = FakeClock()
+    router = ReplicaRouter(replicas, max_lag_seconds=5, check_interval_seconds=2,
+                           lag_probe=probe, clock=clock)
+
+    chosen = [str(router.session_local().kw["bind"].url) for _ in range(4)]
+    # 遅れているreplica2は飛ばして次のレプリカを使う
+    assert chosen == [urls[0], urls[1], urls[0], urls[0]]
+    assert probe.calls == 3
+
+    # 確認間隔の間は遅延を再確認しない
+    probe.lags.update({urls[0]: RuntimeError("down"), urls[1]: 60.0})
+    router.session_local()
+    assert probe.calls == 3
+
+    # 全てのレプリカが使えなければNone（プライマリで読む）
+    clock.now = 10
+    assert router.session_local() is None
+
+    probe.lags[urls[2]] = 1.0
+    clock.now = 20
+    assert router.session_local().kw["bind"] is replicas[2]
+
+
+def test_replica_sessions_reject_writes(engines):
+    _, replica = engines
+    router = ReplicaRouter([replica], lag_probe=lambda engine: 0.0)
+    db = router.session_local()()
+    db.add(UserStockModel(user_id=1, ticker_symbol="7974", quantity=1, acquisition_price=1))
+    with pytest.raises(RuntimeError):
+        db.commit()
+    db.close()
+
+
+@pytest.fixture
+def replica_client(engines, monkeypatch):
+    primary, replica = engines
+    for engine in (primary, replica):
+        with engine.begin() as connection:
+            connection.execute(UserModel.__table__.insert().values(
+                id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"
+            ))
+    probe = FakeLagProbe({str(replica.url): 0.0})
+    monkeypatch.setattr(database, "_engine", primary)
+    monkeypatch.setattr(database, "_SessionLocal", None)
+    monkeypatch.setattr(
+        database, "_replica_router",
+        ReplicaRouter([replica], check_interval_seconds=0, lag_probe=probe),
+    )
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token({'sub': '1'})}"
+    return client, primary, probe
+
+
+def _symbols(response):
+    assert response.status_code == 200
+    return [stock["ticker_symbol"] for stock in response.json()]
+
+
+def test_reads_go_to_replica_and_fall_back_to_primary(replica_client):
+    client, primary, probe = replica_client
+    # プライマリにだけある行（レプリカにはまだ反映されていない）
+    with primary.begin() as connection:
+        connection.execute(UserStockModel.__table__.insert().values(
+            user_id=1, user_stock_id=1, ticker_symbol="6758", quantity=100,
+            acquisition_price=Decimal("3000"),
+        ))
+
+    assert _symbols(client.get("/api/user-stocks/")) == []
+    assert _symbols(client.get(
+        "/api/user-stocks/", headers={"X-Read-Consistency": "strong"}
+    )) == ["6758"]
+
+    probe.lags[next(iter(probe.lags))] = 60.0
+    assert _symbols(client.get("/api/user-stocks/")) == ["6758"]
+
+
+def test_reads_after_write_stay_on_primary(replica_client, monkeypatch):
+    client, _, _ = replica_client
+    clock = FakeClock()
+    recent_writes = InProcessRecentWrites(window_seconds=10, clock=clock)
+    monkeypatch.setattr(database, "get_recent_writes", lambda: recent_writes)
+
+    created = client.post(
+        "/api/user-stocks/",
+        json={"ticker_symbol": "7974", "quantity": 100, "acquisition_price": "8000.00"},
+    )
+
+    assert created.status_code == 201
+    # クライアントに何も送り返してもらわなくても、書き込んだ利用者の読み取りはプライマリに向く
+    assert "set-cookie" not in created.headers
+    client.cookies.clear()
+    assert _symbols(client.get("/api/user-stocks/")) == ["7974"]
+
+    # 記録するのは書き込んだ利用者（トークンのsub）だけ
+    assert asyncio.run(recent_writes.is_recent("1")) is True
+    assert asyncio.run(recent_writes.is_recent("2")) is False
+
+    clock.now = 11
+    assert _symbols(client.get("/api/user-stocks/")) == []
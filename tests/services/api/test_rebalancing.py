@@ -0,0 +1,143 @@
+"""リバランスの最適化のテスト"""
+import asyncio
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from application.use_cases.rebalance_portfolio import RebalancePortfolioUseCase
+from domain.entities.stock import Stock
+from domain.entities.user_stock import UserStock
+from domain.services.rebalancing import solve_rebalance, tracking_error
+from infrastructure.config.market_calendar import get_market_calendar
+from infrastructure.repositories.price_history_repository_impl import (
+    FixturePriceHistoryRepository,
+)
+from presentation.schemas.rebalance import RebalanceRequest
+
+
+class StubUserStockRepository:
+    def __init__(self, holdings):
+        self.holdings = holdings
+
+    async def get_by_user_id(self, user_id):
+        return [
+            UserStock(id=i, user_stock_id=i, user_id=user_id, ticker_symbol=symbol,
+                      quantity=quantity, acquisition_price=1)
+            for i, (symbol, quantity) in enumerate(self.holdings)
+        ]
+
+
+class StubStockRepository:
+    async def get_stock_price(self, symbol):
+        if symbol == "7974":
+            return Stock(symbol="7974", name="任天堂", price=8000.0, currency="JPY",
+                         timestamp=datetime(2026, 10, 16, 15, 0))
+        return None
+
+
+class StubExchangeRateRepository:
+    def get_usd_jpy_rate(self):
+        return {"symbol": "USD/JPY", "last": "150.00"}
+
+
+def _solve(values, lot_values, targets, cash, cost_rate=0.0, min_lots=None):
+    values = np.asarray(values, dtype=float)
+    return solve_rebalance(
+        values,
+        np.asarray(lot_values, dtype=float),
+        np.asarray(targets, dtype=float),
+        cash,
+        cost_rate,
+        np.asarray(min_lots if min_lots is not None else -np.inf * np.ones(len(values))),
+    )
+
+
+def test_buys_whole_lots_towards_target():
+    # 1単元10万円の銘柄を現金100万円の半分まで買う
+    plan = _solve([0.0], [100_000.0], [0.5], 1_000_000)
+
+    assert plan.lots.tolist() == [5]
+    assert plan.cash_after == pytest.approx(500_000)
+
+
+def test_small_deviation_is_not_traded_because_of_cost():
+    # 目標との差は1万円（1単元）だが、手数料を考えると売買しない方がよい
+    plan = _solve([510_000.0, 490_000.0], [10_000.0, 10_000.0], [0.5, 0.5], 0, cost_rate=0.05)
+    assert plan.lots.tolist() == [0, 0]
+
+    plan = _solve([510_000.0, 490_000.0], [10_000.0, 10_000.0], [0.5, 0.5], 0, cost_rate=0.0)
+    assert plan.lots.tolist() == [-1, 1]
+
+
+def test_cash_constraint_sells_to_fund_buys():
+    # 現金がないので、過大な銘柄を売った代金で過小な銘柄を買う
+    plan = _solve([800_000.0, 200_000.0], [100_000.0, 100_000.0], [0.5, 0.5], 0,
+                  cost_rate=0.001, min_lots=[-8, -2])
+
+    assert plan.lots.tolist() == [-3, 2]
+    assert plan.cash_after >= 0
+    assert plan.transaction_cost == pytest.approx(500)
+
+
+def test_cannot_sell_more_than_held():
+    # 3単元分の評価額があっても売却できるのは保有する1単元まで（端株は売らない）
+    plan = _solve([300_000.0, 0.0], [100_000.0, 100_000.0], [0.0, 1.0], 0, min_lots=[-1, 0])
+
+    assert plan.lots.tolist() == [-1, 1]
+    assert plan.cash_after == pytest.approx(0)
+
+
+def test_solves_hundreds_of_symbols_quickly():
+    rng = np.random.default_rng(0)
+    n = 500
+    lot_values = rng.uniform(10_000, 500_000, n)
+    held_lots = rng.integers(0, 20, n)
+    targets = rng.dirichlet(np.ones(n)) * 0.95
+    values = held_lots * lot_values
+
+    started = time.perf_counter()
+    plan = _solve(values, lot_values, targets, 1_000_000, cost_rate=0.001, min_lots=-held_lots)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.1
+    assert plan.cash_after >= 0
+    assert (plan.lots >= -held_lots).all()
+    values_after = values + plan.trade_values
+    assert tracking_error(values_after, plan.cash_after, targets) < tracking_error(
+        values, 1_000_000, targets
+    )
+
+
+def test_rebalance_use_case_with_board_lots_and_fx():
+    use_case = RebalancePortfolioUseCase(
+        StubUserStockRepository([("7974", 300), ("AAPL", 10)]),
+        StubStockRepository(),
+        FixturePriceHistoryRepository(),
+        StubExchangeRateRepository(),
+        get_market_calendar(),
+    )
+    request = RebalanceRequest(
+        target_weights={"7974": 0.4, "6758": 0.3, "aapl": 0.2}, cash=2_000_000
+    )
+
+    result = asyncio.run(use_case.execute(1, request, as_of=date(2026, 10, 16)))
+
+    trades = {trade.symbol: trade for trade in result.trades}
+    assert trades["6758"].action == "BUY"
+    assert trades["6758"].board_lot == 100
+    assert trades["6758"].quantity % 100 == 0
+    assert trades["AAPL"].board_lot == 1
+    assert trades["AAPL"].currency == "USD"
+    assert result.cash_after >= 0
+    assert result.tracking_error_after < result.tracking_error_before
+    positions = {position.symbol: position for position in result.positions}
+    assert positions["7974"].quantity_before == 300
+    assert positions["7974"].quantity_after % 100 == 0
+    assert sum(p.weight_after for p in result.positions) <= 1.0
+
+
+def test_target_weights_over_one_are_rejected():
+    with pytest.raises(ValueError):
+        RebalanceRequest(target_weights={"7974": 0.7, "6758": 0.4})
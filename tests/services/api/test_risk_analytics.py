@@ -0,0 +1,122 @@
+"""リスク指標の計算のテスト"""
+import asyncio
+from datetime import date, timedelta
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from application.services.portfolio_returns import PortfolioReturnsLoader
+from application.use_cases.get_portfolio_risk import GetPortfolioRiskUseCase
+from domain.entities.user_stock import UserStock
+from domain.services.risk_analytics import (
+    annualized_volatility,
+    beta,
+    build_return_matrix,
+    historical_var,
+    parametric_var,
+)
+from infrastructure.cache.return_matrix_cache import ReturnMatrixCache
+from infrastructure.config.market_calendar import get_market_calendar
+from infrastructure.repositories.price_history_repository_impl import (
+    FixturePriceHistoryRepository,
+)
+
+
+class StubUserStockRepository:
+    def __init__(self, holdings):
+        self.holdings = holdings
+
+    async def get_by_user_id(self, user_id):
+        return [
+            UserStock(id=i, user_stock_id=i, user_id=user_id, ticker_symbol=symbol,
+                      quantity=quantity, acquisition_price=1)
+            for i, (symbol, quantity) in enumerate(self.holdings)
+        ]
+
+
+class CountingPriceHistoryRepository(FixturePriceHistoryRepository):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def get_daily_closes(self, symbol, start, end):
+        self.calls += 1
+        return await super().get_daily_closes(symbol, start, end)
+
+
+class StubExchangeRateRepository:
+    def get_usd_jpy_rate(self):
+        return {"symbol": "USD/JPY", "last": "150.00"}
+
+
+def test_build_return_matrix_aligns_on_common_dates():
+    d = [date(2026, 1, 5) + timedelta(days=i) for i in range(5)]
+    histories = {
+        "A": [(d[0], 100.0), (d[1], 110.0), (d[2], 99.0), (d[3], 99.0), (d[4], 108.9)],
+        # d[2]が欠けている（休場日など）
+        "B": [(d[0], 50.0), (d[1], 55.0), (d[3], 60.5), (d[4], 60.5)],
+    }
+
+    matrix = build_return_matrix(histories, ["A", "B"])
+
+    assert matrix.dates.tolist() == [d[1], d[3], d[4]]
+    np.testing.assert_allclose(matrix.returns, [[0.1, 0.1], [-0.1, 0.1], [0.1, 0.0]])
+    assert matrix.last_closes.tolist() == [108.9, 60.5]
+
+
+def test_risk_formulas():
+    rng = np.random.default_rng(0)
+    benchmark = rng.normal(0, 0.01, 500)
+    returns = 1.5 * benchmark
+
+    assert beta(returns, benchmark) == pytest.approx(1.5)
+    assert annualized_volatility(benchmark) == pytest.approx(np.std(benchmark, ddof=1) * np.sqrt(252))
+    assert historical_var(np.linspace(-0.05, 0.05, 101), 0.95) == pytest.approx(0.045)
+    covariance = np.array([[0.0004, 0.0], [0.0, 0.0001]])
+    expected = NormalDist().inv_cdf(0.99) * np.sqrt(0.25 * 0.0004 + 0.25 * 0.0001)
+    assert parametric_var(np.array([0.5, 0.5]), covariance, 0.99) == pytest.approx(expected)
+
+
+def test_portfolio_risk_use_case_with_fixture_and_cache():
+    history = CountingPriceHistoryRepository()
+    cache = ReturnMatrixCache()
+    use_case = GetPortfolioRiskUseCase(
+        PortfolioReturnsLoader(
+            StubUserStockRepository([("7974", 100), ("6758", 200), ("AAPL", 50)]),
+            history,
+            StubExchangeRateRepository(),
+            cache,
+            get_market_calendar(),
+        )
+    )
+
+    risk = asyncio.run(use_case.execute(1, "TOPIX", 365, 0.95, as_of=date(2026, 10, 16)))
+
+    assert risk.symbols == ["6758", "7974", "AAPL"]
+    assert sum(risk.weights.values()) == pytest.approx(1.0)
+    assert risk.observations > 150
+    assert 0 < risk.beta < 2.0
+    assert risk.correlation[0][0] == pytest.approx(1.0)
+    assert 0 < risk.parametric_var < 0.1 and 0 < risk.historical_var < 0.1
+    assert risk.parametric_var_amount == pytest.approx(risk.parametric_var * risk.portfolio_value)
+    assert history.calls == 4
+
+    # 同じ銘柄の組み合わせ・期間ではリターン行列を再取得しない
+    again = asyncio.run(use_case.execute(1, "TOPIX", 365, 0.99, as_of=date(2026, 10, 16)))
+    assert history.calls == 4
+    assert again.parametric_var > risk.parametric_var
+
+
+def test_portfolio_risk_without_holdings_returns_none():
+    use_case = GetPortfolioRiskUseCase(
+        PortfolioReturnsLoader(
+            StubUserStockRepository([]),
+            FixturePriceHistoryRepository(),
+            StubExchangeRateRepository(),
+            ReturnMatrixCache(),
+            get_market_calendar(),
+        )
+    )
+
+    assert asyncio.run(use_case.execute(1)) is None
@@ -0,0 +1,96 @@
+"""ダッシュボード集約ルートのテスト"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.entities.stock import Stock
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.database import get_session_local
+from infrastructure.jwt_utils import create_access_token
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from main import app
+from presentation.dependencies import auth
+from presentation.dependencies.corporate_actions import get_split_adjustments
+from presentation.routes.exchange_rate import get_exchange_rate_repository
+from presentation.routes.stock import get_stock_repository
+
+
+class SlowStockRepository:
+    """銘柄ごとに少し待ってから株価を返す（並行して取得されているかを確かめる）"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_stock_price(self, symbol):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if symbol == "0000":
+            return None
+        return Stock(symbol, f"name-{symbol}", 1000.0, "JPY", datetime.now())
+
+
+class StubExchangeRateRepository:
+    def get_usd_jpy_rate(self):
+        return {"symbol": "USD/JPY", "last": "150.00"}
+
+
+@pytest.fixture
+def dashboard_client(session_factory):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.add(UserModel(id=2, user_id=2, username="u2", email="u2@example.com", password_hash="x",
+                     is_active=False))
+    for stock_id, symbol in enumerate(["7974", "6758", "7974", "0000"], start=1):
+        db.add(UserStockModel(id=stock_id, user_stock_id=stock_id, user_id=1, ticker_symbol=symbol,
+                              quantity=100, acquisition_price=Decimal("1234.50")))
+    db.commit()
+    db.close()
+
+    stocks = SlowStockRepository()
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_split_adjustments] = lambda: SplitAdjustments()
+    app.dependency_overrides[get_stock_repository] = lambda: stocks
+    app.dependency_overrides[get_exchange_rate_repository] = lambda: StubExchangeRateRepository()
+    try:
+        yield TestClient(app), stocks
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_dashboard_returns_composite_payload_with_one_auth_check(dashboard_client, monkeypatch):
+    client, stocks = dashboard_client
+    verified = []
+    verify_token = auth.verify_token
+    monkeypatch.setattr(auth, "verify_token", lambda token: verified.append(token) or verify_token(token))
+
+    response = client.get(
+        "/api/dashboard", headers={"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["user"]["username"] == "u1"
+    assert sorted(h["ticker_symbol"] for h in body["holdings"]) == ["0000", "6758", "7974", "7974"]
+    # 同じ銘柄は1回だけ取得し、取得できなかった銘柄は含まない
+    assert [q["symbol"] for q in body["quotes"]] == ["6758", "7974"]
+    assert body["usd_jpy"]["last"] == "150.00"
+    assert len(verified) == 1
+    assert stocks.max_in_flight == 3
+
+
+def test_dashboard_rejects_inactive_user_and_missing_token(dashboard_client):
+    client, _ = dashboard_client
+
+    inactive = client.get(
+        "/api/dashboard", headers={"Authorization": f"Bearer {create_access_token({'sub': '2'})}"}
+    )
+
+    assert inactive.status_code == 401
+    assert client.get("/api/dashboard").status_code in (401, 403)
@@ -0,0 +1,103 @@
+"""保有株・取引履歴エクスポートルートのテスト"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from domain.entities.auth import User
+from infrastructure.database import get_session_local
+from infrastructure.models.portfolio import PortfolioModel
+from infrastructure.models.transaction import TransactionModel
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from main import app
+from presentation.dependencies.auth import get_current_user
+from presentation.export import accepts_gzip, gzip_chunks
+
+
+@pytest.fixture
+def export_client(session_factory):
+    db = session_factory()
+    for user_id in (1, 2):
+        db.add(UserModel(id=user_id, user_id=user_id, username=f"u{user_id}",
+                         email=f"u{user_id}@example.com", password_hash="x"))
+    db.add(PortfolioModel(id=1, user_id=1, name="main"))
+    for i, symbol in enumerate(["7974", "6758", "AAPL"]):
+        db.add(UserStockModel(user_id=1, ticker_symbol=symbol, quantity=100 + i,
+                              acquisition_price=Decimal("1234.50")))
+    db.add(UserStockModel(user_id=2, ticker_symbol="9984", quantity=1, acquisition_price=1))
+    for i in range(5):
+        db.add(TransactionModel(user_id=1, portfolio_id=1, symbol="7974", transaction_type="BUY",
+                                quantity=Decimal("10"), price=Decimal("1500.25"),
+                                total_amount=Decimal("15002.50"),
+                                transaction_date=datetime(2026, 1, 5 + i, 9, 0), notes="買付"))
+    db.commit()
+    db.close()
+
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"
+    )
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_export_user_stocks_csv(export_client):
+    response = export_client.get(
+        "/api/user-stocks/export", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "content-encoding" not in response.headers
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert [row["ticker_symbol"] for row in rows] == ["6758", "7974", "AAPL"]
+    assert rows[0]["acquisition_price"] == "1234.50"
+
+
+def test_export_transactions_ndjson_gzip(export_client):
+    response = export_client.get(
+        "/api/transactions/export?format=ndjson", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 5
+    assert lines[0]["transaction_type"] == "BUY"
+    assert lines[0]["price"] == "1500.2500"
+    assert lines[0]["notes"] == "買付"
+    assert lines[0]["transaction_date"] == "2026-01-05T09:00:00"
+
+
+def test_gzip_chunks_are_flushed_per_chunk():
+    chunks = list(gzip_chunks([b"a" * 100, b"b" * 100]))
+
+    # 入力チャンクごとに出力があり、連結すると元に戻る
+    assert len(chunks) == 3 and all(chunks[:2])
+    assert zlib.decompress(b"".join(chunks), 16 + zlib.MAX_WBITS) == b"a" * 100 + b"b" * 100
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000, *", False),
+    ("*;q=0.1", True),
+    ("br, *;q=0", False),
+    ("gzipped", False),
+    ("gzip;q=abc", False),
+    ("", False),
+])
+def test_accepts_gzip_honours_q_values(header, expected):
+    request = Request({"type": "http", "headers": [(b"accept-encoding", header.encode())]})
+
+    assert accepts_gzip(request) is expected
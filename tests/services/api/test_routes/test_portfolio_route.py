@@ -0,0 +1,59 @@
+"""ポートフォリオ明細の追加ルートのテスト"""
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from infrastructure.database import get_db, get_session_local
+from infrastructure.jwt_utils import create_access_token
+from infrastructure.models.portfolio import PortfolioItemModel, PortfolioModel
+from infrastructure.models.user import UserModel
+from main import app
+from presentation.routes.stock import get_stock_repository
+
+
+class NoQuoteStockRepository:
+    async def get_stock_price(self, symbol):
+        return None
+
+
+@pytest.fixture
+def portfolio_client(session_factory):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.add(PortfolioModel(id=1, user_id=1, name="main", currency="JPY", total_value=0))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_stock_repository] = lambda: NoQuoteStockRepository()
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token({'sub': '1'})}"
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_adding_same_symbol_twice_is_a_conflict(portfolio_client, session_factory):
+    item = {"symbol": "7974", "quantity": "100", "average_price": "8000"}
+
+    assert portfolio_client.post("/api/portfolios/1/items", json=item).status_code == 201
+    duplicate = portfolio_client.post("/api/portfolios/1/items", json=item)
+
+    assert duplicate.status_code == 409
+    assert "7974" in duplicate.json()["detail"]
+    db = session_factory()
+    try:
+        items = db.query(PortfolioItemModel).all()
+        assert [(row.symbol, row.quantity) for row in items] == [("7974", Decimal("100"))]
+    finally:
+        db.close()
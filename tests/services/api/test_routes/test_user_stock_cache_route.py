@@ -0,0 +1,140 @@
+"""保有株一覧のバージョン付き応答キャッシュのテスト"""
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.entities.corporate_action import CorporateAction
+from domain.entities.user_stock import UserStock
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.database import get_db, get_session_local
+from infrastructure.jwt_utils import create_access_token
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from main import app
+from presentation.dependencies.corporate_actions import get_split_adjustments
+
+
+@pytest.fixture
+def holdings_client(session_factory, monkeypatch):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.add(UserModel(id=2, user_id=2, username="u2", email="u2@example.com", password_hash="x"))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    queries = []
+    get_by_user_id = SQLUserStockRepository.get_by_user_id
+
+    async def counting_get_by_user_id(self, user_id):
+        queries.append(user_id)
+        return await get_by_user_id(self, user_id)
+
+    monkeypatch.setattr(SQLUserStockRepository, "get_by_user_id", counting_get_by_user_id)
+    adjustments = {"current": SplitAdjustments()}
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_split_adjustments] = lambda: adjustments["current"]
+    try:
+        yield TestClient(app), queries, adjustments
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _headers(user_id):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def _post(client, symbol, user_id=1):
+    response = client.post(
+        "/api/user-stocks/", headers=_headers(user_id),
+        json={"ticker_symbol": symbol, "quantity": 100, "acquisition_price": "1000.00"},
+    )
+    assert response.status_code == 201
+
+
+def _symbols(response):
+    assert response.status_code == 200
+    return sorted(stock["ticker_symbol"] for stock in response.json())
+
+
+def test_repeat_reads_are_served_from_cache_until_next_write(holdings_client):
+    client, queries, _ = holdings_client
+    _post(client, "7203")
+
+    first = client.get("/api/user-stocks/", headers=_headers(1))
+    second = client.get("/api/user-stocks/", headers=_headers(1))
+
+    assert _symbols(first) == ["7203"]
+    assert second.content == first.content
+    assert queries == [1]
+    assert set(first.json()[0]) == {
+        "id", "user_stock_id", "user_id", "ticker_symbol", "quantity", "acquisition_price",
+        "created_at", "updated_at",
+    }
+
+    # 書き込みの直後の取得から新しい内容になる
+    _post(client, "6758")
+    assert _symbols(client.get("/api/user-stocks/", headers=_headers(1))) == ["6758", "7203"]
+    assert queries == [1, 1]
+    # 他のユーザーのキャッシュとは混ざらない
+    assert _symbols(client.get("/api/user-stocks/", headers=_headers(2))) == []
+
+
+def test_cache_key_includes_split_adjustments_and_query(holdings_client):
+    client, queries, adjustments = holdings_client
+    _post(client, "7203")
+    client.get("/api/user-stocks/", headers=_headers(1))
+
+    adjustments["current"] = SplitAdjustments([
+        CorporateAction("7203", date(2100, 1, 1), 1, 2),
+    ])
+    client.get("/api/user-stocks/", headers=_headers(1))
+    client.get("/api/user-stocks/?b=2&a=1", headers=_headers(1))
+    client.get("/api/user-stocks/?a=1&b=2", headers=_headers(1))
+
+    assert queries == [1, 1, 1]
+
+
+def test_users_without_version_are_not_cached(holdings_client, session_factory):
+    client, queries, _ = holdings_client
+    db = session_factory()
+    db.add(UserStockModel(id=1, user_stock_id=1, user_id=1, ticker_symbol="9984",
+                          quantity=100, acquisition_price=Decimal("5000")))
+    db.commit()
+    db.close()
+
+    client.get("/api/user-stocks/", headers=_headers(1))
+    client.get("/api/user-stocks/", headers=_headers(1))
+
+    assert queries == [1, 1]
+
+
+def test_create_bumps_version(db_session):
+    db_session.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com",
+                             password_hash="x"))
+    db_session.commit()
+    repository = SQLUserStockRepository(db_session)
+
+    async def run():
+        versions = [await repository.get_version(1)]
+        for symbol in ("7203", "6758"):
+            await repository.create(UserStock(
+                id=None, user_stock_id=None, user_id=1, ticker_symbol=symbol, quantity=100,
+                acquisition_price=Decimal("1000"), created_at=datetime.now(),
+                updated_at=datetime.now(),
+            ))
+            versions.append(await repository.get_version(1))
+        return versions
+
+    assert asyncio.run(run()) == [None, 1, 2]
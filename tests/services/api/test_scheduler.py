@@ -0,0 +1,197 @@
+"""株価キャッシュの事前取得ジョブのテスト"""
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import infrastructure.cache.shared_market_data as shared_market_data
+import infrastructure.scheduler as scheduler
+from application.use_cases.warm_quote_cache import WarmQuoteCacheUseCase
+from domain.entities.portfolio import Portfolio, PortfolioItem
+from domain.entities.stock import Stock
+from infrastructure.cache.quote_cache import InProcessQuoteCache
+from infrastructure.cache.shared_market_data import SharedMarketDataTable
+from infrastructure.leader_lock import LeaderLock
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from infrastructure.repositories.portfolio_repository_impl import SQLPortfolioRepository
+from infrastructure.repositories.user_stock_repository_impl import SQLUserStockRepository
+from infrastructure.scheduler import create_scheduler
+
+
+class RecordingStockRepository:
+    def __init__(self):
+        self.requested = []
+
+    async def get_stock_price(self, symbol):
+        self.requested.append(symbol)
+        if symbol == "0000":
+            return None
+        return Stock(symbol, f"name-{symbol}", 1000.0, "JPY", datetime.now())
+
+
+class StubExchangeRateClient:
+    def get_usd_jpy_rate(self):
+        return 150.0
+
+
+def _seed_holdings(db, holdings):
+    for user_id, symbols in holdings.items():
+        db.add(UserModel(id=user_id, user_id=user_id, username=f"u{user_id}",
+                         email=f"u{user_id}@example.com", password_hash="x"))
+        for symbol in symbols:
+            db.add(UserStockModel(user_id=user_id, ticker_symbol=symbol,
+                                  quantity=100, acquisition_price=1000))
+    db.commit()
+
+
+def test_stream_ticker_symbols_is_distinct_and_batched(db_session):
+    _seed_holdings(db_session, {1: ["7974", "6758", "AAPL"], 2: ["7974", "AAPL"]})
+    repository = SQLUserStockRepository(db_session)
+
+    batches = list(repository.stream_ticker_symbols(batch_size=2))
+
+    assert all(len(batch) <= 2 for batch in batches)
+    assert sorted(s for batch in batches for s in batch) == ["6758", "7974", "AAPL"]
+
+
+def test_warm_quote_cache_writes_held_symbols_and_fx(db_session):
+    _seed_holdings(db_session, {1: ["7974", "0000"], 2: ["7974", "6758"]})
+    stocks = RecordingStockRepository()
+    cache = InProcessQuoteCache()
+    use_case = WarmQuoteCacheUseCase(
+        SQLUserStockRepository(db_session), stocks, StubExchangeRateClient(), cache, batch_size=2
+    )
+
+    written = asyncio.run(use_case.execute())
+
+    assert written == 3
+    assert sorted(stocks.requested) == ["0000", "6758", "7974"]
+    assert cache.get_quote("7974").name == "name-7974"
+    assert cache.get_quote("0000") is None
+    assert cache.get_fx_rate("USD/JPY")[0] == 150.0
+
+
+def test_warm_quote_cache_prices_symbols_held_only_in_portfolios(db_session):
+    _seed_holdings(db_session, {1: ["7974"]})
+    portfolios = SQLPortfolioRepository(db_session)
+    portfolio = asyncio.run(portfolios.create(Portfolio(user_id=1, name="main")))
+    other = asyncio.run(portfolios.create(Portfolio(user_id=1, name="other")))
+    for portfolio_id, symbol in [(portfolio.id, "7974"), (portfolio.id, "6758"), (other.id, "6758")]:
+        asyncio.run(portfolios.add_item(PortfolioItem(
+            portfolio_id=portfolio_id, symbol=symbol, name=symbol, quantity=Decimal("10"),
+            average_price=Decimal("900"), currency="JPY", current_price=Decimal("900"),
+            fx_rate=Decimal("1"), asset_type="stock",
+        )))
+    stocks = RecordingStockRepository()
+    use_case = WarmQuoteCacheUseCase(
+        SQLUserStockRepository(db_session), stocks, StubExchangeRateClient(),
+        InProcessQuoteCache(), batch_size=1, portfolio_repository=portfolios,
+    )
+
+    asyncio.run(use_case.execute())
+
+    assert sorted(stocks.requested) == ["6758", "7974"]
+    items = [
+        item for portfolio_id in (portfolio.id, other.id)
+        for item in asyncio.run(portfolios.list_items(portfolio_id))
+    ]
+    assert {item.current_price for item in items} == {Decimal("1000")}
+    assert asyncio.run(portfolios.get_by_id(portfolio.id)).total_value == Decimal("20000.00")
+    assert asyncio.run(portfolios.get_by_id(other.id)).total_value == Decimal("10000.00")
+
+
+def test_leader_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    first, second = LeaderLock(path), LeaderLock(path)
+
+    assert first.try_acquire()
+    assert first.try_acquire()
+    assert not second.try_acquire()
+
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+def test_scheduler_registers_market_hour_jobs():
+    scheduler = create_scheduler()
+
+    job_ids = {job.id for job in scheduler.get_jobs()}
+
+    assert {
+        "warm_quotes_startup",
+        "warm_quotes_tse_pre_open",
+        "warm_quotes_tse_session",
+        "warm_quotes_nyse_pre_open",
+        "warm_quotes_nyse_session",
+        "snapshot_portfolios",
+        "reconcile_holding_rollups",
+    } <= job_ids
+
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../services/api"))
+
+# 株価を書き込んだ後、次の書き込みの途中（seqを奇数にした直後）で止まる書き込みプロセス
+_DYING_WRITER = textwrap.dedent("""
+    import sys, time
+    from datetime import datetime
+    from domain.entities.stock import Stock
+    from infrastructure.cache.shared_market_data import _SEQ, SharedMarketDataTable
+
+    table = SharedMarketDataTable.create(sys.argv[1], capacity=64)
+    table.put_quote(Stock("7974", "任天堂", 8000.0, "JPY", datetime.now()))
+    offset = table._slot_offset(table._slot_index["7974"])
+    _SEQ.pack_into(table._buf, offset, _SEQ.unpack_from(table._buf, offset)[0] + 1)
+    print("mid-write", flush=True)
+    time.sleep(60)
+""")
+
+
+def test_next_leader_warm_run_recovers_slots_from_killed_writer(
+    monkeypatch, tmp_path, session_factory
+):
+    name = f"ifmd_{uuid.uuid4().hex[:12]}"
+    writer = subprocess.Popen(
+        [sys.executable, "-c", _DYING_WRITER, name],
+        cwd=API_DIR, env={**os.environ, "PYTHONPATH": API_DIR}, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        assert writer.stdout.readline().strip() == "mid-write"
+    finally:
+        writer.send_signal(signal.SIGKILL)
+        writer.wait()
+
+    db = session_factory()
+    _seed_holdings(db, {1: ["7974"]})
+    db.close()
+    lock = LeaderLock(str(tmp_path / "leader.lock"))
+    monkeypatch.setattr(shared_market_data, "MARKET_DATA_SHM_NAME", name)
+    monkeypatch.setattr(shared_market_data, "_shared_table", None)
+    monkeypatch.setattr(scheduler, "leader_lock", lock)
+    monkeypatch.setattr(scheduler, "get_session_local", lambda: session_factory)
+    monkeypatch.setattr(scheduler, "ExchangeRateClient", StubExchangeRateClient)
+
+    reader = SharedMarketDataTable.attach(name)
+    try:
+        # 書き込みの途中で止まったスロットは読めない（キャッシュのミスとして扱う）
+        assert reader.get_quote("7974") is None
+
+        scheduler.warm_quote_cache_job()
+
+        # 次のリーダーがセグメントを引き継いで直し、事前取得で上書きしている
+        assert reader.get_quote("7974").price == 8150.0
+        assert reader.get_fx_rate("USD/JPY")[0] == 150.0
+        assert sorted(reader.keys()) == ["7974", "FX:USD/JPY"]
+    finally:
+        lock.release()
+        reader.close()
+        writer_table = shared_market_data._shared_table
+        if writer_table is not None:
+            writer_table.close()
+            writer_table.unlink()
@@ -0,0 +1,185 @@
+"""共有メモリの株価テーブルのテスト"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import infrastructure.cache.shared_market_data as shared_market_data
+
+from domain.entities.stock import Stock
+from infrastructure.cache.shared_market_data import SharedMarketDataTable
+from infrastructure.repositories.cached_stock_repository import CachedStockRepository
+from infrastructure.repositories.exchange_rate_repository_impl import (
+    ExchangeRateRepositoryImpl,
+)
+
+
+@pytest.fixture
+def table():
+    """テスト用の共有メモリテーブル（所有者）"""
+    owner = SharedMarketDataTable.create(name=f"ifmd_{uuid.uuid4().hex[:12]}", capacity=16)
+    yield owner
+    owner.close()
+    owner.unlink()
+
+
+class StubStockRepository:
+    def __init__(self, stock):
+        self.stock = stock
+        self.calls = 0
+
+    async def get_stock_price(self, symbol):
+        self.calls += 1
+        return self.stock
+
+
+class StubExchangeRateClient:
+    def __init__(self, rate):
+        self.rate = rate
+        self.calls = 0
+
+    def get_usd_jpy_rate(self):
+        self.calls += 1
+        return self.rate
+
+
+def test_reader_sees_owner_writes(table):
+    """別ハンドルからアタッチしたリーダーが書き込みを読めることを確認"""
+    now = datetime.now().replace(microsecond=0)
+    table.put_quote(Stock("7974", "任天堂", 8150.0, "JPY", now))
+    table.put_fx_rate("USD/JPY", 151.25, now)
+
+    reader = SharedMarketDataTable.attach(table.name)
+    try:
+        assert reader.read_only
+        quote = reader.get_quote("7974")
+        assert quote.name == "任天堂"
+        assert quote.price == 8150.0
+        assert quote.timestamp == now
+        assert reader.get_fx_rate("USD/JPY") == (151.25, now)
+        assert reader.get_quote("9999") is None
+
+        table.put_quote(Stock("7974", "任天堂", 8200.0, "JPY", now))
+        assert reader.get_quote("7974").price == 8200.0
+    finally:
+        reader.close()
+
+
+def test_reader_cannot_write(table):
+    reader = SharedMarketDataTable.attach(table.name)
+    try:
+        with pytest.raises(PermissionError):
+            reader.put_fx_rate("USD/JPY", 150.0, datetime.now())
+    finally:
+        reader.close()
+
+
+def test_table_full(table):
+    for i in range(table.capacity):
+        table.put_fx_rate(f"C{i}/JPY", 1.0, datetime.now())
+    assert len(list(table.keys())) == table.capacity
+    with pytest.raises(RuntimeError):
+        table.put_fx_rate("ZZZ/JPY", 1.0, datetime.now())
+
+
+def test_reader_retries_while_slot_is_being_written(table):
+    """書き込み中（seqが奇数）のスロットは一貫した状態になるまで読まない"""
+    table.put_fx_rate("USD/JPY", 150.0, datetime.now())
+    index = next(i for i in range(table.capacity) if table._read_slot(i)[0])
+    offset = table._slot_offset(index)
+    seq = int.from_bytes(table._buf[offset:offset + 8], "little")
+    table._buf[offset:offset + 8] = (seq + 1).to_bytes(8, "little")
+
+    with pytest.raises(TimeoutError):
+        table.read("FX:USD/JPY")
+    # キャッシュとしてはミスとして扱い、上流に問い合わせさせる
+    assert table.get_fx_rate("USD/JPY") is None
+    assert list(table.keys()) == []
+
+    table._buf[offset:offset + 8] = (seq + 2).to_bytes(8, "little")
+    assert table.get_fx_rate("USD/JPY")[0] == 150.0
+
+
+def test_cached_stock_repository_uses_fresh_quote(table):
+    table.put_quote(Stock("7974", "任天堂", 8150.0, "JPY", datetime.now()))
+    upstream = StubStockRepository(None)
+    repository = CachedStockRepository(upstream, table, max_age_seconds=60)
+
+    stock = asyncio.run(repository.get_stock_price("7974"))
+
+    assert stock.price == 8150.0
+    assert upstream.calls == 0
+
+
+def test_cached_stock_repository_falls_back_without_writing_read_only_cache(table):
+    stale = datetime.now() - timedelta(minutes=10)
+    table.put_quote(Stock("7974", "任天堂", 8000.0, "JPY", stale))
+    upstream = StubStockRepository(Stock("7974", "任天堂", 8150.0, "JPY", datetime.now()))
+    reader = SharedMarketDataTable.attach(table.name)
+    try:
+        repository = CachedStockRepository(upstream, reader, max_age_seconds=60)
+        stock = asyncio.run(repository.get_stock_price("7974"))
+        assert stock.price == 8150.0
+        assert upstream.calls == 1
+        assert reader.get_quote("7974").price == 8000.0
+    finally:
+        reader.close()
+
+
+def test_exchange_rate_repository_reads_shared_rate(table):
+    table.put_fx_rate("USD/JPY", 149.5, datetime.now())
+    client = StubExchangeRateClient(151.0)
+
+    result = ExchangeRateRepositoryImpl(client, table).get_usd_jpy_rate()
+
+    assert result == {"symbol": "USD/JPY", "last": "149.50"}
+    assert client.calls == 0
+
+
+def test_new_owner_repairs_slots_left_mid_write(table):
+    stale = datetime.now()
+    table.put_quote(Stock("7974", "任天堂", 8150.0, "JPY", stale))
+    index = table._slot_index["7974"]
+    offset = table._slot_offset(index)
+    seq = int.from_bytes(table._buf[offset:offset + 8], "little")
+    # 書き込みの途中で終了した（seqが奇数のまま）
+    table._buf[offset:offset + 8] = (seq + 1).to_bytes(8, "little")
+
+    successor = SharedMarketDataTable.create(name=table.name, capacity=16)
+    try:
+        assert successor.instance == table.instance
+        repaired = successor.get_quote("7974")
+        # 途中までの内容は使わず、鮮度切れとして上書きさせる
+        assert repaired.timestamp == datetime.fromtimestamp(0)
+        successor.put_quote(Stock("7974", "任天堂", 8200.0, "JPY", stale))
+        assert table.get_quote("7974").price == 8200.0
+    finally:
+        successor.close()
+
+
+def test_readers_reattach_when_segment_is_recreated(monkeypatch):
+    name = f"ifmd_{uuid.uuid4().hex[:12]}"
+    monkeypatch.setattr(shared_market_data, "MARKET_DATA_SHM_NAME", name)
+    monkeypatch.setattr(shared_market_data, "_shared_table", None)
+    monkeypatch.setattr(shared_market_data, "_next_attach_attempt", 0.0)
+    first = SharedMarketDataTable.create(name=name, capacity=16)
+    first.put_fx_rate("USD/JPY", 150.0, datetime.now())
+    try:
+        attached = shared_market_data.get_shared_market_data()
+        assert attached.get_fx_rate("USD/JPY")[0] == 150.0
+
+        first.close()
+        first.unlink()
+        second = SharedMarketDataTable.create(name=name, capacity=16)
+        second.put_fx_rate("USD/JPY", 155.0, datetime.now())
+
+        # 確認の間隔までは今のハンドルを使い、その後は新しいセグメントにアタッチし直す
+        assert shared_market_data.get_shared_market_data() is attached
+        monkeypatch.setattr(shared_market_data, "_next_attach_attempt", 0.0)
+        reattached = shared_market_data.get_shared_market_data()
+        assert reattached is not attached
+        assert reattached.get_fx_rate("USD/JPY")[0] == 155.0
+    finally:
+        second.close()
+        second.unlink()
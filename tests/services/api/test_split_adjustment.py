@@ -0,0 +1,200 @@
+"""株式分割・併合の読み取り時の調整のテスト"""
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from application.services.split_adjusted_repositories import (
+    SplitAdjustedPriceHistoryRepository,
+    split_adjusted_price_history,
+)
+from domain.entities.auth import User
+from domain.entities.corporate_action import CorporateAction
+from domain.entities.user_stock import UserStock
+from domain.repositories.price_history_repository import PriceHistoryRepository
+from domain.services.split_adjustment import SplitAdjustments
+from infrastructure.cache.split_adjustment_cache import SplitAdjustmentCache
+from infrastructure.database import get_db, get_session_local
+from infrastructure.models.user import UserModel
+from infrastructure.models.user_stock import UserStockModel
+from infrastructure.repositories.corporate_action_repository_impl import (
+    SQLCorporateActionRepository,
+)
+from main import app
+from presentation.dependencies.auth import get_current_user
+from presentation.dependencies.corporate_actions import get_split_adjustments
+
+# 7974: 2026-03-02に1:2、2026-06-01に1:3の分割 / 9999: 2026-04-01に10:1の併合
+ACTIONS = [
+    CorporateAction(symbol="7974", ex_date=date(2026, 6, 1), ratio_from=1, ratio_to=3),
+    CorporateAction(symbol="7974", ex_date=date(2026, 3, 2), ratio_from=1, ratio_to=2),
+    CorporateAction(symbol="9999", ex_date=date(2026, 4, 1), ratio_from=10, ratio_to=1),
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePriceHistoryRepository(PriceHistoryRepository):
+    def __init__(self, closes):
+        self.closes = closes
+
+    async def get_daily_closes(self, symbol, start, end):
+        return [(day, close) for day, close in self.closes if start <= day <= end]
+
+
+def _lot(symbol, quantity, price, created_at):
+    return UserStock(
+        id=1, user_stock_id=1, user_id=1, ticker_symbol=symbol, quantity=quantity,
+        acquisition_price=Decimal(price), created_at=created_at,
+    )
+
+
+def test_cumulative_factors_by_date():
+    adjustments = SplitAdjustments(ACTIONS)
+
+    factors = adjustments.factors("7974", [
+        date(2026, 1, 5), date(2026, 3, 1), date(2026, 3, 2), date(2026, 5, 29), date(2026, 6, 1),
+    ])
+
+    # 権利落ち日当日以降はその分割の影響を受けない
+    np.testing.assert_array_equal(factors, [6.0, 6.0, 3.0, 3.0, 1.0])
+    np.testing.assert_array_equal(adjustments.factors("6758", [date(2026, 1, 5)]), [1.0])
+    assert adjustments.symbols == ["7974", "9999"]
+    assert not SplitAdjustments()
+
+
+def test_adjust_holdings_by_lot_date():
+    adjustments = SplitAdjustments(ACTIONS)
+    holdings = [
+        _lot("7974", 100, "9000.00", datetime(2026, 1, 10, 9, 0)),
+        _lot("7974", 100, "1500.00", datetime(2026, 6, 1, 9, 0)),
+        _lot("6758", 100, "3000.00", datetime(2026, 1, 10, 9, 0)),
+        _lot("9999", 15, "100.00", datetime(2026, 1, 10, 9, 0)),
+        _lot("7974", 100, "1500.00", None),
+    ]
+
+    adjusted = adjustments.adjust_holdings(holdings)
+
+    assert [(h.quantity, h.acquisition_price) for h in adjusted] == [
+        (600, Decimal("1500.00")),
+        (100, Decimal("1500.00")),
+        (100, Decimal("3000.00")),
+        # 併合の端株は切り捨て
+        (1, Decimal("1000.00")),
+        (100, Decimal("1500.00")),
+    ]
+    # 元の保有株は変更しない
+    assert holdings[0].quantity == 100
+    assert adjusted[2] is holdings[2]
+
+
+def test_announced_split_is_not_applied_before_ex_date():
+    before = SplitAdjustments(ACTIONS, as_of=date(2026, 5, 29))
+    on_ex_date = SplitAdjustments(ACTIONS, as_of=date(2026, 6, 1))
+    lot = _lot("7974", 100, "9000.00", datetime(2026, 1, 10, 9, 0))
+
+    # 評価日より後の1:3の分割は数えない（評価日の株数に換算する）
+    np.testing.assert_array_equal(
+        before.factors("7974", [date(2026, 1, 5), date(2026, 3, 2), date(2026, 6, 1)]), [2.0, 1.0, 1.0]
+    )
+    assert [(h.quantity, h.acquisition_price) for h in before.adjust_holdings([lot])] == [
+        (200, Decimal("4500.00"))
+    ]
+    assert before.adjust_closes("7974", [(date(2026, 2, 27), 9000.0), (date(2026, 5, 29), 4500.0)]) == [
+        (date(2026, 2, 27), 4500.0), (date(2026, 5, 29), 4500.0)
+    ]
+    assert on_ex_date.adjust_holdings([lot])[0].quantity == 600
+    # 反映する分割が変わるため、応答キャッシュのキーも変わる
+    assert before.key == on_ex_date.key
+    assert before.digest != on_ex_date.digest
+
+
+def test_price_history_is_adjusted_only_when_source_is_raw():
+    adjustments = SplitAdjustments(ACTIONS)
+    raw = FakePriceHistoryRepository([
+        (date(2026, 2, 27), 9000.0), (date(2026, 3, 2), 4500.0), (date(2026, 6, 1), 1500.0),
+    ])
+
+    repository = split_adjusted_price_history(raw, adjustments)
+    closes = asyncio.run(repository.get_daily_closes("7974", date(2026, 1, 1), date(2026, 12, 31)))
+
+    assert isinstance(repository, SplitAdjustedPriceHistoryRepository)
+    assert closes == [(date(2026, 2, 27), 1500.0), (date(2026, 3, 2), 1500.0), (date(2026, 6, 1), 1500.0)]
+    assert split_adjusted_price_history(repository, adjustments) is repository
+    assert split_adjusted_price_history(raw, SplitAdjustments()) is raw
+
+
+def test_cache_reloads_actions_and_notifies_on_change(session_factory):
+    clock = FakeClock()
+    changes = []
+    cache = SplitAdjustmentCache(
+        reload_seconds=60, on_change=[lambda: changes.append(1)], clock=clock
+    )
+
+    async def scenario():
+        assert not await cache.get(session_factory)
+        db = session_factory()
+        try:
+            repository = SQLCorporateActionRepository(db)
+            for action in ACTIONS:
+                await repository.add(action)
+            with pytest.raises(ValueError):
+                await repository.add(ACTIONS[0])
+        finally:
+            db.close()
+        # 確認間隔が過ぎるまでは読み直さない
+        assert not await cache.get(session_factory)
+        clock.now = 60
+        adjustments = await cache.get(session_factory)
+        clock.now = 120
+        await cache.get(session_factory)
+        return adjustments
+
+    adjustments = asyncio.run(scenario())
+    assert adjustments.symbols == ["7974", "9999"]
+    assert changes == [1]
+
+
+def test_holdings_listing_is_adjusted_without_updating_rows(client: TestClient, session_factory):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"))
+    db.add(UserStockModel(
+        id=1, user_stock_id=1, user_id=1, ticker_symbol="7974", quantity=100,
+        acquisition_price=Decimal("9000.00"), created_at=datetime(2026, 1, 10, 9, 0),
+        updated_at=datetime(2026, 1, 10, 9, 0),
+    ))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id=1, user_id=1, username="u1", email="u1@example.com", password_hash="x"
+    )
+    app.dependency_overrides[get_split_adjustments] = lambda: SplitAdjustments(ACTIONS)
+    try:
+        response = client.get("/api/user-stocks/")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [(s["quantity"], s["acquisition_price"]) for s in response.json()] == [(600, 1500.0)]
+    db = session_factory()
+    assert db.query(UserStockModel.quantity).scalar() == 100
+    db.close()
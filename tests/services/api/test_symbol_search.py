@@ -0,0 +1,78 @@
+"""銘柄検索インデックスのテスト"""
+from fastapi.testclient import TestClient
+
+from domain.entities.stock import ListedSymbol
+from domain.services.kana import canonical_romaji, kana_to_romaji
+from domain.services.symbol_search import SymbolIndex
+from infrastructure.repositories.symbol_master import get_symbol_index
+
+SYMBOLS = [
+    ListedSymbol("7974", "TSE", "Nintendo", "任天堂", "ニンテンドウ"),
+    ListedSymbol("7203", "TSE", "Toyota Motor", "トヨタ自動車", "トヨタジドウシャ"),
+    ListedSymbol("8058", "TSE", "Mitsubishi Corporation", "三菱商事", "ミツビシショウジ"),
+    ListedSymbol("8306", "TSE", "Mitsubishi UFJ Financial Group",
+                 "三菱UFJフィナンシャル・グループ", "ミツビシユーエフジェイフィナンシャルグループ"),
+    ListedSymbol("6758", "TSE", "Sony Group", "ソニーグループ", "ソニーグループ"),
+    ListedSymbol("AAPL", "NASDAQ", "Apple", "アップル", "アップル"),
+    ListedSymbol("7", "TEST", "Seven", "セブン", "セブン"),
+]
+
+
+def _symbols(index, query, limit=10):
+    return [symbol.symbol for symbol in index.search(query, limit)]
+
+
+def test_romaji_spelling_variants_are_normalized():
+    assert kana_to_romaji("トウキョウ") == canonical_romaji("tokyo") == canonical_romaji("toukyou")
+    assert kana_to_romaji("ミツビシ") == canonical_romaji("mitsubishi")
+    assert kana_to_romaji("シェブロン") == canonical_romaji("sheburon")
+    assert kana_to_romaji("ジドウシャ") == canonical_romaji("jidosha")
+
+
+def test_search_by_code_name_and_reading():
+    index = SymbolIndex(SYMBOLS)
+
+    assert _symbols(index, "7974") == ["7974"]
+    assert _symbols(index, "7974.T") == ["7974"]
+    assert _symbols(index, "nintendo") == ["7974"]
+    assert _symbols(index, "任天") == ["7974"]
+    assert _symbols(index, "にんてん") == ["7974"]
+    assert _symbols(index, "ﾆﾝﾃﾝﾄﾞｳ") == ["7974"]
+    assert _symbols(index, "ＡＰＰＬ") == ["AAPL"]
+    assert _symbols(index, "jidosha") == ["7203"]
+
+
+def test_search_ranks_exact_code_then_prefix_then_substring():
+    index = SymbolIndex(SYMBOLS)
+
+    # コードの完全一致が、コードの前方一致（7974, 7203）より先に来る
+    assert _symbols(index, "7")[:3] == ["7", "7203", "7974"]
+    # 名称の前方一致の後に、名称中の単語の前方一致が続く
+    assert _symbols(index, "group") == ["8306", "6758"]
+    # 部分一致（n-gram）
+    assert _symbols(index, "天堂") == ["7974"]
+    assert _symbols(index, "フィナンシャル") == ["8306"]
+    assert _symbols(index, "mitsubishi", limit=1) == ["8058"]
+    assert _symbols(index, "zzz") == []
+
+
+def test_listing_file_loads():
+    index = get_symbol_index()
+
+    assert len(index) > 100
+    assert index.get("7974").name_ja == "任天堂"
+    assert _symbols(index, "トヨタ") == ["7203"]
+
+
+def test_search_route_is_not_shadowed_by_stock_code_route(client: TestClient):
+    response = client.get("/api/stocks/search", params={"q": "ソニー", "limit": 3})
+
+    assert response.status_code == 200
+    assert response.json()[0] == {
+        "symbol": "6758",
+        "exchange": "TSE",
+        "name": "ソニーグループ",
+        "name_en": "Sony Group",
+        "name_kana": "ソニーグループ",
+    }
+    assert client.get("/api/stocks/search").status_code == 422
@@ -0,0 +1,212 @@
+"""リフレッシュトークンのローテーションとアクセストークンの失効フィルターのテスト"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from infrastructure.cache.revocation_filter import BloomFilter, RevocationList, jti_key
+from infrastructure.database import get_db, get_session_local
+from infrastructure.jwt_utils import verify_token
+from infrastructure.models.token import RefreshTokenModel, RevokedTokenModel
+from infrastructure.models.user import UserModel
+from infrastructure.security import hash_password
+from main import app
+from presentation.dependencies import auth as auth_dependencies
+from presentation.routes import auth as auth_route
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=1e-4)
+    added = [uuid.uuid4().hex for _ in range(1000)]
+    for jti in added:
+        bloom.add(jti_key(jti))
+
+    assert all(jti_key(jti) in bloom for jti in added)
+    false_positives = sum(jti_key(uuid.uuid4().hex) in bloom for _ in range(20000))
+    assert false_positives <= 10
+    # uuid4以外のjtiもハッシュしてキーにする
+    assert jti_key("legacy-token-id") == jti_key("legacy-token-id")
+
+
+T0 = datetime(2026, 10, 19, 9, 0, 0)
+
+
+def _at(seconds):
+    return T0 + timedelta(seconds=seconds)
+
+
+def test_sync_reads_increments_and_rebuild_drops_expired():
+    rows = [(_at(1), "a" * 32), (_at(2), "b" * 32)]
+    calls = []
+
+    def loader(since, now):
+        calls.append(since)
+        return sorted(row for row in rows if since is None or row[0] >= since)
+
+    clock = FakeClock()
+    revocations = RevocationList(
+        loader, capacity=100, rebuild_seconds=60, overlap_seconds=30, clock=clock
+    )
+    assert revocations.is_revoked("a" * 32) is False
+
+    assert revocations.sync() == 2
+    assert revocations.is_revoked("a" * 32)
+    assert revocations.is_revoked(None) is False
+
+    rows.append((_at(40), "c" * 32))
+    # 最新の失効日時から遡って読み直すが、反映済みの行は数えない
+    assert revocations.sync() == 1
+    assert calls == [None, _at(2) - timedelta(seconds=30)]
+    assert revocations.is_revoked("c" * 32)
+
+    # このワーカーで追加したjtiは作り直しでも落とさない
+    revocations.add("d" * 32)
+    rows[:] = [(_at(40), "c" * 32)]  # a, bは期限切れ
+    clock.now = 60
+    assert revocations.sync() == 1
+    assert not revocations.is_revoked("a" * 32)
+    assert revocations.is_revoked("c" * 32) and revocations.is_revoked("d" * 32)
+
+
+def test_sync_picks_up_rows_committed_after_newer_ones():
+    committed = [(_at(10), "a" * 32)]
+    revocations = RevocationList(
+        lambda since, now: sorted(row for row in committed if since is None or row[0] >= since),
+        capacity=100, overlap_seconds=30,
+    )
+    assert revocations.sync() == 1
+
+    # 先に失効日時の付いた行が、後の行より遅れてコミットされた
+    committed.append((_at(12), "c" * 32))
+    assert revocations.sync() == 1
+    committed.append((_at(11), "b" * 32))
+    assert revocations.sync() == 1
+    assert revocations.is_revoked("b" * 32)
+
+
+@pytest.fixture
+def auth_client(session_factory, monkeypatch):
+    db = session_factory()
+    db.add(UserModel(id=1, user_id=1, username="u1", email="u1@example.com",
+                     password_hash=hash_password("Password123")))
+    db.commit()
+    db.close()
+
+    def loader(since, now):
+        db = session_factory()
+        try:
+            query = db.query(RevokedTokenModel).filter(RevokedTokenModel.expires_at > now)
+            if since is not None:
+                query = query.filter(RevokedTokenModel.created_at >= since)
+            return [
+                (row.created_at, row.jti) for row in query.order_by(RevokedTokenModel.created_at)
+            ]
+        finally:
+            db.close()
+
+    revocations = RevocationList(loader, capacity=100)
+    monkeypatch.setattr(auth_dependencies, "revocation_list", revocations)
+    monkeypatch.setattr(auth_route, "revocation_list", revocations)
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_local] = lambda: session_factory
+    try:
+        yield TestClient(app), session_factory, revocations
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _login(client):
+    response = client.post(
+        "/api/auth/login", json={"email": "u1@example.com", "password": "Password123"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _me(client, access_token):
+    return client.get("/api/auth/me", headers={"Authorization": f"Bearer {access_token}"})
+
+
+def test_refresh_rotates_and_reuse_revokes_the_family(auth_client):
+    client, session_factory, _ = auth_client
+    tokens = _login(client)
+    db = session_factory()
+    # DBにはトークン自体ではなくハッシュを保存する
+    assert db.query(RefreshTokenModel).one().token != tokens["refresh_token"]
+    db.close()
+
+    rotated = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert rotated.status_code == 200
+    new_tokens = rotated.json()
+    assert new_tokens["refresh_token"] != tokens["refresh_token"]
+    assert _me(client, new_tokens["access_token"]).status_code == 200
+
+    # 使用済みのトークンが再び使われたら、新しいトークンも含めて失効させる
+    reused = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 401
+    assert reused.json()["detail"] == "Refresh token reuse detected"
+    assert client.post(
+        "/api/auth/refresh", json={"refresh_token": new_tokens["refresh_token"]}
+    ).status_code == 401
+
+
+def test_expired_refresh_token_is_rejected(auth_client):
+    client, session_factory, _ = auth_client
+    tokens = _login(client)
+    db = session_factory()
+    db.query(RefreshTokenModel).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    db.close()
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Refresh token expired"
+
+
+def test_logout_revokes_access_token_without_db_lookup(auth_client):
+    client, session_factory, revocations = auth_client
+    tokens = _login(client)
+    other = _login(client)
+    assert _me(client, tokens["access_token"]).status_code == 200
+
+    response = client.post(
+        "/api/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert response.status_code == 204
+
+    revoked = _me(client, tokens["access_token"])
+    assert revoked.status_code == 401
+    assert revoked.json()["detail"] == "Token has been revoked"
+    assert _me(client, other["access_token"]).status_code == 200
+    assert client.post(
+        "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    ).status_code == 401
+
+    # 他のワーカーは失効テーブルとの同期で反映する
+    db = session_factory()
+    assert db.query(RevokedTokenModel).count() == 1
+    db.close()
+    other_worker = RevocationList(revocations.loader, capacity=100)
+    jti = verify_token(tokens["access_token"])["jti"]
+    assert not other_worker.is_revoked(jti)
+    other_worker.sync()
+    assert other_worker.is_revoked(jti)
+